@@ -29,6 +29,7 @@ from T02_tmux_agents import (
     build_session_name,
     cleanup_registered_tmux_workers,
     list_registered_tmux_workers,
+    worker_attach_command,
     worker_state_is_prelaunch_active,
 )
 from T03_agent_init_workflow import (
@@ -598,6 +599,7 @@ def prepare_batch_request(request: CliRequest) -> tuple[AgentRunConfig, object]:
         project_dir=request.project_dir,
         target_dirs=request.target_dirs,
         run_init=request.run_init,
+        skip_unchanged=True,
     )
     return config, selection
 
@@ -608,6 +610,7 @@ def render_preflight_summary(request: CliRequest, config: AgentRunConfig, select
         f"target_dirs: {', '.join(request.target_dirs) if request.target_dirs else '(none)'}",
         f"selected_dirs: {', '.join(selection.selected_dirs) if selection.selected_dirs else '(none)'}",
         f"skipped_dirs: {', '.join(selection.skipped_dirs) if selection.skipped_dirs else '(none)'}",
+        f"unchanged_dirs: {', '.join(selection.unchanged_dirs) if selection.unchanged_dirs else '(none)'}",
         f"forced_dirs: {', '.join(selection.forced_dirs) if selection.forced_dirs else '(none)'}",
         f"vendor: {config.vendor.value}",
         f"model: {config.model}",
@@ -737,7 +740,7 @@ def render_runtime_start_summary(
             lines.append(f"- {handle.session_name} | {handle.work_dir}{forced_text}")
         lines.append("可使用以下命令进入某个会话:")
         for handle in live_workers:
-            lines.append(f"  tmux attach -t {handle.session_name}")
+            lines.append(f"  {worker_attach_command(handle)}")
     else:
         lines.append("tmux sessions: (none)")
     if immediate_results:
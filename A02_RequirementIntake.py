@@ -9,12 +9,16 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import multiprocessing
+import os
 import sys
 import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Iterator, Sequence
 from xml.etree import ElementTree
 
 from tmux_core.runtime.vendor_catalog import get_default_model_for_vendor
@@ -33,6 +37,7 @@ from T02_tmux_agents import (
     AgentRunConfig,
     TmuxBatchWorker,
     cleanup_registered_tmux_workers,
+    worker_attach_command,
     worker_state_is_prelaunch_active,
 )
 from T05_hitl_runtime import HitlPromptContext, run_hitl_agent_loop, validate_hitl_status_file
@@ -72,6 +77,12 @@ NOTION_TURN_PHASE = "requirements_intake_notion"
 NOTION_RUNTIME_ROOT_NAME = ".requirements_intake_runtime"
 NOTION_STAGE_NAME = "requirements_notion_intake"
 PLACEHOLDER_NEXT_STEP = "下一步进入需求澄清阶段（待接入）"
+SUPPORTED_INPUT_SUFFIXES = (".md", ".txt", ".pdf", ".docx")
+CACHED_INPUT_SUFFIXES = (".pdf", ".docx")
+INPUT_GLOB_CHARS = ("*", "?", "[")
+INPUT_EXTRACTION_CACHE_DIR_NAME = ".requirements_intake_cache"
+INPUT_EXTRACTION_CACHE_VERSION = 1
+PDF_PAGES_PER_EXTRACTION_JOB = 8
 
 
 @dataclass(frozen=True)
@@ -117,7 +128,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--project-dir", help="项目目录")
     parser.add_argument("--requirement-name", help="需求名称")
     parser.add_argument("--input-type", choices=INPUT_TYPE_CHOICES, help="输入方式: text|file|notion")
-    parser.add_argument("--input-value", default="", help="输入值")
+    parser.add_argument("--input-value", default="", help="输入值；file 方式支持文件、目录或通配符")
     parser.add_argument("--overwrite", action="store_true", help="允许覆盖已存在的原始需求文件")
     parser.add_argument("--reuse-existing-original-requirement", action="store_true", help="复用已存在的原始需求文件")
     parser.add_argument("--allow-previous-stage-back", action="store_true", help=argparse.SUPPRESS)
@@ -183,23 +194,64 @@ def resolve_input_file_path(project_dir: str | Path, input_value: str) -> Path:
     return candidate.resolve()
 
 
+def _is_supported_input_file(path: Path) -> bool:
+    return path.is_file() and path.suffix.lower() in SUPPORTED_INPUT_SUFFIXES and not path.name.startswith((".", "~$"))
+
+
+def resolve_input_file_paths(project_dir: str | Path, input_value: str) -> list[Path]:
+    text = str(input_value or "").strip()
+    candidate = Path(text).expanduser()
+    if not candidate.is_absolute():
+        candidate = resolve_existing_directory(project_dir) / candidate
+    # 文件名本身可能带 [ ] 等通配字符（如 需求[v2].md），字面路径存在时优先按字面路径处理。
+    if not any(char in text for char in INPUT_GLOB_CHARS) or candidate.exists():
+        if not candidate.is_dir():
+            return [resolve_input_file_path(project_dir, text)]
+        matches = [
+            path
+            for path in sorted(candidate.rglob("*"))
+            if not any(part.startswith(".") for part in path.relative_to(candidate).parts) and _is_supported_input_file(path)
+        ]
+        if not matches:
+            raise FileNotFoundError(f"输入目录中没有可读取的文件（支持 {'/'.join(SUPPORTED_INPUT_SUFFIXES)}）: {candidate.resolve()}")
+        return [path.resolve() for path in matches]
+    pattern_path = Path(text).expanduser()
+    if pattern_path.is_absolute():
+        anchor = Path(pattern_path.anchor)
+        pattern = str(pattern_path.relative_to(anchor))
+    else:
+        anchor = resolve_existing_directory(project_dir)
+        pattern = text
+    matches = [path.resolve() for path in sorted(anchor.glob(pattern)) if _is_supported_input_file(path)]
+    if not matches:
+        raise FileNotFoundError(f"没有匹配的输入文件: {text}")
+    return list(dict.fromkeys(matches))
+
+
 def extract_text_from_markdown_or_text(file_path: str | Path) -> str:
     return Path(file_path).read_text(encoding="utf-8").strip()
 
 
-def extract_text_from_pdf(file_path: str | Path) -> str:
+def _load_pdf_reader(file_path: str | Path):
     try:
         from pypdf import PdfReader
     except Exception as error:  # noqa: BLE001
         raise RuntimeError("当前环境缺少 pypdf，无法读取 PDF 文件") from error
+    return PdfReader(str(file_path))
 
-    reader = PdfReader(str(file_path))
+
+def extract_text_from_pdf_pages(file_path: str | Path, start: int = 0, stop: int | None = None) -> list[str]:
+    reader = _load_pdf_reader(file_path)
     parts: list[str] = []
-    for page in reader.pages:
+    for page in reader.pages[start:stop]:
         text = (page.extract_text() or "").strip()
         if text:
             parts.append(text)
-    return "\n\n".join(parts).strip()
+    return parts
+
+
+def extract_text_from_pdf(file_path: str | Path) -> str:
+    return "\n\n".join(extract_text_from_pdf_pages(file_path)).strip()
 
 
 def extract_text_from_docx(file_path: str | Path) -> str:
@@ -226,18 +278,144 @@ def extract_text_from_docx(file_path: str | Path) -> str:
     return "\n".join(lines).strip()
 
 
-def extract_text_from_local_file(project_dir: str | Path, input_value: str) -> str:
-    file_path = resolve_input_file_path(project_dir, input_value)
+def build_input_extraction_cache_dir(project_dir: str | Path) -> Path:
+    return resolve_existing_directory(project_dir) / INPUT_EXTRACTION_CACHE_DIR_NAME
+
+
+def _hash_input_file(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with file_path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extraction_cache_path(cache_dir: Path, file_path: Path, content_hash: str) -> Path:
+    return cache_dir / f"{content_hash}.v{INPUT_EXTRACTION_CACHE_VERSION}{file_path.suffix.lower()}.txt"
+
+
+def _read_extraction_cache(cache_path: Path) -> str | None:
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _write_extraction_cache(cache_path: Path, text: str) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        return
+
+
+def _count_pdf_pages(file_path: Path) -> int:
+    return len(_load_pdf_reader(file_path).pages)
+
+
+def _plan_extraction_jobs(
+        file_path: Path,
+        page_count: int | None = None,
+) -> list[tuple[Callable[..., object], tuple[object, ...]]]:
     suffix = file_path.suffix.lower()
     if suffix in {".md", ".txt"}:
-        return extract_text_from_markdown_or_text(file_path)
+        return [(extract_text_from_markdown_or_text, (str(file_path),))]
     if suffix == ".pdf":
-        return extract_text_from_pdf(file_path)
+        if page_count is None or page_count <= PDF_PAGES_PER_EXTRACTION_JOB:
+            return [(extract_text_from_pdf_pages, (str(file_path),))]
+        return [
+            (extract_text_from_pdf_pages, (str(file_path), start, start + PDF_PAGES_PER_EXTRACTION_JOB))
+            for start in range(0, page_count, PDF_PAGES_PER_EXTRACTION_JOB)
+        ]
     if suffix == ".docx":
-        return extract_text_from_docx(file_path)
+        return [(extract_text_from_docx, (str(file_path),))]
     raise ValueError(f"暂不支持的文件类型: {file_path.suffix or '(无扩展名)'}")
 
 
+def _merge_extraction_results(file_path: Path, results: Sequence[object]) -> str:
+    if file_path.suffix.lower() == ".pdf":
+        return "\n\n".join(part for result in results for part in result).strip()  # type: ignore[union-attr]
+    return str(results[0]).strip()
+
+
+def iter_extracted_input_texts(
+        project_dir: str | Path,
+        file_paths: Sequence[str | Path],
+        *,
+        max_workers: int | None = None,
+        use_cache: bool = True,
+) -> Iterator[tuple[Path, str]]:
+    paths = [Path(item).expanduser().resolve() for item in file_paths]
+    cache_dir = build_input_extraction_cache_dir(project_dir)
+    cached: dict[int, str] = {}
+    cache_paths: dict[int, Path] = {}
+    pending: list[int] = []
+    for index, file_path in enumerate(paths):
+        if use_cache and file_path.suffix.lower() in CACHED_INPUT_SUFFIXES:
+            cache_paths[index] = _extraction_cache_path(cache_dir, file_path, _hash_input_file(file_path))
+            cached_text = _read_extraction_cache(cache_paths[index])
+            if cached_text is not None:
+                cached[index] = cached_text
+                continue
+        pending.append(index)
+    parallel_indices = [index for index in pending if paths[index].suffix.lower() in CACHED_INPUT_SUFFIXES]
+    has_pdf = any(paths[index].suffix.lower() == ".pdf" for index in parallel_indices)
+    cpu_count = os.cpu_count() or 1
+    worker_count = min(max_workers or cpu_count, cpu_count if has_pdf else len(parallel_indices))
+    executor: ProcessPoolExecutor | None = None
+    if worker_count > 1:
+        try:
+            # 该函数会在 TUI bridge 的工作线程中调用，fork 多线程进程可能继承被其他线程持有的锁。
+            executor = ProcessPoolExecutor(max_workers=worker_count, mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, NotImplementedError, ValueError):
+            executor = None
+    try:
+        futures: dict[int, list[Future[object]]] = {}
+        if executor is not None:
+            page_counts = {
+                index: executor.submit(_count_pdf_pages, paths[index])
+                for index in parallel_indices
+                if paths[index].suffix.lower() == ".pdf"
+            }
+            for index in parallel_indices:
+                page_count = page_counts[index].result() if index in page_counts else None
+                futures[index] = [executor.submit(fn, *args) for fn, args in _plan_extraction_jobs(paths[index], page_count)]
+        for index, file_path in enumerate(paths):
+            if index in cached:
+                yield file_path, cached[index]
+                continue
+            if index in futures:
+                results = [future.result() for future in futures[index]]
+            else:
+                results = [fn(*args) for fn, args in _plan_extraction_jobs(file_path)]
+            text = _merge_extraction_results(file_path, results)
+            if index in cache_paths:
+                _write_extraction_cache(cache_paths[index], text)
+            yield file_path, text
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_text_from_local_file(project_dir: str | Path, input_value: str) -> str:
+    file_paths = resolve_input_file_paths(project_dir, input_value)
+    if len(file_paths) == 1:
+        return next(iter_extracted_input_texts(project_dir, file_paths))[1]
+    project_root = resolve_existing_directory(project_dir)
+    sections: list[str] = []
+    for file_path, text in iter_extracted_input_texts(project_dir, file_paths):
+        if not text:
+            continue
+        try:
+            label = file_path.relative_to(project_root).as_posix()
+        except ValueError:
+            label = str(file_path)
+        sections.append(f"## 来源: {label}\n\n{text}")
+    return "\n\n".join(sections).strip()
+
+
 def build_notion_hitl_paths(project_dir: str | Path, requirement_name: str) -> tuple[Path, Path, Path]:
     project_root = resolve_existing_directory(project_dir)
     safe_name = sanitize_requirement_name(requirement_name)
@@ -348,7 +526,7 @@ def reprompt_request_for_input_source(request: RequirementIntakeRequest) -> Requ
     input_value = ""
     if input_type == "file":
         default_value = request.input_value if request.input_type == "file" else ""
-        input_value = prompt_with_default("输入本地文件路径", default_value, allow_empty=False)
+        input_value = prompt_with_default("输入本地文件路径（支持目录或通配符）", default_value, allow_empty=False)
     elif input_type == "notion":
         default_value = request.input_value if request.input_type == "notion" else ""
         input_value = prompt_with_default("输入 Notion 页面链接", default_value, allow_empty=False)
@@ -369,7 +547,7 @@ def render_notion_tmux_start_summary(worker: TmuxBatchWorker) -> str:
             f"runtime_dir: {worker.runtime_dir}",
             f"session_name: {worker.session_name}",
             "可使用以下命令进入会话:",
-            f"  tmux attach -t {worker.session_name}",
+            f"  {worker_attach_command(worker)}",
         ]
     )
 
@@ -746,7 +924,7 @@ def collect_request(args: argparse.Namespace) -> RequirementIntakeRequest:
             if step == 4:
                 if input_type == "file" and not input_value:
                     with _requirement_prompt_step(4, allow_back=step > first_prompt_step):
-                        input_value = prompt_with_default("输入本地文件路径", "", allow_empty=False)
+                        input_value = prompt_with_default("输入本地文件路径（支持目录或通配符）", "", allow_empty=False)
                 elif input_type == "notion" and not input_value:
                     with _requirement_prompt_step(4, allow_back=step > first_prompt_step):
                         input_value = prompt_with_default("输入 Notion 页面链接", "", allow_empty=False)
@@ -43,6 +43,7 @@ from A02_RequirementIntake import (
     extract_text_from_local_file,
     extract_text_from_markdown_or_text,
     extract_text_from_pdf,
+    iter_extracted_input_texts,
     format_notion_failure_message,
     load_json_object,
     main as intake_main,
@@ -55,6 +56,7 @@ from A02_RequirementIntake import (
     render_notion_tmux_start_summary,
     reprompt_request_for_input_source,
     resolve_input_file_path,
+    resolve_input_file_paths,
     run_notion_reader,
     run_requirement_intake_stage,
     validate_notion_status,
@@ -41,6 +41,7 @@ from T02_tmux_agents import (
     is_agent_ready_timeout_error,
     is_provider_auth_error,
     is_worker_death_error,
+    worker_attach_command,
     worker_state_is_prelaunch_active,
 )
 from T05_hitl_runtime import HitlPromptContext, run_hitl_agent_loop
@@ -206,7 +207,7 @@ def render_requirements_clarification_tmux_start_summary(worker: TmuxBatchWorker
             f"runtime_dir: {worker.runtime_dir}",
             f"session_name: {worker.session_name}",
             "可使用以下命令进入会话:",
-            f"  tmux attach -t {worker.session_name}",
+            f"  {worker_attach_command(worker)}",
         ]
     )
 
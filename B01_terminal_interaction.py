@@ -65,6 +65,8 @@ from T03_agent_init_workflow import (
     resolve_existing_directory,
     resolve_target_selection,
     run_directory_initialization_with_worker,
+    run_timed_directory_initialization,
+    schedule_live_workers_longest_first,
 )
 
 
@@ -323,7 +325,8 @@ class AgentInitControlCenter:
 
         self.executor = ThreadPoolExecutor(
             max_workers=determine_batch_worker_count([item.work_dir for item in self.live_workers],
-                                                     max_workers=max_workers)
+                                                     max_workers=max_workers,
+                                                     vendor=config.vendor)
             if self.live_workers
             else 1
         )
@@ -414,18 +417,19 @@ class AgentInitControlCenter:
         self.started = True
         if self.live_workers:
             self.run_store.set_status("running")
-        for handle in self.live_workers:
-            if handle.work_dir in self.results_by_dir:
-                continue
+        pending_handles = [handle for handle in self.live_workers if handle.work_dir not in self.results_by_dir]
+        for handle in schedule_live_workers_longest_first(pending_handles, run_store=self.run_store):
             self._submit_handle(handle)
 
     def _submit_handle(self, handle: LiveWorkerHandle) -> None:
         future = self.executor.submit(
+            run_timed_directory_initialization,
+            self.run_store,
+            handle.work_dir,
             run_directory_initialization_with_worker,
             worker=handle.worker,
             forced=handle.forced,
             max_refine_rounds=self.max_refine_rounds,
-            run_store=self.run_store,
             resume_state=handle.resume_state,
         )
         self.futures[future] = handle
@@ -989,6 +993,7 @@ def main(argv: Sequence[str] | None = None) -> int:
         project_dir=request.project_dir,
         target_dirs=request.target_dirs,
         run_init=request.run_init,
+        skip_unchanged=True,
     )
 
     if not selection.should_run:
@@ -7,12 +7,29 @@
 """
 from __future__ import annotations
 
+import contextlib
+import copy
+import fcntl
+import inspect
 import json
+import os
 import sys
+import threading
+import time
+import weakref
+from collections.abc import Callable, Mapping
 from pathlib import Path
+from typing import Any
 
 from tmux_core.runtime.contracts import normalize_review_status_payload
 
+# 文件 mtime 落在该窗口内时，同一时钟刻度内的改写可能不改变签名，需要回读字节确认
+_TASK_LEDGER_RACY_WINDOW_NS = 1_000_000_000
+_TASK_LEDGERS: dict[str, "TaskLedger"] = {}
+_TASK_LEDGERS_LOCK = threading.Lock()
+_TASK_LEDGER_LISTENERS: list[Any] = []
+_TASK_LEDGER_LISTENERS_LOCK = threading.Lock()
+
 
 def _normalize_required_files(
         file_paths: list[str | Path] | None,
@@ -201,33 +218,213 @@ def is_file_empty(file_path: str | Path, encoding: str = "utf-8") -> bool:
         return False
 
 
-def get_first_false_task(file_path: str | Path, encoding: str = "utf-8") -> str | None:
+def _task_progress_payload_is_valid(data: Any) -> bool:
+    if not isinstance(data, dict) or not data:
+        return False
+    for tasks in data.values():
+        if not isinstance(tasks, dict) or not tasks:
+            return False
+        for task_status in tasks.values():
+            if not isinstance(task_status, bool):
+                return False
+    return True
+
+
+def _listener_ref(listener: Callable[["TaskLedger", dict[str, Any] | None], None]) -> Callable[[], Any]:
+    if inspect.ismethod(listener):
+        return weakref.WeakMethod(listener)
+    return lambda: listener
+
+
+def subscribe_task_ledger_changes(
+        listener: Callable[["TaskLedger", dict[str, Any] | None], None],
+) -> Callable[[], None]:
     """
-    读取 JSON 文件，按顺序返回第一个值为 False 的任务 Key。
-    如果全部为 True，则返回 None。
+    订阅所有任务单 JSON 的变更通知；绑定方法以弱引用保存，返回取消订阅函数。
     """
-    path = Path(file_path)
-    if not path.exists():
-        return None
+    listener_ref = _listener_ref(listener)
+    with _TASK_LEDGER_LISTENERS_LOCK:
+        _TASK_LEDGER_LISTENERS.append(listener_ref)
 
-    try:
-        with path.open(encoding=encoding) as f:
-            data = json.load(f)
+    def _unsubscribe() -> None:
+        with _TASK_LEDGER_LISTENERS_LOCK:
+            with contextlib.suppress(ValueError):
+                _TASK_LEDGER_LISTENERS.remove(listener_ref)
 
-        # 第一层遍历：M1, M2, M3...
-        for module_key, tasks in data.items():
-            # 确保 tasks 是字典格式
+    return _unsubscribe
+
+
+class TaskLedger:
+    """
+    任务单 JSON 的进程内视图：按文件签名缓存解析结果，写入时持有 fcntl 锁并原子替换。
+    同一路径在进程内共享一个实例，开发循环与快照构建只在文件变化后解析一次。
+    """
+
+    def __init__(self, file_path: str | Path, encoding: str = "utf-8") -> None:
+        self.path = Path(file_path).expanduser().resolve()
+        self.encoding = encoding
+        self._lock = threading.RLock()
+        self._signature: tuple[int, int, int, int] | None = None
+        self._loaded_at_ns = 0
+        self._raw: bytes | None = None
+        self._data: Any = None
+        self._loaded = False
+        self._listeners: list[Any] = []
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_name(f".{self.path.name}.lock")
+
+    def subscribe(self, listener: Callable[["TaskLedger", dict[str, Any] | None], None]) -> Callable[[], None]:
+        listener_ref = _listener_ref(listener)
+        with self._lock:
+            self._listeners.append(listener_ref)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                with contextlib.suppress(ValueError):
+                    self._listeners.remove(listener_ref)
+
+        return _unsubscribe
+
+    def _notify(self, snapshot: dict[str, Any] | None) -> None:
+        with self._lock:
+            listener_refs = list(self._listeners)
+        with _TASK_LEDGER_LISTENERS_LOCK:
+            listener_refs.extend(_TASK_LEDGER_LISTENERS)
+        for listener_ref in listener_refs:
+            listener = listener_ref()
+            if listener is None:
+                continue
+            try:
+                listener(self, copy.deepcopy(snapshot))
+            except Exception as error:  # noqa: BLE001
+                _stderr_message(f"任务单变更通知失败: {error}")
+
+    def _stat_signature(self) -> tuple[tuple[int, int, int, int] | None, int]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None, 0
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns), stat.st_mtime_ns
+
+    def _store(self, raw: bytes | None, signature: tuple[int, int, int, int] | None) -> bool:
+        changed = self._loaded and raw != self._raw
+        if raw != self._raw or not self._loaded:
+            self._raw = raw
+            if raw is None:
+                self._data = None
+            else:
+                try:
+                    self._data = json.loads(raw.decode(self.encoding))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    self._data = None
+        self._signature = signature
+        self._loaded_at_ns = time.time_ns()
+        self._loaded = True
+        return changed
+
+    def _refresh_locked(self) -> bool:
+        signature, mtime_ns = self._stat_signature()
+        if signature is None:
+            return self._store(None, None)
+        racy = mtime_ns + _TASK_LEDGER_RACY_WINDOW_NS >= self._loaded_at_ns
+        if signature == self._signature and not racy:
+            return False
+        try:
+            raw = self.path.read_bytes()
+        except OSError:
+            raw = None
+        return self._store(raw, signature)
+
+    def refresh(self) -> Any:
+        with self._lock:
+            changed = self._refresh_locked()
+            data = self._data
+            snapshot = copy.deepcopy(data) if changed and isinstance(data, dict) else None
+        if changed:
+            self._notify(snapshot)
+        return data
+
+    def snapshot(self) -> dict[str, Any] | None:
+        data = self.refresh()
+        return copy.deepcopy(data) if isinstance(data, dict) else None
+
+    def is_valid_progress(self) -> bool:
+        return _task_progress_payload_is_valid(self.refresh())
+
+    def first_false_task(self) -> str | None:
+        data = self.refresh()
+        if not isinstance(data, dict):
+            return None
+        # 第一层遍历：M1, M2, M3...；第二层遍历：M1-T1, M1-T2...
+        for tasks in data.values():
             if isinstance(tasks, dict):
-                # 第二层遍历：M1-T1, M1-T2...
                 for task_key, status in tasks.items():
-                    # 找到第一个 False
                     if status is False:
                         return task_key
-
-    except (json.JSONDecodeError, IOError):
         return None
 
-    return None
+    def update_tasks(self, updates: Mapping[str, bool]) -> list[str]:
+        """
+        批量修改任务状态，返回实际找到并写入的任务 key；整个读改写过程持有跨进程文件锁。
+        """
+        normalized_updates = {str(key): bool(value) for key, value in updates.items()}
+        if not normalized_updates:
+            return []
+        with self._lock:
+            if not self.path.exists():
+                return []
+            with self.lock_path.open("a+", encoding="utf-8") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._refresh_locked()
+                    data = copy.deepcopy(self._data)
+                    if not isinstance(data, dict):
+                        return []
+                    applied: list[str] = []
+                    for target_key, target_value in normalized_updates.items():
+                        for tasks in data.values():
+                            if isinstance(tasks, dict) and target_key in tasks:
+                                tasks[target_key] = target_value
+                                applied.append(target_key)
+                                break
+                    if not applied:
+                        return []
+                    raw = json.dumps(data, indent=2, ensure_ascii=False).encode(self.encoding)
+                    temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+                    temp_path.write_bytes(raw)
+                    os.replace(temp_path, self.path)
+                    signature, _mtime_ns = self._stat_signature()
+                    changed = self._store(raw, signature)
+                    snapshot = copy.deepcopy(self._data)
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        if changed:
+            self._notify(snapshot)
+        return applied
+
+    def mark_task_done(self, task_key: str) -> bool:
+        return bool(self.update_tasks({task_key: True}))
+
+
+def get_task_ledger(file_path: str | Path, encoding: str = "utf-8") -> TaskLedger:
+    path = Path(file_path).expanduser().resolve()
+    key = f"{path}|{encoding}"
+    with _TASK_LEDGERS_LOCK:
+        ledger = _TASK_LEDGERS.get(key)
+        if ledger is None:
+            ledger = TaskLedger(path, encoding=encoding)
+            _TASK_LEDGERS[key] = ledger
+        return ledger
+
+
+def get_first_false_task(file_path: str | Path, encoding: str = "utf-8") -> str | None:
+    """
+    读取 JSON 文件，按顺序返回第一个值为 False 的任务 Key。
+    如果全部为 True，则返回 None。
+    """
+    return get_task_ledger(file_path, encoding).first_false_task()
 
 
 def is_task_progress_json(file_path: str | Path, encoding: str = "utf-8") -> bool:
@@ -240,53 +437,16 @@ def is_task_progress_json(file_path: str | Path, encoding: str = "utf-8") -> boo
     path = Path(file_path)
     if not path.exists() or not path.is_file():
         return False
-
-    try:
-        data = json.loads(path.read_text(encoding=encoding))
-        if not isinstance(data, dict) or not data:
-            return False
-        for tasks in data.values():
-            if not isinstance(tasks, dict) or not tasks:
-                return False
-            for task_status in tasks.values():
-                if not isinstance(task_status, bool):
-                    return False
-        return True
-    except (json.JSONDecodeError, UnicodeDecodeError, IOError):
-        return False
+    return get_task_ledger(path, encoding).is_valid_progress()
 
 
 def update_task_to_true(file_path: str | Path, target_key: str, encoding: str = "utf-8") -> bool:
     """
     将 JSON 文件中指定 task key 的值修改为 true。
     """
-    path = Path(file_path)
-    if not path.exists():
-        return False
-
     try:
-        # 1. 读取原始数据
-        with path.open("r", encoding=encoding) as f:
-            data = json.load(f)
-
-        # 2. 遍历查找并修改
-        found = False
-        for module_name, tasks in data.items():
-            if isinstance(tasks, dict) and target_key in tasks:
-                tasks[target_key] = True
-                found = True
-                break  # 找到后立即退出循环
-
-        # 3. 如果修改成功，写回文件
-        if found:
-            with path.open("w", encoding=encoding) as f:
-                # indent=2 保持 JSON 的美观易读
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            return True
-
-        return False
-
-    except (json.JSONDecodeError, IOError):
+        return get_task_ledger(file_path, encoding).mark_task_done(target_key)
+    except OSError:
         return False
 
 
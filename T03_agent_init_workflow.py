@@ -10,8 +10,10 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import shutil
 import threading
+import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass, field
@@ -37,6 +39,16 @@ from T02_tmux_agents import (
     worker_state_is_prelaunch_active,
 )
 
+from tmux_core.stage_kernel.routing_fingerprint import (
+    ROUTING_REFRESH_ACTION_REFRESH,
+    ROUTING_REFRESH_ACTION_SKIP,
+    RoutingRefreshPlan,
+    plan_routing_refresh,
+    render_routing_refresh_record,
+    write_routing_fingerprint,
+)
+from U01_common_config import DEFAULT_VENDOR_MAX_CONCURRENCY, VENDOR_MAX_CONCURRENCY
+
 
 ROUTING_LAYER_REQUIRED_FILES = (
     "AGENTS.md",
@@ -55,11 +67,19 @@ TURN_STATUS_SCHEMA_VERSION = "1.0"
 PHASE_ROUTING_LAYER_CREATE = "routing_layer_create"
 PHASE_ROUTING_LAYER_AUDIT = "routing_layer_audit"
 PHASE_ROUTING_LAYER_REFINE = "routing_layer_refine"
+ROUTING_REFRESH_RECORD_FILE = "路由层增量刷新.md"
 ROUTING_RUNTIME_ROOT_NAME = ".routing_init_runtime"
 RUN_MANIFEST_VERSION = 1
 FINAL_RESULT_STATUSES = {"passed", "failed", "skipped", "stale_failed"}
 ACTIVE_ROUTING_WORKFLOW_STAGES = {"create_running", "audit_running", "refine_running"}
 PRELAUNCH_AGENT_STATES = {"", AgentRuntimeState.STARTING.value, AgentRuntimeState.DEAD.value}
+VENDOR_CONCURRENCY_ENV = "TMUX_VENDOR_CONCURRENCY"
+ROUTING_COST_EXCLUDED_DIRS = {"node_modules", "__pycache__", "venv", "dist", "build"}
+ROUTING_COST_MAX_ENTRIES = 50000
+ROUTING_COST_BASE_SEC = 60.0
+ROUTING_COST_SEC_PER_FILE = 0.5
+ROUTING_COST_SEC_PER_MB = 2.0
+ROUTING_PRIOR_DURATION_RUN_LIMIT = 8
 
 
 def _now_iso() -> str:
@@ -220,6 +240,12 @@ def has_complete_routing_layer(work_dir: str | Path) -> bool:
     return True
 
 
+def plan_routing_layer_refresh(work_dir: str | Path) -> RoutingRefreshPlan | None:
+    if not has_complete_routing_layer(work_dir):
+        return None
+    return plan_routing_refresh(work_dir)
+
+
 @dataclass(frozen=True)
 class TargetSelection:
     project_dir: str
@@ -227,11 +253,16 @@ class TargetSelection:
     skipped_dirs: tuple[str, ...]
     forced_dirs: tuple[str, ...]
     project_missing_files: tuple[str, ...]
+    unchanged_dirs: tuple[str, ...] = ()
+    refresh_plans: tuple[RoutingRefreshPlan, ...] = ()
 
     @property
     def should_run(self) -> bool:
         return bool(self.selected_dirs)
 
+    def refresh_plan_for(self, work_dir: str) -> RoutingRefreshPlan | None:
+        return next((plan for plan in self.refresh_plans if plan.work_dir == work_dir), None)
+
     @property
     def project_is_forced(self) -> bool:
         return self.project_dir in self.forced_dirs
@@ -242,6 +273,7 @@ def resolve_target_selection(
     project_dir: str | Path,
     target_dirs: Sequence[str | Path] = (),
     run_init: bool = True,
+    skip_unchanged: bool = False,
 ) -> TargetSelection:
     project_root = resolve_existing_directory(project_dir)
     ordered_candidates: list[Path] = []
@@ -262,6 +294,8 @@ def resolve_target_selection(
     skipped_dirs: list[str] = []
     selected_dirs: list[str] = []
     forced_dirs: list[str] = []
+    unchanged_dirs: list[str] = []
+    refresh_plans: list[RoutingRefreshPlan] = []
 
     if not run_init:
         if project_missing:
@@ -275,7 +309,18 @@ def resolve_target_selection(
         else:
             skipped_dirs = [str(candidate) for candidate in ordered_candidates]
     else:
-        selected_dirs = [str(candidate) for candidate in ordered_candidates]
+        for candidate in ordered_candidates:
+            if project_missing and candidate == project_root:
+                selected_dirs.append(str(candidate))
+                continue
+            plan = plan_routing_layer_refresh(candidate) if skip_unchanged else None
+            if plan is not None and plan.action == ROUTING_REFRESH_ACTION_SKIP:
+                skipped_dirs.append(str(candidate))
+                unchanged_dirs.append(str(candidate))
+                continue
+            selected_dirs.append(str(candidate))
+            if plan is not None:
+                refresh_plans.append(plan)
         if project_missing:
             forced_dirs.append(str(project_root))
 
@@ -285,6 +330,8 @@ def resolve_target_selection(
         skipped_dirs=tuple(skipped_dirs),
         forced_dirs=tuple(forced_dirs),
         project_missing_files=project_missing,
+        unchanged_dirs=tuple(unchanged_dirs),
+        refresh_plans=tuple(refresh_plans),
     )
 
 
@@ -940,6 +987,7 @@ class WorkerManifestEntry:
     raw_log_path: str = ""
     state_path: str = ""
     transcript_path: str = ""
+    duration_sec: float = 0.0
 
     def to_dict(self) -> dict[str, object]:
         return asdict(self)
@@ -1098,6 +1146,7 @@ class RunStore:
                 raw_log_path=str(item.get("raw_log_path", "")),
                 state_path=str(item.get("state_path", "")),
                 transcript_path=str(item.get("transcript_path", "")),
+                duration_sec=float(item.get("duration_sec", 0.0) or 0.0),
             )
             for item in payload.get("workers", [])
             if isinstance(item, dict)
@@ -1124,6 +1173,17 @@ class RunStore:
             skipped_dirs=tuple(raw.get("skipped_dirs", ())),
             forced_dirs=tuple(raw.get("forced_dirs", ())),
             project_missing_files=tuple(raw.get("project_missing_files", ())),
+            unchanged_dirs=tuple(raw.get("unchanged_dirs", ())),
+            refresh_plans=tuple(
+                RoutingRefreshPlan(
+                    work_dir=str(item.get("work_dir", "")),
+                    action=str(item.get("action", "")),
+                    changed_scopes=tuple(item.get("changed_scopes", ())),
+                    reason=str(item.get("reason", "")),
+                )
+                for item in raw.get("refresh_plans", ())
+                if isinstance(item, dict)
+            ),
         )
 
     def config_object(self) -> AgentRunConfig:
@@ -1283,6 +1343,12 @@ class RunStore:
         self.write_manifest()
         return entry
 
+    def record_worker_duration(self, work_dir: str, duration_sec: float) -> None:
+        entry = self.ensure_worker(work_dir=work_dir)
+        entry.duration_sec = round(max(float(duration_sec), 0.0), 3)
+        self.write_manifest()
+        self.append_event("worker_timing", work_dir=work_dir, duration_sec=entry.duration_sec)
+
     def update_worker_result(
         self,
         result: DirectoryInitResult,
@@ -1543,6 +1609,7 @@ def run_directory_initialization_with_worker(
     max_refine_rounds: int = 3,
     run_store: RunStore | None = None,
     resume_state: dict[str, object] | None = None,
+    refresh_plan: RoutingRefreshPlan | None = None,
 ) -> DirectoryInitResult:
     target_dir = resolve_existing_directory(worker.work_dir)
     missing_before = missing_routing_layer_files(target_dir)
@@ -1662,6 +1729,11 @@ def run_directory_initialization_with_worker(
             last_audit_summary=summarize_audit_output(last_audit_output),
             commands=[_command_to_dict(item) for item in collected.commands],
         )
+        try:
+            write_routing_fingerprint(target_dir)
+        except OSError as error:
+            if run_store is not None:
+                run_store.append_event("routing_fingerprint_failed", work_dir=str(target_dir), error=str(error))
         if run_store is not None:
             run_store.update_worker_result(result)
         return result
@@ -1779,6 +1851,45 @@ def run_directory_initialization_with_worker(
             return fail(f"audit_turn_status_invalid: {error}")
         return consume_audit_files(round_index, source="fresh")
 
+    def run_refresh_step(plan: RoutingRefreshPlan) -> str | DirectoryInitResult:
+        nonlocal current_turn_id, current_turn_phase, current_turn_status_path, current_turn_baseline_hashes
+        current_turn_id = "refresh_routing_layer_1"
+        current_turn_phase = PHASE_ROUTING_LAYER_REFINE
+        current_turn_baseline_hashes = {}
+        contract = build_contract(current_turn_id, current_turn_phase, ROUTING_LAYER_REQUIRED_FILES)
+        refresh_record = reset_turn_runtime_dir(worker.runtime_dir, current_turn_id) / ROUTING_REFRESH_RECORD_FILE
+        refresh_record.write_text(render_routing_refresh_record(plan), encoding="utf-8")
+        current_turn_status_path = str(contract.status_path)
+        sync_state("refine_running", note=f"refresh_routing_layer: {', '.join(plan.changed_scopes)}")
+        refresh_result = worker.run_turn(
+            label="refresh_routing_layer",
+            prompt=build_refine_prompt(refresh_record),
+            completion_contract=contract,
+        )
+        if run_store is not None:
+            run_store.update_worker_state_from_file(
+                str(target_dir),
+                worker.state_path,
+                preserve_workflow_fields=True,
+            )
+            run_store.append_event(
+                "turn_finished",
+                work_dir=str(target_dir),
+                label="refresh_routing_layer",
+                changed_scopes=list(plan.changed_scopes),
+            )
+        if not refresh_result.ok:
+            return fail(_command_failure_reason("refresh_command_failed", refresh_result))
+        try:
+            validate_contract(contract)
+        except Exception as error:
+            return fail(f"refresh_turn_status_invalid: {error}")
+        current_turn_id = ""
+        current_turn_phase = ""
+        current_turn_status_path = ""
+        sync_state("audit_pending", note="refresh_completed")
+        return "audit"
+
     def run_refine_step() -> str | DirectoryInitResult:
         nonlocal current_turn_id, current_turn_phase, current_turn_status_path, current_turn_baseline_hashes
         current_round = max(rounds_used, 1)
@@ -1928,6 +2039,18 @@ def run_directory_initialization_with_worker(
         else:
             rounds_used = 0
             next_action = "create"
+            if forced:
+                refresh_plan = None
+            elif refresh_plan is None:
+                refresh_plan = plan_routing_layer_refresh(target_dir)
+            if refresh_plan is not None and refresh_plan.action == ROUTING_REFRESH_ACTION_SKIP:
+                sync_state("completed", note="routing_fingerprint_unchanged", result_status="passed")
+                return finalize_pass_result()
+            if refresh_plan is not None and refresh_plan.action == ROUTING_REFRESH_ACTION_REFRESH:
+                next_step = run_refresh_step(refresh_plan)
+                if isinstance(next_step, DirectoryInitResult):
+                    return next_step
+                next_action = next_step
 
         while True:
             if next_action == "create":
@@ -1989,11 +2112,154 @@ def has_overlapping_scope_paths(paths: Sequence[str | Path]) -> bool:
     return False
 
 
+def resolve_vendor_concurrency(vendor: str | None = None) -> int:
+    vendor_key = str(getattr(vendor, "value", vendor) or "").strip().lower()
+    limits = dict(VENDOR_MAX_CONCURRENCY)
+    for item in str(os.environ.get(VENDOR_CONCURRENCY_ENV, "")).split(","):
+        name, _, value = item.partition("=")
+        name = name.strip().lower()
+        if not name or not value.strip():
+            continue
+        try:
+            limits[name] = int(value)
+        except ValueError:
+            continue
+    return max(int(limits.get(vendor_key, DEFAULT_VENDOR_MAX_CONCURRENCY)), 1)
+
+
 def determine_batch_worker_count(
     selected_dirs: Sequence[str | Path],
     max_workers: int | None = None,
+    *,
+    vendor: str | None = None,
 ) -> int:
-    return max_workers or min(len(selected_dirs), 4) or 1
+    return max_workers or min(len(selected_dirs), resolve_vendor_concurrency(vendor)) or 1
+
+
+@dataclass(frozen=True)
+class DirectoryCostEstimate:
+    work_dir: str
+    file_count: int
+    total_bytes: int
+    prior_duration_sec: float = 0.0
+
+    @property
+    def estimated_sec(self) -> float:
+        if self.prior_duration_sec > 0:
+            return self.prior_duration_sec
+        return (
+            ROUTING_COST_BASE_SEC
+            + self.file_count * ROUTING_COST_SEC_PER_FILE
+            + self.total_bytes / (1024 * 1024) * ROUTING_COST_SEC_PER_MB
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return {**asdict(self), "estimated_sec": round(self.estimated_sec, 3)}
+
+
+def load_prior_directory_durations(
+    *,
+    project_dir: str | Path | None = None,
+    runtime_root: str | Path | None = None,
+    run_limit: int = ROUTING_PRIOR_DURATION_RUN_LIMIT,
+) -> dict[str, float]:
+    durations: dict[str, float] = {}
+    try:
+        manifest_paths = list_routing_run_manifest_paths(project_dir=project_dir, runtime_root=runtime_root)
+    except (OSError, ValueError):
+        return durations
+    for manifest_path in manifest_paths[: max(int(run_limit), 0)]:
+        try:
+            payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        for item in payload.get("workers", []) if isinstance(payload, dict) else []:
+            if not isinstance(item, dict):
+                continue
+            work_dir = str(item.get("work_dir", "")).strip()
+            try:
+                duration_sec = float(item.get("duration_sec", 0.0) or 0.0)
+            except (TypeError, ValueError):
+                continue
+            if work_dir and duration_sec > 0:
+                durations.setdefault(work_dir, duration_sec)
+    return durations
+
+
+def estimate_directory_cost(
+    work_dir: str | Path,
+    *,
+    prior_durations: dict[str, float] | None = None,
+    max_entries: int = ROUTING_COST_MAX_ENTRIES,
+) -> DirectoryCostEstimate:
+    root = str(Path(work_dir).expanduser().resolve())
+    file_count = 0
+    total_bytes = 0
+    visited = 0
+    pending = [root]
+    while pending and visited < max_entries:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    visited += 1
+                    if entry.name.startswith(".") or entry.name in ROUTING_COST_EXCLUDED_DIRS:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            file_count += 1
+                            total_bytes += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return DirectoryCostEstimate(
+        work_dir=root,
+        file_count=file_count,
+        total_bytes=total_bytes,
+        prior_duration_sec=float((prior_durations or {}).get(root, 0.0)),
+    )
+
+
+def schedule_live_workers_longest_first(
+    live_workers: Sequence[LiveWorkerHandle],
+    *,
+    run_store: RunStore,
+) -> list[LiveWorkerHandle]:
+    prior_durations = load_prior_directory_durations(runtime_root=run_store.run_root.parent)
+    estimates = {
+        handle.work_dir: estimate_directory_cost(handle.work_dir, prior_durations=prior_durations)
+        for handle in live_workers
+    }
+    ordered = sorted(enumerate(live_workers), key=lambda item: (-estimates[item[1].work_dir].estimated_sec, item[0]))
+    schedule = [handle for _, handle in ordered]
+    run_store.append_event(
+        "batch_schedule",
+        order=[estimates[handle.work_dir].to_dict() for handle in schedule],
+    )
+    return schedule
+
+
+def run_timed_directory_initialization(
+    run_store: RunStore,
+    work_dir: str,
+    runner: Callable[..., DirectoryInitResult],
+    **kwargs: object,
+) -> DirectoryInitResult:
+    started_at = time.monotonic()
+    result = runner(run_store=run_store, **kwargs)
+    if _is_full_directory_run(result, kwargs.get("resume_state")):
+        run_store.record_worker_duration(work_dir, time.monotonic() - started_at)
+    return result
+
+
+def _is_full_directory_run(result: DirectoryInitResult, resume_state: object) -> bool:
+    # 失败、指纹未变跳过与续跑的耗时不代表完整建档成本，记下来会让下一轮排序误判
+    if result.status != "passed" or result.rounds_used <= 0:
+        return False
+    resumed_state = resume_state if isinstance(resume_state, dict) else {}
+    return str(resumed_state.get("workflow_stage", "pending") or "pending") == "pending"
 
 
 def build_batch_result(
@@ -2112,18 +2378,25 @@ def run_batch_initialization(
         results_by_dir[item.work_dir] = item
 
     if live_workers:
-        worker_count = determine_batch_worker_count([item.work_dir for item in live_workers], max_workers=max_workers)
+        worker_count = determine_batch_worker_count(
+            [item.work_dir for item in live_workers],
+            max_workers=max_workers,
+            vendor=config.vendor,
+        )
         with ThreadPoolExecutor(max_workers=worker_count) as executor:
             future_map = {
                 executor.submit(
+                    run_timed_directory_initialization,
+                    run_store,
+                    handle.work_dir,
                     run_directory_initialization_with_worker,
                     worker=handle.worker,
                     forced=handle.forced,
                     max_refine_rounds=max_refine_rounds,
-                    run_store=run_store,
                     resume_state=handle.resume_state,
+                    refresh_plan=selection.refresh_plan_for(handle.work_dir),
                 ): handle.work_dir
-                for handle in live_workers
+                for handle in schedule_live_workers_longest_first(live_workers, run_store=run_store)
             }
             for future in as_completed(future_map):
                 target_dir = future_map[future]
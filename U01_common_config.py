@@ -10,3 +10,10 @@ from __future__ import annotations
 
 
 SYSTEM_PYTHON_PATH = "/Library/Frameworks/Python.framework/Versions/3.9/bin/python3.9"
+VENDOR_MAX_CONCURRENCY = {
+    "codex": 4,
+    "claude": 4,
+    "gemini": 2,
+    "opencode": 4,
+}
+DEFAULT_VENDOR_MAX_CONCURRENCY = 4
@@ -1142,7 +1142,8 @@ export function App(props: StartupOptions) {
 
   const handleEvent = (event: BackendEvent) => {
     if (event.type === 'log.append') {
-      appendLog(String(event.payload.text ?? ''), event.type, event.payload)
+      const lines: unknown[] = Array.isArray(event.payload.lines) ? event.payload.lines : [event.payload.text ?? '']
+      for (const line of lines) appendLog(String(line ?? ''), event.type, event.payload)
       return
     }
     if (event.type === 'progress.start') {
@@ -701,7 +701,8 @@ export function App() {
 
   const handleEvent = (event: BridgeEvent) => {
     if (event.type === 'log.append') {
-      setLogs((prev) => appendLog(prev, classifyLog(String(event.payload.text ?? ''), event.type, event.payload)))
+      const lines: unknown[] = Array.isArray(event.payload.lines) ? event.payload.lines : [event.payload.text ?? '']
+      setLogs((prev) => lines.reduce((current, line) => appendLog(current, classifyLog(String(line ?? ''), event.type, event.payload)), prev))
       return
     }
     if (event.type === 'progress.start' || event.type === 'progress.update') {
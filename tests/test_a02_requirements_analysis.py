@@ -37,9 +37,11 @@ from A02_RequirementsAnalysis import (
     extract_text_from_docx,
     extract_text_from_local_file,
     extract_text_from_pdf,
+    iter_extracted_input_texts,
     format_notion_failure_message,
     main,
     render_agent_boot_progress_line,
+    resolve_input_file_paths,
     render_requirements_analysis_progress_line,
     render_requirements_analysis_tmux_start_summary,
     render_notion_progress_line,
@@ -643,6 +645,52 @@ class RequirementsAnalysisIntakeTests(unittest.TestCase):
             self.assertIn("PDF TEXT", extract_text_from_local_file(root, "sample.pdf"))
             self.assertEqual(extract_text_from_local_file(root, "sample.docx"), "DOCX 文本")
 
+    def test_extract_text_from_local_file_accepts_directory_and_glob_inputs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "docs" / "nested").mkdir(parents=True)
+            (root / "docs" / "a.md").write_text("# 概述", encoding="utf-8")
+            _make_simple_docx(root / "docs" / "nested" / "b.docx", ["详细规则"])
+            (root / "docs" / "notes.json").write_text("{}", encoding="utf-8")
+            (root / "docs" / ".hidden.md").write_text("隐藏", encoding="utf-8")
+
+            self.assertEqual(
+                [path.name for path in resolve_input_file_paths(root, "docs")],
+                ["a.md", "b.docx"],
+            )
+            self.assertEqual(
+                extract_text_from_local_file(root, "docs"),
+                "## 来源: docs/a.md\n\n# 概述\n\n## 来源: docs/nested/b.docx\n\n详细规则",
+            )
+            self.assertEqual(
+                [path.name for path in resolve_input_file_paths(root, "docs/**/*.docx")],
+                ["b.docx"],
+            )
+            with self.assertRaises(FileNotFoundError):
+                resolve_input_file_paths(root, "docs/*.pdf")
+
+            (root / "需求[v2].md").write_text("# 第二版", encoding="utf-8")
+            self.assertEqual(resolve_input_file_paths(root, "需求[v2].md"), [(root / "需求[v2].md").resolve()])
+            self.assertEqual(extract_text_from_local_file(root, "需求[v2].md"), "# 第二版")
+
+    def test_extracted_input_texts_stream_in_order_and_reuse_content_hash_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            paths = []
+            for index in range(3):
+                path = root / f"part{index}.docx"
+                _make_simple_docx(path, [f"第{index}部分"])
+                paths.append(path)
+            first = list(iter_extracted_input_texts(root, paths, max_workers=2))
+            self.assertEqual([text for _path, text in first], ["第0部分", "第1部分", "第2部分"])
+            self.assertEqual(len(list((root / ".requirements_intake_cache").glob("*.txt"))), 3)
+
+            copy_path = root / "copy.docx"
+            copy_path.write_bytes(paths[1].read_bytes())
+            with patch("A02_RequirementIntake.extract_text_from_docx", side_effect=AssertionError("cache miss")):
+                cached = list(iter_extracted_input_texts(root, [paths[2], copy_path]))
+            self.assertEqual(cached, [(paths[2].resolve(), "第2部分"), (copy_path.resolve(), "第1部分")])
+
     def test_get_notion_requirement_prompt_mentions_output_files_only(self):
         prompt = get_notion_requirement(
             "https://www.notion.so/demo",
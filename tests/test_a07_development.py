@@ -2226,6 +2226,114 @@ class A07DevelopmentTests(unittest.TestCase):
         self.assertEqual(parallel_reviewers.call_count, 2)
         refine_task.assert_called_once()
 
+    def test_run_development_stage_rejoins_and_snapshots_after_refine_before_each_dispatch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_dir = Path(tmp_dir)
+            paths = build_development_paths(project_dir, "需求A")
+            _write_required_inputs(paths)
+            paths["task_md_path"].write_text("任务单正文\n", encoding="utf-8")
+            paths["task_json_path"].write_text(
+                json.dumps({"M1": {"M1-T1": False}}, ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+            developer = DeveloperRuntime(
+                selection=ReviewAgentSelection("codex", "gpt-5.4", "high", ""),
+                worker=_FakeWorker(session_name="开发工程师-天魁星"),
+                role_prompt="实现视角",
+            )
+            reviewers = [
+                ReviewerRuntime(
+                    reviewer_name="审核员",
+                    selection=ReviewAgentSelection("codex", "gpt-5.4", "high", ""),
+                    worker=_FakeWorker(session_name="审核员-天平星"),
+                    review_md_path=project_dir / "需求A_代码评审记录_审核员.md",
+                    review_json_path=project_dir / "需求A_评审记录_审核员.json",
+                    contract=_dummy_contract(),
+                )
+            ]
+            events: list[str] = []
+
+            def fake_record(tracker, round_index):  # noqa: ANN001
+                events.append(f"snapshot:{round_index}")
+                return None
+
+            def fake_parallel(reviewers_arg, **kwargs):  # noqa: ANN001
+                events.append(f"review:{kwargs['round_index']}")
+                return list(reviewers_arg)
+
+            def fake_refine(*args, **kwargs):  # noqa: ANN001
+                events.append("refine")
+                return developer, "修订后代码变更"
+
+            def fake_task_done(**kwargs):  # noqa: ANN001
+                if "refine" in events:
+                    paths["task_json_path"].write_text(
+                        json.dumps({"M1": {"M1-T1": True}}, ensure_ascii=False, indent=2),
+                        encoding="utf-8",
+                    )
+                    return True
+                paths["merged_review_path"].write_text("请补充异常处理\n", encoding="utf-8")
+                return False
+
+            with patch("A07_Development.cleanup_stale_development_runtime_state", return_value=()), patch(
+                "A07_Development.cleanup_existing_development_artifacts",
+                return_value=(),
+            ), patch(
+                "A07_Development.resolve_developer_plan",
+                return_value=DeveloperPlan(selection=developer.selection, role_prompt=developer.role_prompt),
+            ), patch(
+                "A07_Development.create_developer_runtime",
+                return_value=developer,
+            ), patch(
+                "A07_Development.resolve_reviewer_specs",
+                return_value=[DevelopmentReviewerSpec(role_name="审核员", role_prompt="审计视角", reviewer_key="审核员")],
+            ), patch(
+                "A07_Development.collect_reviewer_agent_selections",
+                return_value={"审核员": reviewers[0].selection},
+            ), patch(
+                "A07_Development.build_reviewer_workers",
+                return_value=reviewers,
+            ), patch(
+                "A07_Development.initialize_development_workers",
+                return_value=(developer, reviewers),
+            ), patch(
+                "A07_Development.resolve_subagent_num",
+                return_value=0,
+            ), patch(
+                "A07_Development.develop_current_task",
+                return_value=(developer, "首轮代码变更"),
+            ), patch(
+                "A07_Development.record_review_diff_round",
+                side_effect=fake_record,
+            ), patch(
+                "A07_Development._rejoin_pending_reviewers",
+                side_effect=lambda pending, reviewer_list, **kwargs: events.append("rejoin") or list(reviewer_list),
+            ), patch(
+                "A07_Development._run_parallel_reviewers",
+                side_effect=fake_parallel,
+            ), patch(
+                "A07_Development.repair_reviewer_outputs",
+                side_effect=lambda reviewer_list, **kwargs: list(reviewer_list),
+            ), patch(
+                "A07_Development.task_done",
+                side_effect=fake_task_done,
+            ), patch(
+                "A07_Development.refine_current_task",
+                side_effect=fake_refine,
+            ), patch(
+                "A07_Development._shutdown_workers",
+                return_value=(),
+            ):
+                result = run_development_stage(
+                    ["--project-dir", str(project_dir), "--requirement-name", "需求A"],
+                )
+
+        self.assertTrue(result.completed)
+        self.assertEqual(
+            events,
+            ["rejoin", "snapshot:1", "review:1", "refine", "rejoin", "snapshot:2", "review:2", "rejoin"],
+        )
+
     def test_run_development_stage_recreates_workers_before_next_task_when_turn_limit_reached(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             project_dir = Path(tmp_dir)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
@@ -18,6 +20,7 @@ from A07_Development import (
 from A08_OverallReview import (
     OverallReviewStageResult,
     _build_overall_review_active_code_context,
+    _discover_overall_review_active_files,
     bind_reviewer_runtime_from_handoff,
     build_overall_review_reviewer_completion_contract,
     build_overall_review_metadata_repair_result_contract,
@@ -225,6 +228,53 @@ class A08OverallReviewTests(unittest.TestCase):
         self.assertIn("text_stats.py", context)
         self.assertIn("不能仅凭 `repo_map.json`", context)
 
+    def test_active_file_walk_prunes_excluded_dirs_and_ranks_recent_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_dir = Path(tmp_dir)
+            (project_dir / "node_modules" / "pkg").mkdir(parents=True)
+            (project_dir / "node_modules" / "pkg" / "index.js").write_text("x\n", encoding="utf-8")
+            (project_dir / "src").mkdir()
+            for index, name in enumerate(("src/old.py", "src/new.py", "app.ts", ".env.py")):
+                path = project_dir / name
+                path.write_text("x\n", encoding="utf-8")
+                os.utime(path, (1_000 + index, 1_000 + index))
+
+            with patch("tmux_core.stage_kernel.overall_review._run_overall_review_git", return_value=None):
+                files = _discover_overall_review_active_files(project_dir, limit=2)
+
+        self.assertEqual(files, ("app.ts", "src/new.py"))
+
+    def test_active_files_prefer_git_change_set_and_cache_per_commit(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_dir = Path(tmp_dir)
+            try:
+                subprocess.run(["git", "init", "-q"], cwd=project_dir, check=True)
+            except (OSError, subprocess.CalledProcessError):
+                self.skipTest("git 不可用")
+            (project_dir / ".gitignore").write_text("vendor/\n", encoding="utf-8")
+            (project_dir / "vendor").mkdir()
+            (project_dir / "vendor" / "lib.py").write_text("x\n", encoding="utf-8")
+            for name in ("stable.py", "touched.py"):
+                (project_dir / name).write_text("x\n", encoding="utf-8")
+            subprocess.run(["git", "add", "."], cwd=project_dir, check=True)
+            subprocess.run(
+                ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init"],
+                cwd=project_dir,
+                check=True,
+            )
+            (project_dir / "touched.py").write_text("y\n", encoding="utf-8")
+            (project_dir / "added.py").write_text("z\n", encoding="utf-8")
+            os.utime(project_dir / "stable.py", (9_999_999_999, 9_999_999_999))
+
+            first = _discover_overall_review_active_files(project_dir)
+            with patch("tmux_core.stage_kernel.overall_review._rank_overall_review_active_files") as rank_mock:
+                second = _discover_overall_review_active_files(project_dir)
+
+        self.assertEqual(set(first[:2]), {"touched.py", "added.py"})
+        self.assertEqual(first[2:], ("stable.py",))
+        self.assertEqual(second, first)
+        rank_mock.assert_not_called()
+
     def test_shutdown_overall_review_workers_removes_requirement_scoped_runtime(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             project_dir = Path(tmp_dir)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from tmux_core.runtime.agent_budget import (
+    AgentBudgetLedger,
+    AgentBudgetLimits,
+    AgentBudgetServer,
+    acquire_agent_slot,
+    parse_vendor_limits,
+    query_agent_budget_status,
+    render_agent_budget_status,
+)
+
+
+class AgentBudgetLedgerTests(unittest.TestCase):
+    def test_global_and_vendor_limits_grant_by_priority(self):
+        ledger = AgentBudgetLedger(AgentBudgetLimits(global_limit=3, vendor_limits={"codex": 2}))
+
+        first = ledger.request("codex", scope="A")
+        second = ledger.request("codex", scope="B")
+        low = ledger.request("codex", priority=0, scope="C")
+        high = ledger.request("codex", priority=5, scope="D")
+        other_vendor = ledger.request("claude", scope="E")
+
+        self.assertTrue(ledger.is_granted(first))
+        self.assertTrue(ledger.is_granted(second))
+        self.assertFalse(ledger.is_granted(low))
+        self.assertFalse(ledger.is_granted(high))
+        self.assertTrue(ledger.is_granted(other_vendor))
+        self.assertEqual(ledger.request("gemini"), 6)
+        self.assertFalse(ledger.is_granted(6))
+
+        ledger.release(first)
+        self.assertTrue(ledger.is_granted(high))
+        self.assertFalse(ledger.is_granted(low))
+
+        ledger.release(6)
+        ledger.release(other_vendor)
+        self.assertFalse(ledger.is_granted(low))
+        ledger.release(second)
+        self.assertTrue(ledger.wait(low, timeout_sec=0))
+        self.assertEqual([item["lease_id"] for item in ledger.snapshot()["active"]], [low, high])
+
+    def test_parse_vendor_limits_rejects_malformed_items(self):
+        self.assertEqual(parse_vendor_limits(["Codex=2", "claude=1"]), {"codex": 2, "claude": 1})
+        with self.assertRaisesRegex(ValueError, "vendor=N"):
+            parse_vendor_limits(["codex"])
+
+
+class AgentBudgetServerTests(unittest.TestCase):
+    def test_leases_queue_across_clients_and_release_on_close(self):
+        with TemporaryDirectory() as tmpdir:
+            socket_path = Path(tmpdir) / "budget.sock"
+            self.assertIsNone(acquire_agent_slot("codex", socket_path=socket_path))
+            server = AgentBudgetServer(socket_path, AgentBudgetLimits(vendor_limits={"codex": 1}))
+            thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+            thread.start()
+            try:
+                first = acquire_agent_slot("codex", scope="需求A", socket_path=socket_path)
+                self.assertIsNotNone(first)
+                with self.assertRaises(TimeoutError):
+                    acquire_agent_slot("codex", scope="需求B", socket_path=socket_path, timeout_sec=0.2)
+
+                granted: list[object] = []
+                waiter = threading.Thread(
+                    target=lambda: granted.append(acquire_agent_slot("codex", scope="需求C", socket_path=socket_path)),
+                )
+                waiter.start()
+                first.release()
+                waiter.join(5)
+                self.assertTrue(granted and granted[0] is not None)
+
+                status = query_agent_budget_status(socket_path)
+                self.assertEqual([item["scope"] for item in status["active"]], ["需求C"])
+                self.assertIn("运行中 1/不限", render_agent_budget_status(status))
+                granted[0].release()
+            finally:
+                server.shutdown()
+                server.server_close()
+            self.assertFalse(socket_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
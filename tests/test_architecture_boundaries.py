@@ -64,8 +64,16 @@ class ArchitectureBoundaryTests(unittest.TestCase):
             )
 
     def test_internal_workflow_bridge_and_runtime_use_package_modules(self):
+        from tmux_core.workflow.stage_registry import STAGE_ENTRYPOINTS
+
+        stage_modules = {entrypoint.module_name for entrypoint in STAGE_ENTRYPOINTS.values()}
         workflow_imports = _collect_imports("tmux_core/workflow/entry.py")
         bridge_imports = _collect_imports("tmux_core/bridge/backend.py")
+        self.assertIn("tmux_core.workflow.stage_registry", workflow_imports)
+        self.assertIn("tmux_core.workflow.stage_registry", bridge_imports)
+        self.assertFalse(any(name.startswith("tmux_core.stage_kernel.") for name in stage_modules & workflow_imports))
+        workflow_imports |= stage_modules
+        bridge_imports |= stage_modules
         hitl_imports = _collect_imports("tmux_core/runtime/hitl.py")
         self.assertIn("tmux_core.stage_kernel.requirements_review", workflow_imports)
         self.assertIn("tmux_core.stage_kernel.detailed_design", workflow_imports)
@@ -93,6 +101,21 @@ class ArchitectureBoundaryTests(unittest.TestCase):
         contracts_imports = _collect_imports("tmux_core/runtime/contracts.py")
         self.assertNotIn("T04_common_prompt", contracts_imports)
 
+    def test_stage_registry_matches_stage_kernels(self):
+        from tmux_core.workflow.stage_registry import STAGE_ENTRYPOINTS, load_stage_module, resolve_stage_attribute
+
+        for stage_key, entrypoint in STAGE_ENTRYPOINTS.items():
+            module = load_stage_module(stage_key)
+            self.assertTrue(callable(resolve_stage_attribute(stage_key)), stage_key)
+            if not entrypoint.runtime_root_name:
+                continue
+            root_constants = [
+                value
+                for name, value in vars(module).items()
+                if name.endswith("_RUNTIME_ROOT_NAME") and not name.startswith("LEGACY_")
+            ]
+            self.assertIn(entrypoint.runtime_root_name, root_constants, stage_key)
+
     def test_agent_runtime_state_has_single_source_of_truth(self):
         runtime_source = (PROJECT_ROOT / "tmux_core/runtime/tmux_runtime.py").read_text(encoding="utf-8")
         self.assertNotIn("ProviderPhase", runtime_source)
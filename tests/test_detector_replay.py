@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+
+from tmux_core.runtime.clock import VirtualClock
+from tmux_core.runtime.detector_fixture import DetectorFixtureRecorder, load_detector_fixture
+from tmux_core.runtime.detector_replay import main as detector_replay_main
+from tmux_core.runtime.detector_replay import replay_detector_fixture
+
+
+def _observation(visible_text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        visible_text=visible_text,
+        current_command="claude",
+        current_path="/repo",
+        pane_title="claude",
+        pane_dead=False,
+        session_exists=True,
+    )
+
+
+class DetectorReplayTests(unittest.TestCase):
+    def _record(self, path: Path) -> None:
+        clock = VirtualClock()
+        recorder = DetectorFixtureRecorder(
+            path,
+            vendor="claude",
+            session_name="会话-1",
+            pane_id="%1",
+            expected_current_commands=("claude",),
+            tail_bytes=64,
+            clock=clock,
+        )
+        flags = dict(agent_started=True, task_running=True, title_ready=False, title_busy=False)
+        log = ""
+        elapsed = 0.0
+        for offset, chunk, visible, state in (
+                (0.0, "\x1b[2mthinking\x1b[0m\n", "正在思考…", "BUSY"),
+                (1.5, "still working\n", "正在思考…", "READY"),
+                (2.0, "done\n", "回答内容\n\n❯ ", "READY"),
+        ):
+            clock.advance(offset - elapsed)
+            elapsed = offset
+            log += chunk
+            recorder.record(_observation(visible), raw_log_delta=chunk, raw_log_tail=log[-64:], state=state, **flags)
+        recorder.record(
+            _observation("回答内容\n\n❯ "),
+            raw_log_delta="",
+            raw_log_tail="restarted\n",
+            state="READY",
+            **flags,
+        )
+
+    def test_recorder_writes_compact_fixture_that_replays_to_same_tail(self):
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "worker.detector.jsonl"
+            self._record(path)
+            entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+            self.assertEqual(entries[0]["kind"], "meta")
+            self.assertEqual(entries[2], {"kind": "sample", "t": 1.5, "log": "still working\n", "state": "READY"})
+            self.assertEqual(entries[4]["tail"], "restarted\n")
+
+            fixture = load_detector_fixture(path)
+            self.assertEqual(fixture.expected_current_commands, ("claude",))
+            self.assertEqual(
+                [sample.raw_log_tail for sample in fixture.samples],
+                [
+                    "\x1b[2mthinking\x1b[0m\n",
+                    "\x1b[2mthinking\x1b[0m\nstill working\n",
+                    "\x1b[2mthinking\x1b[0m\nstill working\ndone\n",
+                    "restarted\n",
+                ],
+            )
+            self.assertEqual(fixture.samples[1].visible_text, "正在思考…")
+
+    def test_replay_reports_timeline_throughput_and_state_change_latency(self):
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "worker.detector.jsonl"
+            self._record(path)
+
+            report = replay_detector_fixture(load_detector_fixture(path))
+
+            self.assertEqual([entry.replayed_state for entry in report.timeline], ["BUSY", "BUSY", "READY", "READY"])
+            self.assertEqual(report.replayed_transitions(), [(0.0, "BUSY"), (2.0, "READY")])
+            self.assertEqual([item.latency_sec for item in report.state_changes], [0.0, 0.5])
+            self.assertEqual(report.agreement, 0.75)
+            self.assertEqual(report.timeline[2].last_message, "回答内容")
+            self.assertTrue(report.timeline[2].visible_ready)
+            self.assertGreater(report.observations_per_sec("classify"), 0)
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                exit_code = detector_replay_main([tmpdir, "--json"])
+            self.assertEqual(exit_code, 0)
+            payload = json.loads(stdout.getvalue())
+            self.assertEqual(payload["samples"], 4)
+            self.assertEqual(payload["max_latency_sec"], 0.5)
+            self.assertEqual(payload["missed_changes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
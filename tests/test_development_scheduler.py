@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tmux_core.stage_kernel.development_scheduler import (
+    RUNTIME_SNAPSHOT_EXCLUDES,
+    DevelopedTask,
+    GitWorktreePool,
+    ParallelDevelopmentScheduler,
+    TaskDependencyGraph,
+    build_task_dependency_path,
+    load_passed_tasks,
+    load_task_dependency_graph,
+)
+from tmux_core.stage_kernel.development import (
+    ParallelDevelopmentState,
+    preempt_parallel_speculation,
+    stash_preempted_speculation,
+)
+from tmux_core.stage_kernel.review_diff_context import ReviewDiffTracker, render_review_diff_appendix
+
+
+def _write_task_json(path: Path, tasks: dict[str, dict[str, bool]]) -> None:
+    path.write_text(json.dumps(tasks, ensure_ascii=False), encoding="utf-8")
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            return self.now
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self.now += seconds
+
+
+class TaskDependencyGraphTests(unittest.TestCase):
+    def test_missing_dependency_file_keeps_sequential_chain(self):
+        with TemporaryDirectory() as tmpdir:
+            task_json = Path(tmpdir) / "需求_任务单.json"
+            _write_task_json(task_json, {"M1": {"M1-T1": True, "M1-T2": False}, "M2": {"M2-T1": False}})
+
+            graph = load_task_dependency_graph(task_json, build_task_dependency_path(tmpdir, "需求"))
+
+            self.assertFalse(graph.explicit)
+            self.assertEqual(graph.topological_order(), ("M1-T1", "M1-T2", "M2-T1"))
+            self.assertEqual(graph.ready_tasks(load_passed_tasks(task_json)), ["M1-T2"])
+
+    def test_explicit_dependencies_expose_independent_tasks(self):
+        with TemporaryDirectory() as tmpdir:
+            task_json = Path(tmpdir) / "需求_任务单.json"
+            _write_task_json(task_json, {"M1": {"M1-T1": False, "M1-T2": False}, "M2": {"M2-T1": False}})
+            dependency_path = build_task_dependency_path(tmpdir, "需求")
+            dependency_path.write_text(json.dumps({"M2-T1": ["M1-T1"]}), encoding="utf-8")
+
+            graph = load_task_dependency_graph(task_json, dependency_path)
+
+            self.assertTrue(graph.explicit)
+            self.assertEqual(graph.ready_tasks(()), ["M1-T1", "M1-T2"])
+            self.assertEqual(graph.ready_tasks({"M1-T1"}, {"M1-T2"}), ["M2-T1"])
+
+    def test_cycles_and_unknown_tasks_are_rejected(self):
+        with TemporaryDirectory() as tmpdir:
+            task_json = Path(tmpdir) / "需求_任务单.json"
+            _write_task_json(task_json, {"M1": {"M1-T1": False, "M1-T2": False}})
+            dependency_path = build_task_dependency_path(tmpdir, "需求")
+
+            dependency_path.write_text(json.dumps({"M1-T1": ["M1-T2"], "M1-T2": ["M1-T1"]}), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "环"):
+                load_task_dependency_graph(task_json, dependency_path)
+
+            dependency_path.write_text(json.dumps({"M1-T1": ["M9-T9"]}), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "M9-T9"):
+                load_task_dependency_graph(task_json, dependency_path)
+
+
+class ParallelDevelopmentSchedulerTests(unittest.TestCase):
+    def test_independent_tasks_run_concurrently_and_report_savings(self):
+        graph = TaskDependencyGraph(
+            task_order=("T1", "T2", "T3"),
+            dependencies={"T1": frozenset(), "T2": frozenset(), "T3": frozenset({"T1"})},
+            explicit=True,
+        )
+        clock = _FakeClock()
+        both_started = threading.Barrier(2, timeout=5)
+        started: list[tuple[str, int]] = []
+
+        def develop(task_name: str, slot_index: int) -> DevelopedTask:
+            started.append((task_name, slot_index))
+            if task_name in {"T1", "T2"}:
+                both_started.wait()
+            if task_name != "T2":
+                clock.advance(10.0)
+            if task_name in {"T1", "T2"}:
+                both_started.wait()
+            return DevelopedTask(task_name=task_name, slot_index=slot_index, code_change=f"{task_name} done")
+
+        scheduler = ParallelDevelopmentScheduler(graph, max_workers=2, develop_task=develop, clock=clock)
+        try:
+            scheduler.start()
+            first = scheduler.wait_for("T1", timeout_sec=5)
+            second = scheduler.wait_for("T2", timeout_sec=5)
+            self.assertEqual({first.slot_index, second.slot_index}, {0, 1})
+            self.assertFalse(scheduler.is_scheduled("T3"))
+
+            scheduler.mark_passed("T1")
+            scheduler.mark_passed("T2")
+            third = scheduler.wait_for("T3", timeout_sec=5)
+            scheduler.mark_passed("T3")
+
+            self.assertEqual(third.code_change, "T3 done")
+            self.assertIsNone(scheduler.next_task())
+            report = scheduler.report()
+        finally:
+            scheduler.shutdown()
+
+        self.assertEqual(report.task_count, 3)
+        self.assertEqual(report.sequential_estimate_sec, 30.0)
+        self.assertEqual(report.wall_clock_sec, 20.0)
+        self.assertEqual(report.saved_sec, 10.0)
+        self.assertIn("串行估算 30.0s", report.render())
+        self.assertEqual(sorted(name for name, _ in started), ["T1", "T2", "T3"])
+
+    def test_claimed_tasks_stay_with_main_developer_and_errors_are_returned(self):
+        graph = TaskDependencyGraph(
+            task_order=("T1", "T2"),
+            dependencies={"T1": frozenset(), "T2": frozenset()},
+            explicit=True,
+        )
+
+        def develop(task_name: str, slot_index: int) -> DevelopedTask:
+            raise RuntimeError(f"{task_name} 失败")
+
+        scheduler = ParallelDevelopmentScheduler(graph, max_workers=2, develop_task=develop)
+        try:
+            scheduler.claim("T1")
+            scheduler.start()
+            result = scheduler.wait_for("T2", timeout_sec=5)
+            self.assertIsInstance(result.error, RuntimeError)
+            self.assertFalse(scheduler.is_scheduled("T1"))
+            with self.assertRaisesRegex(RuntimeError, "主开发工程师"):
+                scheduler.wait_for("T1", timeout_sec=0)
+            scheduler.record_serial_duration("T1", 4.0)
+            self.assertEqual(scheduler.next_task(), "T1")
+        finally:
+            scheduler.shutdown()
+
+
+    def test_pipeline_speculates_next_task_and_preempts_on_review_failure(self):
+        graph = TaskDependencyGraph(
+            task_order=("T1", "T2", "T3"),
+            dependencies={"T1": frozenset(), "T2": frozenset({"T1"}), "T3": frozenset({"T2"})},
+        )
+
+        def develop(task_name: str, slot_index: int) -> DevelopedTask:
+            return DevelopedTask(task_name=task_name, slot_index=slot_index, patch=f"{task_name} patch".encode())
+
+        scheduler = ParallelDevelopmentScheduler(graph, max_workers=1, develop_task=develop, auto_schedule=False)
+        try:
+            scheduler.claim("T1")
+            scheduler.start()
+            self.assertFalse(scheduler.is_scheduled("T2"))
+
+            self.assertEqual(scheduler.speculate_after("T1"), "T2")
+            self.assertEqual(scheduler.speculative_base("T2"), "T1")
+            self.assertIsNone(scheduler.speculate_after("T1"))
+            self.assertEqual(scheduler.wait_for("T2", timeout_sec=5).patch, b"T2 patch")
+
+            self.assertEqual(scheduler.preempt_speculation("T1"), ["T2"])
+            self.assertTrue(scheduler.is_preempted("T2"))
+            self.assertFalse(scheduler.is_scheduled("T2"))
+            self.assertEqual(scheduler.result_for("T2").patch, b"T2 patch")
+            self.assertEqual(scheduler.preempt_speculation("T1"), [])
+            self.assertFalse(scheduler.is_scheduled("T3"))
+        finally:
+            scheduler.shutdown()
+
+    def test_shutdown_waits_for_running_slot_threads(self):
+        graph = TaskDependencyGraph(task_order=("T1",), dependencies={"T1": frozenset()})
+        started = threading.Event()
+        release = threading.Event()
+
+        def develop(task_name: str, slot_index: int) -> DevelopedTask:
+            started.set()
+            release.wait(5)
+            return DevelopedTask(task_name=task_name, slot_index=slot_index)
+
+        scheduler = ParallelDevelopmentScheduler(graph, max_workers=1, develop_task=develop)
+        scheduler.start()
+        self.assertTrue(started.wait(5))
+        self.assertFalse(scheduler.shutdown(wait=False))
+        self.assertFalse(scheduler.shutdown(wait=True, timeout_sec=0.05))
+        release.set()
+        self.assertTrue(scheduler.shutdown(wait=True, timeout_sec=5))
+        self.assertTrue(scheduler.has_result("T1"))
+
+
+    def test_preempt_interrupts_running_slot_agent_and_stashes_partial_patch(self):
+        graph = TaskDependencyGraph(
+            task_order=("T1", "T2"),
+            dependencies={"T1": frozenset(), "T2": frozenset({"T1"})},
+        )
+        started = threading.Event()
+        killed = threading.Event()
+
+        def develop(task_name: str, slot_index: int) -> DevelopedTask:
+            started.set()
+            killed.wait(5)
+            return DevelopedTask(task_name=task_name, slot_index=slot_index, patch=b"partial", error=RuntimeError("killed"))
+
+        developer = SimpleNamespace(worker=SimpleNamespace(request_kill=killed.set))
+        scheduler = ParallelDevelopmentScheduler(graph, max_workers=1, develop_task=develop, auto_schedule=False)
+        with TemporaryDirectory() as tmpdir:
+            state = ParallelDevelopmentState(
+                scheduler=scheduler,
+                worktree_pool=GitWorktreePool(tmpdir, Path(tmpdir) / "runtime" / "worktrees"),
+                slot_developers={0: developer},
+                slot_lock=threading.Lock(),
+            )
+            try:
+                scheduler.claim("T1")
+                scheduler.start()
+                self.assertEqual(scheduler.speculate_after("T1"), "T2")
+                self.assertTrue(started.wait(5))
+                self.assertEqual(scheduler.running_slot("T2"), 0)
+
+                self.assertEqual(preempt_parallel_speculation(state, task_name="T1"), ["T2"])
+                self.assertTrue(killed.is_set())
+                self.assertEqual(state.slot_developers, {})
+                self.assertEqual(state.retired_developers, [developer])
+
+                with patch("tmux_core.stage_kernel.development.message"):
+                    stash_path = stash_preempted_speculation(state, task_name="T2")
+                self.assertIsNotNone(stash_path)
+                self.assertEqual(stash_path.read_bytes(), b"partial")
+                self.assertIsNone(scheduler.running_slot("T2"))
+            finally:
+                scheduler.shutdown()
+
+
+class GitWorktreePoolTests(unittest.TestCase):
+    def test_worktree_patch_applies_back_to_main_tree(self):
+        with TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir) / "project"
+            project_root.mkdir()
+            try:
+                subprocess.run(["git", "init", "-q"], cwd=project_root, check=True)
+            except (OSError, subprocess.CalledProcessError):
+                self.skipTest("git 不可用")
+            (project_root / "app.py").write_text("VALUE = 1\n", encoding="utf-8")
+            (project_root / ".development_runtime").mkdir()
+            (project_root / ".development_runtime" / "state.json").write_text("{}", encoding="utf-8")
+            self.assertTrue(GitWorktreePool.available(project_root))
+            pool = GitWorktreePool(project_root, project_root / ".development_runtime" / "worktrees")
+
+            base_commit = pool.snapshot_working_tree()
+            status = subprocess.run(["git", "status", "--porcelain"], cwd=project_root, capture_output=True, text=True)
+            self.assertIn("?? app.py", status.stdout)
+            slot_root = pool.checkout_slot(0, base_commit)
+            self.assertFalse((slot_root / ".development_runtime").exists())
+            (slot_root / "app.py").write_text("VALUE = 2\n", encoding="utf-8")
+            (slot_root / "feature.py").write_text("ENABLED = True\n", encoding="utf-8")
+
+            patch = pool.collect_patch(slot_root, base_commit)
+            self.assertTrue(pool.apply_patch(patch))
+            self.assertEqual((project_root / "app.py").read_text(encoding="utf-8"), "VALUE = 2\n")
+            self.assertTrue((project_root / "feature.py").exists())
+            self.assertFalse(pool.apply_patch(patch))
+
+            reviewed_commit = pool.record_reviewed_base()
+            (project_root / "app.py").write_text("VALUE = 'half written'\n", encoding="utf-8")
+            self.assertEqual(pool.reviewed_base(), reviewed_commit)
+            slot_root = pool.checkout_slot(0, pool.reviewed_base())
+            self.assertEqual((slot_root / "app.py").read_text(encoding="utf-8"), "VALUE = 2\n")
+
+            self.assertEqual(pool.cleanup(), [str(slot_root)])
+            self.assertFalse(slot_root.exists())
+
+
+    def test_snapshot_excludes_cover_every_runtime_directory(self):
+        import A02_RequirementIntake
+        import T03_agent_init_workflow
+        from tmux_core.bridge import backend
+        from tmux_core.runtime.turn_trace import TURN_TRACE_ROOT_NAME
+        from tmux_core.stage_kernel.requirement_concurrency import LOCK_ROOT_NAME
+        from tmux_core.workflow.stage_registry import STAGE_ENTRYPOINTS
+
+        expected = {entrypoint.runtime_root_name for entrypoint in STAGE_ENTRYPOINTS.values() if entrypoint.runtime_root_name}
+        expected |= {
+            A02_RequirementIntake.INPUT_EXTRACTION_CACHE_DIR_NAME,
+            T03_agent_init_workflow.ROUTING_RUNTIME_ROOT_NAME,
+            backend.LEGACY_REQUIREMENTS_RUNTIME_ROOT_NAME,
+            backend.WORKFLOW_RECORD_ROOT_NAME,
+            LOCK_ROOT_NAME,
+            TURN_TRACE_ROOT_NAME,
+        }
+        self.assertEqual(set(RUNTIME_SNAPSHOT_EXCLUDES), expected)
+
+
+class ReviewDiffTrackerTests(unittest.TestCase):
+    def test_review_rounds_capture_task_and_incremental_diffs(self):
+        with TemporaryDirectory() as tmpdir:
+            project_root = Path(tmpdir) / "project"
+            project_root.mkdir()
+            try:
+                subprocess.run(["git", "init", "-q"], cwd=project_root, check=True)
+            except (OSError, subprocess.CalledProcessError):
+                self.skipTest("git 不可用")
+            (project_root / "app.py").write_text("VALUE = 1\n", encoding="utf-8")
+            context_dir = project_root / ".development_runtime" / "review_context"
+            tracker = ReviewDiffTracker.create(project_root, context_dir, requirement_name="需求")
+            self.assertIsNotNone(tracker)
+
+            tracker.begin_task("M1-T1")
+            (project_root / "app.py").write_text("VALUE = 2\n", encoding="utf-8")
+            (project_root / "需求_工程师开发内容.md").write_text("开发说明\n", encoding="utf-8")
+            first = tracker.record_round(1)
+            self.assertEqual(first.changed_files, ("M\tapp.py",))
+            first_text = first.context_path.read_text(encoding="utf-8")
+            self.assertIn("+VALUE = 2", first_text)
+            self.assertNotIn("相对上一轮评审的变更", first_text)
+            self.assertIn(str(first.context_path), render_review_diff_appendix(first))
+
+            (project_root / "feature.py").write_text("ENABLED = True\n", encoding="utf-8")
+            second = tracker.record_round(2)
+            self.assertEqual(second.previous_commit, first.head_commit)
+            self.assertEqual(second.changed_files, ("M\tapp.py", "A\tfeature.py"))
+            second_text = second.context_path.read_text(encoding="utf-8")
+            incremental = second_text.split("## 相对上一轮评审的变更", 1)[1].split("## 本任务完整 diff", 1)[0]
+            self.assertIn("+ENABLED = True", incremental)
+            self.assertNotIn("VALUE", incremental)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,8 +14,10 @@ from tmux_core.prompt_contracts.spec import (
     CHANGE_MUST_CHANGE,
     CHANGE_MUST_EXIST_NONEMPTY,
     CHANGE_MUST_NOT_CHANGE,
+    clear_prompt_render_cache,
     get_prompt_spec,
     is_prompt_helper,
+    prompt_render_cache_stats,
 )
 from tmux_core.runtime.contracts import (
     TaskResultContract,
@@ -26,6 +28,7 @@ from tmux_core.runtime.contracts import (
 )
 from tmux_core.stage_kernel.prompt_turns import (
     build_prompt_task_turn,
+    build_prompt_text,
     run_prompt_completion_turn,
     run_prompt_turn,
 )
@@ -114,6 +117,50 @@ class PromptContractSpecTests(unittest.TestCase):
             self.assertEqual(rule["change"], CHANGE_MUST_CHANGE)
             self.assertEqual(rule["baseline"], snapshot_file_fingerprint(paths["what_just_dev"]))
 
+    def test_prompt_render_cache_reuses_contract_until_prompt_source_changes(self):
+        source = (
+            "from tmux_core.prompt_contracts.spec import CHANGE_MUST_CHANGE, FileSpec, OutcomeSpec, agent_prompt\n"
+            "\n"
+            "@agent_prompt(\n"
+            "    prompt_id='cache_probe',\n"
+            "    stage='A07',\n"
+            "    role='developer',\n"
+            "    intent='probe',\n"
+            "    files={'output': FileSpec('output_md', access='write', change=CHANGE_MUST_CHANGE)},\n"
+            "    outcomes={'done': OutcomeSpec('done', requires=('output',))},\n"
+            ")\n"
+            "def cache_probe(task_name, output_md):\n"
+            "    return f'开始任务 {task_name}'\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            module_path = root / "Prompt_99_CacheProbe.py"
+            module_path.write_text(source, encoding="utf-8")
+            module_spec = importlib.util.spec_from_file_location("Prompt_99_CacheProbe", module_path)
+            assert module_spec is not None and module_spec.loader is not None
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+            output_md = root / "output.md"
+            clear_prompt_render_cache()
+            try:
+                first_prompt, first = build_prompt_text(module.cache_probe, "M1-T1", output_md=str(output_md))
+                second_prompt, second = build_prompt_text(module.cache_probe, "M1-T2", output_md=output_md)
+                stats = prompt_render_cache_stats()
+                self.assertEqual((stats.hits, stats.misses, stats.appendix_hits), (1, 1, 1))
+                self.assertEqual(stats.hit_rate, 0.5)
+                self.assertIn("开始任务 M1-T2", second_prompt)
+                self.assertEqual(first_prompt.split("\n", 1)[1], second_prompt.split("\n", 1)[1])
+                self.assertEqual(second.files, {"output": output_md.resolve()})
+                second.files.clear()
+                self.assertEqual(build_prompt_text(module.cache_probe, "M1-T3", output_md=str(output_md))[1].files, first.files)
+
+                module_path.write_text(source + "\n# edited\n", encoding="utf-8")
+                build_prompt_text(module.cache_probe, "M1-T4", output_md=str(output_md))
+                stats = prompt_render_cache_stats()
+                self.assertEqual((stats.misses, stats.invalidations, stats.appendix_misses), (2, 1, 2))
+            finally:
+                clear_prompt_render_cache()
+
     def test_a07_ready_hitl_prompt_metadata_matches_legacy_init_contract_outcomes(self):
         from Prompt_07_Development import human_reply, init_developer
         from tmux_core.stage_kernel.development import build_developer_init_result_contract
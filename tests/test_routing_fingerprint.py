@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from tmux_core.stage_kernel.routing_fingerprint import (
+    ROUTING_REFRESH_ACTION_FULL,
+    ROUTING_REFRESH_ACTION_REFRESH,
+    ROUTING_REFRESH_ACTION_SKIP,
+    compute_routing_fingerprint,
+    load_routing_fingerprint,
+    plan_routing_refresh,
+    render_routing_refresh_record,
+    write_routing_fingerprint,
+)
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class RoutingFingerprintTests(unittest.TestCase):
+    def test_plan_detects_changed_scopes_and_reuses_file_hashes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write(root / "main.py", "print('a')\n")
+            _write(root / "api" / "routes.py", "ROUTES = []\n")
+            _write(root / "core" / "model.py", "MODEL = 1\n")
+            _write(root / "web" / "app.ts", "export {}\n")
+            _write(root / "node_modules" / "dep" / "index.js", "x\n")
+            self.assertEqual(plan_routing_refresh(root).action, ROUTING_REFRESH_ACTION_FULL)
+
+            write_routing_fingerprint(root)
+            _write(root / "AGENTS.md", "regenerated\n")
+            _write(root / "node_modules" / "dep" / "index.js", "y\n")
+            _write(root / ".routing_init_runtime" / "state.json", "{}\n")
+            _write(root / "web" / "AGENTS.md", "child routing layer\n")
+            _write(root / "web" / "docs" / "repo_map.json", "{}\n")
+            _write(root / "web" / "docs" / "routing_fingerprint.json", "{}\n")
+            self.assertEqual(plan_routing_refresh(root).action, ROUTING_REFRESH_ACTION_SKIP)
+
+            _write(root / "api" / "routes.py", "ROUTES = ['/v1']\n")
+            os.utime(root / "api" / "routes.py", ns=(1, 1))
+            plan = plan_routing_refresh(root)
+            current = compute_routing_fingerprint(root, previous=load_routing_fingerprint(root))
+
+        self.assertEqual(plan.action, ROUTING_REFRESH_ACTION_REFRESH)
+        self.assertEqual(plan.changed_scopes, ("api",))
+        self.assertEqual(current.hashed_files, 1)
+        self.assertIn("`api`", render_routing_refresh_record(plan))
+
+    def test_plan_falls_back_to_full_run_when_most_scopes_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write(root / "main.py", "a\n")
+            _write(root / "api" / "routes.py", "b\n")
+            write_routing_fingerprint(root)
+            _write(root / "main.py", "changed\n")
+            _write(root / "api" / "routes.py", "changed\n")
+            _write(root / "jobs" / "worker.py", "new\n")
+
+            plan = plan_routing_refresh(root)
+
+        self.assertEqual(plan.action, ROUTING_REFRESH_ACTION_FULL)
+        self.assertEqual(plan.changed_scopes, (".", "api", "jobs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,35 +2,36 @@ from __future__ import annotations
 
 import json
 import unittest
+import unittest.mock
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from T01_tools import task_done
+from tmux_core.stage_kernel import stage_audit
 from tmux_core.stage_kernel.stage_audit import (
     STAGE_AUDIT_SCHEMA_VERSION,
     StageAuditRunContext,
     append_stage_audit_record,
     begin_stage_audit_run,
+    build_stage_audit_blob_dir,
+    build_stage_audit_index_path,
     build_stage_audit_log_path,
+    iter_stage_audit_records,
     record_before_cleanup,
+    rehydrate_stage_audit_record,
 )
 
 
-def _read_jsonl(path: Path) -> list[dict[str, object]]:
+def _read_raw_jsonl(path: Path) -> list[dict[str, object]]:
     return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
 
 
+def _read_jsonl(path: Path) -> list[dict[str, object]]:
+    return [rehydrate_stage_audit_record(path, record) for record in _read_raw_jsonl(path)]
+
+
 def _read_valid_jsonl(path: Path) -> list[dict[str, object]]:
-    records: list[dict[str, object]] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            payload = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        records.append(payload)
-    return records
+    return list(iter_stage_audit_records(path))
 
 
 class StageAuditTests(unittest.TestCase):
@@ -106,6 +107,58 @@ class StageAuditTests(unittest.TestCase):
             self.assertEqual(record["snapshots"]["human_answer"], '人类回答 "A"\n第二行')
             self.assertEqual(record["snapshots"]["hitl_record"], "旧记录\n")
 
+    def test_snapshots_are_stored_once_per_content_hash(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir)
+            task_doc = project_dir / "任务单.md"
+            reviewer_md = project_dir / "reviewer.md"
+            task_doc.write_text("任务内容\n" * 100, encoding="utf-8")
+            reviewer_md.write_text("任务内容\n" * 100, encoding="utf-8")
+            context = begin_stage_audit_run(project_dir, "需求", "A07")
+            assert context is not None
+
+            for round_index in (1, 2):
+                self.assertTrue(
+                    append_stage_audit_record(
+                        context,
+                        "review_merged",
+                        {"task_doc": task_doc},
+                        reviewer_markdown_paths=[reviewer_md],
+                        review_round_index=round_index,
+                    )
+                )
+
+            raw_records = _read_raw_jsonl(context.audit_log_path)
+            digest = raw_records[-1]["snapshots"]["task_doc"]["$blob"]
+            self.assertEqual(raw_records[-1]["snapshots"]["reviewer_markdowns"][0]["sha256"], digest)
+            self.assertNotIn("任务内容", context.audit_log_path.read_text(encoding="utf-8"))
+            blob_names = sorted(path.name for path in build_stage_audit_blob_dir(context.audit_log_path).iterdir())
+            self.assertEqual(blob_names, [f"{digest}.gz"])
+
+            records = list(iter_stage_audit_records(context.audit_log_path))
+            self.assertEqual(records[-1]["snapshots"]["task_doc"], "任务内容\n" * 100)
+            self.assertEqual(records[-1]["snapshots"]["reviewer_markdowns"][0]["content"], "任务内容\n" * 100)
+            raw_iterated = list(iter_stage_audit_records(context.audit_log_path, rehydrate=False))
+            self.assertEqual(raw_iterated[-1]["snapshots"]["task_doc"], {"$blob": digest})
+
+    def test_deleted_blob_dir_is_rewritten_for_known_content(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir)
+            task_doc = project_dir / "任务单.md"
+            task_doc.write_text("任务内容\n", encoding="utf-8")
+            context = begin_stage_audit_run(project_dir, "需求", "A07")
+            assert context is not None
+            self.assertTrue(append_stage_audit_record(context, "task_passed", {"task_doc": task_doc}))
+            blob_dir = build_stage_audit_blob_dir(context.audit_log_path)
+            for blob_path in blob_dir.iterdir():
+                blob_path.unlink()
+            blob_dir.rmdir()
+
+            self.assertTrue(append_stage_audit_record(context, "task_passed", {"task_doc": task_doc}))
+
+            records = _read_valid_jsonl(context.audit_log_path)
+            self.assertEqual(records[-1]["snapshots"]["task_doc"], "任务内容\n")
+
     def test_missing_and_read_error_sources_are_recorded_without_failure(self):
         with TemporaryDirectory() as tmpdir:
             project_dir = Path(tmpdir)
@@ -197,6 +250,45 @@ class StageAuditTests(unittest.TestCase):
             self.assertEqual(records[-1]["snapshots"]["merged_review"], "旧内容\n")
             self.assertEqual(records[-1]["source_paths"]["reviewer_markdowns"], [])
 
+    def test_record_index_recovers_from_sidecar_without_rescanning_log(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir)
+            context = begin_stage_audit_run(project_dir, "需求", "A07")
+            assert context is not None
+            self.assertTrue(append_stage_audit_record(context, "task_passed", {}, task_name="M1-T1"))
+            index_path = build_stage_audit_index_path(context.audit_log_path)
+            index_payload = json.loads(index_path.read_text(encoding="utf-8"))
+            self.assertEqual(index_payload["record_index"], 2)
+            self.assertEqual(index_payload["size"], context.audit_log_path.stat().st_size)
+
+            stage_audit._INDEX_STATES.clear()
+            with unittest.mock.patch.object(stage_audit, "_scan_index_state") as scan_mock:
+                self.assertTrue(append_stage_audit_record(context, "task_passed", {}, task_name="M1-T2"))
+            scan_mock.assert_not_called()
+
+            records = _read_jsonl(context.audit_log_path)
+            self.assertEqual([record["record_index"] for record in records], [1, 2, 3])
+
+    def test_foreign_appends_and_missing_sidecar_are_scanned_incrementally(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir)
+            audit_path = build_stage_audit_log_path(project_dir, "需求", "A07")
+            audit_path.write_text(
+                '{"record_index": 7, "stage_run_index": 3}\n{"record_index": 4, "stage_run_index": 5}\n',
+                encoding="utf-8",
+            )
+            context = begin_stage_audit_run(project_dir, "需求", "A07")
+            assert context is not None
+            self.assertEqual(context.stage_run_index, 6)
+
+            with audit_path.open("a", encoding="utf-8") as file_obj:
+                file_obj.write('{"record_index": 20, "stage_run_index": 6}\n')
+            self.assertTrue(append_stage_audit_record(context, "stage_passed", {}))
+
+            records = _read_jsonl(audit_path)
+            self.assertEqual(records[2]["record_index"], 8)
+            self.assertEqual(records[-1]["record_index"], 21)
+
     def test_unknown_event_and_write_failure_return_false(self):
         with TemporaryDirectory() as tmpdir:
             project_dir = Path(tmpdir)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import unittest
+import unittest.mock
+from contextlib import redirect_stdout
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from tmux_core.stage_kernel import audit_query
+from tmux_core.stage_kernel.audit_query import (
+    load_stage_audit_offset_index,
+    main,
+    query_stage_audit_records,
+)
+from tmux_core.stage_kernel.stage_audit import (
+    append_stage_audit_record,
+    begin_stage_audit_run,
+    build_stage_audit_offset_index_path,
+    rebuild_stage_audit_indexes,
+)
+
+
+def _write_review_history(project_dir: Path):
+    review = project_dir / "评审.md"
+    review.write_text("评审内容\n", encoding="utf-8")
+    context = begin_stage_audit_run(project_dir, "需求", "A07")
+    assert context is not None
+    for task_name in ("M1-T1", "M2-T3"):
+        for round_index in (1, 2):
+            append_stage_audit_record(
+                context,
+                "review_merged",
+                {"merged_review": review},
+                review_round_index=round_index,
+                task_name=task_name,
+            )
+        append_stage_audit_record(context, "task_passed", {}, task_name=task_name)
+    return context
+
+
+class StageAuditQueryTests(unittest.TestCase):
+    def test_query_seeks_matching_records_through_offset_index(self):
+        with TemporaryDirectory() as tmpdir:
+            context = _write_review_history(Path(tmpdir))
+
+            index = load_stage_audit_offset_index(context.audit_log_path)
+            assert index is not None
+            self.assertEqual(len(index.entries), 7)
+            self.assertEqual(index.covered_size, context.audit_log_path.stat().st_size)
+
+            with unittest.mock.patch.object(audit_query, "iter_stage_audit_records") as scan_mock:
+                records = list(
+                    query_stage_audit_records(
+                        context.audit_log_path,
+                        event_type="review_merged",
+                        task_name="M2-T3",
+                    )
+                )
+            scan_mock.assert_not_called()
+            self.assertEqual([record["review_round_index"] for record in records], [1, 2])
+            self.assertEqual(records[0]["snapshots"]["merged_review"], "评审内容\n")
+
+            second_round = list(
+                query_stage_audit_records(
+                    context.audit_log_path,
+                    task_name="M2-T3",
+                    review_round_index=2,
+                    rehydrate=False,
+                )
+            )
+            self.assertEqual(len(second_round), 1)
+            self.assertIn("$blob", second_round[0]["snapshots"]["merged_review"])
+
+    def test_query_covers_unindexed_tail_and_missing_index(self):
+        with TemporaryDirectory() as tmpdir:
+            context = _write_review_history(Path(tmpdir))
+            with context.audit_log_path.open("a", encoding="utf-8") as file_obj:
+                file_obj.write(json.dumps({"event_type": "task_passed", "task_name": "M3-T1"}) + "\n")
+
+            tail_records = list(query_stage_audit_records(context.audit_log_path, task_name="M3-T1"))
+            self.assertEqual(len(tail_records), 1)
+
+            build_stage_audit_offset_index_path(context.audit_log_path).unlink()
+            passed = list(query_stage_audit_records(context.audit_log_path, event_type="task_passed"))
+            self.assertEqual([record["task_name"] for record in passed], ["M1-T1", "M2-T3", "M3-T1"])
+
+    def test_failed_offset_append_invalidates_index_until_rebuilt(self):
+        with TemporaryDirectory() as tmpdir:
+            context = _write_review_history(Path(tmpdir))
+            offsets_path = build_stage_audit_offset_index_path(context.audit_log_path)
+            original_open = Path.open
+
+            def failing_open(path, mode="r", *args, **kwargs):
+                if path == offsets_path and "a" in mode:
+                    raise OSError("磁盘已满")
+                return original_open(path, mode, *args, **kwargs)
+
+            with unittest.mock.patch.object(Path, "open", failing_open):
+                self.assertTrue(append_stage_audit_record(context, "task_passed", {}, task_name="M3-T1"))
+
+            self.assertFalse(offsets_path.exists())
+            self.assertEqual(len(list(query_stage_audit_records(context.audit_log_path, task_name="M3-T1"))), 1)
+
+            append_stage_audit_record(context, "task_passed", {}, task_name="M4-T1")
+            index = load_stage_audit_offset_index(context.audit_log_path)
+            assert index is not None
+            self.assertEqual(len(index.entries), 9)
+            passed = list(query_stage_audit_records(context.audit_log_path, event_type="task_passed"))
+            self.assertEqual([record["task_name"] for record in passed], ["M1-T1", "M2-T3", "M3-T1", "M4-T1"])
+
+    def test_index_cache_extends_from_last_parsed_offset(self):
+        with TemporaryDirectory() as tmpdir:
+            context = _write_review_history(Path(tmpdir))
+            index = load_stage_audit_offset_index(context.audit_log_path)
+            assert index is not None
+
+            append_stage_audit_record(context, "task_passed", {}, task_name="M3-T1")
+            with unittest.mock.patch.object(
+                audit_query,
+                "_entry_from_payload",
+                wraps=audit_query._entry_from_payload,  # noqa: SLF001
+            ) as parse_mock:
+                extended = load_stage_audit_offset_index(context.audit_log_path)
+
+            self.assertIs(extended, index)
+            self.assertEqual(parse_mock.call_count, 1)
+            self.assertEqual(len(extended.entries), 8)
+            self.assertEqual(extended.covered_size, context.audit_log_path.stat().st_size)
+
+            rebuild_stage_audit_indexes(context.audit_log_path)
+            rebuilt = load_stage_audit_offset_index(context.audit_log_path)
+            assert rebuilt is not None
+            self.assertIsNot(rebuilt, index)
+            self.assertEqual(len(rebuilt.entries), 8)
+
+    def test_query_falls_back_to_scan_when_log_was_replaced(self):
+        with TemporaryDirectory() as tmpdir:
+            context = _write_review_history(Path(tmpdir))
+            self.assertIsNotNone(load_stage_audit_offset_index(context.audit_log_path))
+            original = context.audit_log_path.read_text(encoding="utf-8")
+            rewritten = json.dumps({"event_type": "task_passed", "task_name": "M9-T9"}) + "\n" + original
+
+            replacement = context.audit_log_path.with_name("replacement.jsonl")
+            replacement.write_text(rewritten, encoding="utf-8")
+            os.replace(replacement, context.audit_log_path)
+            replaced = list(query_stage_audit_records(context.audit_log_path, event_type="task_passed"))
+            self.assertEqual([record["task_name"] for record in replaced], ["M9-T9", "M1-T1", "M2-T3"])
+
+            context.audit_log_path.write_text(rewritten.replace("M1-T1", "M1-T2"), encoding="utf-8")
+            in_place = list(query_stage_audit_records(context.audit_log_path, event_type="task_passed"))
+            self.assertEqual([record["task_name"] for record in in_place], ["M9-T9", "M1-T2", "M2-T3"])
+
+    def test_cli_reindexes_and_counts_matches(self):
+        with TemporaryDirectory() as tmpdir:
+            project_dir = Path(tmpdir)
+            context = _write_review_history(project_dir)
+            build_stage_audit_offset_index_path(context.audit_log_path).write_text("", encoding="utf-8")
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                exit_code = main(
+                    [
+                        "--project-dir",
+                        str(project_dir),
+                        "--requirement-name",
+                        "需求",
+                        "--stage",
+                        "A07",
+                        "--event-type",
+                        "review_merged",
+                        "--count",
+                        "--reindex",
+                    ]
+                )
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(stdout.getvalue().strip(), "4")
+            index = load_stage_audit_offset_index(context.audit_log_path)
+            assert index is not None
+            self.assertEqual(len(index.entries), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
@@ -9,6 +10,7 @@ from unittest.mock import patch
 
 import A01_Routing_LayerPlanning as routing_stage
 from tmux_core.stage_kernel import detailed_design, requirements_review, reviewer_orchestration, shared_review
+from T01_tools import task_done
 from T09_terminal_ops import PromptBackRequested
 
 
@@ -64,6 +66,104 @@ class StageKernelSharedTests(unittest.TestCase):
 
         self.assertFalse(reviewer_orchestration._owner_is_dead(reviewer))  # noqa: SLF001
 
+    def test_review_decision_policy_parses_and_decides_early(self):
+        self.assertTrue(reviewer_orchestration.parse_review_decision_policy("all").waits_for_all)
+        any_fail = reviewer_orchestration.parse_review_decision_policy("any-fail")
+        quorum = reviewer_orchestration.parse_review_decision_policy("2-of-n")
+        self.assertEqual(quorum.quorum, 2)
+        with self.assertRaisesRegex(ValueError, "评审决策策略"):
+            reviewer_orchestration.parse_review_decision_policy("most")
+
+        self.assertFalse(any_fail.decide([False], total=3))
+        self.assertIsNone(any_fail.decide([True], total=3))
+        self.assertTrue(quorum.decide([True, True], total=3))
+        self.assertFalse(quorum.decide([False, False], total=3))
+        self.assertIsNone(quorum.decide([True, False], total=3))
+        self.assertIsNone(quorum.decide([False, True, True], total=4))
+        self.assertFalse(quorum.decide([False, True, True], total=3))
+
+    def test_parallel_reviewer_round_returns_on_decision_and_rejoins_late_reviewers(self):
+        release_slow = threading.Event()
+        verdicts = {"fast_fail": False, "slow": True}
+
+        def run_turn(reviewer: str) -> str:
+            if reviewer == "slow":
+                release_slow.wait(5)
+            return reviewer
+
+        pending = reviewer_orchestration.PendingReviewerTurns()
+        decided = reviewer_orchestration.run_parallel_reviewer_round(
+            ["fast_fail", "slow"],
+            key_func=lambda reviewer: reviewer,
+            run_turn=run_turn,
+            error_prefix="审核失败:",
+            decision_policy=reviewer_orchestration.parse_review_decision_policy("any-fail"),
+            verdict_func=verdicts.get,
+            pending=pending,
+        )
+        self.assertEqual(decided, ["fast_fail"])
+        self.assertEqual(pending.pending_keys(), ("slow",))
+
+        late_results = []
+        release_slow.set()
+        rejoined = pending.rejoin(decided, on_late_result=late_results.append)
+
+        self.assertEqual(rejoined, ["fast_fail", "slow"])
+        self.assertEqual(late_results, [reviewer_orchestration.LateReviewerResult(reviewer_key="slow", verdict=True)])
+        self.assertEqual(pending.pending_keys(), ())
+
+    def test_quorum_round_matches_task_done_for_mixed_verdicts(self):
+        def run_round(verdicts: dict[str, bool], review_dir: Path, release_slow: threading.Event):
+            def run_turn(reviewer: str) -> str:
+                if reviewer == "slow":
+                    release_slow.wait(5)
+                (review_dir / f"代码评审记录_{reviewer}.json").write_text(
+                    json.dumps([{"task_name": "M1-T1", "review_pass": verdicts[reviewer]}]),
+                    encoding="utf-8",
+                )
+                (review_dir / f"代码评审记录_{reviewer}.md").write_text("" if verdicts[reviewer] else "需修改\n", encoding="utf-8")
+                return reviewer
+
+            pending = reviewer_orchestration.PendingReviewerTurns()
+            decided = reviewer_orchestration.run_parallel_reviewer_round(
+                list(verdicts),
+                key_func=lambda reviewer: reviewer,
+                run_turn=run_turn,
+                error_prefix="审核失败:",
+                decision_policy=reviewer_orchestration.parse_review_decision_policy("2-of-n"),
+                verdict_func=verdicts.get,
+                pending=pending,
+            )
+            passed = task_done(
+                review_dir,
+                review_dir / "任务单.json",
+                task_name="M1-T1",
+                json_files=[review_dir / f"代码评审记录_{reviewer}.json" for reviewer in decided],
+                md_files=[review_dir / f"代码评审记录_{reviewer}.md" for reviewer in decided],
+            )
+            return decided, pending, passed
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            review_dir = Path(tmpdir)
+            (review_dir / "任务单.json").write_text(json.dumps({"M1-T1": False}), encoding="utf-8")
+            release_slow = threading.Event()
+            threading.Timer(0.2, release_slow.set).start()
+            decided, pending, passed = run_round({"f": False, "a": True, "b": True, "slow": True}, review_dir, release_slow)
+            self.assertEqual(sorted(decided), ["a", "b", "f", "slow"])
+            self.assertEqual(pending.pending_keys(), ())
+            self.assertFalse(passed)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            review_dir = Path(tmpdir)
+            (review_dir / "任务单.json").write_text(json.dumps({"M1-T1": False}), encoding="utf-8")
+            release_slow = threading.Event()
+            decided, pending, passed = run_round({"a": True, "b": True, "slow": False}, review_dir, release_slow)
+            self.assertEqual(sorted(decided), ["a", "b"])
+            self.assertEqual(pending.pending_keys(), ("slow",))
+            self.assertTrue(passed)
+            release_slow.set()
+            pending.rejoin(decided)
+
     def test_parse_review_max_rounds_supports_default_and_infinite(self):
         self.assertEqual(shared_review.parse_review_max_rounds("", source="--review-max-rounds"), 5)
         self.assertIsNone(shared_review.parse_review_max_rounds("infinite", source="--review-max-rounds"))
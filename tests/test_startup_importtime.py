@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)\s*$")
+# 绝对耗时受机器负载影响，默认只校验导入的模块集合；设置该变量（如 1）后才按比例校验耗时预算。
+BUDGET_SCALE = float(os.environ.get("AUTOCODEX_STARTUP_BUDGET_SCALE", "0") or 0)
+STAGE_KERNEL_MODULES = (
+    "tmux_core.stage_kernel.requirements_review",
+    "tmux_core.stage_kernel.detailed_design",
+    "tmux_core.stage_kernel.task_split",
+    "tmux_core.stage_kernel.development",
+    "tmux_core.stage_kernel.overall_review",
+    "A02_RequirementIntake",
+    "A03_RequirementsClarification",
+)
+
+
+def _measure_startup(*args: str) -> tuple[float, set[str]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PROJECT_ROOT,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    total_us = 0
+    modules: set[str] = set()
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        total_us += int(match.group(1))
+        modules.add(match.group(3))
+    return total_us / 1000.0, modules
+
+
+class StartupImportBudgetTests(unittest.TestCase):
+    def assert_startup_within_budget(self, budget_ms: float, *args: str, forbidden: tuple[str, ...] = ()) -> None:
+        elapsed_ms, modules = _measure_startup(*args)
+        self.assertTrue(modules, "未采集到 -X importtime 输出")
+        self.assertEqual(sorted(set(forbidden) & modules), [], f"启动时不应导入这些模块: {args}")
+        if BUDGET_SCALE > 0:
+            self.assertLessEqual(elapsed_ms, budget_ms * BUDGET_SCALE, f"{' '.join(args)} 导入耗时 {elapsed_ms:.1f}ms")
+
+    def test_workflow_help_does_not_load_stage_kernels(self):
+        self.assert_startup_within_budget(
+            350.0,
+            "A00_main_tui.py",
+            "--help",
+            forbidden=(*STAGE_KERNEL_MODULES, "tmux_core.runtime.tmux_runtime", "A01_Routing_LayerPlanning"),
+        )
+
+    def test_web_launcher_help_stays_light(self):
+        self.assert_startup_within_budget(
+            300.0,
+            "A00_main_web.py",
+            "--help",
+            forbidden=("tmux_core.bridge.backend", "tmux_core.runtime.tmux_runtime"),
+        )
+
+    def test_tui_backend_spawn_defers_stage_kernels(self):
+        self.assert_startup_within_budget(600.0, "T11_tui_backend.py", forbidden=STAGE_KERNEL_MODULES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,12 +3,69 @@ from __future__ import annotations
 import json
 import tempfile
 import unittest
+import unittest.mock
 from pathlib import Path
 
-from T01_tools import check_all_reviews_passed, check_task_exists, get_task_review_status, task_done
+import T01_tools
+from T01_tools import (
+    check_all_reviews_passed,
+    check_task_exists,
+    get_first_false_task,
+    get_task_ledger,
+    get_task_review_status,
+    is_task_progress_json,
+    task_done,
+    update_task_to_true,
+)
 
 
 class T01ToolsTests(unittest.TestCase):
+    def test_task_ledger_parses_once_per_change_and_sees_external_rewrites(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            task_json = Path(tmpdir) / "需求_任务单.json"
+            task_json.write_text(
+                json.dumps({"M1": {"M1-T1": False, "M1-T2": False}}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+
+            with unittest.mock.patch.object(T01_tools.json, "loads", wraps=json.loads) as loads_mock:
+                self.assertTrue(is_task_progress_json(task_json))
+                self.assertEqual(get_first_false_task(task_json), "M1-T1")
+                self.assertEqual(get_task_ledger(task_json).snapshot(), {"M1": {"M1-T1": False, "M1-T2": False}})
+            self.assertEqual(loads_mock.call_count, 1)
+
+            task_json.write_text(
+                json.dumps({"M1": {"M1-T1": True, "M1-T2": False}}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            self.assertEqual(get_first_false_task(task_json), "M1-T2")
+
+    def test_task_ledger_batch_update_is_atomic_and_notifies_subscribers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            task_json = Path(tmpdir) / "需求_任务单.json"
+            task_json.write_text(
+                json.dumps({"M1": {"M1-T1": False}, "M2": {"M2-T1": False}}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            ledger = get_task_ledger(task_json)
+            events: list[dict[str, object] | None] = []
+            unsubscribe = ledger.subscribe(lambda _ledger, snapshot: events.append(snapshot))
+            ledger.refresh()
+
+            applied = ledger.update_tasks({"M1-T1": True, "M2-T1": True, "M9-T9": True})
+            unsubscribe()
+
+            self.assertEqual(applied, ["M1-T1", "M2-T1"])
+            self.assertEqual(
+                json.loads(task_json.read_text(encoding="utf-8")),
+                {"M1": {"M1-T1": True}, "M2": {"M2-T1": True}},
+            )
+            self.assertEqual(events, [{"M1": {"M1-T1": True}, "M2": {"M2-T1": True}}])
+            self.assertIsNone(get_first_false_task(task_json))
+            self.assertFalse(update_task_to_true(task_json, "M9-T9"))
+            self.assertFalse(update_task_to_true(Path(tmpdir) / "missing.json", "M1-T1"))
+            self.assertEqual([path.name for path in Path(tmpdir).glob("*.tmp")], [])
+
     def test_review_status_helpers_accept_single_object_payload(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import io
 import json
+import os
 import subprocess
 import tempfile
 import time
 import unittest
+from contextlib import redirect_stdout
 from types import SimpleNamespace
 from unittest import mock
 from pathlib import Path
@@ -47,9 +49,23 @@ from T02_tmux_agents import (
     TERMINAL_ACTIVITY_IDLE_WINDOW_SEC,
     _session_name_lease_lock,
 )
+from tmux_core.runtime.clock import VirtualClock
 from tmux_core.runtime.contracts import finalize_task_result, write_task_status
+from tmux_core.runtime.fake_backend import FakeTmuxBackend, ScriptedAgent
+from tmux_core.runtime.metrics import TURN_PHASE_SECONDS
+from tmux_core.runtime.turn_trace import TurnTracer, build_turn_trace_path, load_trace_events, summarize_turn_traces
+from tmux_core.runtime.turn_trace import main as turn_trace_main
+from tmux_core.runtime.vendor_catalog import LaunchResolution
 from tmux_core.runtime.tmux_runtime import (
+    OBSERVATION_DELTA_MAX_CHARS,
+    SESSION_NAME_RESERVE_LIST_TIMEOUT_SEC,
+    _release_reserved_session_name,
+    _reserve_session_name,
+    clean_ansi,
     is_worker_death_error,
+    iter_tmux_backends,
+    resolve_tmux_socket_name,
+    tmux_shard_socket_names,
     worker_state_has_launch_evidence,
     worker_state_is_prelaunch_active,
 )
@@ -7571,6 +7587,29 @@ Do you trust the files in this folder?
             )
             self.assertNotEqual(worker_a.session_name, worker_b.session_name)
 
+    def test_session_name_reservation_lists_only_target_shard_with_short_timeout(self):
+        class ShardBackend(TmuxBackend):
+            def __init__(self):
+                super().__init__(socket_name="acx-shard-1")
+                self.calls: list[tuple[tuple[str, ...], float]] = []
+
+            def run(self, *args, timeout_sec=10.0, **kwargs):  # noqa: ANN001, ANN003
+                _ = kwargs
+                self.calls.append((args, timeout_sec))
+                return subprocess.CompletedProcess(["tmux"], 0, "developer-busy\n", "")
+
+        backend = ShardBackend()
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch(
+            "tmux_core.runtime.tmux_runtime.iter_tmux_backends",
+            side_effect=AssertionError("other shards listed"),
+        ):
+            session_name = _reserve_session_name(worker_id="developer", work_dir=tmp_dir, vendor=Vendor.CODEX, backend=backend)
+            try:
+                self.assertEqual(backend.calls, [(("list-sessions", "-F", "#S"), SESSION_NAME_RESERVE_LIST_TIMEOUT_SEC)])
+                self.assertNotEqual(session_name, "developer-busy")
+            finally:
+                _release_reserved_session_name(session_name)
+
     def test_session_name_reservation_is_released_after_session_creation(self):
         class FakeBackend:
             def __init__(self):
@@ -7848,6 +7887,314 @@ Do you trust the files in this folder?
             self.assertEqual(state["health_status"], "awaiting_reconfig")
             self.assertEqual(state["health_note"], "需要重新选择模型")
 
+    def test_health_supervisor_waits_on_injected_virtual_clock(self):
+        clock = VirtualClock()
+        calls = []
+        supervisor = HealthSupervisor(
+            refresh_callback=lambda: calls.append(clock.monotonic()),
+            interval_sec=2.0,
+            clock=clock,
+        )
+        supervisor.start()
+        try:
+            time.sleep(0.05)
+            self.assertEqual(calls, [])
+            for expected_calls in range(1, 4):
+                clock.advance(2.0)
+                deadline = time.monotonic() + 1.0
+                while time.monotonic() < deadline and len(calls) < expected_calls:
+                    time.sleep(0.005)
+            self.assertEqual(calls, [1002.0, 1004.0, 1006.0])
+        finally:
+            supervisor.stop()
+        self.assertTrue(supervisor.stopped())
+
+    def test_fake_tmux_backend_runs_launch_and_turns_in_virtual_time(self):
+        import re
+
+        import tmux_core.runtime.tmux_runtime as tmux_runtime
+
+        def fake_resolve_launch(vendor_id, requested_model, requested_effort):
+            return LaunchResolution(
+                vendor_id=vendor_id,
+                requested_model=requested_model,
+                resolved_model=requested_model,
+                requested_effort=requested_effort,
+                normalized_effort=requested_effort,
+                native_reasoning_level=requested_effort,
+                resolved_variant="",
+                reasoning_control_mode="test",
+                supports_reasoning=True,
+                catalog_source_kind="test",
+                confidence="high",
+            )
+
+        workers: list[TmuxBatchWorker] = []
+
+        def respond(pane, prompt):
+            turn_token = re.search(r"\[\[ACX_TURN:[^\]]+:DONE\]\]", prompt).group(0)
+            write_task_status(workers[0].current_task_status_path, status="done")
+            return f"codex: 已完成 {len(pane.submissions) - 1}\n{turn_token}"
+
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch(
+            "tmux_core.runtime.tmux_runtime.resolve_launch",
+            side_effect=fake_resolve_launch,
+        ), mock.patch.object(tmux_runtime, "_SESSION_NAME_LEASE_ROOT", Path(tmp_dir) / "leases"), mock.patch(
+            "tmux_core.runtime.tmux_runtime.time.sleep",
+            side_effect=AssertionError("real sleep"),
+        ), mock.patch.dict(os.environ, {"TMUX_TURN_TRACE": "1"}):
+            clock = VirtualClock()
+            agent = ScriptedAgent(respond=respond, busy_sec=30.0)
+            backend = FakeTmuxBackend(clock=clock, on_submit=agent)
+            worker = TmuxBatchWorker(
+                worker_id="fake-developer",
+                work_dir=tmp_dir,
+                config=AgentRunConfig(vendor="codex", model="gpt-5.4"),
+                runtime_root=Path(tmp_dir) / "runtime",
+                backend=backend,
+            )
+            workers.append(worker)
+            turns_before = TURN_PHASE_SECONDS.count(phase="turn", vendor="codex", stage="-")
+            started = time.monotonic()
+            try:
+                worker.launch_agent(timeout_sec=60.0)
+                results = [worker.run_turn(label=f"turn-{index}", prompt=f"执行第 {index} 步", timeout_sec=60.0) for index in range(3)]
+            finally:
+                worker._stop_health_supervisor()  # noqa: SLF001
+
+            self.assertEqual([result.clean_output for result in results], ["已完成 1", "已完成 2", "已完成 3"])
+            self.assertEqual(agent.turns, 3)
+            self.assertIs(worker.clock, clock)
+            self.assertGreaterEqual(clock.monotonic() - 1000.0, 90.0)
+            self.assertLess(time.monotonic() - started, 5.0)
+            pane = backend.pane(worker.pane_id)
+            self.assertEqual(pane.current_command, "codex")
+            self.assertEqual(pane.options[tmux_runtime.TMUX_IDENTITY_WORKER_ID_OPTION], "fake-developer")
+            self.assertEqual(len(pane.submissions), 4)
+            self.assertTrue(worker.session_exists())
+            trace_path = Path(tmp_dir) / "runtime" / ".turn_traces" / "turns.trace.json"
+            events = load_trace_events(trace_path)
+            spans = [event for event in events if event.get("ph") == "X"]
+            self.assertEqual([event["args"]["label"] for event in spans if event["name"] == "turn"], ["turn-0", "turn-1", "turn-2"])
+            self.assertEqual(sum(1 for event in spans if event["name"] == "agent_boot"), 1)
+            self.assertEqual(sum(1 for event in spans if event["name"] == "paste_submit"), 4)
+            self.assertTrue(all(event["args"]["vendor"] == "codex" for event in spans))
+            turn_span = next(event for event in spans if event["name"] == "turn")
+            self.assertGreaterEqual(turn_span["dur"], 30_000_000)
+            self.assertEqual(TURN_PHASE_SECONDS.count(phase="turn", vendor="codex", stage="-") - turns_before, 3)
+            worker._release_session_name_reservation()  # noqa: SLF001
+
+    def test_agent_slot_is_leased_per_turn_and_wait_timeout_is_reported(self):
+        import tmux_core.runtime.tmux_runtime as tmux_runtime
+
+        def fake_resolve_launch(vendor_id, requested_model, requested_effort):
+            return LaunchResolution(
+                vendor_id=vendor_id,
+                requested_model=requested_model,
+                resolved_model=requested_model,
+                requested_effort=requested_effort,
+                normalized_effort=requested_effort,
+                native_reasoning_level=requested_effort,
+                resolved_variant="",
+                reasoning_control_mode="test",
+                supports_reasoning=True,
+                catalog_source_kind="test",
+                confidence="high",
+            )
+
+        leases: list[SimpleNamespace] = []
+
+        def fake_acquire(vendor, **kwargs):  # noqa: ANN001
+            lease = SimpleNamespace(lease_id=len(leases) + 1, active=True, released=False, kwargs=kwargs)
+            lease.release = lambda: setattr(lease, "released", True)
+            leases.append(lease)
+            return lease
+
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch(
+            "tmux_core.runtime.tmux_runtime.resolve_launch",
+            side_effect=fake_resolve_launch,
+        ), mock.patch.object(tmux_runtime, "_SESSION_NAME_LEASE_ROOT", Path(tmp_dir) / "leases"), mock.patch.object(
+            tmux_runtime,
+            "acquire_agent_slot",
+            side_effect=fake_acquire,
+        ), mock.patch.dict(os.environ, {"TMUX_AGENT_BUDGET_WAIT_SEC": "5"}):
+            worker = TmuxBatchWorker(
+                worker_id="budget-developer",
+                work_dir=tmp_dir,
+                config=AgentRunConfig(vendor="codex", model="gpt-5.4"),
+                runtime_root=Path(tmp_dir) / "runtime",
+                backend=FakeTmuxBackend(clock=VirtualClock()),
+            )
+            try:
+                worker.create_session()
+                self.assertEqual(leases, [])
+                with mock.patch.object(worker, "_run_turn_attempts", return_value="done") as run_attempts:
+                    self.assertEqual(worker.run_turn(label="turn-1", prompt="执行"), "done")
+                    self.assertEqual(worker.run_turn(label="turn-2", prompt="执行"), "done")
+                self.assertEqual(run_attempts.call_count, 2)
+                self.assertEqual([lease.released for lease in leases], [True, True])
+                self.assertEqual(leases[0].kwargs["timeout_sec"], 5.0)
+
+                with mock.patch.object(tmux_runtime, "acquire_agent_slot", side_effect=TimeoutError("busy")):
+                    with self.assertRaisesRegex(RuntimeError, "等待 codex 智能体并发额度超过 5 秒"):
+                        worker.run_turn(label="turn-3", prompt="执行")
+            finally:
+                worker._stop_health_supervisor()  # noqa: SLF001
+                worker._release_session_name_reservation()  # noqa: SLF001
+
+    def test_worker_observation_tail_lines_match_cleaning_the_whole_tail(self):
+        fields = dict(
+            visible_text="a\rb\nc",
+            current_command="codex",
+            current_path="/tmp",
+            pane_dead=False,
+            session_exists=True,
+            log_mtime=1.0,
+            observed_at="2026-01-01T00:00:00",
+            pane_title="codex",
+        )
+        pieces = ["abc", "\n", "\r\n", "\r", "\x1b[2K", "\x1b[32m", "\x1b]0;title\x07", "\x1b]0;a\nb", "\x1b]8;;u\x1b\\", "\x07", "中文"]
+        samples = ["abc\n\x1b[2K", "x\x1b]0;a\n\x1b]0;b\x07y\n", "1\n2\n\x1b]8;;u\n3\x1b\\4\n"]
+        samples.extend("".join(pieces[(seed * 7 + index * 3) % len(pieces)] for index in range(seed % 40)) for seed in range(200))
+        for raw_tail in samples:
+            for max_lines in (1, 2, 5):
+                expected = "\n".join(clean_ansi(raw_tail).splitlines()[-max_lines:])
+                observation = WorkerObservation.from_raw_log(raw_log_delta="", raw_log_tail=raw_tail, **fields)
+                self.assertEqual(observation.raw_log_tail_lines(max_lines), expected, (raw_tail, max_lines))
+                _ = observation.raw_log_tail
+                self.assertEqual(observation.raw_log_tail_lines(max_lines), expected, (raw_tail, max_lines))
+        self.assertEqual(observation.visible_tail_lines(2), "b\nc")
+
+    def test_worker_observation_cleans_raw_log_lazily_and_bounds_delta(self):
+        fields = dict(
+            visible_text="› ready",
+            current_command="codex",
+            current_path="/tmp",
+            pane_dead=False,
+            session_exists=True,
+            log_mtime=1.0,
+            observed_at="2026-01-01T00:00:00",
+            pane_title="codex",
+        )
+        raw_tail = "".join(f"\x1b[32mline {index}\x1b[0m\n" for index in range(500))
+        raw_delta = "\x1b[1m" + "x" * (OBSERVATION_DELTA_MAX_CHARS + 100) + "\n最后一行\x1b[0m\n"
+        observation = WorkerObservation.from_raw_log(raw_log_delta=raw_delta, raw_log_tail=raw_tail, **fields)
+
+        self.assertEqual(observation.raw_log_tail_lines(2), "line 498\nline 499")
+        self.assertIsNone(observation._raw_log_tail)
+        self.assertEqual(observation.raw_log_delta, "最后一行\n")
+        self.assertLessEqual(len(observation.raw_log_delta), OBSERVATION_DELTA_MAX_CHARS)
+        self.assertEqual(observation.raw_log_tail.splitlines()[-1], "line 499")
+        self.assertEqual(observation.raw_log_tail_lines(2), "line 498\nline 499")
+        self.assertEqual(observation.visible_tail_lines(1), "› ready")
+        self.assertEqual(
+            observation,
+            WorkerObservation(raw_log_delta="最后一行\n", raw_log_tail=observation.raw_log_tail, **fields),
+        )
+        self.assertFalse(hasattr(observation, "__dict__"))
+        with self.assertRaises(AttributeError):
+            observation.visible_text = "changed"
+
+    def test_tmux_shards_route_scopes_to_sockets_and_controller_aggregates(self):
+        with mock.patch.dict(os.environ, {"TMUX_SERVER_SHARDS": "4", "TMUX_SERVER_SOCKET": ""}):
+            names = tmux_shard_socket_names()
+            self.assertEqual(names, tuple(f"acx-shard-{index}" for index in range(4)))
+            socket_name = resolve_tmux_socket_name("/repo::需求A")
+            self.assertIn(socket_name, names)
+            self.assertEqual(resolve_tmux_socket_name("/repo::需求A"), socket_name)
+            self.assertEqual(len(iter_tmux_backends()), 5)
+        with mock.patch.dict(os.environ, {"TMUX_SERVER_SHARDS": "4", "TMUX_SERVER_SOCKET": "acx-solo"}):
+            self.assertEqual(resolve_tmux_socket_name("/repo::需求A"), "acx-solo")
+        with mock.patch.dict(os.environ, {"TMUX_SERVER_SHARDS": "", "TMUX_SERVER_SOCKET": ""}):
+            self.assertEqual(resolve_tmux_socket_name("/repo::需求A"), "")
+
+        backend = TmuxBackend(socket_name="acx-shard-1")
+        self.assertEqual(backend.command_prefix(), ["tmux", "-L", "acx-shard-1"])
+        self.assertEqual(backend.attach_command("sess-1"), "tmux -L acx-shard-1 attach -t sess-1")
+        self.assertEqual(TmuxBackend().attach_command("sess-1"), "tmux attach -t sess-1")
+
+        default_shard = FakeTmuxBackend()
+        other_shard = FakeTmuxBackend()
+        other_shard.socket_name = "acx-shard-2"
+        default_shard.run("new-session", "-d", "-s", "sess-default", "-c", "/tmp", "zsh")
+        other_shard.run("new-session", "-d", "-s", "sess-sharded", "-c", "/tmp", "zsh")
+        controller = TmuxRuntimeController(backend=default_shard)
+        controller.shard_backends = (default_shard, other_shard)
+
+        self.assertEqual(controller.list_sessions(), ["sess-default", "sess-sharded"])
+        self.assertTrue(controller.session_exists("sess-sharded"))
+        self.assertEqual(controller.attach_command("sess-sharded"), ["tmux", "-L", "acx-shard-2", "attach", "-t", "sess-sharded"])
+        self.assertEqual(controller.kill_session("sess-sharded"), "sess-sharded")
+        self.assertFalse(controller.session_exists("sess-sharded"))
+        self.assertTrue(default_shard.has_session("sess-default"))
+
+    def test_turn_trace_summary_reports_percentiles_per_phase_vendor_and_stage(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {"TMUX_TURN_TRACE": "1"}):
+            clock = VirtualClock()
+            trace_path = Path(tmp_dir) / ".turn_traces" / "需求A.trace.json"
+            tracer = TurnTracer(trace_path, clock=clock, track_name="reviewer", base_args={"vendor": "codex", "stage": "A07"})
+            for seconds in (1, 2, 3, 4, 20):
+                with tracer.span("wait_task_result"):
+                    clock.advance(seconds)
+            with self.assertRaises(ValueError), tracer.span("paste_submit"):
+                raise ValueError("boom")
+            with mock.patch.dict(os.environ, {"TMUX_TURN_TRACE": "0"}), tracer.span("turn"):
+                clock.advance(1)
+
+            events = load_trace_events(trace_path)
+            self.assertTrue(trace_path.read_text(encoding="utf-8").startswith("[\n"))
+            self.assertEqual(events[0]["ph"], "M")
+            self.assertEqual(next(event for event in events if event["name"] == "paste_submit")["args"]["error"], "ValueError")
+            summaries = {summary.group: summary for summary in summarize_turn_traces(events)}
+            self.assertNotIn(("turn", "codex", "A07"), summaries)
+            wait_summary = summaries[("wait_task_result", "codex", "A07")]
+            self.assertEqual((wait_summary.count, wait_summary.p50_sec, wait_summary.p95_sec), (5, 3.0, 20.0))
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                exit_code = turn_trace_main([tmp_dir, "--group-by", "phase", "--json"])
+            self.assertEqual(exit_code, 0)
+            rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+            self.assertEqual(rows[-1], {"phase": "wait_task_result", "count": 5, "p50_sec": 3.0, "p95_sec": 20.0, "max_sec": 20.0, "total_sec": 30.0})
+
+    def test_turn_trace_path_prefers_stage_runtime_root_over_project_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_dir = Path(tmp_dir) / "project"
+            runtime_root = project_dir / ".development_runtime" / "需求A"
+            self.assertEqual(
+                build_turn_trace_path(project_dir=project_dir, requirement_name="需求 A", runtime_root=runtime_root),
+                runtime_root.resolve() / ".turn_traces" / "需求_A.trace.json",
+            )
+            self.assertEqual(
+                build_turn_trace_path(project_dir=project_dir),
+                project_dir.resolve() / ".turn_traces" / "turns.trace.json",
+            )
+
+    def test_turn_trace_is_opt_in_and_rotates_at_size_limit(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            clock = VirtualClock()
+            trace_path = Path(tmp_dir) / ".turn_traces" / "turns.trace.json"
+            tracer = TurnTracer(trace_path, clock=clock, track_name="developer", base_args={"vendor": "codex"})
+            with mock.patch.dict(os.environ, {"TMUX_TURN_TRACE": ""}), tracer.span("turn"):
+                clock.advance(1)
+            self.assertFalse(trace_path.exists())
+
+            with mock.patch.dict(os.environ, {"TMUX_TURN_TRACE": "1", "TMUX_TURN_TRACE_MAX_BYTES": "400"}):
+                for _ in range(6):
+                    with tracer.span("turn"):
+                        clock.advance(1)
+
+            rotated_path = trace_path.with_name("turns.1.trace.json")
+            self.assertTrue(rotated_path.exists())
+            self.assertLess(trace_path.stat().st_size, 800)
+            for path in (trace_path, rotated_path):
+                events = load_trace_events(path)
+                self.assertEqual(events[0]["ph"], "M")
+                self.assertEqual(sum(1 for event in events if event["ph"] == "M"), 1)
+            total_spans = sum(
+                1 for path in (trace_path, rotated_path) for event in load_trace_events(path) if event["ph"] == "X"
+            )
+            self.assertLessEqual(total_spans, 6)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
+from tmux_core.stage_kernel.routing_fingerprint import write_routing_fingerprint
 from T02_tmux_agents import AgentRunConfig, AgentRuntimeState, CommandResult, WorkerResult
 from T03_agent_init_workflow import (
     BatchInitResult,
@@ -20,6 +24,7 @@ from T03_agent_init_workflow import (
     PHASE_ROUTING_LAYER_AUDIT,
     PHASE_ROUTING_LAYER_CREATE,
     PHASE_ROUTING_LAYER_REFINE,
+    RunManifest,
     RunStore,
     TURN_STATUS_SCHEMA_VERSION,
     TURN_STATUS_FILE,
@@ -34,6 +39,7 @@ from T03_agent_init_workflow import (
     build_prefixed_sha256,
     cleanup_routing_stage_artifacts,
     determine_batch_worker_count,
+    estimate_directory_cost,
     extract_protocol_token,
     has_overlapping_scope_paths,
     has_complete_routing_layer,
@@ -44,8 +50,11 @@ from T03_agent_init_workflow import (
     prepare_revise_audit_output,
     prepare_live_workers,
     resolve_target_selection,
+    resolve_vendor_concurrency,
     run_batch_initialization,
     run_directory_initialization_with_worker,
+    run_timed_directory_initialization,
+    schedule_live_workers_longest_first,
     routing_turn_status_path,
     validate_routing_layer_artifacts,
 )
@@ -706,6 +715,161 @@ class AgentInitWorkflowTests(unittest.TestCase):
             calc_dir.mkdir(parents=True)
             self.assertEqual(determine_batch_worker_count([project_dir, calc_dir], max_workers=4), 4)
 
+    def test_unchanged_routing_layer_is_skipped_and_changed_scope_gets_refresh_turn(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = (Path(tmpdir) / "project").resolve()
+            (project_dir / "api").mkdir(parents=True)
+            (project_dir / "core").mkdir()
+            (project_dir / "api" / "routes.py").write_text("ROUTES = []\n", encoding="utf-8")
+            (project_dir / "core" / "model.py").write_text("MODEL = 1\n", encoding="utf-8")
+            _write_valid_routing_layer(project_dir)
+            write_routing_fingerprint(project_dir)
+
+            self.assertEqual(
+                resolve_target_selection(project_dir=project_dir, run_init=True).selected_dirs,
+                (str(project_dir),),
+            )
+            selection = resolve_target_selection(project_dir=project_dir, run_init=True, skip_unchanged=True)
+            self.assertEqual(selection.selected_dirs, ())
+            self.assertEqual(selection.skipped_dirs, (str(project_dir),))
+            self.assertEqual(selection.unchanged_dirs, (str(project_dir),))
+
+            (project_dir / "api" / "routes.py").write_text("ROUTES = ['/v1']\n", encoding="utf-8")
+            selection = resolve_target_selection(project_dir=project_dir, run_init=True, skip_unchanged=True)
+            self.assertEqual(selection.selected_dirs, (str(project_dir),))
+            self.assertEqual(selection.refresh_plan_for(str(project_dir)).changed_scopes, ("api",))
+            FakeWorker.scripts = {
+                str(project_dir): [
+                    {"label": "refresh_routing_layer", "output": ""},
+                    {
+                        "label": "audit_routing_layer_1",
+                        "output": "",
+                        "write_files": self._audit_write_files(
+                            round_index=1,
+                            status=ROUTING_AUDIT_STATUS_PASS,
+                            record_text="- status: 审核通过\n",
+                        ),
+                    },
+                ]
+            }
+            worker = FakeWorker(
+                worker_id="project",
+                work_dir=project_dir,
+                config=SimpleNamespace(to_summary=lambda: {}),
+                runtime_root=Path(tmpdir) / "runtime",
+            )
+
+            with patch("T03_agent_init_workflow.plan_routing_refresh", side_effect=AssertionError("plan recomputed")):
+                result = run_directory_initialization_with_worker(
+                    worker=worker,
+                    refresh_plan=selection.refresh_plan_for(str(project_dir)),
+                )
+
+            self.assertEqual(result.status, "passed")
+            self.assertEqual([item.label for item in worker.results], ["refresh_routing_layer", "audit_routing_layer_1"])
+            self.assertIn("路由层增量刷新.md", worker.results[0].command)
+            self.assertEqual(
+                resolve_target_selection(project_dir=project_dir, run_init=True, skip_unchanged=True).selected_dirs,
+                (),
+            )
+
+    def test_batch_worker_count_follows_vendor_concurrency(self):
+        dirs = [f"/tmp/dir-{index}" for index in range(6)]
+        with patch.dict(os.environ, {"TMUX_VENDOR_CONCURRENCY": "codex=5,gemini=bad"}):
+            self.assertEqual(resolve_vendor_concurrency("codex"), 5)
+            self.assertEqual(resolve_vendor_concurrency("gemini"), 2)
+            self.assertEqual(determine_batch_worker_count(dirs, vendor="codex"), 5)
+            self.assertEqual(determine_batch_worker_count(dirs[:2], vendor="codex"), 2)
+        self.assertEqual(determine_batch_worker_count(dirs), 4)
+
+    def test_schedule_dispatches_longest_directory_first_and_records_timings(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project_dir = (Path(tmpdir) / "project").resolve()
+            small_dir = project_dir / "small"
+            large_dir = project_dir / "large"
+            known_dir = project_dir / "known"
+            for path in (small_dir, large_dir / "node_modules", known_dir):
+                path.mkdir(parents=True)
+            (small_dir / "a.py").write_text("x\n", encoding="utf-8")
+            for index in range(5):
+                (large_dir / f"m{index}.py").write_text("x\n", encoding="utf-8")
+            for index in range(50):
+                (large_dir / "node_modules" / f"dep{index}.js").write_text("x\n", encoding="utf-8")
+            runtime_root = build_routing_runtime_root(project_dir)
+
+            def make_store(run_id: str) -> RunStore:
+                run_root = runtime_root / run_id
+                run_root.mkdir(parents=True)
+                manifest = RunManifest(
+                    manifest_version=1,
+                    run_id=run_id,
+                    runtime_dir=str(run_root),
+                    project_dir=str(project_dir),
+                    selection={},
+                    config={},
+                    status="running",
+                    created_at="",
+                    updated_at="",
+                )
+                return RunStore(run_root=run_root, manifest=manifest)
+
+            previous = make_store("run_prev")
+            run_timed_directory_initialization(
+                previous,
+                str(known_dir),
+                lambda **kwargs: DirectoryInitResult(work_dir=str(known_dir), forced=False, status="passed", rounds_used=1),
+            )
+            previous.manifest.workers[0].duration_sec = 900.0
+            previous.write_manifest()
+            self.assertEqual(estimate_directory_cost(large_dir).file_count, 5)
+
+            current = make_store("run_next")
+            handles = [SimpleNamespace(work_dir=str(path)) for path in (small_dir, large_dir, known_dir)]
+            ordered = schedule_live_workers_longest_first(handles, run_store=current)
+
+            self.assertEqual([item.work_dir for item in ordered], [str(known_dir), str(large_dir), str(small_dir)])
+            events = [json.loads(line) for line in current.events_path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(events[-1]["type"], "batch_schedule")
+            self.assertEqual(events[-1]["order"][0]["prior_duration_sec"], 900.0)
+
+    def test_timed_initialization_skips_partial_and_failed_runs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            run_root = Path(tmpdir) / "run_timing"
+            run_root.mkdir(parents=True)
+            store = RunStore(
+                run_root=run_root,
+                manifest=RunManifest(
+                    manifest_version=1,
+                    run_id="run_timing",
+                    runtime_dir=str(run_root),
+                    project_dir=tmpdir,
+                    selection={},
+                    config={},
+                    status="running",
+                    created_at="",
+                    updated_at="",
+                ),
+            )
+            cases = {
+                "failed": (DirectoryInitResult(work_dir="failed", forced=False, status="failed", rounds_used=1), {}),
+                "unchanged": (DirectoryInitResult(work_dir="unchanged", forced=False, status="passed", rounds_used=0), {}),
+                "resumed": (
+                    DirectoryInitResult(work_dir="resumed", forced=False, status="passed", rounds_used=2),
+                    {"workflow_stage": "audit_running"},
+                ),
+                "full": (DirectoryInitResult(work_dir="full", forced=False, status="passed", rounds_used=1), {}),
+            }
+            for work_dir, (result, resume_state) in cases.items():
+                returned = run_timed_directory_initialization(
+                    store,
+                    work_dir,
+                    lambda result=result, **kwargs: result,
+                    resume_state=resume_state,
+                )
+                self.assertIs(returned, result)
+
+            self.assertEqual([entry.work_dir for entry in store.manifest.workers], ["full"])
+
     def test_run_batch_initialization_passes_after_refine(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             project_dir = (Path(tmpdir) / "project").resolve()
@@ -23,7 +23,16 @@ from A08_OverallReview import build_overall_review_paths
 from T03_agent_init_workflow import build_routing_runtime_root, required_routing_layer_paths
 from T08_pre_development import update_pre_development_task_status
 from T12_requirements_common import build_requirements_clarification_paths
+from tmux_core.bridge.message_writer import BatchedMessageWriter
+from tmux_core.bridge.request_pool import (
+    BRIDGE_ACTION_MUTATING,
+    BRIDGE_ACTION_READ_ONLY,
+    READ_ONLY_BRIDGE_ACTION_LIMITS,
+    ReadOnlyRequestPool,
+    classify_bridge_action,
+)
 from T11_tui_backend import (
+    BridgeLogSink,
     ControlSessionState,
     HumanAttentionManager,
     PendingPromptState,
@@ -31,7 +40,7 @@ from T11_tui_backend import (
     TuiBackendServer,
     main as backend_main,
 )
-from T10_tui_protocol import build_request
+from T10_tui_protocol import build_event, build_request, build_response
 from T09_terminal_ops import BridgePromptRequest
 
 
@@ -4932,6 +4941,194 @@ class T11TuiBackendTests(unittest.TestCase):
         self.assertIn("snapshot.hitl", event_types)
         self.assertIn("snapshot.artifacts", event_types)
 
+    def test_batched_message_writer_prioritises_responses_and_merges_snapshots(self):
+        class _GateWriter(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.entered = threading.Event()
+                self.release = threading.Event()
+                self.chunks: list[str] = []
+
+            def write(self, text):
+                self.entered.set()
+                self.release.wait(5)
+                self.chunks.append(text)
+                return super().write(text)
+
+        gate = _GateWriter()
+        writer = BatchedMessageWriter(gate, flush_interval_sec=0)
+        try:
+            writer.submit(build_event("log.append", {"text": "first\n"}))
+            self.assertTrue(gate.entered.wait(5))
+            writer.submit(build_event("log.append", {"text": "second\n"}))
+            for index in range(3):
+                writer.submit(build_event("snapshot.app", {"index": index}))
+            writer.submit(build_response("req_1", ok=True, payload={"done": True}))
+            gate.release.set()
+            self.assertTrue(writer.flush(5))
+            stats = writer.stats()
+        finally:
+            writer.close()
+
+        self.assertEqual(len(gate.chunks), 2)
+        batch = [json.loads(line) for line in gate.chunks[1].splitlines()]
+        self.assertEqual(batch[0]["kind"], "response")
+        self.assertEqual(batch[1]["payload"]["text"], "second\n")
+        self.assertEqual([item["payload"]["index"] for item in batch[2:]], [2])
+        self.assertEqual(stats["written_messages"], 4)
+        self.assertEqual(stats["merged_snapshots"], 2)
+        self.assertEqual(stats["batches"], 2)
+        self.assertEqual(stats["queue_depth"], 0)
+
+    def test_batched_message_writer_merges_logs_and_evicts_only_snapshots_when_full(self):
+        class _GateWriter(io.StringIO):
+            def __init__(self):
+                super().__init__()
+                self.entered = threading.Event()
+                self.release = threading.Event()
+
+            def write(self, text):
+                self.entered.set()
+                self.release.wait(5)
+                return super().write(text)
+
+        gate = _GateWriter()
+        writer = BatchedMessageWriter(gate, max_queue_size=3, flush_interval_sec=0)
+        try:
+            writer.submit(build_event("log.append", {"text": "writing\n"}))
+            self.assertTrue(gate.entered.wait(5))
+            writer.submit(build_event("snapshot.app", {"index": 0}))
+            writer.submit(build_event("log.append", {"text": "old\n"}))
+            writer.submit(build_event("task.progress", {"step": 1}))
+            writer.submit(build_event("log.append", {"text": "new\n"}))
+            writer.submit(build_event("log.append", {"text": "a\nb\n", "lines": ["a\n", "b\n"]}))
+            writer.submit(build_event("snapshot.control", {"index": 1}))
+            writer.submit(build_event("task.progress", {"step": 2}))
+            writer.submit(build_response("req_1", ok=True, payload={}))
+            stats = writer.stats()
+            self.assertEqual(stats["queue_depth"], 4)
+            self.assertEqual(stats["blocked_submits"], 0)
+            blocked = threading.Thread(target=writer.submit, args=(build_event("task.progress", {"step": 3}),))
+            blocked.start()
+            deadline = time.time() + 5
+            while writer.stats()["blocked_submits"] == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            gate.release.set()
+            blocked.join(5)
+            self.assertTrue(writer.flush(5))
+            final_stats = writer.stats()
+        finally:
+            writer.close()
+
+        messages = [json.loads(line) for line in gate.getvalue().splitlines() if line.strip()]
+        self.assertEqual(messages[1]["kind"], "response")
+        self.assertEqual(
+            [item["payload"] for item in messages[2:]],
+            [
+                {"step": 1},
+                {"step": 2},
+                {"text": "old\nnew\na\nb\n", "lines": ["old\n", "new\n", "a\n", "b\n"]},
+                {"step": 3},
+            ],
+        )
+        self.assertEqual(stats["merged_log_lines"], 3)
+        self.assertEqual(stats["evicted_messages"], 1)
+        self.assertEqual(stats["dropped_messages"], 2)
+        self.assertEqual(final_stats["blocked_submits"], 1)
+        self.assertEqual(final_stats["dropped_messages"], 2)
+
+    def test_batched_tui_server_flushes_events_on_shutdown(self):
+        writer = io.StringIO()
+        server = TuiBackendServer(reader=io.StringIO(), writer=writer, batched_output=True)
+        server.emit_event("log.append", {"text": "hello\n"})
+        self.assertTrue(server.flush_messages(5))
+        self.assertIn("hello", writer.getvalue())
+        server.emit_event("log.append", {"text": "bye\n"})
+        server.shutdown(cleanup_tmux=False)
+
+        messages = [json.loads(line) for line in writer.getvalue().splitlines() if line.strip()]
+        texts = [item["payload"].get("text") for item in messages if item.get("type") == "log.append"]
+        self.assertEqual(texts[:2], ["hello\n", "bye\n"])
+        self.assertGreaterEqual(server.outbound_stats()["written_messages"], 2)
+
+    def test_coalescing_log_sink_batches_lines_and_keeps_order(self):
+        events: list[tuple[str, dict[str, object]]] = []
+        sink = BridgeLogSink(
+            lambda event_type, payload: events.append((event_type, dict(payload))),
+            coalesce_window_sec=60,
+            max_coalesced_lines=3,
+        )
+        sink.write("a\nb\n")
+        self.assertEqual(events, [])
+        sink.write("c\nd\ntail")
+        self.assertEqual(events, [("log.append", {"text": "a\nb\nc\n", "lines": ["a\n", "b\n", "c\n"]})])
+        sink.flush()
+        self.assertEqual(events[-1], ("log.append", {"text": "d\ntail", "lines": ["d\n", "tail"]}))
+        sink.flush()
+        self.assertEqual(len(events), 2)
+
+    def test_coalesced_log_lines_are_emitted_after_window_and_before_other_events(self):
+        writer = io.StringIO()
+        server = TuiBackendServer(reader=io.StringIO(), writer=writer, log_coalesce_window_sec=0.01)
+        with redirect_stdout(server.protocol_log_sink()):
+            print("one")
+            print("two")
+        deadline = time.time() + 5
+        while "two" not in writer.getvalue() and time.time() < deadline:
+            time.sleep(0.01)
+        with redirect_stdout(server.protocol_log_sink()):
+            print("three")
+        server.emit_event("stage.changed", {"action": "idle"})
+
+        messages = [json.loads(line) for line in writer.getvalue().splitlines() if line.strip()]
+        self.assertEqual(messages[0]["payload"]["lines"], ["one\n", "two\n"])
+        self.assertEqual(messages[1]["payload"], {"text": "three\n"})
+        self.assertEqual(messages[2]["type"], "stage.changed")
+
+    def test_only_run_list_is_routed_to_the_read_pool(self):
+        self.assertEqual(classify_bridge_action("run.list"), BRIDGE_ACTION_READ_ONLY)
+        self.assertEqual(classify_bridge_action("ui.presence"), BRIDGE_ACTION_MUTATING)
+
+    def test_run_list_walk_does_not_block_serialized_requests(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first_dir = Path(tmpdir) / "first"
+            latest_dir = Path(tmpdir) / "latest"
+            writer = io.StringIO()
+            server = TuiBackendServer(reader=io.StringIO(), writer=writer)
+            server._read_request_pool.shutdown()  # noqa: SLF001
+            server._read_request_pool = ReadOnlyRequestPool(action_limits=READ_ONLY_BRIDGE_ACTION_LIMITS)  # noqa: SLF001
+            release = threading.Event()
+            started = threading.Event()
+            walked: list[str] = []
+
+            def slow_list_runs(*, project_dir: str = ""):
+                walked.append(project_dir)
+                started.set()
+                release.wait(5)
+                return [{"run_id": Path(project_dir).name}]
+
+            with patch.object(server, "_list_runs", side_effect=slow_list_runs):
+                server.route_request(build_request("run.list", {"project_dir": str(first_dir)}, message_id="req_list"))
+                self.assertTrue(started.wait(5))
+                server.route_request(build_request("run.list", {"project_dir": str(latest_dir)}, message_id="req_queued"))
+                server.route_request(build_request("run.list", {"project_dir": str(latest_dir)}, message_id="req_latest"))
+                server.route_request(build_request("ui.presence", {"reason": "keyboard"}, message_id="req_presence"))
+                responses = [json.loads(line) for line in writer.getvalue().splitlines() if '"response"' in line]
+                self.assertEqual([item["id"] for item in responses], ["req_queued", "req_presence"])
+                self.assertTrue(responses[0]["payload"]["cancelled"])
+                self.assertEqual(server._context.project_dir, "")  # noqa: SLF001
+                release.set()
+                deadline = time.time() + 5
+                while "req_latest" not in writer.getvalue() and time.time() < deadline:
+                    time.sleep(0.01)
+            server.shutdown(cleanup_tmux=False)
+
+            responses = {item["id"]: item for item in (json.loads(line) for line in writer.getvalue().splitlines() if '"response"' in line)}
+            self.assertEqual(responses["req_list"]["payload"], {"runs": [{"run_id": "first"}]})
+            self.assertEqual(responses["req_latest"]["payload"], {"runs": [{"run_id": "latest"}]})
+            self.assertEqual(walked, [str(first_dir.resolve()), str(latest_dir.resolve())])
+            self.assertEqual(server._context.project_dir, str(latest_dir.resolve()))  # noqa: SLF001
+
 
 if __name__ == "__main__":
     unittest.main()
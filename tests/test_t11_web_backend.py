@@ -5,6 +5,7 @@ import io
 import json
 import queue
 import signal
+import subprocess
 import tempfile
 import threading
 import unittest
@@ -17,6 +18,8 @@ from types import SimpleNamespace
 from unittest.mock import patch
 
 from tmux_core.bridge import web_backend as web_backend_module
+from tmux_core.runtime.metrics import SSE_DROPPED_EVENTS_TOTAL, MetricsRegistry
+from tmux_core.runtime.tmux_runtime import TmuxBackend
 from T11_tui_backend import BridgeCore, PendingPromptState
 from T11_web_backend import WebBackendServer, main as web_backend_main
 
@@ -67,6 +70,57 @@ class WebBackendTests(unittest.TestCase):
         self.assertIn('development', snapshots['payload']['stages'])
         self.assertIn('overall-review', snapshots['payload']['stages'])
 
+    def test_web_backend_serves_prometheus_metrics(self):
+        hub = web_backend_module._EventStreamHub()  # noqa: SLF001
+        subscriber = hub.subscribe()
+        for index in range(130):
+            hub.publish({'type': 'log', 'index': index})
+        dropped_before = SSE_DROPPED_EVENTS_TOTAL.value()
+        hub.publish({'type': 'log', 'index': 130})
+        hub.unsubscribe(subscriber)
+        with patch(
+            'tmux_core.runtime.tmux_runtime.subprocess.run',
+            return_value=subprocess.CompletedProcess(['tmux', 'has-session'], 1, '', ''),
+        ):
+            self.assertFalse(TmuxBackend().has_session('missing'))
+        server, thread = self._start_server()
+        try:
+            self._get_json(server, '/api/snapshots')
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=5) as response:
+                content_type = response.headers.get('Content-Type', '')
+                body = response.read().decode('utf-8')
+        finally:
+            self._stop_server(server, thread)
+
+        self.assertTrue(content_type.startswith('text/plain; version=0.0.4'))
+        self.assertEqual(SSE_DROPPED_EVENTS_TOTAL.value(), dropped_before + 1)
+        self.assertIn('# TYPE acx_snapshot_build_seconds histogram', body)
+        self.assertIn('acx_snapshot_build_seconds_count{section="control"}', body)
+        self.assertIn('acx_snapshot_build_seconds_bucket{section="development",le="+Inf"}', body)
+        self.assertIn('acx_tmux_commands_total{subcommand="has-session",outcome="error"}', body)
+        self.assertIn('acx_sse_queue_depth{aggregate="max"} 128', body)
+        self.assertIn('# TYPE acx_worker_deaths_total counter', body)
+
+    def test_metrics_registry_renders_cumulative_histogram_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram('demo_seconds', 'demo', ('vendor',), buckets=(1.0, 5.0))
+        for value in (0.5, 2.0, 9.0):
+            histogram.observe(value, vendor='codex')
+        counter = registry.counter('demo_total', 'demo', ('reason',))
+        counter.inc(reason='pane "dead"')
+
+        self.assertIs(registry.histogram('demo_seconds', 'demo', ('vendor',)), histogram)
+        with self.assertRaises(ValueError):
+            registry.counter('demo_seconds', 'demo')
+        with self.assertRaises(ValueError):
+            histogram.observe(1.0)
+        rendered = registry.render()
+        self.assertIn('demo_seconds_bucket{vendor="codex",le="1"} 1', rendered)
+        self.assertIn('demo_seconds_bucket{vendor="codex",le="5"} 2', rendered)
+        self.assertIn('demo_seconds_bucket{vendor="codex",le="+Inf"} 3', rendered)
+        self.assertIn('demo_seconds_sum{vendor="codex"} 11.5', rendered)
+        self.assertIn('demo_total{reason="pane \\"dead\\""} 1', rendered)
+
     def test_web_backend_prompt_response_roundtrip(self):
         server, thread = self._start_server()
         try:
@@ -319,6 +373,7 @@ class WebBackendTests(unittest.TestCase):
         self.assertEqual(status, 0)
         self.assertIn('[web-backend] listening on http://127.0.0.1:8765', output)
         self.assertIn('[web-backend] healthz: http://127.0.0.1:8765/healthz', output)
+        self.assertIn('[web-backend] metrics: http://127.0.0.1:8765/metrics', output)
         self.assertIn('[web-backend] sse: http://127.0.0.1:8765/api/events', output)
         self.assertIn('[web-backend] press Ctrl+C to stop', output)
         self.assertIn('[web-backend] shutdown complete', output)
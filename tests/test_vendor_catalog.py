@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import os
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
+from tmux_core.runtime import vendor_catalog
 from tmux_core.runtime.vendor_catalog import (
     CatalogSnapshot,
     CONFIDENCE_HIGH,
@@ -18,6 +22,8 @@ from tmux_core.runtime.vendor_catalog import (
     SOURCE_PACKAGE_METADATA,
     VendorInventory,
     VENDOR_ORDER,
+    catalog_snapshot_is_fresh,
+    get_catalog_snapshot,
     get_default_model_for_vendor,
     get_model_choices,
     get_vendor_inventory,
@@ -25,7 +31,10 @@ from tmux_core.runtime.vendor_catalog import (
     parse_codex_models_output,
     parse_opencode_debug_config_output,
     parse_opencode_verbose_output,
+    refresh_catalog_snapshot,
+    reset_catalog_cache_for_tests,
     resolve_launch,
+    wait_for_catalog_refresh,
     _build_gemini_models,
 )
 
@@ -247,3 +256,102 @@ kimi-code/kimi-for-coding
         self.assertTrue(get_default_model_for_vendor("opencode"))
         self.assertGreater(len(get_model_choices("codex")), 0)
         self.assertGreater(len(get_model_choices("opencode")), 0)
+
+
+class VendorCatalogCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmpdir.cleanup)
+        root = Path(self._tmpdir.name)
+        self.binaries: dict[str, str] = {}
+        for vendor_id in VENDOR_ORDER:
+            binary = root / "bin" / vendor_id
+            binary.parent.mkdir(parents=True, exist_ok=True)
+            binary.write_text("#!/bin/sh\n", encoding="utf-8")
+            self.binaries[vendor_id] = str(binary)
+        env_patch = patch.dict(os.environ, {"XDG_CACHE_HOME": str(root / "cache")})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+        path_patch = patch.object(vendor_catalog, "_resolved_binary_path", side_effect=lambda name: self.binaries[name])
+        path_patch.start()
+        self.addCleanup(path_patch.stop)
+        reset_catalog_cache_for_tests()
+        self.addCleanup(reset_catalog_cache_for_tests)
+
+    def _scanners(self, barrier: threading.Barrier | None = None, calls: list[str] | None = None):
+        def build(vendor_id: str):
+            def scan(binary_path: str) -> VendorInventory:
+                if calls is not None:
+                    calls.append(vendor_id)
+                if barrier is not None:
+                    barrier.wait()
+                return vendor_catalog._fallback_vendor(vendor_id, binary_path=binary_path, note="test")  # noqa: SLF001
+
+            return scan
+
+        return {vendor_id: build(vendor_id) for vendor_id in VENDOR_ORDER}
+
+    def test_refresh_scans_vendors_concurrently_and_records_fingerprints(self):
+        barrier = threading.Barrier(len(VENDOR_ORDER), timeout=5)
+        with patch.dict(vendor_catalog._SCANNERS, self._scanners(barrier)):  # noqa: SLF001
+            snapshot = refresh_catalog_snapshot()
+
+        self.assertEqual([item.vendor_id for item in snapshot.vendors], list(VENDOR_ORDER))
+        self.assertEqual(snapshot.binary_fingerprints["codex"]["path"], self.binaries["codex"])
+        self.assertTrue(catalog_snapshot_is_fresh(snapshot))
+        os.utime(self.binaries["codex"], ns=(1, 1))
+        self.assertFalse(catalog_snapshot_is_fresh(snapshot))
+
+    def test_fresh_cache_is_trusted_and_stale_cache_refreshes_in_background(self):
+        with patch.dict(vendor_catalog._SCANNERS, self._scanners()):  # noqa: SLF001
+            refresh_catalog_snapshot()
+
+        calls: list[str] = []
+        with patch.dict(vendor_catalog._SCANNERS, self._scanners(calls=calls)):  # noqa: SLF001
+            cached = get_catalog_snapshot()
+            self.assertTrue(wait_for_catalog_refresh(5))
+            self.assertEqual(calls, [])
+
+            reset_catalog_cache_for_tests()
+            Path(self.binaries["claude"]).write_text("#!/bin/sh\n# upgraded\n", encoding="utf-8")
+            release = threading.Event()
+            original_build = vendor_catalog._build_catalog_snapshot  # noqa: SLF001
+
+            def slow_build(prior_snapshot):
+                release.wait(5)
+                return original_build(prior_snapshot)
+
+            with patch.object(vendor_catalog, "_build_catalog_snapshot", side_effect=slow_build):
+                stale = get_catalog_snapshot()
+                self.assertEqual(stale.generated_at, cached.generated_at)
+                release.set()
+                self.assertTrue(wait_for_catalog_refresh(5))
+
+        self.assertEqual(sorted(calls), sorted(VENDOR_ORDER))
+        refreshed = get_catalog_snapshot()
+        self.assertTrue(catalog_snapshot_is_fresh(refreshed))
+        self.assertNotEqual(refreshed.binary_fingerprints["claude"], cached.binary_fingerprints["claude"])
+
+    def test_late_background_refresh_does_not_replace_forced_snapshot(self):
+        with patch.dict(vendor_catalog._SCANNERS, self._scanners()):  # noqa: SLF001
+            refresh_catalog_snapshot()
+            reset_catalog_cache_for_tests()
+            Path(self.binaries["claude"]).write_text("#!/bin/sh\n# upgraded\n", encoding="utf-8")
+            release = threading.Event()
+            original_build = vendor_catalog._build_catalog_snapshot  # noqa: SLF001
+
+            def slow_background_build(prior_snapshot):
+                if threading.current_thread().name == "vendor-catalog-refresh":
+                    release.wait(5)
+                return original_build(prior_snapshot)
+
+            with patch.object(vendor_catalog, "_build_catalog_snapshot", side_effect=slow_background_build):
+                get_catalog_snapshot()
+                forced = get_catalog_snapshot(force_refresh=True)
+                release.set()
+                self.assertTrue(wait_for_catalog_refresh(5))
+
+        self.assertIs(get_catalog_snapshot(), forced)
+        cached = vendor_catalog._load_cached_snapshot()  # noqa: SLF001
+        assert cached is not None
+        self.assertEqual(cached.generated_at, forced.generated_at)
@@ -26,7 +26,10 @@ from dataclasses import asdict, dataclass, is_dataclass
 from pathlib import Path
 from typing import Any, Callable, Mapping, Sequence, TextIO
 
+from tmux_core.bridge.message_writer import BatchedMessageWriter
+from tmux_core.bridge.request_pool import BRIDGE_ACTION_READ_ONLY, ReadOnlyRequestPool, classify_bridge_action
 from tmux_core.requirements_scope import resolve_requirement_name_from_prompt_response
+from tmux_core.runtime.metrics import SNAPSHOT_BUILD_SECONDS
 from tmux_core.runtime.tmux_runtime import (
     TmuxBatchWorker,
     TmuxRuntimeController,
@@ -36,59 +39,7 @@ from tmux_core.runtime.tmux_runtime import (
     load_worker_from_state_path,
     worker_state_is_prelaunch_active,
 )
-from tmux_core.stage_kernel.detailed_design import (
-    DETAILED_DESIGN_RUNTIME_ROOT_NAME,
-    build_detailed_design_paths,
-    build_parser as build_a05_parser,
-    run_detailed_design_stage,
-)
-from tmux_core.stage_kernel.development import (
-    DEVELOPMENT_RUNTIME_ROOT_NAME,
-    build_development_paths,
-    build_parser as build_a07_parser,
-    build_reviewer_artifact_paths,
-    run_development_stage,
-)
-from tmux_core.stage_kernel.overall_review import (
-    build_overall_review_paths,
-    build_parser as build_a08_parser,
-    overall_review_passed,
-    run_overall_review_stage,
-)
-from tmux_core.stage_kernel.task_split import (
-    TASK_SPLIT_RUNTIME_ROOT_NAME,
-    build_parser as build_a06_parser,
-    build_task_split_paths,
-    run_task_split_stage,
-)
-from tmux_core.stage_kernel.requirements_review import (
-    REQUIREMENTS_REVIEW_RUNTIME_ROOT_NAME,
-    build_parser as build_a04_parser,
-    build_requirements_review_paths,
-    run_requirements_review_stage,
-)
-from tmux_core.stage_kernel.requirement_intake import (
-    NOTION_RUNTIME_ROOT_NAME,
-    build_notion_hitl_paths,
-    build_parser as build_a02_parser,
-    run_requirement_intake_stage,
-)
-from tmux_core.stage_kernel.requirements_clarification import (
-    REQUIREMENTS_RUNTIME_ROOT_NAME,
-    build_parser as build_a03_parser,
-    run_requirements_clarification_stage,
-)
-from tmux_core.stage_kernel.routing_init import (
-    build_parser as build_a01_parser,
-    format_batch_summary,
-    prepare_batch_request,
-    prompt_confirmation,
-    render_noop_summary,
-    render_preflight_summary,
-    render_requirements_stage_placeholder,
-    run_routing_stage,
-)
-from tmux_core.workflow.entry import build_parser as build_a00_parser, main as a00_main
+from tmux_core.workflow.stage_registry import lazy_stage_callable, stage_runtime_root_name
 from B01_terminal_interaction import (
     AgentInitControlCenter,
     collect_b01_request,
@@ -103,7 +54,14 @@ from T08_pre_development import (
     build_pre_development_task_record_path,
     load_pre_development_task_record,
 )
-from T01_tools import get_first_false_task, get_markdown_content, is_task_progress_json, normalize_review_status_payload
+from T01_tools import (
+    get_first_false_task,
+    get_markdown_content,
+    get_task_ledger,
+    is_task_progress_json,
+    normalize_review_status_payload,
+    subscribe_task_ledger_changes,
+)
 from T09_terminal_ops import BridgePromptRequest, BridgeTerminalUI, use_terminal_ui
 from T12_requirements_common import (
     build_requirements_clarification_paths,
@@ -120,6 +78,46 @@ from T10_tui_protocol import (
 from U01_common_config import SYSTEM_PYTHON_PATH
 
 
+a00_main = lazy_stage_callable("A00")
+build_a00_parser = lazy_stage_callable("A00", "build_parser")
+run_routing_stage = lazy_stage_callable("A01")
+build_a01_parser = lazy_stage_callable("A01", "build_parser")
+format_batch_summary = lazy_stage_callable("A01", "format_batch_summary")
+prepare_batch_request = lazy_stage_callable("A01", "prepare_batch_request")
+prompt_confirmation = lazy_stage_callable("A01", "prompt_confirmation")
+render_noop_summary = lazy_stage_callable("A01", "render_noop_summary")
+render_preflight_summary = lazy_stage_callable("A01", "render_preflight_summary")
+render_requirements_stage_placeholder = lazy_stage_callable("A01", "render_requirements_stage_placeholder")
+NOTION_RUNTIME_ROOT_NAME = stage_runtime_root_name("A02")
+run_requirement_intake_stage = lazy_stage_callable("A02")
+build_a02_parser = lazy_stage_callable("A02", "build_parser")
+build_notion_hitl_paths = lazy_stage_callable("A02", "build_notion_hitl_paths")
+REQUIREMENTS_RUNTIME_ROOT_NAME = stage_runtime_root_name("A03")
+run_requirements_clarification_stage = lazy_stage_callable("A03")
+build_a03_parser = lazy_stage_callable("A03", "build_parser")
+REQUIREMENTS_REVIEW_RUNTIME_ROOT_NAME = stage_runtime_root_name("A04")
+run_requirements_review_stage = lazy_stage_callable("A04")
+build_a04_parser = lazy_stage_callable("A04", "build_parser")
+build_requirements_review_paths = lazy_stage_callable("A04", "build_requirements_review_paths")
+DETAILED_DESIGN_RUNTIME_ROOT_NAME = stage_runtime_root_name("A05")
+run_detailed_design_stage = lazy_stage_callable("A05")
+build_a05_parser = lazy_stage_callable("A05", "build_parser")
+build_detailed_design_paths = lazy_stage_callable("A05", "build_detailed_design_paths")
+TASK_SPLIT_RUNTIME_ROOT_NAME = stage_runtime_root_name("A06")
+run_task_split_stage = lazy_stage_callable("A06")
+build_a06_parser = lazy_stage_callable("A06", "build_parser")
+build_task_split_paths = lazy_stage_callable("A06", "build_task_split_paths")
+DEVELOPMENT_RUNTIME_ROOT_NAME = stage_runtime_root_name("A07")
+run_development_stage = lazy_stage_callable("A07")
+build_a07_parser = lazy_stage_callable("A07", "build_parser")
+build_development_paths = lazy_stage_callable("A07", "build_development_paths")
+build_reviewer_artifact_paths = lazy_stage_callable("A07", "build_reviewer_artifact_paths")
+run_overall_review_stage = lazy_stage_callable("A08")
+build_a08_parser = lazy_stage_callable("A08", "build_parser")
+build_overall_review_paths = lazy_stage_callable("A08", "build_overall_review_paths")
+overall_review_passed = lazy_stage_callable("A08", "overall_review_passed")
+
+
 class PromptBroker:
     def __init__(
         self,
@@ -284,14 +282,69 @@ WORKFLOW_RECORD_ROOT_NAME = ".tmux_workflow"
 WEB_FILE_PREVIEW_MAX_BYTES = 256 * 1024
 
 
+DEFAULT_LOG_COALESCE_WINDOW_SEC = 0.05
+DEFAULT_LOG_COALESCE_MAX_LINES = 200
+DEFAULT_LOG_COALESCE_MAX_CHARS = 64 * 1024
+
+
 class BridgeLogSink:
-    def __init__(self, emit_event: Callable[[str, dict[str, Any]], None]) -> None:
+    def __init__(
+        self,
+        emit_event: Callable[[str, dict[str, Any]], None],
+        *,
+        coalesce_window_sec: float = 0.0,
+        max_coalesced_lines: int = DEFAULT_LOG_COALESCE_MAX_LINES,
+        max_coalesced_chars: int = DEFAULT_LOG_COALESCE_MAX_CHARS,
+    ) -> None:
         self._emit_event = emit_event
         self._buffer = ""
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._coalesce_window_sec = max(float(coalesce_window_sec), 0.0)
+        self._max_coalesced_lines = max(int(max_coalesced_lines), 1)
+        self._max_coalesced_chars = max(int(max_coalesced_chars), 1)
+        self._pending_lines: list[str] = []
+        self._pending_chars = 0
+        self._pending_timer: threading.Timer | None = None
         self.encoding = "utf-8"
         self.errors = "strict"
 
+    def _emit_lines_locked(self, lines: Sequence[str]) -> None:
+        if not lines:
+            return
+        if len(lines) == 1:
+            self._emit_event("log.append", {"text": lines[0]})
+            return
+        self._emit_event("log.append", {"text": "".join(lines), "lines": list(lines)})
+
+    def _take_pending_locked(self) -> list[str]:
+        timer = self._pending_timer
+        self._pending_timer = None
+        if timer is not None:
+            timer.cancel()
+        lines = self._pending_lines
+        self._pending_lines = []
+        self._pending_chars = 0
+        return lines
+
+    def drain_pending(self) -> None:
+        with self._lock:
+            self._emit_lines_locked(self._take_pending_locked())
+
+    def _queue_line_locked(self, chunk: str) -> None:
+        if self._coalesce_window_sec <= 0:
+            self._emit_event("log.append", {"text": chunk})
+            return
+        self._pending_lines.append(chunk)
+        self._pending_chars += len(chunk)
+        if len(self._pending_lines) >= self._max_coalesced_lines or self._pending_chars >= self._max_coalesced_chars:
+            self._emit_lines_locked(self._take_pending_locked())
+            return
+        if self._pending_timer is None:
+            timer = threading.Timer(self._coalesce_window_sec, self.drain_pending)
+            timer.daemon = True
+            self._pending_timer = timer
+            timer.start()
+
     def write(self, data: object) -> int:
         text = str(data)
         if not text:
@@ -305,16 +358,16 @@ class BridgeLogSink:
                 chunk = self._buffer[: index + 1]
                 self._buffer = self._buffer[index + 1 :]
                 if chunk:
-                    self._emit_event("log.append", {"text": chunk})
+                    self._queue_line_locked(chunk)
         return len(text)
 
     def flush(self) -> None:
         with self._lock:
-            if not self._buffer:
-                return
-            chunk = self._buffer
-            self._buffer = ""
-        self._emit_event("log.append", {"text": chunk})
+            lines = self._take_pending_locked()
+            if self._buffer:
+                lines.append(self._buffer)
+                self._buffer = ""
+            self._emit_lines_locked(lines)
 
     def isatty(self) -> bool:
         return False
@@ -836,28 +889,15 @@ def _build_file_snapshot(path_value: str | Path, *, label: str = "") -> dict[str
 
 
 def _build_task_progress_snapshot(task_json_path: str | Path) -> dict[str, Any]:
-    path = Path(task_json_path).expanduser().resolve()
-    if not is_task_progress_json(path):
-        return {
-            "milestones": [],
-            "current_milestone_key": "",
-            "all_tasks_completed": False,
-        }
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return {
-            "milestones": [],
-            "current_milestone_key": "",
-            "all_tasks_completed": False,
-        }
+    ledger = get_task_ledger(task_json_path)
+    payload = ledger.snapshot() if ledger.is_valid_progress() else None
     if not isinstance(payload, dict):
         return {
             "milestones": [],
             "current_milestone_key": "",
             "all_tasks_completed": False,
         }
-    current_task_key = get_first_false_task(path)
+    current_task_key = ledger.first_false_task()
     current_milestone_key = ""
     milestones: list[dict[str, Any]] = []
     all_tasks_completed = True
@@ -1224,7 +1264,7 @@ ProtocolLogSink = BridgeLogSink
 
 
 class BridgeCore:
-    def __init__(self) -> None:
+    def __init__(self, *, log_coalesce_window_sec: float = 0.0) -> None:
         self._adapter_name = ""
         self._event_subscribers: list[Callable[[Mapping[str, Any]], None]] = []
         self._event_lock = threading.Lock()
@@ -1237,7 +1277,9 @@ class BridgeCore:
             on_prompt_open=self._handle_prompt_open,
             on_prompt_resolved=self._handle_prompt_resolved,
         )
-        self._protocol_log_sink = BridgeLogSink(self.emit_event)
+        self._protocol_log_sink = BridgeLogSink(self.emit_event, coalesce_window_sec=log_coalesce_window_sec)
+        self._read_request_pool = ReadOnlyRequestPool()
+        self._serial_dispatch_lock = threading.RLock()
         self._bridge_ui = BridgeTerminalUI(
             emit_event=self.emit_event,
             request_prompt=self._prompt_broker.request,
@@ -1272,6 +1314,7 @@ class BridgeCore:
         self._routing_manifest_worker_suppressed_projects: set[str] = set()
         self._active_control_id = ""
         self._tmux_runtime = TmuxRuntimeController()
+        self._task_ledger_unsubscribe = subscribe_task_ledger_changes(self._handle_task_ledger_change)
         self._attention_manager = HumanAttentionManager(
             adapter_name_provider=lambda: self._adapter_name,
             emit_log=lambda text: self.emit_event("log.append", {"text": text}),
@@ -1559,6 +1602,11 @@ class BridgeCore:
             stage_routes=self._stage_routes_for_action(self._display_action or self._context.current_action),
         )
 
+    def _handle_task_ledger_change(self, _ledger: Any, _snapshot: Mapping[str, Any] | None) -> None:
+        if self._shutdown_started:
+            return
+        self._schedule_snapshot_update(sections={"app"}, stage_routes=("development", "overall-review"))
+
     def _active_stage_runner_alive(self, action: str) -> bool:
         normalized = str(action or "").strip()
         if not normalized:
@@ -1806,6 +1854,8 @@ class BridgeCore:
         return STAGE_LABEL_BY_ACTION.get(normalized_action, "等待中")
 
     def emit_event(self, event_type: str, payload: Mapping[str, Any] | None = None) -> None:
+        if event_type != "log.append":
+            self._protocol_log_sink.drain_pending()
         message = build_event(event_type, payload)
         with self._event_lock:
             listeners = tuple(self._event_subscribers)
@@ -1822,6 +1872,7 @@ class BridgeCore:
     ) -> None:
         if self._response_emitter is None:
             return
+        self._protocol_log_sink.drain_pending()
         self._response_emitter(build_response(request_id, ok=ok, payload=payload, error=error))
 
     def protocol_log_sink(self) -> BridgeLogSink:
@@ -1959,8 +2010,8 @@ class BridgeCore:
                 return snapshot
         return snapshot
 
-    def _list_runs(self) -> list[dict[str, Any]]:
-        project_dir = self._resolve_routing_project_dir()
+    def _list_runs(self, *, project_dir: str = "") -> list[dict[str, Any]]:
+        project_dir = project_dir or self._resolve_routing_project_dir()
         if not project_dir:
             return []
         project_path = Path(project_dir).expanduser().resolve()
@@ -2575,7 +2626,8 @@ class BridgeCore:
         if not builder_name:
             raise KeyError(f"unknown stage snapshot route: {normalized}")
         builder = getattr(self, builder_name)
-        return builder()
+        with SNAPSHOT_BUILD_SECONDS.time(section=normalized):
+            return builder()
 
     def _build_stage_snapshots(self, routes: Sequence[str] | None = None) -> dict[str, dict[str, Any]]:
         selected = tuple(routes or [route for route, _builder in STAGE_SNAPSHOT_BUILDERS])
@@ -3194,6 +3246,7 @@ class BridgeCore:
         include_artifacts: bool = False,
         stage_routes: Sequence[str] | None = None,
         include_all_stages: bool = False,
+        runs: Sequence[Mapping[str, Any]] | None = None,
     ) -> None:
         selected_routes = tuple(route for route, _builder in STAGE_SNAPSHOT_BUILDERS) if include_all_stages else tuple(stage_routes or ())
         stage_snapshots: dict[str, dict[str, Any]] = {}
@@ -3201,7 +3254,6 @@ class BridgeCore:
         hitl_snapshot: dict[str, Any] | None = None
         attention_snapshot: dict[str, Any] | None = None
         artifacts_snapshot: dict[str, Any] | None = None
-        runs: list[Mapping[str, Any]] | None = None
 
         if selected_routes:
             def _build_stages() -> Mapping[str, Any]:
@@ -3243,7 +3295,7 @@ class BridgeCore:
         if include_app:
             try:
                 attention_snapshot = self._attention_manager.snapshot()
-                runs = self._list_runs()
+                runs = list(runs) if runs is not None else self._list_runs()
             except Exception as error:  # noqa: BLE001
                 self._emit_log_error(
                     title="snapshot emit failed",
@@ -3783,6 +3835,8 @@ class BridgeCore:
             if self._shutdown_started:
                 return []
             self._shutdown_started = True
+        self._task_ledger_unsubscribe()
+        self._read_request_pool.shutdown()
         with self._snapshot_dirty_lock:
             timer = self._snapshot_debounce_timer
             self._snapshot_debounce_timer = None
@@ -3910,7 +3964,7 @@ class BridgeCore:
         snapshot.update(
             {
                 "attach_session_name": target.session_name,
-                "attach_command": ["tmux", "attach", "-t", target.session_name],
+                "attach_command": self._tmux_runtime.attach_command(target.session_name),
                 "transcript_path": target.transcript_path,
                 "work_dir": target.work_dir,
             }
@@ -3941,12 +3995,17 @@ class BridgeCore:
         self._set_control_session(session)
         return self._snapshot_control_session(session)
 
-    def _handle_run_list(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+    def _collect_run_list(self, payload: Mapping[str, Any]) -> tuple[str, list[dict[str, Any]]]:
         project_dir = self._resolve_routing_project_dir(payload)
         if not project_dir:
-            return {"runs": []}
-        self._set_context(project_dir=project_dir)
-        return {"runs": self._list_runs()}
+            return "", []
+        return project_dir, self._list_runs(project_dir=project_dir)
+
+    def _handle_run_list(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+        project_dir, runs = self._collect_run_list(payload)
+        if project_dir:
+            self._set_context(project_dir=project_dir)
+        return {"runs": runs}
 
     @staticmethod
     def _add_preview_path(allowed: set[str], value: object) -> None:
@@ -4034,18 +4093,23 @@ class BridgeCore:
 
     def build_snapshots(self) -> dict[str, Any]:
         stages = self._build_stage_snapshots()
-        control = self._build_control_snapshot_for_session(self._current_control_session())
-        hitl = self._build_hitl_snapshot()
+        with SNAPSHOT_BUILD_SECONDS.time(section="control"):
+            control = self._build_control_snapshot_for_session(self._current_control_session())
+        with SNAPSHOT_BUILD_SECONDS.time(section="hitl"):
+            hitl = self._build_hitl_snapshot()
         attention = self._attention_manager.snapshot()
-        artifacts = self._build_artifacts_snapshot(stages=stages, control=control)
-        prompt = self.build_prompt_snapshot()
-        app = self._build_app_snapshot(
-            runs=self._list_runs(),
-            control=control,
-            hitl=hitl,
-            attention=attention,
-            artifacts=artifacts,
-        )
+        with SNAPSHOT_BUILD_SECONDS.time(section="artifacts"):
+            artifacts = self._build_artifacts_snapshot(stages=stages, control=control)
+        with SNAPSHOT_BUILD_SECONDS.time(section="prompt"):
+            prompt = self.build_prompt_snapshot()
+        with SNAPSHOT_BUILD_SECONDS.time(section="app"):
+            app = self._build_app_snapshot(
+                runs=self._list_runs(),
+                control=control,
+                hitl=hitl,
+                attention=attention,
+                artifacts=artifacts,
+            )
         return {
             "app": app,
             "stages": stages,
@@ -4252,7 +4316,7 @@ class BridgeCore:
             result = self._handle_run_list(request_payload)
             if respond and normalized_request_id:
                 self.emit_response(normalized_request_id, ok=True, payload=result)
-            self._emit_snapshot_update(include_app=True)
+            self._emit_snapshot_update(include_app=True, runs=result["runs"])
             return result
         if normalized_action == "run.resume":
             result = self._handle_resume_control(request_payload)
@@ -4293,7 +4357,45 @@ class BridgeCore:
             raise ValueError("request.id 不能为空")
         if not isinstance(payload, dict):
             raise ValueError("request.payload 必须是对象")
-        self.dispatch_action(action, payload, request_id=request_id, respond=True)
+        with self._serial_dispatch_lock:
+            self.dispatch_action(action, payload, request_id=request_id, respond=True)
+
+    def _dispatch_run_list_request(self, request_id: str, action: str, payload: dict[str, Any]) -> None:
+        def run(cancel_event: threading.Event) -> None:
+            if cancel_event.is_set():
+                return
+            try:
+                project_dir, runs = self._collect_run_list(payload)
+            except Exception as error:  # noqa: BLE001
+                if not cancel_event.is_set():
+                    self.emit_response(request_id, ok=False, error=str(error), payload={"traceback": traceback.format_exc()})
+                return
+            # 目录遍历在线程池里完成；切换上下文和推送快照回到串行路径，被取消的请求不改上下文。
+            with self._serial_dispatch_lock:
+                if cancel_event.is_set():
+                    self.emit_response(request_id, ok=False, error="请求已取消", payload={"cancelled": True})
+                    return
+                if project_dir:
+                    self._set_context(project_dir=project_dir)
+                self.emit_response(request_id, ok=True, payload={"runs": runs})
+                self._emit_snapshot_update(include_app=True, runs=runs)
+
+        self._read_request_pool.submit(
+            request_id,
+            action,
+            run,
+            on_cancelled=lambda: self.emit_response(request_id, ok=False, error="请求已取消", payload={"cancelled": True}),
+            stale_key=f"{action}:{json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)}",
+        )
+
+    def route_request(self, request: Mapping[str, Any]) -> None:
+        request_id = str(request.get("id", "")).strip()
+        action = str(request.get("action", "")).strip()
+        payload = request.get("payload", {})
+        if request_id and isinstance(payload, dict) and classify_bridge_action(action) == BRIDGE_ACTION_READ_ONLY:
+            self._dispatch_run_list_request(request_id, action, payload)
+            return
+        self.handle_request(request)
 
     def serve_forever(self) -> int:
         for raw_line in self.reader:
@@ -4304,7 +4406,7 @@ class BridgeCore:
                 request = decode_message(text)
                 if request.get("kind") != "request":
                     raise ValueError("stdio backend 仅接收 request 消息")
-                self.handle_request(request)
+                self.route_request(request)
             except Exception as error:  # noqa: BLE001
                 self.write_message(
                     build_event(
@@ -4319,21 +4421,48 @@ class BridgeCore:
 
 
 class TuiBackendServer(BridgeCore):
-    def __init__(self, *, reader: TextIO | None = None, writer: TextIO | None = None) -> None:
-        super().__init__()
+    def __init__(
+        self,
+        *,
+        reader: TextIO | None = None,
+        writer: TextIO | None = None,
+        batched_output: bool = False,
+        log_coalesce_window_sec: float = 0.0,
+    ) -> None:
+        super().__init__(log_coalesce_window_sec=log_coalesce_window_sec)
         self.reader = reader or sys.stdin
         self.writer = writer or sys.stdout
         self._write_lock = threading.Lock()
+        self._message_writer = BatchedMessageWriter(self.writer) if batched_output else None
         self.attach_adapter("tui")
         self.subscribe_events(self.write_message)
         self.set_response_emitter(self.write_message)
 
     def write_message(self, payload: Mapping[str, Any]) -> None:
+        if self._message_writer is not None:
+            self._message_writer.submit(payload)
+            return
         line = encode_message(payload)
         with self._write_lock:
             self.writer.write(line)
             self.writer.flush()
 
+    def flush_messages(self, timeout_sec: float | None = None) -> bool:
+        if self._message_writer is None:
+            return True
+        return self._message_writer.flush(timeout_sec)
+
+    def outbound_stats(self) -> dict[str, Any]:
+        if self._message_writer is None:
+            return {}
+        return self._message_writer.stats()
+
+    def shutdown(self, *, cleanup_tmux: bool) -> list[str]:
+        cleaned_sessions = super().shutdown(cleanup_tmux=cleanup_tmux)
+        if self._message_writer is not None:
+            self._message_writer.close()
+        return cleaned_sessions
+
 
 def build_parser() -> argparse.ArgumentParser:
     return argparse.ArgumentParser(description="OpenTUI Python stdio backend")
@@ -4341,7 +4470,7 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main(argv: Sequence[str] | None = None) -> int:
     build_parser().parse_args(argv)
-    server = TuiBackendServer()
+    server = TuiBackendServer(batched_output=True, log_coalesce_window_sec=DEFAULT_LOG_COALESCE_WINDOW_SEC)
 
     def _handle_signal(signum: int, _frame: Any) -> None:
         server.shutdown(cleanup_tmux=True)
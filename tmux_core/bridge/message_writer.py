@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, TextIO
+
+from T10_tui_protocol import encode_message
+
+
+MESSAGE_PRIORITY_HIGH = 0
+MESSAGE_PRIORITY_NORMAL = 1
+MESSAGE_PRIORITY_LOW = 2
+HIGH_PRIORITY_EVENT_TYPES = frozenset({"prompt.request", "error", "stage.changed"})
+DEFAULT_OUTBOUND_QUEUE_SIZE = 2048
+DEFAULT_OUTBOUND_FLUSH_INTERVAL_SEC = 0.02
+DEFAULT_OUTBOUND_BATCH_BYTES = 256 * 1024
+
+
+def classify_message_priority(payload: Mapping[str, Any]) -> int:
+    if str(payload.get("kind", "")).strip() == "response":
+        return MESSAGE_PRIORITY_HIGH
+    event_type = str(payload.get("type", "")).strip()
+    if event_type in HIGH_PRIORITY_EVENT_TYPES:
+        return MESSAGE_PRIORITY_HIGH
+    if event_type == "log.append" or event_type.startswith("snapshot."):
+        return MESSAGE_PRIORITY_LOW
+    return MESSAGE_PRIORITY_NORMAL
+
+
+def snapshot_coalesce_key(payload: Mapping[str, Any]) -> str:
+    if str(payload.get("kind", "")).strip() != "event":
+        return ""
+    event_type = str(payload.get("type", "")).strip()
+    if not event_type.startswith("snapshot."):
+        return ""
+    if event_type == "snapshot.stage":
+        body = payload.get("payload")
+        route = str(body.get("route", "")).strip() if isinstance(body, Mapping) else ""
+        return f"{event_type}:{route}"
+    return event_type
+
+
+def mergeable_log_payload(payload: Mapping[str, Any]) -> dict[str, Any] | None:
+    # 只有纯文本日志可以合并；带 log_kind/log_title 等结构化字段的日志保持独立。
+    if str(payload.get("kind", "")).strip() != "event" or str(payload.get("type", "")).strip() != "log.append":
+        return None
+    body = payload.get("payload")
+    if not isinstance(body, Mapping) or not set(body) <= {"text", "lines"}:
+        return None
+    text = str(body.get("text", "") or "")
+    lines = body.get("lines")
+    return {"text": text, "lines": [str(item) for item in lines] if isinstance(lines, list) else [text]}
+
+
+@dataclass
+class _OutboundEntry:
+    line: str
+    coalesce_key: str = ""
+    log_event: Mapping[str, Any] | None = None
+    log_payload: dict[str, Any] | None = None
+
+
+class BatchedMessageWriter:
+    def __init__(
+        self,
+        writer: TextIO,
+        *,
+        max_queue_size: int = DEFAULT_OUTBOUND_QUEUE_SIZE,
+        flush_interval_sec: float = DEFAULT_OUTBOUND_FLUSH_INTERVAL_SEC,
+        max_batch_bytes: int = DEFAULT_OUTBOUND_BATCH_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.writer = writer
+        self.max_queue_size = max(int(max_queue_size), 1)
+        self.flush_interval_sec = max(float(flush_interval_sec), 0.0)
+        self.max_batch_bytes = max(int(max_batch_bytes), 1)
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._queues: tuple[deque[_OutboundEntry], ...] = (deque(), deque(), deque())
+        self._pending_snapshots: dict[str, _OutboundEntry] = {}
+        self._queued = 0
+        self._writing = False
+        self._closed = False
+        self._write_error = ""
+        self._counters = {
+            "submitted": 0,
+            "written_messages": 0,
+            "written_bytes": 0,
+            "batches": 0,
+            "merged_snapshots": 0,
+            "merged_log_lines": 0,
+            "dropped_messages": 0,
+            "evicted_messages": 0,
+            "blocked_submits": 0,
+            "max_queue_depth": 0,
+        }
+        self._started_at = clock()
+        self._thread = threading.Thread(target=self._run, name="tui-outbound-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, payload: Mapping[str, Any]) -> None:
+        line = encode_message(payload)
+        priority = classify_message_priority(payload)
+        coalesce_key = snapshot_coalesce_key(payload)
+        log_payload = mergeable_log_payload(payload)
+        with self._condition:
+            self._counters["submitted"] += 1
+            if self._closed or self._write_error:
+                self._counters["dropped_messages"] += 1
+                return
+            pending = self._pending_snapshots.get(coalesce_key) if coalesce_key else None
+            if pending is not None:
+                pending.line = line
+                self._counters["merged_snapshots"] += 1
+                return
+            if priority != MESSAGE_PRIORITY_HIGH and self._queued >= self.max_queue_size:
+                # 队列满时：新快照直接丢弃（下一次同类快照会带上最新状态）；纯文本日志并入最近一条排队日志；
+                # 普通消息挤掉最旧的快照。日志和普通消息都不丢，实在腾不出位置才等待写线程消化。
+                if coalesce_key:
+                    self._counters["dropped_messages"] += 1
+                    return
+                if log_payload is not None and self._merge_into_queued_log_locked(log_payload):
+                    return
+                if not self._evict_oldest_snapshot_locked() and not self._wait_for_room_locked():
+                    self._counters["dropped_messages"] += 1
+                    return
+            entry = _OutboundEntry(
+                line=line,
+                coalesce_key=coalesce_key,
+                log_event=payload if str(payload.get("type", "")).strip() == "log.append" else None,
+                log_payload=log_payload,
+            )
+            self._queues[priority].append(entry)
+            if coalesce_key:
+                self._pending_snapshots[coalesce_key] = entry
+            self._queued += 1
+            self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], self._queued)
+            self._condition.notify_all()
+
+    def _merge_into_queued_log_locked(self, log_payload: Mapping[str, Any]) -> bool:
+        # 只并入最近一条排队日志，保证日志顺序不变；它是结构化日志时不能合并。
+        target = next((item for item in reversed(self._queues[MESSAGE_PRIORITY_LOW]) if item.log_event is not None), None)
+        if target is None or target.log_payload is None:
+            return False
+        target.log_payload["text"] += log_payload["text"]
+        target.log_payload["lines"].extend(log_payload["lines"])
+        target.line = encode_message({**target.log_event, "payload": target.log_payload})
+        self._counters["merged_log_lines"] += len(log_payload["lines"])
+        return True
+
+    def _evict_oldest_snapshot_locked(self) -> bool:
+        entries = self._queues[MESSAGE_PRIORITY_LOW]
+        entry = next((item for item in entries if item.coalesce_key), None)
+        if entry is None:
+            return False
+        entries.remove(entry)
+        if self._pending_snapshots.get(entry.coalesce_key) is entry:
+            self._pending_snapshots.pop(entry.coalesce_key, None)
+        self._queued -= 1
+        self._counters["dropped_messages"] += 1
+        self._counters["evicted_messages"] += 1
+        return True
+
+    def _wait_for_room_locked(self) -> bool:
+        self._counters["blocked_submits"] += 1
+        self._condition.notify_all()
+        self._condition.wait_for(lambda: self._queued < self.max_queue_size or self._closed or bool(self._write_error))
+        return not self._closed and not self._write_error
+
+    def _has_high_priority_locked(self) -> bool:
+        return bool(self._queues[MESSAGE_PRIORITY_HIGH])
+
+    def _take_batch_locked(self) -> list[str]:
+        lines: list[str] = []
+        batch_bytes = 0
+        for entries in self._queues:
+            while entries and (not lines or batch_bytes + len(entries[0].line) <= self.max_batch_bytes):
+                entry = entries.popleft()
+                if entry.coalesce_key and self._pending_snapshots.get(entry.coalesce_key) is entry:
+                    self._pending_snapshots.pop(entry.coalesce_key, None)
+                lines.append(entry.line)
+                batch_bytes += len(entry.line)
+            if entries:
+                break
+        self._queued -= len(lines)
+        return lines
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queued > 0 or self._closed)
+                if self._queued == 0 and self._closed:
+                    return
+                if self.flush_interval_sec > 0 and not self._closed and not self._has_high_priority_locked():
+                    deadline = self._clock() + self.flush_interval_sec
+                    while not self._closed and not self._has_high_priority_locked():
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                lines = self._take_batch_locked()
+                self._writing = True
+                self._condition.notify_all()
+            error_text = ""
+            if lines:
+                chunk = "".join(lines)
+                try:
+                    self.writer.write(chunk)
+                    self.writer.flush()
+                except Exception as error:  # noqa: BLE001
+                    error_text = str(error) or type(error).__name__
+            with self._condition:
+                self._writing = False
+                if error_text:
+                    self._write_error = error_text
+                    self._counters["dropped_messages"] += len(lines) + self._queued
+                    for entries in self._queues:
+                        entries.clear()
+                    self._pending_snapshots.clear()
+                    self._queued = 0
+                elif lines:
+                    self._counters["written_messages"] += len(lines)
+                    self._counters["written_bytes"] += sum(len(line.encode("utf-8")) for line in lines)
+                    self._counters["batches"] += 1
+                self._condition.notify_all()
+
+    def flush(self, timeout_sec: float | None = None) -> bool:
+        with self._condition:
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: (self._queued == 0 and not self._writing) or not self._thread.is_alive(),
+                timeout=timeout_sec,
+            )
+
+    def close(self, timeout_sec: float | None = 2.0) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout_sec)
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            elapsed = max(self._clock() - self._started_at, 1e-9)
+            return {
+                **self._counters,
+                "queue_depth": self._queued,
+                "queue_depth_by_priority": {
+                    "high": len(self._queues[MESSAGE_PRIORITY_HIGH]),
+                    "normal": len(self._queues[MESSAGE_PRIORITY_NORMAL]),
+                    "low": len(self._queues[MESSAGE_PRIORITY_LOW]),
+                },
+                "messages_per_sec": self._counters["written_messages"] / elapsed,
+                "bytes_per_sec": self._counters["written_bytes"] / elapsed,
+                "write_error": self._write_error,
+            }
+
+
+__all__ = [
+    "BatchedMessageWriter",
+    "MESSAGE_PRIORITY_HIGH",
+    "MESSAGE_PRIORITY_LOW",
+    "MESSAGE_PRIORITY_NORMAL",
+    "classify_message_priority",
+    "mergeable_log_payload",
+    "snapshot_coalesce_key",
+]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Mapping
+
+
+BRIDGE_ACTION_READ_ONLY = "read_only"
+BRIDGE_ACTION_MUTATING = "mutating"
+# 线程池里只跑没有副作用的读取；run.list 遍历 run 目录后，切换项目上下文与推送快照
+# 由 backend 回到串行锁内完成。
+READ_ONLY_BRIDGE_ACTION_LIMITS: dict[str, int] = {
+    "run.list": 1,
+}
+READ_ONLY_DISPATCH_WORKERS = 4
+
+
+def classify_bridge_action(action: str) -> str:
+    normalized_action = str(action or "").strip()
+    if normalized_action in READ_ONLY_BRIDGE_ACTION_LIMITS:
+        return BRIDGE_ACTION_READ_ONLY
+    return BRIDGE_ACTION_MUTATING
+
+
+@dataclass
+class _ReadRequest:
+    request_id: str
+    action: str
+    stale_key: str
+    run: Callable[[threading.Event], None]
+    on_cancelled: Callable[[], None]
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    started: bool = False
+
+
+class ReadOnlyRequestPool:
+    def __init__(
+        self,
+        *,
+        max_workers: int = READ_ONLY_DISPATCH_WORKERS,
+        action_limits: Mapping[str, int] | None = None,
+    ) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="bridge-read")
+        self._action_limits = {
+            str(action): max(int(limit), 1)
+            for action, limit in dict(action_limits or READ_ONLY_BRIDGE_ACTION_LIMITS).items()
+        }
+        self._lock = threading.Lock()
+        self._running: dict[str, int] = {}
+        self._waiting: dict[str, deque[_ReadRequest]] = {}
+        self._requests: dict[str, _ReadRequest] = {}
+        self._closed = False
+
+    def submit(
+        self,
+        request_id: str,
+        action: str,
+        run: Callable[[threading.Event], None],
+        *,
+        on_cancelled: Callable[[], None],
+        stale_key: str = "",
+    ) -> None:
+        request = _ReadRequest(
+            request_id=str(request_id).strip(),
+            action=str(action).strip(),
+            stale_key=str(stale_key or "").strip(),
+            run=run,
+            on_cancelled=on_cancelled,
+        )
+        superseded: list[_ReadRequest] = []
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("只读请求线程池已关闭")
+            waiting = self._waiting.setdefault(request.action, deque())
+            if request.stale_key:
+                superseded = [item for item in waiting if item.stale_key == request.stale_key]
+                for item in superseded:
+                    waiting.remove(item)
+                    self._requests.pop(item.request_id, None)
+            self._requests[request.request_id] = request
+            if self._running.get(request.action, 0) < self._action_limits.get(request.action, 1):
+                self._start_locked(request)
+            else:
+                waiting.append(request)
+        for item in superseded:
+            item.cancel_event.set()
+            item.on_cancelled()
+
+    def _start_locked(self, request: _ReadRequest) -> None:
+        request.started = True
+        self._running[request.action] = self._running.get(request.action, 0) + 1
+        self._executor.submit(self._run_request, request)
+
+    def _run_request(self, request: _ReadRequest) -> None:
+        try:
+            request.run(request.cancel_event)
+        finally:
+            with self._lock:
+                self._requests.pop(request.request_id, None)
+                self._running[request.action] = max(self._running.get(request.action, 1) - 1, 0)
+                waiting = self._waiting.get(request.action)
+                if waiting and not self._closed:
+                    self._start_locked(waiting.popleft())
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        with self._lock:
+            self._closed = True
+            pending = [item for waiting in self._waiting.values() for item in waiting]
+            for waiting in self._waiting.values():
+                waiting.clear()
+            for request in self._requests.values():
+                request.cancel_event.set()
+        for request in pending:
+            request.on_cancelled()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+__all__ = [
+    "BRIDGE_ACTION_MUTATING",
+    "BRIDGE_ACTION_READ_ONLY",
+    "READ_ONLY_BRIDGE_ACTION_LIMITS",
+    "ReadOnlyRequestPool",
+    "classify_bridge_action",
+]
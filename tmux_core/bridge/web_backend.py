@@ -13,7 +13,14 @@ from pathlib import Path
 from typing import Any, Mapping, Sequence
 from urllib.parse import parse_qs, urlparse
 
-from tmux_core.bridge.backend import BridgeCore
+from tmux_core.bridge.backend import DEFAULT_LOG_COALESCE_WINDOW_SEC, BridgeCore
+from tmux_core.runtime.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    SSE_DROPPED_EVENTS_TOTAL,
+    SSE_QUEUE_DEPTH,
+    SSE_SUBSCRIBERS,
+    render_metrics,
+)
 from tmux_core.runtime.vendor_catalog import VENDOR_ORDER, get_catalog_snapshot, get_default_model_for_vendor
 from T12_requirements_common import build_output_path, list_existing_requirements, resolve_existing_directory
 
@@ -27,11 +34,13 @@ class _EventStreamHub:
         subscriber: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=128)
         with self._lock:
             self._subscribers.add(subscriber)
+            SSE_SUBSCRIBERS.set(len(self._subscribers))
         return subscriber
 
     def unsubscribe(self, subscriber: queue.Queue[dict[str, Any] | None]) -> None:
         with self._lock:
             self._subscribers.discard(subscriber)
+            SSE_SUBSCRIBERS.set(len(self._subscribers))
 
     def publish(self, message: Mapping[str, Any]) -> None:
         with self._lock:
@@ -41,6 +50,7 @@ class _EventStreamHub:
             try:
                 subscriber.put_nowait(item)
             except queue.Full:
+                SSE_DROPPED_EVENTS_TOTAL.inc()
                 try:
                     subscriber.get_nowait()
                 except queue.Empty:
@@ -49,11 +59,15 @@ class _EventStreamHub:
                     subscriber.put_nowait(item)
                 except queue.Full:
                     continue
+        depths = [subscriber.qsize() for subscriber in subscribers]
+        SSE_QUEUE_DEPTH.set(max(depths, default=0), aggregate="max")
+        SSE_QUEUE_DEPTH.set(sum(depths), aggregate="total")
 
     def close(self) -> None:
         with self._lock:
             subscribers = tuple(self._subscribers)
             self._subscribers.clear()
+            SSE_SUBSCRIBERS.set(0)
         for subscriber in subscribers:
             with contextlib.suppress(queue.Full):
                 subscriber.put_nowait(None)
@@ -75,10 +89,10 @@ class _BridgeWebHttpServer(ThreadingHTTPServer):
 
 
 class WebBackendServer(BridgeCore):
-    def __init__(self, *, host: str = '127.0.0.1', port: int = 8765) -> None:
+    def __init__(self, *, host: str = '127.0.0.1', port: int = 8765, log_coalesce_window_sec: float = DEFAULT_LOG_COALESCE_WINDOW_SEC) -> None:
         if str(host).strip() != '127.0.0.1':
             raise ValueError('Web backend 仅允许绑定 127.0.0.1')
-        super().__init__()
+        super().__init__(log_coalesce_window_sec=log_coalesce_window_sec)
         self.attach_adapter('web')
         self._event_hub = _EventStreamHub()
         self.subscribe_events(self._event_hub.publish)
@@ -189,12 +203,23 @@ class WebBackendServer(BridgeCore):
             def _write_error(self, status: int, message: str) -> None:
                 self._write_json(status, {'ok': False, 'error': str(message).strip()})
 
+            def _write_text(self, status: int, text: str, *, content_type: str) -> None:
+                data = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
             def do_GET(self) -> None:  # noqa: N802
                 parsed = urlparse(self.path)
                 try:
                     if parsed.path == '/healthz':
                         self._write_json(HTTPStatus.OK, {'ok': True, 'adapter': 'web', 'host': backend.host, 'port': backend.port})
                         return
+                    if parsed.path == '/metrics':
+                        self._write_text(HTTPStatus.OK, render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+                        return
                     if parsed.path == '/api/bootstrap':
                         self._write_json(HTTPStatus.OK, {'ok': True, 'payload': backend.bootstrap()})
                         return
@@ -323,6 +348,7 @@ def main(argv: Sequence[str] | None = None) -> int:
     try:
         print(f'[web-backend] listening on {base_url}', flush=True)
         print(f'[web-backend] healthz: {base_url}/healthz', flush=True)
+        print(f'[web-backend] metrics: {base_url}/metrics', flush=True)
         print(f'[web-backend] sse: {base_url}/api/events', flush=True)
         print('[web-backend] press Ctrl+C to stop', flush=True)
         return server.serve_forever()
@@ -2,10 +2,29 @@ from __future__ import annotations
 
 import sys
 from importlib import import_module
+from importlib.util import LazyLoader, find_spec, module_from_spec
 from types import ModuleType
 
 
+def _lazy_import(target_name: str) -> ModuleType:
+    module = sys.modules.get(target_name)
+    if module is not None:
+        return module
+    spec = find_spec(target_name)
+    if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+        return import_module(target_name)
+    loader = LazyLoader(spec.loader)
+    spec.loader = loader
+    module = module_from_spec(spec)
+    sys.modules[target_name] = module
+    loader.exec_module(module)
+    parent_name, _, child_name = target_name.rpartition(".")
+    if parent_name:
+        setattr(sys.modules[parent_name], child_name, module)
+    return module
+
+
 def alias_module(current_name: str, target_name: str) -> ModuleType:
-    module = import_module(target_name)
+    module = _lazy_import(target_name)
     sys.modules[current_name] = module
     return module
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import functools
 import inspect
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable
@@ -28,6 +31,8 @@ SPECIAL_REVIEW_PASS = "review_pass"
 SPECIAL_REVIEW_FAIL = "review_fail"
 SPECIAL_STAGE_ARTIFACT = "stage_artifact"
 
+PROMPT_RENDER_CACHE_MAX_ENTRIES = 512
+
 _VALID_ACCESS = {ACCESS_READ, ACCESS_WRITE, ACCESS_READ_WRITE}
 _VALID_CHANGE = {
     CHANGE_NONE,
@@ -202,9 +207,7 @@ def bind_prompt_arguments(fn: Callable[..., Any], *args: Any, **kwargs: Any) ->
     return bound
 
 
-def resolve_prompt_files(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> ResolvedPromptSpec:
-    spec = require_prompt_spec(fn)
-    bound = bind_prompt_arguments(fn, *args, **kwargs)
+def _resolve_bound_prompt_files(spec: PromptSpec, bound: inspect.BoundArguments) -> ResolvedPromptSpec:
     resolved: dict[str, Path] = {}
     missing: list[str] = []
     for alias, file_spec in spec.files.items():
@@ -221,6 +224,175 @@ def resolve_prompt_files(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> R
     return ResolvedPromptSpec(spec=spec, files=resolved)
 
 
+@dataclass(frozen=True)
+class PromptRenderCacheStats:
+    hits: int = 0
+    misses: int = 0
+    appendix_hits: int = 0
+    appendix_misses: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def appendix_hit_rate(self) -> float:
+        total = self.appendix_hits + self.appendix_misses
+        return self.appendix_hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "appendix_hits": self.appendix_hits,
+            "appendix_misses": self.appendix_misses,
+            "appendix_hit_rate": round(self.appendix_hit_rate, 4),
+            "invalidations": self.invalidations,
+            "entries": self.entries,
+        }
+
+
+@dataclass
+class _PromptRenderEntry:
+    source_stamp: tuple[str, int, int]
+    resolved: ResolvedPromptSpec
+    appendix: str | None = None
+
+
+class _PromptRenderCache:
+    def __init__(self, max_entries: int = PROMPT_RENDER_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Any, ...], _PromptRenderEntry] = OrderedDict()
+        self._signatures: dict[Callable[..., Any], inspect.Signature] = {}
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "appendix_hits", "appendix_misses", "invalidations"),
+            0,
+        )
+
+    def signature(self, fn: Callable[..., Any]) -> inspect.Signature:
+        with self._lock:
+            signature = self._signatures.get(fn)
+        if signature is None:
+            signature = inspect.signature(fn)
+            with self._lock:
+                self._signatures[fn] = signature
+        return signature
+
+    def lookup(self, key: tuple[Any, ...], source_stamp: tuple[str, int, int]) -> _PromptRenderEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.source_stamp != source_stamp:
+                del self._entries[key]
+                self._signatures.pop(key[0], None)
+                self._counters["invalidations"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry
+
+    def store(self, key: tuple[Any, ...], entry: _PromptRenderEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def appendix(self, entry: _PromptRenderEntry) -> str:
+        with self._lock:
+            if entry.appendix is not None:
+                self._counters["appendix_hits"] += 1
+                return entry.appendix
+            self._counters["appendix_misses"] += 1
+        appendix = render_prompt_contract_appendix(entry.resolved)
+        with self._lock:
+            entry.appendix = appendix
+        return appendix
+
+    def stats(self) -> PromptRenderCacheStats:
+        with self._lock:
+            return PromptRenderCacheStats(entries=len(self._entries), **self._counters)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._signatures.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+_PROMPT_RENDER_CACHE = _PromptRenderCache()
+
+
+def _prompt_source_stamp(fn: Callable[..., Any]) -> tuple[str, int, int]:
+    code = getattr(inspect.unwrap(fn), "__code__", None)
+    source_path = str(getattr(code, "co_filename", "") or "")
+    if not source_path:
+        try:
+            source_path = inspect.getsourcefile(fn) or ""
+        except TypeError:
+            source_path = ""
+    try:
+        stat_result = os.stat(source_path)
+    except OSError:
+        return source_path, 0, 0
+    return source_path, stat_result.st_mtime_ns, stat_result.st_size
+
+
+def _normalize_prompt_argument(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _prompt_render_key(fn: Callable[..., Any], spec: PromptSpec, bound: inspect.BoundArguments) -> tuple[Any, ...]:
+    path_args = tuple(
+        dict.fromkeys(file_spec.path_arg for file_spec in spec.files.values() if file_spec.path_arg in bound.arguments)
+    )
+    normalized = tuple((name, _normalize_prompt_argument(bound.arguments[name])) for name in path_args)
+    return fn, os.getcwd(), os.environ.get("HOME", ""), normalized
+
+
+def _resolve_prompt_entry(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> _PromptRenderEntry:
+    spec = require_prompt_spec(fn)
+    bound = _PROMPT_RENDER_CACHE.signature(fn).bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    source_stamp = _prompt_source_stamp(fn)
+    key = _prompt_render_key(fn, spec, bound)
+    entry = _PROMPT_RENDER_CACHE.lookup(key, source_stamp)
+    if entry is None:
+        entry = _PromptRenderEntry(source_stamp=source_stamp, resolved=_resolve_bound_prompt_files(spec, bound))
+        _PROMPT_RENDER_CACHE.store(key, entry)
+    return entry
+
+
+def _copy_resolved_prompt_spec(resolved: ResolvedPromptSpec) -> ResolvedPromptSpec:
+    return ResolvedPromptSpec(spec=resolved.spec, files=dict(resolved.files))
+
+
+def resolve_prompt_files(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> ResolvedPromptSpec:
+    return _copy_resolved_prompt_spec(_resolve_prompt_entry(fn, *args, **kwargs).resolved)
+
+
+def resolve_prompt_contract(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[ResolvedPromptSpec, str]:
+    entry = _resolve_prompt_entry(fn, *args, **kwargs)
+    appendix = _PROMPT_RENDER_CACHE.appendix(entry) if entry.resolved.spec.prompt_appendix else ""
+    return _copy_resolved_prompt_spec(entry.resolved), appendix
+
+
+def prompt_render_cache_stats() -> PromptRenderCacheStats:
+    return _PROMPT_RENDER_CACHE.stats()
+
+
+def clear_prompt_render_cache() -> None:
+    _PROMPT_RENDER_CACHE.clear()
+
+
 def render_prompt_contract_appendix(resolved: ResolvedPromptSpec) -> str:
     spec = resolved.spec
     lines = [
@@ -290,16 +462,21 @@ __all__ = [
     "SPECIAL_STAGE_ARTIFACT",
     "FileSpec",
     "OutcomeSpec",
+    "PROMPT_RENDER_CACHE_MAX_ENTRIES",
+    "PromptRenderCacheStats",
     "PromptSpec",
     "ResolvedPromptSpec",
     "agent_prompt",
     "bind_prompt_arguments",
+    "clear_prompt_render_cache",
     "copy_prompt_metadata",
     "get_prompt_spec",
     "is_prompt_helper",
     "prompt_helper",
+    "prompt_render_cache_stats",
     "render_prompt_contract_appendix",
     "require_prompt_spec",
+    "resolve_prompt_contract",
     "resolve_prompt_files",
     "wraps_prompt",
 ]
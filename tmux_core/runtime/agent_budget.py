@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import select
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+AGENT_BUDGET_SOCKET_ENV = "TMUX_AGENT_BUDGET_SOCKET"
+AGENT_BUDGET_PRIORITY_ENV = "TMUX_AGENT_BUDGET_PRIORITY"
+AGENT_BUDGET_WAIT_ENV = "TMUX_AGENT_BUDGET_WAIT_SEC"
+AGENT_BUDGET_DEFAULT_WAIT_SEC = 1800.0
+AGENT_BUDGET_DEFAULT_SOCKET = Path.home() / ".tmux_coding_team" / "agent_budget.sock"
+AGENT_BUDGET_CONNECT_TIMEOUT_SEC = 2.0
+AGENT_BUDGET_DISCONNECT_POLL_SEC = 0.5
+
+
+def resolve_agent_budget_socket_path(socket_path: str | Path | None = None) -> Path:
+    raw_path = socket_path or os.environ.get(AGENT_BUDGET_SOCKET_ENV, "").strip() or AGENT_BUDGET_DEFAULT_SOCKET
+    return Path(raw_path).expanduser()
+
+
+def resolve_agent_budget_priority(default: int = 0) -> int:
+    try:
+        return int(os.environ.get(AGENT_BUDGET_PRIORITY_ENV, "").strip() or default)
+    except ValueError:
+        return default
+
+
+def resolve_agent_budget_wait_sec(default: float = AGENT_BUDGET_DEFAULT_WAIT_SEC) -> float:
+    try:
+        return max(float(os.environ.get(AGENT_BUDGET_WAIT_ENV, "").strip() or default), 0.0)
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class AgentBudgetLimits:
+    global_limit: int = 0
+    vendor_limits: Mapping[str, int] = field(default_factory=dict)
+
+    def vendor_limit(self, vendor: str) -> int:
+        return int(self.vendor_limits.get(vendor, 0) or 0)
+
+
+@dataclass
+class _LeaseRequest:
+    lease_id: int
+    vendor: str
+    priority: int
+    scope: str
+    worker: str
+    requested_at: float
+    granted_at: float | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "lease_id": self.lease_id,
+            "vendor": self.vendor,
+            "priority": self.priority,
+            "scope": self.scope,
+            "worker": self.worker,
+            "requested_at": self.requested_at,
+            "granted_at": self.granted_at,
+        }
+
+
+class AgentBudgetLedger:
+    def __init__(self, limits: AgentBudgetLimits, *, clock=time.time) -> None:
+        self.limits = limits
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._lease_ids = itertools.count(1)
+        self._waiting: list[_LeaseRequest] = []
+        self._active: dict[int, _LeaseRequest] = {}
+
+    def _vendor_active_locked(self, vendor: str) -> int:
+        return sum(1 for item in self._active.values() if item.vendor == vendor)
+
+    def _grant_ready_locked(self) -> None:
+        blocked_vendors: set[str] = set()
+        for request in sorted(self._waiting, key=lambda item: (-item.priority, item.lease_id)):
+            if self.limits.global_limit and len(self._active) >= self.limits.global_limit:
+                break
+            if request.vendor in blocked_vendors:
+                continue
+            vendor_limit = self.limits.vendor_limit(request.vendor)
+            if vendor_limit and self._vendor_active_locked(request.vendor) >= vendor_limit:
+                blocked_vendors.add(request.vendor)
+                continue
+            request.granted_at = self._clock()
+            self._waiting.remove(request)
+            self._active[request.lease_id] = request
+        self._condition.notify_all()
+
+    def request(self, vendor: str, *, priority: int = 0, scope: str = "", worker: str = "") -> int:
+        with self._condition:
+            request = _LeaseRequest(
+                lease_id=next(self._lease_ids),
+                vendor=str(vendor or "").strip().lower(),
+                priority=int(priority),
+                scope=str(scope or ""),
+                worker=str(worker or ""),
+                requested_at=self._clock(),
+            )
+            self._waiting.append(request)
+            self._grant_ready_locked()
+            return request.lease_id
+
+    def is_granted(self, lease_id: int) -> bool:
+        with self._condition:
+            return lease_id in self._active
+
+    def wait(self, lease_id: int, timeout_sec: float | None = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: lease_id in self._active, timeout=timeout_sec)
+
+    def release(self, lease_id: int) -> None:
+        with self._condition:
+            self._active.pop(lease_id, None)
+            self._waiting = [item for item in self._waiting if item.lease_id != lease_id]
+            self._grant_ready_locked()
+
+    def snapshot(self) -> dict[str, object]:
+        with self._condition:
+            active = [item.to_dict() for item in sorted(self._active.values(), key=lambda item: item.lease_id)]
+            waiting = [item.to_dict() for item in sorted(self._waiting, key=lambda item: (-item.priority, item.lease_id))]
+        return {
+            "global_limit": self.limits.global_limit,
+            "vendor_limits": dict(self.limits.vendor_limits),
+            "active": active,
+            "waiting": waiting,
+        }
+
+
+def _client_disconnected(connection: socket.socket) -> bool:
+    readable, _, _ = select.select([connection], [], [], 0)
+    if not readable:
+        return False
+    try:
+        return connection.recv(1, socket.MSG_PEEK) == b""
+    except OSError:
+        return True
+
+
+class _AgentBudgetRequestHandler(socketserver.StreamRequestHandler):
+    server: AgentBudgetServer
+
+    def _reply(self, payload: Mapping[str, object]) -> None:
+        self.wfile.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            message = json.loads(line.decode("utf-8") or "{}")
+        except ValueError:
+            self._reply({"ok": False, "error": "invalid json"})
+            return
+        op = str(message.get("op", "") or "")
+        ledger = self.server.ledger
+        if op == "status":
+            self._reply({"ok": True, **ledger.snapshot()})
+            return
+        if op != "acquire":
+            self._reply({"ok": False, "error": f"unknown op: {op}"})
+            return
+        lease_id = ledger.request(
+            str(message.get("vendor", "") or ""),
+            priority=int(message.get("priority", 0) or 0),
+            scope=str(message.get("scope", "") or ""),
+            worker=str(message.get("worker", "") or ""),
+        )
+        try:
+            while not ledger.wait(lease_id, AGENT_BUDGET_DISCONNECT_POLL_SEC):
+                if _client_disconnected(self.connection):
+                    return
+            self._reply({"ok": True, "lease_id": lease_id})
+            self.rfile.readline()
+        except OSError:
+            pass
+        finally:
+            ledger.release(lease_id)
+
+
+class AgentBudgetServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str | Path, limits: AgentBudgetLimits) -> None:
+        self.socket_path = Path(socket_path).expanduser()
+        self.ledger = AgentBudgetLedger(limits)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists() and not agent_budget_daemon_running(self.socket_path):
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _AgentBudgetRequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class AgentSlotLease:
+    def __init__(self, connection: socket.socket, lease_id: int) -> None:
+        self._connection: socket.socket | None = connection
+        self.lease_id = lease_id
+
+    @property
+    def active(self) -> bool:
+        return self._connection is not None
+
+    def release(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            connection.sendall(b'{"op": "release"}\n')
+        except OSError:
+            pass
+        finally:
+            connection.close()
+
+    def __enter__(self) -> AgentSlotLease:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+
+def _connect(socket_path: Path) -> socket.socket | None:
+    if not socket_path.exists():
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(AGENT_BUDGET_CONNECT_TIMEOUT_SEC)
+    try:
+        connection.connect(str(socket_path))
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def _read_reply(connection: socket.socket) -> dict[str, object]:
+    chunks: list[bytes] = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    payload = json.loads(b"".join(chunks).decode("utf-8") or "{}")
+    return payload if isinstance(payload, dict) else {}
+
+
+def agent_budget_daemon_running(socket_path: str | Path | None = None) -> bool:
+    connection = _connect(resolve_agent_budget_socket_path(socket_path))
+    if connection is None:
+        return False
+    connection.close()
+    return True
+
+
+def acquire_agent_slot(
+        vendor: str,
+        *,
+        priority: int | None = None,
+        scope: str = "",
+        worker: str = "",
+        socket_path: str | Path | None = None,
+        timeout_sec: float | None = None,
+) -> AgentSlotLease | None:
+    connection = _connect(resolve_agent_budget_socket_path(socket_path))
+    if connection is None:
+        return None
+    request = {
+        "op": "acquire",
+        "vendor": vendor,
+        "priority": resolve_agent_budget_priority() if priority is None else int(priority),
+        "scope": scope,
+        "worker": worker,
+    }
+    try:
+        connection.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        connection.settimeout(timeout_sec)
+        reply = _read_reply(connection)
+    except (OSError, ValueError) as error:
+        connection.close()
+        if isinstance(error, socket.timeout):
+            raise TimeoutError(f"等待智能体并发额度超时: vendor={vendor}") from error
+        return None
+    if not reply.get("ok"):
+        connection.close()
+        return None
+    connection.settimeout(None)
+    return AgentSlotLease(connection, int(reply.get("lease_id", 0) or 0))
+
+
+def query_agent_budget_status(socket_path: str | Path | None = None) -> dict[str, object] | None:
+    connection = _connect(resolve_agent_budget_socket_path(socket_path))
+    if connection is None:
+        return None
+    try:
+        connection.sendall(b'{"op": "status"}\n')
+        return _read_reply(connection)
+    except (OSError, ValueError):
+        return None
+    finally:
+        connection.close()
+
+
+def parse_vendor_limits(items: Sequence[str]) -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for item in items:
+        vendor, separator, value = str(item).partition("=")
+        if not separator or not vendor.strip():
+            raise ValueError(f"厂商额度格式应为 vendor=N: {item}")
+        limits[vendor.strip().lower()] = max(int(value), 0)
+    return limits
+
+
+def render_agent_budget_status(status: Mapping[str, object]) -> str:
+    active = list(status.get("active", []) or [])
+    waiting = list(status.get("waiting", []) or [])
+    global_limit = int(status.get("global_limit", 0) or 0)
+    vendor_limits = dict(status.get("vendor_limits", {}) or {})
+    lines = [
+        f"运行中 {len(active)}/{global_limit or '不限'}，排队 {len(waiting)}",
+        "厂商额度: " + (", ".join(f"{vendor}={limit}" for vendor, limit in sorted(vendor_limits.items())) or "不限"),
+    ]
+    for title, items in (("运行中", active), ("排队中", waiting)):
+        for item in items:
+            lines.append(
+                f"- [{title}] #{item.get('lease_id')} {item.get('vendor')} "
+                f"priority={item.get('priority')} {item.get('scope') or '-'} {item.get('worker') or ''}".rstrip()
+            )
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="跨需求的主机级智能体并发额度调度服务")
+    parser.add_argument("--socket", default=None, help=f"Unix socket 路径；默认读取 {AGENT_BUDGET_SOCKET_ENV} 或 {AGENT_BUDGET_DEFAULT_SOCKET}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="启动调度服务")
+    serve.add_argument("--global-limit", type=int, default=0, help="全局同时运行的智能体上限；0 表示不限")
+    serve.add_argument("--vendor-limit", action="append", default=[], help="单厂商上限，格式 vendor=N，可重复")
+    subparsers.add_parser("status", help="查看当前额度占用与排队情况")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    socket_path = resolve_agent_budget_socket_path(args.socket)
+    if args.command == "status":
+        status = query_agent_budget_status(socket_path)
+        if status is None:
+            sys.stderr.write(f"调度服务未运行: {socket_path}\n")
+            return 1
+        sys.stdout.write(render_agent_budget_status(status) + "\n")
+        return 0
+    if agent_budget_daemon_running(socket_path):
+        sys.stderr.write(f"调度服务已在运行: {socket_path}\n")
+        return 1
+    try:
+        limits = AgentBudgetLimits(global_limit=max(args.global_limit, 0), vendor_limits=parse_vendor_limits(args.vendor_limit))
+    except ValueError as error:
+        sys.stderr.write(f"{error}\n")
+        return 2
+    with AgentBudgetServer(socket_path, limits) as server:
+        sys.stdout.write(f"智能体额度调度服务已启动: {socket_path}\n")
+        sys.stdout.flush()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+__all__ = [
+    "AGENT_BUDGET_PRIORITY_ENV",
+    "AGENT_BUDGET_SOCKET_ENV",
+    "AGENT_BUDGET_WAIT_ENV",
+    "AgentBudgetLedger",
+    "AgentBudgetLimits",
+    "AgentBudgetServer",
+    "AgentSlotLease",
+    "acquire_agent_slot",
+    "agent_budget_daemon_running",
+    "build_parser",
+    "main",
+    "parse_vendor_limits",
+    "query_agent_budget_status",
+    "render_agent_budget_status",
+    "resolve_agent_budget_priority",
+    "resolve_agent_budget_socket_path",
+    "resolve_agent_budget_wait_sec",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
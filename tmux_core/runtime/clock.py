@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+
+VIRTUAL_CLOCK_WAIT_POLL_SEC = 0.005
+
+
+class RuntimeClock:
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def wait(self, event: threading.Event, timeout: float | None = None) -> bool:
+        return event.wait(timeout)
+
+    def now_iso(self) -> str:
+        return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.time()))
+
+
+class VirtualClock(RuntimeClock):
+    def __init__(self, *, start_monotonic: float = 1000.0, start_time: float | None = None) -> None:
+        self._condition = threading.Condition()
+        self._monotonic = float(start_monotonic)
+        self._epoch_offset = (time.time() if start_time is None else float(start_time)) - self._monotonic
+        self.sleep_calls = 0
+        self.slept_sec = 0.0
+
+    def monotonic(self) -> float:
+        with self._condition:
+            return self._monotonic
+
+    def time(self) -> float:
+        with self._condition:
+            return self._monotonic + self._epoch_offset
+
+    def advance(self, seconds: float) -> float:
+        with self._condition:
+            self._monotonic += max(float(seconds), 0.0)
+            self._condition.notify_all()
+            return self._monotonic
+
+    def sleep(self, seconds: float) -> None:
+        with self._condition:
+            self.sleep_calls += 1
+            self.slept_sec += max(float(seconds), 0.0)
+        self.advance(seconds)
+
+    def wait(self, event: threading.Event, timeout: float | None = None) -> bool:
+        with self._condition:
+            deadline = None if timeout is None else self._monotonic + max(float(timeout), 0.0)
+            while not event.is_set() and (deadline is None or self._monotonic < deadline):
+                self._condition.wait(VIRTUAL_CLOCK_WAIT_POLL_SEC)
+        return event.is_set()
+
+
+SYSTEM_CLOCK = RuntimeClock()
+
+
+__all__ = [
+    "RuntimeClock",
+    "SYSTEM_CLOCK",
+    "VirtualClock",
+]
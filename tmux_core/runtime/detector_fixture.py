@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from tmux_core.runtime.clock import SYSTEM_CLOCK, RuntimeClock
+
+DETECTOR_RECORD_ENV = "TMUX_DETECTOR_RECORD_DIR"
+DETECTOR_FIXTURE_SUFFIX = ".detector.jsonl"
+DETECTOR_FIXTURE_VERSION = 1
+DEFAULT_FIXTURE_TAIL_BYTES = 24000
+_UNSAFE_FIXTURE_NAME_RE = re.compile(r'[\\/:*?"<>|\s]+')
+# 每条样本只写出相对上一条发生变化的字段，回放时沿用上一条的取值。
+_CARRIED_SAMPLE_FIELDS = {
+    "visible": ("visible_text", ""),
+    "cmd": ("current_command", ""),
+    "path": ("current_path", ""),
+    "title": ("pane_title", ""),
+    "dead": ("pane_dead", False),
+    "exists": ("session_exists", True),
+    "started": ("agent_started", False),
+    "task": ("task_running", False),
+    "title_ready": ("title_ready", False),
+    "title_busy": ("title_busy", False),
+    "state": ("recorded_state", ""),
+}
+
+
+def detector_record_dir() -> Path | None:
+    text = str(os.environ.get(DETECTOR_RECORD_ENV, "") or "").strip()
+    return Path(text).expanduser().resolve() if text else None
+
+
+def build_detector_fixture_path(root: str | Path, session_name: str) -> Path:
+    stem = _UNSAFE_FIXTURE_NAME_RE.sub("_", str(session_name or "").strip()).strip("._") or "worker"
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return Path(root).expanduser().resolve() / f"{stem}_{stamp}{DETECTOR_FIXTURE_SUFFIX}"
+
+
+def _tail_text(buffer: bytearray, tail_bytes: int) -> str:
+    return bytes(buffer[-tail_bytes:]).decode("utf-8", errors="replace") if buffer else ""
+
+
+def _append_log(buffer: bytearray, chunk: str, tail_bytes: int) -> None:
+    buffer.extend(chunk.encode("utf-8"))
+    if len(buffer) > tail_bytes:
+        del buffer[:len(buffer) - tail_bytes]
+
+
+@dataclass(frozen=True)
+class DetectorSample:
+    offset_sec: float
+    raw_log_delta: str
+    raw_log_tail: str
+    visible_text: str
+    current_command: str
+    current_path: str
+    pane_title: str
+    pane_dead: bool
+    session_exists: bool
+    agent_started: bool
+    task_running: bool
+    title_ready: bool
+    title_busy: bool
+    recorded_state: str
+
+
+@dataclass(frozen=True)
+class DetectorFixture:
+    path: Path
+    vendor: str
+    session_name: str
+    pane_id: str
+    expected_current_commands: tuple[str, ...]
+    tail_bytes: int
+    samples: tuple[DetectorSample, ...]
+
+
+class DetectorFixtureRecorder:
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            vendor: str,
+            session_name: str = "",
+            pane_id: str = "",
+            expected_current_commands: Sequence[str] = (),
+            tail_bytes: int = DEFAULT_FIXTURE_TAIL_BYTES,
+            clock: RuntimeClock | None = None,
+    ) -> None:
+        self.path = Path(path).expanduser().resolve()
+        self.vendor = str(vendor)
+        self.session_name = str(session_name or "")
+        self.pane_id = str(pane_id or "")
+        self.expected_current_commands = tuple(str(item) for item in expected_current_commands)
+        self.tail_bytes = max(int(tail_bytes), 1)
+        self.clock = clock or SYSTEM_CLOCK
+        self._lock = threading.Lock()
+        self._started_at: float | None = None
+        self._log_buffer = bytearray()
+        self._previous: dict[str, object] = {}
+
+    def _header(self) -> dict[str, object]:
+        return {
+            "kind": "meta",
+            "version": DETECTOR_FIXTURE_VERSION,
+            "vendor": self.vendor,
+            "session_name": self.session_name,
+            "pane_id": self.pane_id,
+            "expected_current_commands": list(self.expected_current_commands),
+            "tail_bytes": self.tail_bytes,
+            "recorded_at": self.clock.now_iso(),
+        }
+
+    def record(
+            self,
+            observation: Any,
+            *,
+            raw_log_delta: str,
+            raw_log_tail: str,
+            agent_started: bool,
+            task_running: bool,
+            title_ready: bool,
+            title_busy: bool,
+            state: str,
+    ) -> None:
+        fields = {
+            "visible": str(observation.visible_text or ""),
+            "cmd": str(observation.current_command or ""),
+            "path": str(observation.current_path or ""),
+            "title": str(observation.pane_title or ""),
+            "dead": bool(observation.pane_dead),
+            "exists": bool(observation.session_exists),
+            "started": bool(agent_started),
+            "task": bool(task_running),
+            "title_ready": bool(title_ready),
+            "title_busy": bool(title_busy),
+            "state": str(getattr(state, "value", state) or ""),
+        }
+        with self._lock:
+            lines: list[dict[str, object]] = []
+            now = self.clock.monotonic()
+            if self._started_at is None:
+                self._started_at = now
+                lines.append(self._header())
+            entry: dict[str, object] = {"kind": "sample", "t": round(now - self._started_at, 3)}
+            delta = str(raw_log_delta or "")
+            if delta:
+                entry["log"] = delta
+                _append_log(self._log_buffer, delta, self.tail_bytes)
+            tail = str(raw_log_tail or "")
+            if _tail_text(self._log_buffer, self.tail_bytes) != tail:
+                entry["tail"] = tail
+                self._log_buffer = bytearray()
+                _append_log(self._log_buffer, tail, self.tail_bytes)
+            for key, value in fields.items():
+                if key not in self._previous or self._previous[key] != value:
+                    entry[key] = value
+            self._previous = fields
+            lines.append(entry)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+
+
+def load_detector_fixture(path: str | Path) -> DetectorFixture:
+    fixture_path = Path(path).expanduser().resolve()
+    meta: dict[str, Any] = {}
+    samples: list[DetectorSample] = []
+    log_buffer = bytearray()
+    carried = {name: default for name, default in _CARRIED_SAMPLE_FIELDS.values()}
+    tail_bytes = DEFAULT_FIXTURE_TAIL_BYTES
+    with fixture_path.open(encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"检测器夹具第 {line_number} 行不是合法 JSON: {fixture_path}") from error
+            if not isinstance(entry, dict):
+                raise ValueError(f"检测器夹具第 {line_number} 行格式不正确: {fixture_path}")
+            if entry.get("kind") == "meta":
+                if int(entry.get("version", 0) or 0) != DETECTOR_FIXTURE_VERSION:
+                    raise ValueError(f"不支持的检测器夹具版本: {entry.get('version')}")
+                meta = entry
+                tail_bytes = max(int(entry.get("tail_bytes", DEFAULT_FIXTURE_TAIL_BYTES) or 1), 1)
+                continue
+            if entry.get("kind") != "sample":
+                continue
+            if not meta:
+                raise ValueError(f"检测器夹具缺少 meta 头: {fixture_path}")
+            delta = str(entry.get("log", "") or "")
+            if delta:
+                _append_log(log_buffer, delta, tail_bytes)
+            if "tail" in entry:
+                log_buffer = bytearray()
+                _append_log(log_buffer, str(entry.get("tail", "") or ""), tail_bytes)
+            for key, (name, _) in _CARRIED_SAMPLE_FIELDS.items():
+                if key in entry:
+                    carried[name] = entry[key]
+            samples.append(
+                DetectorSample(
+                    offset_sec=float(entry.get("t", 0.0) or 0.0),
+                    raw_log_delta=delta,
+                    raw_log_tail=_tail_text(log_buffer, tail_bytes),
+                    visible_text=str(carried["visible_text"] or ""),
+                    current_command=str(carried["current_command"] or ""),
+                    current_path=str(carried["current_path"] or ""),
+                    pane_title=str(carried["pane_title"] or ""),
+                    pane_dead=bool(carried["pane_dead"]),
+                    session_exists=bool(carried["session_exists"]),
+                    agent_started=bool(carried["agent_started"]),
+                    task_running=bool(carried["task_running"]),
+                    title_ready=bool(carried["title_ready"]),
+                    title_busy=bool(carried["title_busy"]),
+                    recorded_state=str(carried["recorded_state"] or ""),
+                )
+            )
+    if not meta:
+        raise ValueError(f"检测器夹具缺少 meta 头: {fixture_path}")
+    return DetectorFixture(
+        path=fixture_path,
+        vendor=str(meta.get("vendor", "") or ""),
+        session_name=str(meta.get("session_name", "") or ""),
+        pane_id=str(meta.get("pane_id", "") or ""),
+        expected_current_commands=tuple(str(item) for item in meta.get("expected_current_commands", []) or []),
+        tail_bytes=tail_bytes,
+        samples=tuple(samples),
+    )
+
+
+def iter_detector_fixture_files(paths: Iterable[str | Path]) -> Iterator[Path]:
+    for raw_path in paths:
+        path = Path(raw_path).expanduser().resolve()
+        if path.is_dir():
+            yield from sorted(path.rglob(f"*{DETECTOR_FIXTURE_SUFFIX}"))
+        elif path.is_file():
+            yield path
+
+
+__all__ = [
+    "DEFAULT_FIXTURE_TAIL_BYTES",
+    "DETECTOR_FIXTURE_SUFFIX",
+    "DETECTOR_FIXTURE_VERSION",
+    "DETECTOR_RECORD_ENV",
+    "DetectorFixture",
+    "DetectorFixtureRecorder",
+    "DetectorSample",
+    "build_detector_fixture_path",
+    "detector_record_dir",
+    "iter_detector_fixture_files",
+    "load_detector_fixture",
+]
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from tmux_core.runtime.detector_fixture import (
+    DETECTOR_FIXTURE_SUFFIX,
+    DetectorFixture,
+    iter_detector_fixture_files,
+    load_detector_fixture,
+)
+from tmux_core.runtime.tmux_runtime import (
+    AgentRuntimeClassifierContext,
+    AgentRuntimeState,
+    WorkerObservation,
+    build_output_detector,
+    classify_agent_runtime_state,
+    normalize_vendor,
+    visible_indicates_agent_ready,
+)
+
+DETECTOR_REPLAY_STAGES = ("classify", "visible_ready", "extract_last_message")
+
+
+@dataclass(frozen=True)
+class DetectorTimelineEntry:
+    offset_sec: float
+    recorded_state: str
+    replayed_state: str
+    visible_ready: bool
+    last_message: str
+
+
+@dataclass(frozen=True)
+class StateChangeLatency:
+    state: str
+    recorded_at_sec: float
+    replayed_at_sec: float | None
+
+    @property
+    def latency_sec(self) -> float | None:
+        if self.replayed_at_sec is None:
+            return None
+        return self.replayed_at_sec - self.recorded_at_sec
+
+
+@dataclass(frozen=True)
+class DetectorReplayReport:
+    fixture_path: Path
+    vendor: str
+    timeline: tuple[DetectorTimelineEntry, ...]
+    state_changes: tuple[StateChangeLatency, ...]
+    stage_seconds: dict[str, float]
+
+    @property
+    def sample_count(self) -> int:
+        return len(self.timeline)
+
+    @property
+    def agreement(self) -> float:
+        labelled = [entry for entry in self.timeline if entry.recorded_state]
+        if not labelled:
+            return 1.0
+        return sum(entry.recorded_state == entry.replayed_state for entry in labelled) / len(labelled)
+
+    @property
+    def missed_changes(self) -> int:
+        return sum(item.replayed_at_sec is None for item in self.state_changes)
+
+    def observations_per_sec(self, stage: str) -> float:
+        elapsed = self.stage_seconds.get(stage, 0.0)
+        return self.sample_count / elapsed if elapsed > 0 else 0.0
+
+    def replayed_transitions(self) -> list[tuple[float, str]]:
+        return _transitions((entry.offset_sec, entry.replayed_state) for entry in self.timeline)
+
+    def to_dict(self) -> dict[str, object]:
+        latencies = [item.latency_sec for item in self.state_changes if item.latency_sec is not None]
+        return {
+            "fixture": str(self.fixture_path),
+            "vendor": self.vendor,
+            "samples": self.sample_count,
+            "agreement": round(self.agreement, 4),
+            "observations_per_sec": {stage: round(self.observations_per_sec(stage), 1) for stage in DETECTOR_REPLAY_STAGES},
+            "state_changes": [
+                {
+                    "state": item.state,
+                    "recorded_at_sec": item.recorded_at_sec,
+                    "replayed_at_sec": item.replayed_at_sec,
+                    "latency_sec": None if item.latency_sec is None else round(item.latency_sec, 3),
+                }
+                for item in self.state_changes
+            ],
+            "max_latency_sec": round(max(latencies), 3) if latencies else 0.0,
+            "missed_changes": self.missed_changes,
+            "replayed_timeline": [{"t": offset, "state": state} for offset, state in self.replayed_transitions()],
+        }
+
+
+def _transitions(points: Iterable[tuple[float, str]]) -> list[tuple[float, str]]:
+    transitions: list[tuple[float, str]] = []
+    for offset, state in points:
+        if state and (not transitions or transitions[-1][1] != state):
+            transitions.append((offset, state))
+    return transitions
+
+
+def _state_change_latencies(timeline: Sequence[DetectorTimelineEntry]) -> list[StateChangeLatency]:
+    recorded = _transitions((entry.offset_sec, entry.recorded_state) for entry in timeline)
+    latencies: list[StateChangeLatency] = []
+    for index, (recorded_at, state) in enumerate(recorded):
+        window_end = recorded[index + 1][0] if index + 1 < len(recorded) else float("inf")
+        replayed_at = next(
+            (
+                entry.offset_sec
+                for entry in timeline
+                if recorded_at <= entry.offset_sec < window_end and entry.replayed_state == state
+            ),
+            None,
+        )
+        latencies.append(StateChangeLatency(state=state, recorded_at_sec=recorded_at, replayed_at_sec=replayed_at))
+    return latencies
+
+
+def replay_detector_fixture(fixture: DetectorFixture) -> DetectorReplayReport:
+    vendor = normalize_vendor(fixture.vendor)
+    detector = build_output_detector(vendor)
+    stage_seconds = {stage: 0.0 for stage in DETECTOR_REPLAY_STAGES}
+    cached_state = AgentRuntimeState.STARTING
+    timeline: list[DetectorTimelineEntry] = []
+    for sample in fixture.samples:
+        observation = WorkerObservation.from_raw_log(
+            visible_text=sample.visible_text,
+            raw_log_delta=sample.raw_log_delta,
+            raw_log_tail=sample.raw_log_tail,
+            current_command=sample.current_command,
+            current_path=sample.current_path,
+            pane_dead=sample.pane_dead,
+            session_exists=sample.session_exists,
+            log_mtime=0.0,
+            observed_at="",
+            pane_title=sample.pane_title,
+        )
+        context = AgentRuntimeClassifierContext(
+            vendor=vendor,
+            agent_started=sample.agent_started,
+            cached_state=cached_state,
+            pane_id=fixture.pane_id or "%replay",
+            expected_current_commands=fixture.expected_current_commands,
+            task_running=sample.task_running,
+            title_ready=sample.title_ready,
+            title_busy=sample.title_busy,
+        )
+        started = time.perf_counter()
+        cached_state = classify_agent_runtime_state(observation, context=context, detector=detector)
+        classified = time.perf_counter()
+        visible_ready = visible_indicates_agent_ready(
+            vendor,
+            observation.visible_text,
+            observation.raw_log_tail,
+            current_command=observation.current_command,
+        )
+        checked = time.perf_counter()
+        last_message = ""
+        source = observation.visible_text or observation.raw_log_tail
+        if source:
+            try:
+                last_message = detector.extract_last_message(source)
+            except ValueError:
+                last_message = ""
+        extracted = time.perf_counter()
+        stage_seconds["classify"] += classified - started
+        stage_seconds["visible_ready"] += checked - classified
+        stage_seconds["extract_last_message"] += extracted - checked
+        timeline.append(
+            DetectorTimelineEntry(
+                offset_sec=sample.offset_sec,
+                recorded_state=sample.recorded_state,
+                replayed_state=cached_state.value,
+                visible_ready=visible_ready,
+                last_message=last_message,
+            )
+        )
+    return DetectorReplayReport(
+        fixture_path=fixture.path,
+        vendor=vendor.value,
+        timeline=tuple(timeline),
+        state_changes=tuple(_state_change_latencies(timeline)),
+        stage_seconds=stage_seconds,
+    )
+
+
+def render_detector_replay_report(report: DetectorReplayReport) -> str:
+    lines = [
+        f"{report.fixture_path.name} [{report.vendor}] 样本 {report.sample_count}，"
+        f"与录制状态一致率 {report.agreement:.1%}，漏检状态切换 {report.missed_changes}",
+        "吞吐(obs/s): " + "  ".join(
+            f"{stage}={report.observations_per_sec(stage):.0f}" for stage in DETECTOR_REPLAY_STAGES
+        ),
+        "录制状态切换 -> 回放识别延迟:",
+    ]
+    for item in report.state_changes:
+        latency = "未识别" if item.latency_sec is None else f"+{item.latency_sec:.3f}s"
+        lines.append(f"  {item.recorded_at_sec:>9.3f}s  {item.state:<8}  {latency}")
+    lines.append("回放状态时间线:")
+    lines.extend(f"  {offset:>9.3f}s  {state}" for offset, state in report.replayed_transitions())
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="回放录制的智能体终端输出，评估状态检测器的时间线、吞吐与状态切换延迟")
+    parser.add_argument("paths", nargs="+", help=f"夹具文件或目录；目录下递归查找 *{DETECTOR_FIXTURE_SUFFIX}")
+    parser.add_argument("--json", action="store_true", help="以 JSON 行输出")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    fixture_files = list(iter_detector_fixture_files(args.paths))
+    if not fixture_files:
+        sys.stderr.write("未找到检测器夹具文件\n")
+        return 1
+    for path in fixture_files:
+        try:
+            report = replay_detector_fixture(load_detector_fixture(path))
+        except (OSError, ValueError) as error:
+            sys.stderr.write(f"{path}: {error}\n")
+            return 1
+        if args.json:
+            sys.stdout.write(json.dumps(report.to_dict(), ensure_ascii=False) + "\n")
+        else:
+            sys.stdout.write(render_detector_replay_report(report) + "\n")
+    sys.stdout.flush()
+    return 0
+
+
+__all__ = [
+    "DETECTOR_REPLAY_STAGES",
+    "DetectorReplayReport",
+    "DetectorTimelineEntry",
+    "StateChangeLatency",
+    "build_parser",
+    "main",
+    "render_detector_replay_report",
+    "replay_detector_fixture",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
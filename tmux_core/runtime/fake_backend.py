@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import itertools
+import re
+import shlex
+import subprocess
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tmux_core.runtime.clock import RuntimeClock, VirtualClock
+from tmux_core.runtime.tmux_runtime import DEFAULT_CAPTURE_TAIL_LINES, SHELL_COMMANDS, TmuxBackend
+
+FAKE_SHELL_COMMAND = "zsh"
+FAKE_SHELL_PROMPT = "fake@tmux $"
+FAKE_SCREEN_MAX_LINES = 2000
+_DISPLAY_EXPRESSION_RE = re.compile(r"#\{([a-z_]+)\}")
+
+
+@dataclass
+class FakePane:
+    pane_id: str
+    session_name: str
+    work_dir: str
+    launch_command: str = ""
+    current_command: str = FAKE_SHELL_COMMAND
+    current_path: str = ""
+    title: str = ""
+    dead: bool = False
+    lines: list[str] = field(default_factory=list)
+    raw_log: bytearray = field(default_factory=bytearray)
+    raw_log_path: str = ""
+    log_mtime: float = 0.0
+    input_buffer: str = ""
+    submissions: list[str] = field(default_factory=list)
+    keys: list[str] = field(default_factory=list)
+    options: dict[str, str] = field(default_factory=dict)
+
+
+FakeSubmitHandler = Callable[["FakeTmuxBackend", FakePane, str], None]
+FakeKeyHandler = Callable[["FakeTmuxBackend", FakePane, str], None]
+
+
+class FakeTmuxBackend(TmuxBackend):
+    def __init__(
+            self,
+            *,
+            clock: RuntimeClock | None = None,
+            on_submit: FakeSubmitHandler | None = None,
+            on_key: FakeKeyHandler | None = None,
+            max_screen_lines: int = FAKE_SCREEN_MAX_LINES,
+    ) -> None:
+        self.clock = clock or VirtualClock()
+        self.on_submit = on_submit
+        self.on_key = on_key
+        self.max_screen_lines = max(int(max_screen_lines), 1)
+        self.commands: list[tuple[str, ...]] = []
+        self.global_options: dict[str, str] = {}
+        self._sessions: dict[str, FakePane] = {}
+        self._panes: dict[str, FakePane] = {}
+        self._buffers: dict[str, str] = {}
+        self._pane_ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def pane(self, target: str) -> FakePane:
+        with self._lock:
+            pane = self._find_pane(target)
+        if pane is None:
+            raise KeyError(f"fake tmux target 不存在: {target}")
+        return pane
+
+    def panes(self) -> list[FakePane]:
+        with self._lock:
+            return list(self._panes.values())
+
+    def screen(self, target: str) -> str:
+        pane = self.pane(target)
+        with self._lock:
+            return "\n".join(pane.lines)
+
+    def write(self, target: str, text: str) -> None:
+        with self._lock:
+            pane = self.pane(target)
+            self._write_locked(pane, text)
+
+    def set_title(self, target: str, title: str) -> None:
+        with self._lock:
+            self.pane(target).title = str(title or "")
+
+    def set_current_command(self, target: str, command: str) -> None:
+        with self._lock:
+            self.pane(target).current_command = str(command or "")
+
+    def mark_dead(self, target: str) -> None:
+        with self._lock:
+            self.pane(target).dead = True
+
+    def clear_screen(self, target: str) -> None:
+        with self._lock:
+            self.pane(target).lines.clear()
+
+    def run(
+            self,
+            *args: str,
+            input_text: str | None = None,
+            timeout_sec: float = 10.0,
+            check: bool = True,
+    ) -> subprocess.CompletedProcess[str]:
+        del timeout_sec
+        with self._lock:
+            self.commands.append(tuple(args))
+            returncode, stdout, stderr = self._dispatch(list(args), input_text)
+        result = subprocess.CompletedProcess(["tmux", *args], returncode, stdout, stderr)
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, result.args, output=stdout, stderr=stderr)
+        return result
+
+    def attach_session(self, session_name: str) -> None:
+        self.run("has-session", "-t", session_name)
+
+    def send_text(self, target: str, text: str, *, submit_count: int) -> None:
+        buffer_name = f"acx_fake_{len(self.commands)}"
+        try:
+            self.run("load-buffer", "-b", buffer_name, "-", input_text=text)
+            self.run("paste-buffer", "-p", "-b", buffer_name, "-t", target)
+            self.clock.sleep(0.3)
+            for index in range(submit_count):
+                if index > 0:
+                    self.clock.sleep(0.5)
+                self.run("send-keys", "-t", target, "Enter")
+        finally:
+            self.run("delete-buffer", "-b", buffer_name, check=False)
+
+    def tail_raw_log(
+            self,
+            raw_log_path: str | Path,
+            *,
+            last_offset: int = 0,
+            tail_bytes: int = 24000,
+    ) -> tuple[str, str, int, float]:
+        path_text = str(raw_log_path)
+        with self._lock:
+            pane = next((item for item in self._panes.values() if item.raw_log_path == path_text), None)
+            if pane is None:
+                return super().tail_raw_log(raw_log_path, last_offset=last_offset, tail_bytes=tail_bytes)
+            data = bytes(pane.raw_log)
+            mtime = pane.log_mtime
+        size = len(data)
+        start = min(max(last_offset, 0), size)
+        return (
+            data[start:].decode("utf-8", errors="replace"),
+            data[max(size - tail_bytes, 0):].decode("utf-8", errors="replace"),
+            size,
+            mtime,
+        )
+
+    def _find_pane(self, target: str) -> FakePane | None:
+        name = str(target or "").strip()
+        if name in self._panes:
+            return self._panes[name]
+        return self._sessions.get(name.split(":", 1)[0])
+
+    @staticmethod
+    def _flag_value(args: list[str], flag: str) -> str:
+        if flag in args:
+            index = args.index(flag)
+            if index + 1 < len(args):
+                return args[index + 1]
+        return ""
+
+    @staticmethod
+    def _positional(args: list[str], *, value_flags: tuple[str, ...] = ("-t", "-b", "-s", "-c", "-F")) -> list[str]:
+        values: list[str] = []
+        skip = False
+        for item in args[1:]:
+            if skip:
+                skip = False
+                continue
+            if item in value_flags:
+                skip = True
+                continue
+            if item.startswith("-") and item != "-":
+                continue
+            values.append(item)
+        return values
+
+    def _dispatch(self, args: list[str], input_text: str | None) -> tuple[int, str, str]:
+        command = args[0] if args else ""
+        target = self._flag_value(args, "-t")
+        if command == "new-session":
+            return self._new_session(args)
+        if command == "list-sessions":
+            return 0, "".join(f"{name}\n" for name in self._sessions), ""
+        if command == "load-buffer":
+            self._buffers[self._flag_value(args, "-b")] = str(input_text or "")
+            return 0, "", ""
+        if command == "delete-buffer":
+            self._buffers.pop(self._flag_value(args, "-b"), None)
+            return 0, "", ""
+        if command == "set-option" and "-g" in args:
+            name, *value = self._positional(args)
+            self.global_options[name] = value[0] if value else ""
+            return 0, "", ""
+        pane = self._find_pane(target)
+        if pane is None:
+            return 1, "", f"can't find session: {target}"
+        if command in {"has-session", "list-panes", "detach-client"}:
+            return 0, "", ""
+        if command == "kill-session":
+            self._sessions.pop(pane.session_name, None)
+            self._panes.pop(pane.pane_id, None)
+            return 0, "", ""
+        if command in {"set-option", "set-window-option"}:
+            name, *value = self._positional(args)
+            pane.options[name] = value[0] if value else ""
+            return 0, "", ""
+        if command == "show-options":
+            name = self._positional(args)[0]
+            return (0, f"{pane.options[name]}\n", "") if name in pane.options else (1, "", f"unknown option: {name}")
+        if command == "display-message":
+            expression = self._positional(args)[-1]
+            return 0, _DISPLAY_EXPRESSION_RE.sub(lambda match: self._display_value(pane, match.group(1)), expression) + "\n", ""
+        if command == "capture-pane":
+            tail_lines = abs(int(self._flag_value(args, "-S") or -DEFAULT_CAPTURE_TAIL_LINES))
+            return 0, "\n".join(pane.lines[-tail_lines:]) + "\n", ""
+        if command == "pipe-pane":
+            pipe_command = self._positional(args)[-1]
+            pane.raw_log_path = shlex.split(pipe_command)[-1]
+            pane.raw_log.clear()
+            return 0, "", ""
+        if command == "paste-buffer":
+            text = self._buffers.get(self._flag_value(args, "-b"), "")
+            pane.input_buffer += text
+            self._write_locked(pane, text)
+            return 0, "", ""
+        if command == "send-keys":
+            for key in self._positional(args):
+                self._press_key_locked(pane, key)
+            return 0, "", ""
+        return 0, "", ""
+
+    def _new_session(self, args: list[str]) -> tuple[int, str, str]:
+        session_name = self._flag_value(args, "-s")
+        if session_name in self._sessions:
+            return 1, "", f"duplicate session: {session_name}"
+        work_dir = self._flag_value(args, "-c")
+        positional = self._positional(args)
+        pane = FakePane(
+            pane_id=f"%{next(self._pane_ids)}",
+            session_name=session_name,
+            work_dir=work_dir,
+            launch_command=positional[-1] if positional else "",
+            current_path=work_dir,
+        )
+        self._sessions[session_name] = pane
+        self._panes[pane.pane_id] = pane
+        self._write_locked(pane, FAKE_SHELL_PROMPT)
+        return 0, f"{pane.pane_id}\n", ""
+
+    @staticmethod
+    def _display_value(pane: FakePane, name: str) -> str:
+        values = {
+            "pane_id": pane.pane_id,
+            "session_name": pane.session_name,
+            "pane_current_command": pane.current_command,
+            "pane_current_path": pane.current_path,
+            "pane_title": pane.title,
+            "pane_dead": "1" if pane.dead else "0",
+        }
+        return values.get(name, "")
+
+    def _write_locked(self, pane: FakePane, text: str) -> None:
+        payload = str(text or "")
+        if not payload:
+            return
+        pane.lines.extend(payload.splitlines() or [""])
+        del pane.lines[:-self.max_screen_lines]
+        pane.raw_log.extend((payload if payload.endswith("\n") else payload + "\n").encode("utf-8"))
+        pane.log_mtime = self.clock.time()
+
+    def _press_key_locked(self, pane: FakePane, key: str) -> None:
+        pane.keys.append(key)
+        if key != "Enter" or not pane.input_buffer:
+            if self.on_key is not None:
+                self.on_key(self, pane, key)
+            return
+        submitted = pane.input_buffer
+        pane.input_buffer = ""
+        pane.submissions.append(submitted)
+        if self.on_submit is not None:
+            self.on_submit(self, pane, submitted)
+
+
+class ScriptedAgent:
+    def __init__(
+            self,
+            *,
+            command: str = "codex",
+            ready_title: str = "TmuxCodingTeam",
+            ready_prompt: str = "›",
+            busy_sec: float = 0.0,
+            respond: Callable[[FakePane, str], str] | None = None,
+    ) -> None:
+        self.command = command
+        self.ready_title = ready_title
+        self.ready_prompt = ready_prompt
+        self.busy_sec = busy_sec
+        self.respond = respond
+        self.turns = 0
+
+    def __call__(self, backend: FakeTmuxBackend, pane: FakePane, text: str) -> None:
+        if pane.current_command in SHELL_COMMANDS:
+            pane.current_command = self.command
+            pane.title = self.ready_title
+            backend.write(pane.pane_id, self.ready_prompt)
+            return
+        self.turns += 1
+        if self.busy_sec:
+            backend.clock.sleep(self.busy_sec)
+        reply = self.respond(pane, text) if self.respond is not None else ""
+        backend.write(pane.pane_id, f"{reply}\n\n{self.ready_prompt}" if reply else self.ready_prompt)
+
+
+__all__ = [
+    "FAKE_SHELL_COMMAND",
+    "FAKE_SHELL_PROMPT",
+    "FakePane",
+    "FakeTmuxBackend",
+    "ScriptedAgent",
+]
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SHORT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TURN_LATENCY_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric(ABC):
+    metric_type = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"指标 {self.name} 的标签不匹配: 需要 {self.labelnames}，实际 {tuple(sorted(labels))}")
+        return tuple(str(labels[name] if labels[name] is not None else "") for name in self.labelnames)
+
+    @abstractmethod
+    def _render_samples(self) -> list[str]: ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return "\n".join(lines)
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError(f"计数器 {self.name} 只能递增")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: object) -> float:
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            help_text: str,
+            labelnames: Sequence[str] = (),
+            *,
+            buckets: Sequence[float] = SHORT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(float(item) for item in buckets))
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._label_values(labels)
+        amount = max(float(value), 0.0)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if amount <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            totals[0] += amount
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        key = self._label_values(labels)
+        with self._lock:
+            series = self._series.get(key)
+            return sum(series[0]) if series is not None else 0
+
+    def _render_samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), totals[0])) for key, (counts, totals) in self._series.items())
+        bucket_names = (*self.labelnames, "le")
+        lines: list[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, (*key, _format_value(bound)))} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"指标重复注册且定义不一致: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+            self,
+            name: str,
+            help_text: str,
+            labelnames: Sequence[str] = (),
+            *,
+            buckets: Sequence[float] = SHORT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets=buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda item: item.name)
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+    def clear(self) -> None:
+        with self._lock:
+            metrics = tuple(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+TMUX_COMMANDS_TOTAL = REGISTRY.counter(
+    "acx_tmux_commands_total",
+    "tmux 子进程调用次数，按子命令与结果分类",
+    ("subcommand", "outcome"),
+)
+TMUX_COMMAND_SECONDS = REGISTRY.histogram(
+    "acx_tmux_command_seconds",
+    "tmux 子进程调用耗时（秒）",
+    ("subcommand",),
+)
+HEALTH_REFRESH_SECONDS = REGISTRY.histogram(
+    "acx_health_refresh_seconds",
+    "后台健康检查单次刷新耗时（秒）",
+)
+SNAPSHOT_BUILD_SECONDS = REGISTRY.histogram(
+    "acx_snapshot_build_seconds",
+    "Bridge 快照构建耗时（秒），按分区分类",
+    ("section",),
+)
+SSE_SUBSCRIBERS = REGISTRY.gauge(
+    "acx_sse_subscribers",
+    "当前 SSE 订阅者数量",
+)
+SSE_QUEUE_DEPTH = REGISTRY.gauge(
+    "acx_sse_queue_depth",
+    "最近一次发布后 SSE 订阅队列的积压深度",
+    ("aggregate",),
+)
+SSE_DROPPED_EVENTS_TOTAL = REGISTRY.counter(
+    "acx_sse_dropped_events_total",
+    "因订阅队列已满被丢弃的 SSE 事件数",
+)
+TURN_PHASE_SECONDS = REGISTRY.histogram(
+    "acx_turn_phase_seconds",
+    "turn 各分段耗时（秒），phase=turn 为整轮耗时",
+    ("phase", "vendor", "stage"),
+    buckets=TURN_LATENCY_BUCKETS,
+)
+REPAIR_TURNS_TOTAL = REGISTRY.counter(
+    "acx_repair_turns_total",
+    "修复轮次数",
+    ("vendor", "stage", "kind"),
+)
+WORKER_DEATHS_TOTAL = REGISTRY.counter(
+    "acx_worker_deaths_total",
+    "智能体进入 DEAD 状态的次数",
+    ("vendor", "reason"),
+)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "HEALTH_REFRESH_SECONDS",
+    "Histogram",
+    "MetricsRegistry",
+    "PROMETHEUS_CONTENT_TYPE",
+    "REGISTRY",
+    "REPAIR_TURNS_TOTAL",
+    "SNAPSHOT_BUILD_SECONDS",
+    "SSE_DROPPED_EVENTS_TOTAL",
+    "SSE_QUEUE_DEPTH",
+    "SSE_SUBSCRIBERS",
+    "TMUX_COMMANDS_TOTAL",
+    "TMUX_COMMAND_SECONDS",
+    "TURN_PHASE_SECONDS",
+    "WORKER_DEATHS_TOTAL",
+    "render_metrics",
+]
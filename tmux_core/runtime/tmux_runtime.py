@@ -29,6 +29,22 @@ from pathlib import Path
 from typing import Any, Mapping, Sequence
 from contextlib import contextmanager
 from urllib.parse import urlparse
+from tmux_core.runtime.agent_budget import AgentSlotLease, acquire_agent_slot, resolve_agent_budget_wait_sec
+from tmux_core.runtime.clock import SYSTEM_CLOCK, RuntimeClock
+from tmux_core.runtime.detector_fixture import DetectorFixtureRecorder, build_detector_fixture_path, detector_record_dir
+from tmux_core.runtime.metrics import (
+    HEALTH_REFRESH_SECONDS,
+    TMUX_COMMAND_SECONDS,
+    TMUX_COMMANDS_TOTAL,
+    WORKER_DEATHS_TOTAL,
+)
+from tmux_core.runtime.turn_trace import (
+    TurnTracer,
+    build_turn_trace_path,
+    stage_from_workflow_action,
+    traced_method,
+    tracer_for,
+)
 from tmux_core.runtime.vendor_catalog import LaunchResolution, resolve_launch
 from tmux_core.runtime.contracts import (
     TASK_RESULT_COMPLETED,
@@ -55,6 +71,11 @@ DEFAULT_COMMAND_TIMEOUT_SEC = 60 * 20
 DEFAULT_PROXY_HOST = "127.0.0.1"
 TMUX_HISTORY_LIMIT_LINES = 10000
 DEFAULT_CAPTURE_TAIL_LINES = 10000
+OBSERVATION_DELTA_MAX_CHARS = 256_000
+TMUX_SERVER_SOCKET_ENV = "TMUX_SERVER_SOCKET"
+TMUX_SERVER_SHARDS_ENV = "TMUX_SERVER_SHARDS"
+TMUX_SHARD_SOCKET_PREFIX = "acx-shard"
+SESSION_NAME_RESERVE_LIST_TIMEOUT_SEC = 2.0
 SESSION_NAME_CREATE_MAX_RETRIES = 8
 TERMINAL_ACTIVITY_IDLE_WINDOW_SEC = 1.5
 TURN_ARTIFACT_POST_DONE_GRACE_SEC = 10.0
@@ -532,8 +553,65 @@ def list_registered_tmux_workers() -> list["TmuxBatchWorker"]:
 
 
 def list_tmux_session_names(*, backend: Any | None = None) -> tuple[str, ...]:
-    runtime_backend = backend or TmuxBackend()
-    return tuple(sorted(_list_backend_session_names(runtime_backend)))
+    if backend is not None:
+        return tuple(sorted(_list_backend_session_names(backend)))
+    return tuple(sorted(_list_shard_session_names()))
+
+
+def resolve_tmux_shard_count() -> int:
+    try:
+        return max(int(os.environ.get(TMUX_SERVER_SHARDS_ENV, "").strip() or 0), 0)
+    except ValueError:
+        return 0
+
+
+def tmux_shard_socket_names() -> tuple[str, ...]:
+    explicit = os.environ.get(TMUX_SERVER_SOCKET_ENV, "").strip()
+    if explicit:
+        return (explicit,)
+    shard_count = resolve_tmux_shard_count()
+    if shard_count <= 1:
+        return ()
+    return tuple(f"{TMUX_SHARD_SOCKET_PREFIX}-{index}" for index in range(shard_count))
+
+
+def resolve_tmux_socket_name(scope: str | Path) -> str:
+    socket_names = tmux_shard_socket_names()
+    if len(socket_names) <= 1:
+        return socket_names[0] if socket_names else ""
+    digest = hashlib.sha1(str(scope or "").encode("utf-8")).hexdigest()  # noqa: S324
+    return socket_names[int(digest[:8], 16) % len(socket_names)]
+
+
+def build_tmux_attach_command(session_name: str, *, socket_name: str = "") -> list[str]:
+    prefix = ["tmux", "-L", socket_name] if socket_name else ["tmux"]
+    return [*prefix, "attach", "-t", session_name]
+
+
+def render_tmux_attach_command(session_name: str, *, socket_name: str = "") -> str:
+    return shlex.join(build_tmux_attach_command(session_name, socket_name=socket_name))
+
+
+def worker_attach_command(worker: object | None) -> str:
+    session_name = str(getattr(worker, "session_name", "") or "").strip()
+    if not session_name:
+        return ""
+    backend = getattr(getattr(worker, "worker", worker), "backend", None)
+    return render_tmux_attach_command(session_name, socket_name=str(getattr(backend, "socket_name", "") or ""))
+
+
+def iter_tmux_backends() -> tuple["TmuxBackend", ...]:
+    return (TmuxBackend(), *(TmuxBackend(socket_name=name) for name in tmux_shard_socket_names()))
+
+
+def _list_shard_session_names(backend: Any | None = None) -> set[str]:
+    names = _list_backend_session_names(backend)
+    known_sockets = {str(getattr(backend, "socket_name", "") or "")} if backend is not None else set()
+    for shard_backend in iter_tmux_backends():
+        if shard_backend.socket_name in known_sockets:
+            continue
+        names.update(_list_backend_session_names(shard_backend))
+    return names
 
 
 def _pid_exists(pid: int) -> bool:
@@ -610,7 +688,13 @@ def _active_session_name_leases_locked() -> set[str]:
     return active
 
 
-def _write_session_name_lease_locked(*, session_name: str, worker_id: str, work_dir: str | Path) -> None:
+def _write_session_name_lease_locked(
+        *,
+        session_name: str,
+        worker_id: str,
+        work_dir: str | Path,
+        socket_name: str = "",
+) -> None:
     lease_path = _session_name_lease_path(session_name)
     _atomic_write_json(
         lease_path,
@@ -618,6 +702,7 @@ def _write_session_name_lease_locked(*, session_name: str, worker_id: str, work_
             "session_name": session_name,
             "worker_id": str(worker_id or "").strip(),
             "work_dir": str(Path(work_dir).expanduser().resolve()),
+            "tmux_socket": str(socket_name or ""),
             "owner_pid": os.getpid(),
             "created_at": _now_iso(),
         },
@@ -644,7 +729,7 @@ def list_occupied_tmux_session_names(
         additional_session_names: Sequence[str] = (),
 ) -> tuple[str, ...]:
     occupied = {str(name).strip() for name in additional_session_names if str(name).strip()}
-    occupied.update(_list_backend_session_names(backend))
+    occupied.update(_list_shard_session_names(backend))
     with _session_name_lease_lock():
         occupied.update(_active_session_name_leases_locked())
     for worker in list_registered_tmux_workers():
@@ -669,18 +754,187 @@ def cleanup_registered_tmux_workers(*, reason: str = "process_exit") -> list[str
     return sorted(set(cleaned_sessions))
 
 
-@dataclass(frozen=True)
+def _bounded_tail_text(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    start = len(text) - max_chars
+    line_start = text.find("\n", start)
+    return text[line_start + 1:] if 0 <= line_start < len(text) - 1 else text[start:]
+
+
+def _tail_line_start(text: str, max_lines: int) -> int:
+    position = len(text.rstrip("\n"))
+    for _ in range(max_lines):
+        position = text.rfind("\n", 0, position)
+        if position < 0:
+            return 0
+    return position + 1
+
+
+def _clean_ansi_safe_start(text: str, start: int) -> int:
+    # clean_ansi 中只有 OSC 序列可能跨行；切点前若有尚未结束的 OSC，就把切点挪到它所在行的行首，
+    # 保证切开后再清洗与整段清洗的结果一致。
+    while start > 0:
+        last_bel = text.rfind("\x07", 0, start)
+        opener = text.rfind("\x1b]", 0, start)
+        if opener <= last_bel:
+            last_escape = text.rfind("\x1b", 0, start)
+            opener = last_escape if last_escape >= 0 and text.startswith("\x1b]", last_escape) else -1
+        if opener < 0:
+            return start
+        start = text.rfind("\n", 0, opener) + 1
+    return 0
+
+
+def _tail_lines(text: str, max_lines: int, *, clean: bool = False) -> str:
+    # 等价于对整段文本（clean 时先 clean_ansi）取 splitlines()[-max_lines:]，但只处理末尾若干行，行数不够再加倍回看。
+    if max_lines <= 0 or not text:
+        return ""
+    fetch_lines = max_lines
+    while True:
+        start = _tail_line_start(text, fetch_lines)
+        if clean:
+            start = _clean_ansi_safe_start(text, start)
+        segment = text[start:]
+        lines = (clean_ansi(segment) if clean else segment).splitlines()
+        if start == 0 or len(lines) >= max_lines:
+            return "\n".join(lines[-max_lines:])
+        fetch_lines *= 2
+
+
 class WorkerObservation:
-    visible_text: str
-    raw_log_delta: str
-    raw_log_tail: str
-    current_command: str
-    current_path: str
-    pane_dead: bool
-    session_exists: bool
-    log_mtime: float
-    observed_at: str
-    pane_title: str = ""
+    __slots__ = (
+        "visible_text",
+        "current_command",
+        "current_path",
+        "pane_dead",
+        "session_exists",
+        "log_mtime",
+        "observed_at",
+        "pane_title",
+        "_raw_log_delta",
+        "_raw_log_tail",
+        "_delta_source",
+        "_tail_source",
+        "_cleaned_visible_text",
+        "_combined_text",
+    )
+    _field_names = (
+        "visible_text",
+        "raw_log_delta",
+        "raw_log_tail",
+        "current_command",
+        "current_path",
+        "pane_dead",
+        "session_exists",
+        "log_mtime",
+        "observed_at",
+        "pane_title",
+    )
+
+    def __init__(
+            self,
+            visible_text: str,
+            raw_log_delta: str,
+            raw_log_tail: str,
+            current_command: str,
+            current_path: str,
+            pane_dead: bool,
+            session_exists: bool,
+            log_mtime: float,
+            observed_at: str,
+            pane_title: str = "",
+    ) -> None:
+        init = object.__setattr__
+        init(self, "visible_text", visible_text)
+        init(self, "current_command", current_command)
+        init(self, "current_path", current_path)
+        init(self, "pane_dead", pane_dead)
+        init(self, "session_exists", session_exists)
+        init(self, "log_mtime", log_mtime)
+        init(self, "observed_at", observed_at)
+        init(self, "pane_title", pane_title)
+        init(self, "_raw_log_delta", _bounded_tail_text(str(raw_log_delta or ""), OBSERVATION_DELTA_MAX_CHARS))
+        init(self, "_raw_log_tail", raw_log_tail)
+        init(self, "_delta_source", "")
+        init(self, "_tail_source", "")
+        init(self, "_cleaned_visible_text", None)
+        init(self, "_combined_text", None)
+
+    @classmethod
+    def from_raw_log(
+            cls,
+            *,
+            raw_log_delta: str,
+            raw_log_tail: str,
+            **fields: Any,
+    ) -> WorkerObservation:
+        observation = cls(raw_log_delta="", raw_log_tail="", **fields)
+        init = object.__setattr__
+        init(observation, "_raw_log_delta", None)
+        init(observation, "_raw_log_tail", None)
+        init(observation, "_delta_source", _bounded_tail_text(str(raw_log_delta or ""), OBSERVATION_DELTA_MAX_CHARS))
+        init(observation, "_tail_source", str(raw_log_tail or ""))
+        return observation
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"WorkerObservation 为只读对象，不能修改 {name}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"WorkerObservation 为只读对象，不能删除 {name}")
+
+    @property
+    def raw_log_delta(self) -> str:
+        if self._raw_log_delta is None:
+            object.__setattr__(self, "_raw_log_delta", clean_ansi(self._delta_source))
+            object.__setattr__(self, "_delta_source", "")
+        return self._raw_log_delta
+
+    @property
+    def raw_log_tail(self) -> str:
+        if self._raw_log_tail is None:
+            object.__setattr__(self, "_raw_log_tail", clean_ansi(self._tail_source))
+            object.__setattr__(self, "_tail_source", "")
+        return self._raw_log_tail
+
+    @property
+    def cleaned_visible_text(self) -> str:
+        if self._cleaned_visible_text is None:
+            object.__setattr__(self, "_cleaned_visible_text", clean_ansi(self.visible_text or ""))
+        return self._cleaned_visible_text
+
+    @property
+    def combined_text(self) -> str:
+        if self._combined_text is None:
+            combined = "\n".join(part for part in [self.raw_log_tail, self.visible_text] if part)
+            object.__setattr__(self, "_combined_text", clean_ansi(combined))
+        return self._combined_text
+
+    def raw_log_tail_lines(self, max_lines: int) -> str:
+        if self._raw_log_tail is not None:
+            return _tail_lines(self._raw_log_tail, max_lines)
+        return _tail_lines(self._tail_source, max_lines, clean=True)
+
+    def visible_tail_lines(self, max_lines: int) -> str:
+        return _tail_lines(self.visible_text or "", max_lines)
+
+    def _field_values(self) -> tuple[object, ...]:
+        return tuple(getattr(self, name) for name in self._field_names)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._field_values() == other._field_values()
+
+    def __hash__(self) -> int:
+        return hash(self._field_values())
+
+    def __repr__(self) -> str:
+        return (
+            f"WorkerObservation(session_exists={self.session_exists!r}, pane_dead={self.pane_dead!r}, "
+            f"current_command={self.current_command!r}, pane_title={self.pane_title!r}, "
+            f"visible_chars={len(self.visible_text or '')}, observed_at={self.observed_at!r})"
+        )
 
 
 @dataclass(frozen=True)
@@ -699,6 +953,18 @@ class WorkerHealthSnapshot:
 
 
 class TmuxBackend:
+    clock: RuntimeClock = SYSTEM_CLOCK
+    socket_name: str = ""
+
+    def __init__(self, socket_name: str = "") -> None:
+        self.socket_name = str(socket_name or "").strip()
+
+    def command_prefix(self) -> list[str]:
+        return ["tmux", "-L", self.socket_name] if self.socket_name else ["tmux"]
+
+    def attach_command(self, session_name: str) -> str:
+        return render_tmux_attach_command(session_name, socket_name=self.socket_name)
+
     def run(
             self,
             *args: str,
@@ -706,21 +972,33 @@ class TmuxBackend:
             timeout_sec: float = 10.0,
             check: bool = True,
     ) -> subprocess.CompletedProcess[str]:
-        return subprocess.run(
-            ["tmux", *args],
-            check=check,
-            text=True,
-            capture_output=True,
-            input=input_text,
-            timeout=timeout_sec,
-        )
+        subcommand = args[0] if args else ""
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(
+                [*self.command_prefix(), *args],
+                check=check,
+                text=True,
+                capture_output=True,
+                input=input_text,
+                timeout=timeout_sec,
+            )
+            outcome = "ok" if result.returncode == 0 else "error"
+            return result
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+            raise
+        finally:
+            TMUX_COMMAND_SECONDS.observe(time.perf_counter() - started, subcommand=subcommand)
+            TMUX_COMMANDS_TOTAL.inc(subcommand=subcommand, outcome=outcome)
 
     def has_session(self, session_name: str) -> bool:
         result = self.run("has-session", "-t", session_name, check=False)
         return result.returncode == 0
 
-    def list_sessions(self) -> list[str]:
-        result = self.run("list-sessions", "-F", "#S", check=False)
+    def list_sessions(self, *, timeout_sec: float = 10.0) -> list[str]:
+        result = self.run("list-sessions", "-F", "#S", check=False, timeout_sec=timeout_sec)
         if result.returncode != 0:
             return []
         return [line.strip() for line in result.stdout.splitlines() if line.strip()]
@@ -744,7 +1022,7 @@ class TmuxBackend:
         self.run("kill-session", "-t", session_name)
 
     def attach_session(self, session_name: str) -> None:
-        subprocess.run(["tmux", "attach-session", "-t", session_name], check=True)
+        subprocess.run([*self.command_prefix(), "attach-session", "-t", session_name], check=True)
 
     def detach_session(self, session_name: str) -> None:
         self.run("detach-client", "-s", session_name)
@@ -786,13 +1064,13 @@ class TmuxBackend:
         try:
             self.run("load-buffer", "-b", buffer_name, "-", input_text=text)
             self.run("paste-buffer", "-p", "-b", buffer_name, "-t", target)
-            time.sleep(0.3)
+            self.clock.sleep(0.3)
             for index in range(submit_count):
                 if index > 0:
-                    time.sleep(0.5)
+                    self.clock.sleep(0.5)
                 self.run("send-keys", "-t", target, "Enter")
         finally:
-            subprocess.run(["tmux", "delete-buffer", "-b", buffer_name], check=False, capture_output=True)
+            subprocess.run([*self.command_prefix(), "delete-buffer", "-b", buffer_name], check=False, capture_output=True)
 
     def tail_raw_log(
             self,
@@ -828,8 +1106,9 @@ class LaunchCoordinator:
     base_stagger_sec = 2.0
     max_stagger_sec = 10.0
 
-    def __init__(self, runtime_root: str | Path) -> None:
+    def __init__(self, runtime_root: str | Path, *, clock: RuntimeClock | None = None) -> None:
         self.runtime_root = Path(runtime_root).expanduser().resolve()
+        self.clock = clock or SYSTEM_CLOCK
         self.lock_root = self.runtime_root / "_locks"
         self.lock_root.mkdir(parents=True, exist_ok=True)
 
@@ -858,7 +1137,7 @@ class LaunchCoordinator:
             with lock_path.open("a+", encoding="utf-8") as lock_file:
                 fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
                 try:
-                    time.sleep(self.current_stagger(vendor))
+                    self.clock.sleep(self.current_stagger(vendor))
                     yield
                 finally:
                     fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -874,15 +1153,17 @@ class HealthSupervisor:
             idle_interval_sec: float = IDLE_HEALTH_INTERVAL_SEC,
             idle_after_sec: float = IDLE_HEALTH_AFTER_SEC,
             thread_name: str = "tmux-health",
+            clock: RuntimeClock | None = None,
     ) -> None:
         self.refresh_callback = refresh_callback
+        self.clock = clock or SYSTEM_CLOCK
         self.interval_sec = interval_sec
         self.ready_interval_sec = ready_interval_sec
         self.idle_interval_sec = idle_interval_sec
         self.idle_after_sec = idle_after_sec
         self._next_interval_sec = interval_sec
         self._last_state_key = ""
-        self._last_state_since = time.monotonic()
+        self._last_state_since = self.clock.monotonic()
         self._terminal_snapshot_count = 0
         self._stopped = False
         self._stop_event = threading.Event()
@@ -909,7 +1190,7 @@ class HealthSupervisor:
         agent_state = str(snapshot.agent_state or "").strip().upper()
         health_status = str(snapshot.health_status or "").strip().lower()
         state_key = f"{agent_state}:{health_status}"
-        now = time.monotonic()
+        now = self.clock.monotonic()
         if state_key != self._last_state_key:
             self._last_state_key = state_key
             self._last_state_since = now
@@ -926,9 +1207,12 @@ class HealthSupervisor:
         return False
 
     def _run(self) -> None:
-        while not self._stop_event.wait(self._next_interval_sec):
+        while not self.clock.wait(self._stop_event, self._next_interval_sec):
+            started = self.clock.monotonic()
             try:
-                should_stop = self._update_next_interval(self.refresh_callback())
+                snapshot = self.refresh_callback()
+                HEALTH_REFRESH_SECONDS.observe(self.clock.monotonic() - started)
+                should_stop = self._update_next_interval(snapshot)
             except Exception:
                 self._next_interval_sec = self.interval_sec
                 continue
@@ -940,9 +1224,17 @@ class HealthSupervisor:
 class TmuxRuntimeController:
     def __init__(self, backend: TmuxBackend | None = None) -> None:
         self.backend = backend or TmuxBackend()
+        self.shard_backends: tuple[TmuxBackend, ...] = (self.backend,) if backend is not None else iter_tmux_backends()
+
+    def backend_for_session(self, session_name: str) -> TmuxBackend:
+        if session_name and len(self.shard_backends) > 1:
+            for shard_backend in self.shard_backends:
+                if shard_backend.has_session(session_name):
+                    return shard_backend
+        return self.backend
 
     def session_exists(self, session_name: str) -> bool:
-        return bool(session_name) and self.backend.has_session(session_name)
+        return bool(session_name) and self.backend_for_session(session_name).has_session(session_name)
 
     def session_matches_context(
         self,
@@ -954,7 +1246,7 @@ class TmuxRuntimeController:
         workflow_action: str = "",
     ) -> bool:
         return _tmux_session_matches_context(
-            self.backend,
+            self.backend_for_session(session_name),
             session_name,
             runtime_dir=runtime_dir,
             work_dir=work_dir,
@@ -972,17 +1264,22 @@ class TmuxRuntimeController:
         )
 
     def list_sessions(self) -> list[str]:
-        return self.backend.list_sessions()
+        if len(self.shard_backends) == 1:
+            return self.backend.list_sessions()
+        return sorted({name for shard_backend in self.shard_backends for name in shard_backend.list_sessions()})
+
+    def attach_command(self, session_name: str) -> list[str]:
+        return build_tmux_attach_command(session_name, socket_name=self.backend_for_session(session_name).socket_name)
 
     def attach_session(self, session_name: str) -> None:
         if not self.session_exists(session_name):
             raise RuntimeError(f"tmux 会话尚未创建: {session_name}")
-        self.backend.attach_session(session_name)
+        self.backend_for_session(session_name).attach_session(session_name)
 
     def detach_session(self, session_name: str) -> str:
         if not session_name:
             raise RuntimeError("tmux 会话尚未创建")
-        self.backend.detach_session(session_name)
+        self.backend_for_session(session_name).detach_session(session_name)
         return session_name
 
     def kill_session(self, session_name: str, *, missing_ok: bool = True) -> str:
@@ -994,7 +1291,7 @@ class TmuxRuntimeController:
             if missing_ok:
                 return session_name
             raise RuntimeError(f"tmux 会话尚未创建: {session_name}")
-        self.backend.kill_session(session_name)
+        self.backend_for_session(session_name).kill_session(session_name)
         return session_name
 
     def read_transcript_tail(self, transcript_path: str | Path, *, max_lines: int = 60) -> str:
@@ -1248,12 +1545,16 @@ def _path_is_same_or_under(candidate: str | Path, root: str | Path) -> bool:
     return candidate_path == root_path or root_path in candidate_path.parents
 
 
-def _list_backend_session_names(backend: Any | None) -> set[str]:
+def _list_backend_session_names(backend: Any | None, *, timeout_sec: float | None = None) -> set[str]:
     list_sessions = getattr(backend, "list_sessions", None)
     if not callable(list_sessions):
         return set()
     try:
-        return {str(name).strip() for name in list_sessions() if str(name).strip()}
+        if timeout_sec is not None and isinstance(backend, TmuxBackend):
+            names = list_sessions(timeout_sec=timeout_sec)
+        else:
+            names = list_sessions()
+        return {str(name).strip() for name in names if str(name).strip()}
     except Exception:
         return set()
 
@@ -1362,8 +1663,13 @@ def _reserve_session_name(
         backend: Any | None = None,
 ) -> str:
     del instance_id
+    # 只查询会话将要落在的那台 tmux server，并且放在租约锁之外、带短超时；
+    # 其他 shard 上的会话由租约文件和已注册 worker 保证不重名，某个 shard 卡住也不会拖住全局的会话名分配。
+    occupied = _list_backend_session_names(
+        backend if backend is not None else TmuxBackend(),
+        timeout_sec=SESSION_NAME_RESERVE_LIST_TIMEOUT_SEC,
+    )
     with _session_name_lease_lock():
-        occupied = _list_backend_session_names(backend)
         occupied.update(_active_session_name_leases_locked())
         for worker in list_registered_tmux_workers():
             session_name = str(getattr(worker, "session_name", "") or "").strip()
@@ -1381,12 +1687,31 @@ def _reserve_session_name(
             session_name=session_name,
             worker_id=worker_id,
             work_dir=work_dir,
+            socket_name=str(getattr(backend, "socket_name", "") or ""),
         )
         with _RESERVED_SESSION_NAMES_LOCK:
             _RESERVED_SESSION_NAMES.add(session_name)
         return session_name
 
 
+def _resolve_worker_tmux_socket(
+        *,
+        work_dir: Path,
+        existing_runtime_dir: str | Path | None,
+        runtime_metadata: Mapping[str, object] | None,
+) -> str:
+    if existing_runtime_dir:
+        state_path = Path(existing_runtime_dir).expanduser().resolve() / "worker.state.json"
+        with contextlib.suppress(Exception):
+            payload = json.loads(state_path.read_text(encoding="utf-8"))
+            if isinstance(payload, dict) and "tmux_socket" in payload:
+                return str(payload.get("tmux_socket") or "")
+    metadata = dict(runtime_metadata or {})
+    project_dir = str(metadata.get("project_dir", "") or "").strip() or str(work_dir)
+    requirement_name = str(metadata.get("requirement_name", "") or "").strip()
+    return resolve_tmux_socket_name(f"{project_dir}::{requirement_name}" if requirement_name else project_dir)
+
+
 def _release_reserved_session_name(session_name: str) -> None:
     session_name_text = str(session_name or "").strip()
     with _session_name_lease_lock():
@@ -1684,16 +2009,15 @@ class BaseOutputDetector:
         return bool(re.search(r"\[\[ACX_TURN:[^:\]]+:DONE\]\]", text))
 
     def observation_text(self, observation: WorkerObservation) -> str:
-        return clean_ansi("\n".join(part for part in [observation.raw_log_tail, observation.visible_text] if part))
+        return observation.combined_text
 
     @staticmethod
     def current_visible_text(observation: WorkerObservation) -> str:
-        return clean_ansi(observation.visible_text or "")
+        return observation.cleaned_visible_text
 
     @staticmethod
     def recent_log_text(observation: WorkerObservation, *, max_lines: int = 120) -> str:
-        lines = clean_ansi(observation.raw_log_tail or "").splitlines()
-        return "\n".join(lines[-max_lines:])
+        return observation.raw_log_tail_lines(max_lines)
 
     def classify_agent_state(self, observation: WorkerObservation) -> AgentRuntimeState:
         text = self.observation_text(observation)
@@ -1974,6 +2298,45 @@ def classify_agent_runtime_state(
     return detector.classify_agent_state(observation)
 
 
+def visible_indicates_agent_ready(
+        vendor: Vendor,
+        visible_text: str,
+        raw_log_tail: str = "",
+        *,
+        current_command: str = "",
+) -> bool:
+    recent_output = "\n".join(str(visible_text or raw_log_tail or "").splitlines()[-120:])
+    if not recent_output.strip():
+        return False
+    if vendor == Vendor.CODEX:
+        recent_output = _codex_effective_recent_surface(recent_output)
+        if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_TRUST_PROMPT_PATTERNS):
+            return False
+        if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_MODEL_SELECTION_PROMPT_PATTERNS):
+            return False
+        if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_STARTING_PATTERNS):
+            return False
+        if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_BUSY_PATTERNS):
+            return False
+        return any(re.search(pattern, recent_output, re.IGNORECASE | re.MULTILINE) for pattern in CODEX_READY_PATTERNS)
+    if vendor == Vendor.CLAUDE:
+        return bool(re.search(r"^\s*❯", recent_output, re.MULTILINE))
+    if vendor == Vendor.GEMINI:
+        if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in GEMINI_TRUST_PROMPT_PATTERNS + GEMINI_NOT_READY_PATTERNS):
+            return False
+        if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in GEMINI_BUSY_PATTERNS):
+            return False
+        return any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in GEMINI_INPUT_BOX_PATTERNS + GEMINI_READY_PATTERNS)
+    if vendor == Vendor.OPENCODE:
+        state = _classify_opencode_surface_state(
+            visible_text=recent_output,
+            recent_log=raw_log_tail,
+            current_command=current_command or "node",
+        )
+        return state == AgentRuntimeState.READY
+    return False
+
+
 @dataclass(frozen=True)
 class AgentRunConfig:
     vendor: Vendor
@@ -2133,6 +2496,7 @@ class TmuxBatchWorker:
             backend: TmuxBackend | None = None,
             launch_coordinator: LaunchCoordinator | None = None,
             runtime_metadata: Mapping[str, object] | None = None,
+            clock: RuntimeClock | None = None,
     ) -> None:
         reserved_session_name = ""
         self._session_name_reserved = False
@@ -2142,10 +2506,17 @@ class TmuxBatchWorker:
         if not self.work_dir.is_dir():
             raise FileNotFoundError(f"工作目录不存在: {self.work_dir}")
         self.config = config
-        self.backend = backend or TmuxBackend()
+        self.backend = backend or TmuxBackend(
+            socket_name=_resolve_worker_tmux_socket(
+                work_dir=self.work_dir,
+                existing_runtime_dir=existing_runtime_dir,
+                runtime_metadata=runtime_metadata,
+            ),
+        )
+        self.clock = clock or getattr(self.backend, "clock", None) or SYSTEM_CLOCK
         self.detector = build_output_detector(self.config.vendor)
         self.runtime_root = Path(runtime_root or DEFAULT_RUNTIME_ROOT).expanduser().resolve()
-        self.launch_coordinator = launch_coordinator or LaunchCoordinator(self.runtime_root)
+        self.launch_coordinator = launch_coordinator or LaunchCoordinator(self.runtime_root, clock=self.clock)
         if existing_runtime_dir:
             self.runtime_dir = Path(existing_runtime_dir).expanduser().resolve()
             self.runtime_dir.mkdir(parents=True, exist_ok=True)
@@ -2230,6 +2601,9 @@ class TmuxBatchWorker:
             for key in ("project_dir", "requirement_name", "workflow_action", "stage_seq", "run_id"):
                 if key in existing_state and key not in self._runtime_metadata:
                     self._runtime_metadata[key] = existing_state.get(key)
+        self.tracer = self._build_turn_tracer()
+        self._agent_slot_lease: AgentSlotLease | None = None
+        self._detector_recorder: DetectorFixtureRecorder | None = None
         self._session_name_reserved = bool(reserved_session_name)
         _register_live_worker(self)
 
@@ -2328,6 +2702,7 @@ class TmuxBatchWorker:
             if str(key).strip()
         }
         self._runtime_metadata.update(normalized)
+        self.tracer = self._build_turn_tracer()
         if not self.state_path.exists():
             return
         with self.state_lock:
@@ -2336,6 +2711,37 @@ class TmuxBatchWorker:
             _atomic_write_json(self.state_path, payload)
         _notify_runtime_state_changed_best_effort()
 
+    def _build_turn_tracer(self) -> TurnTracer:
+        requirement_name = str(self._runtime_metadata.get("requirement_name", "") or "").strip()
+        return TurnTracer(
+            build_turn_trace_path(
+                project_dir=str(self._runtime_metadata.get("project_dir", "") or "").strip(),
+                requirement_name=requirement_name,
+                runtime_root=self.runtime_root,
+            ),
+            clock=self.clock,
+            track_name=f"{self.worker_id} ({self.config.vendor.value})",
+            base_args={
+                "vendor": self.config.vendor.value,
+                "stage": stage_from_workflow_action(str(self._runtime_metadata.get("workflow_action", "") or "")),
+                "worker_id": self.worker_id,
+                "requirement": requirement_name,
+            },
+        )
+
+    def _trace_file_wait_tail(
+            self,
+            *,
+            stable_since_monotonic: float = 0.0,
+            post_done_since_monotonic: float = 0.0,
+    ) -> None:
+        tracer = tracer_for(self)
+        if not tracer.recording:
+            return
+        now = self.clock.monotonic()
+        tracer.complete("artifact_stabilisation", stable_since_monotonic, now)
+        tracer.complete("post_done_grace", post_done_since_monotonic, now)
+
     def target_exists(self, target: str | None = None) -> bool:
         target_name = target or self.pane_id
         if not target_name:
@@ -2415,7 +2821,7 @@ class TmuxBatchWorker:
         return True, current_command, current_path, pane_title, pane_dead
 
     def _capture_lightweight_observation(self) -> WorkerObservation:
-        observed_at = _now_iso()
+        observed_at = self.clock.now_iso()
         session_exists, current_command, current_path, pane_title, pane_dead = self._capture_pane_liveness_snapshot()
         self.last_pane_title = pane_title or self.last_pane_title
         self.current_command = current_command or self.current_command
@@ -2435,7 +2841,7 @@ class TmuxBatchWorker:
         )
 
     def _capture_visible_observation_without_raw_log(self, *, tail_lines: int = DEFAULT_CAPTURE_TAIL_LINES) -> WorkerObservation:
-        observed_at = _now_iso()
+        observed_at = self.clock.now_iso()
         session_exists, visible_text, current_command, current_path, pane_title, pane_dead = self._capture_pane_snapshot(
             tail_lines=tail_lines
         )
@@ -2469,7 +2875,7 @@ class TmuxBatchWorker:
         return f"{shlex.quote(shell_path)} -il"
 
     def _log_event(self, event: str, **payload: object) -> None:
-        entry = {"at": _now_iso(), "event": event, **payload}
+        entry = {"at": self.clock.now_iso(), "event": event, **payload}
         with self.log_path.open("a", encoding="utf-8") as file:
             file.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
@@ -2486,6 +2892,7 @@ class TmuxBatchWorker:
             idle_interval_sec=IDLE_HEALTH_INTERVAL_SEC,
             idle_after_sec=IDLE_HEALTH_AFTER_SEC,
             thread_name=f"worker-health-{self.instance_id}",
+            clock=self.clock,
         )
         self.health_supervisor.start()
 
@@ -2644,6 +3051,39 @@ class TmuxBatchWorker:
         self._write_state(WorkerStatus.READY, note="session_created")
         return self.pane_id
 
+    def attach_command(self) -> str:
+        return render_tmux_attach_command(self.session_name, socket_name=str(getattr(self.backend, "socket_name", "") or ""))
+
+    @traced_method("agent_slot_wait")
+    def _acquire_agent_slot_lease(self) -> None:
+        if self._agent_slot_lease is not None and self._agent_slot_lease.active:
+            return
+        requirement_name = str(self._runtime_metadata.get("requirement_name", "") or "").strip()
+        project_dir = str(self._runtime_metadata.get("project_dir", "") or "").strip()
+        wait_sec = resolve_agent_budget_wait_sec()
+        try:
+            self._agent_slot_lease = acquire_agent_slot(
+                self.config.vendor.value,
+                scope=f"{project_dir}::{requirement_name}" if requirement_name else project_dir or str(self.work_dir),
+                worker=self.session_name,
+                timeout_sec=wait_sec,
+            )
+        except TimeoutError as error:
+            self._log_event("agent_slot_timeout", wait_sec=wait_sec)
+            raise RuntimeError(
+                f"{self.session_name} 等待 {self.config.vendor.value} 智能体并发额度超过 {wait_sec:g} 秒，"
+                "请执行 python -m tmux_core.runtime.agent_budget status 查看额度占用，"
+                "或调高额度/TMUX_AGENT_BUDGET_WAIT_SEC 后重试"
+            ) from error
+        if self._agent_slot_lease is not None:
+            self._log_event("agent_slot_granted", lease_id=self._agent_slot_lease.lease_id)
+
+    def _release_agent_slot_lease(self) -> None:
+        lease, self._agent_slot_lease = self._agent_slot_lease, None
+        if lease is not None:
+            lease.release()
+            self._log_event("agent_slot_released", lease_id=lease.lease_id)
+
     def _start_pipe_logging(self) -> None:
         self.log_path.write_text("", encoding="utf-8")
         self.raw_log_path.write_text("", encoding="utf-8")
@@ -2660,7 +3100,7 @@ class TmuxBatchWorker:
         return delta, tail, next_offset, log_mtime
 
     def observe(self, *, tail_lines: int = DEFAULT_CAPTURE_TAIL_LINES, tail_bytes: int = 24000) -> WorkerObservation:
-        observed_at = _now_iso()
+        observed_at = self.clock.now_iso()
         session_exists, visible_text, current_command, current_path, pane_title, pane_dead = self._capture_pane_snapshot(
             tail_lines=tail_lines
         )
@@ -2669,12 +3109,10 @@ class TmuxBatchWorker:
         self.current_command = current_command or self.current_command
         self.current_path = current_path or self.current_path
         self.last_heartbeat_at = observed_at
-        terminal_surface = "\n".join(part for part in [pane_title, visible_text or clean_ansi(raw_log_tail)] if part)
-        self._update_terminal_activity(terminal_surface, observed_at=observed_at)
-        observation = WorkerObservation(
+        observation = WorkerObservation.from_raw_log(
             visible_text=visible_text,
-            raw_log_delta=clean_ansi(raw_log_delta),
-            raw_log_tail=clean_ansi(raw_log_tail),
+            raw_log_delta=raw_log_delta,
+            raw_log_tail=raw_log_tail,
             pane_title=pane_title,
             current_command=current_command,
             current_path=current_path,
@@ -2683,7 +3121,15 @@ class TmuxBatchWorker:
             log_mtime=log_mtime,
             observed_at=observed_at,
         )
+        terminal_surface = "\n".join(part for part in [pane_title, visible_text or observation.raw_log_tail] if part)
+        self._update_terminal_activity(terminal_surface, observed_at=observed_at)
         self.agent_state = self.get_agent_state(observation)
+        self._record_detector_sample(
+            observation,
+            raw_log_delta=raw_log_delta,
+            raw_log_tail=raw_log_tail,
+            tail_bytes=tail_bytes,
+        )
         self.wrapper_state = self._infer_wrapper_state(
             current_command=observation.current_command,
             visible_text=observation.visible_text,
@@ -2691,6 +3137,40 @@ class TmuxBatchWorker:
         )
         return observation
 
+    def _record_detector_sample(
+            self,
+            observation: WorkerObservation,
+            *,
+            raw_log_delta: str,
+            raw_log_tail: str,
+            tail_bytes: int,
+    ) -> None:
+        record_dir = detector_record_dir()
+        if record_dir is None:
+            return
+        context = self._agent_runtime_classifier_context(observation)
+        if self._detector_recorder is None:
+            self._detector_recorder = DetectorFixtureRecorder(
+                build_detector_fixture_path(record_dir, self.session_name),
+                vendor=self.config.vendor.value,
+                session_name=self.session_name,
+                pane_id=self.pane_id,
+                expected_current_commands=context.expected_current_commands,
+                tail_bytes=tail_bytes,
+                clock=self.clock,
+            )
+        with contextlib.suppress(OSError):
+            self._detector_recorder.record(
+                observation,
+                raw_log_delta=raw_log_delta,
+                raw_log_tail=raw_log_tail,
+                agent_started=context.agent_started,
+                task_running=context.task_running,
+                title_ready=context.title_ready,
+                title_busy=context.title_busy,
+                state=self.agent_state.value,
+            )
+
     def _write_state(self, status: WorkerStatus, *, note: str, extra: dict[str, object] | None = None) -> None:
         with self.state_lock:
             previous = self.read_state()
@@ -2709,11 +3189,12 @@ class TmuxBatchWorker:
                 "worker_id": self.worker_id,
                 "runtime_worker_id": self.runtime_worker_id,
                 "session_name": self.session_name,
+                "tmux_socket": getattr(self.backend, "socket_name", ""),
                 "pane_id": self.pane_id,
                 "work_dir": str(self.work_dir),
                 "status": status.value,
                 "note": note,
-                "updated_at": _now_iso(),
+                "updated_at": self.clock.now_iso(),
                 "config": self.config.to_summary(),
                 "log_path": str(self.log_path),
                 "raw_log_path": str(self.raw_log_path),
@@ -2757,9 +3238,19 @@ class TmuxBatchWorker:
             if extra_payload:
                 payload.update(extra_payload)
             _atomic_write_json(self.state_path, payload)
+            self._record_agent_state_transition(previous, payload)
         self._log_event("state_changed", status=status.value, note=note)
         _notify_runtime_state_changed_best_effort()
 
+    def _record_agent_state_transition(self, previous: Mapping[str, object], payload: Mapping[str, object]) -> None:
+        dead = AgentRuntimeState.DEAD.value
+        if not previous or str(previous.get("agent_state", "") or "") == dead or payload.get("agent_state") != dead:
+            return
+        WORKER_DEATHS_TOTAL.inc(
+            vendor=self.config.vendor.value,
+            reason=str(payload.get("health_status", "") or "unknown"),
+        )
+
     def _capture_passive_observation(self, *, tail_lines: int = 120) -> WorkerObservation:
         if self.config.vendor == Vendor.OPENCODE and self.agent_state == AgentRuntimeState.BUSY:
             return self.observe(tail_lines=tail_lines, tail_bytes=12000)
@@ -2864,11 +3355,12 @@ class TmuxBatchWorker:
                         "pane_title": snapshot.pane_title,
                         "current_command": snapshot.current_command,
                         "current_path": snapshot.current_path,
-                        "updated_at": snapshot.last_heartbeat_at or _now_iso(),
+                        "updated_at": snapshot.last_heartbeat_at or self.clock.now_iso(),
                         "last_heartbeat_at": snapshot.last_heartbeat_at,
                     }
                 )
                 _atomic_write_json(self.state_path, payload)
+                self._record_agent_state_transition(previous, payload)
         if health_changed and notify_on_change:
             _notify_runtime_state_changed_best_effort()
         return snapshot
@@ -2894,6 +3386,7 @@ class TmuxBatchWorker:
         if self.session_exists():
             self._stop_health_supervisor()
             self.backend.kill_session(self.session_name)
+        self._release_agent_slot_lease()
         self.agent_ready = False
         self.agent_started = False
         self.wrapper_state = WrapperState.NOT_READY
@@ -2934,6 +3427,7 @@ class TmuxBatchWorker:
             self.backend.send_key(self.pane_id, key)
         self._log_event("send_key", key=key)
 
+    @traced_method("paste_submit")
     def _send_text(self, text: str, enter_count: int | None = None) -> None:
         submit_count = enter_count if enter_count is not None else self.config.submit_enter_count()
         with self.send_lock:
@@ -2994,19 +3488,20 @@ class TmuxBatchWorker:
                 return True
         return False
 
+    @traced_method("prompt_submission")
     def _wait_for_prompt_submission(
             self,
             *,
             prompt: str,
             timeout_sec: float,
     ) -> WorkerObservation:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         extra_enter_sent = False
-        submit_started_at = time.monotonic()
+        submit_started_at = self.clock.monotonic()
         submission_observed = False
         initial_state = self.agent_state
 
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             observation = self.observe(tail_lines=320)
             if not observation.session_exists:
                 raise RuntimeError("tmux pane exited while waiting for prompt submission")
@@ -3043,17 +3538,18 @@ class TmuxBatchWorker:
             if (
                     not submission_observed
                     and not extra_enter_sent
-                    and time.monotonic() - submit_started_at >= 3.0
+                    and self.clock.monotonic() - submit_started_at >= 3.0
                     and current_state in {AgentRuntimeState.READY, AgentRuntimeState.STARTING}
             ):
                 self.send_special_key("Enter")
                 extra_enter_sent = True
                 self._log_event("prompt_extra_enter", agent_state=current_state.value)
 
-            time.sleep(0.5)
+            self.clock.sleep(0.5)
 
         raise TimeoutError(f"等待智能体确认收到 prompt 超时:\n{self._diagnostic_visible_tail(200)}")
 
+    @traced_method("wait_turn_artifacts")
     def wait_for_turn_artifacts(
             self,
             *,
@@ -3061,24 +3557,24 @@ class TmuxBatchWorker:
             task_status_path: Path | None = None,
             timeout_sec: float,
     ) -> TurnFileResult:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         stable_signature: tuple[object, ...] | None = None
         stable_since_monotonic = 0.0
         invalid_signature: tuple[object, ...] | None = None
         invalid_since_monotonic = 0.0
         status_done_seen = task_status_path is None
-        post_done_since_monotonic = time.monotonic() if status_done_seen else 0.0
+        post_done_since_monotonic = self.clock.monotonic() if status_done_seen else 0.0
         post_done_grace_sec = max(float(contract.quiet_window_sec), TURN_ARTIFACT_POST_DONE_GRACE_SEC)
         last_probe_monotonic = 0.0
 
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             previous_done_seen = status_done_seen
             status_done_seen = self._track_task_completion_signal(
                 task_status_path=task_status_path,
                 status_done_seen=status_done_seen,
             )
             if status_done_seen and not previous_done_seen and not post_done_since_monotonic:
-                post_done_since_monotonic = time.monotonic()
+                post_done_since_monotonic = self.clock.monotonic()
 
             try:
                 file_result = contract.validator(contract.status_path)
@@ -3103,13 +3599,13 @@ class TmuxBatchWorker:
                 )
                 if current_invalid_signature == invalid_signature:
                     invalid_elapsed = (
-                        time.monotonic() - invalid_since_monotonic
+                        self.clock.monotonic() - invalid_since_monotonic
                         if invalid_since_monotonic
                         else 0.0
                     )
                 else:
                     invalid_signature = current_invalid_signature
-                    invalid_since_monotonic = time.monotonic()
+                    invalid_since_monotonic = self.clock.monotonic()
                     invalid_elapsed = 0.0
                 if status_done_seen:
                     if invalid_elapsed >= max(post_done_grace_sec, 0.0):
@@ -3144,7 +3640,7 @@ class TmuxBatchWorker:
                             f"phase={contract.phase} status_path={contract.status_path} "
                             f"runtime_stalled idle_sec={idle_elapsed:.1f}"
                         ) from error
-                time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+                self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
                 continue
 
             status_stat = contract.status_path.stat()
@@ -3156,10 +3652,10 @@ class TmuxBatchWorker:
                 tuple(sorted(file_result.artifact_hashes.items())),
             )
             if signature == stable_signature:
-                stable_elapsed = time.monotonic() - stable_since_monotonic if stable_since_monotonic else 0.0
+                stable_elapsed = self.clock.monotonic() - stable_since_monotonic if stable_since_monotonic else 0.0
             else:
                 stable_signature = signature
-                stable_since_monotonic = time.monotonic()
+                stable_since_monotonic = self.clock.monotonic()
                 stable_elapsed = 0.0
 
             if stable_elapsed >= max(float(contract.quiet_window_sec), 0.0):
@@ -3170,9 +3666,13 @@ class TmuxBatchWorker:
                         phase=contract.phase,
                         status_path=str(contract.status_path),
                     )
+                    self._trace_file_wait_tail(
+                        stable_since_monotonic=stable_since_monotonic,
+                        post_done_since_monotonic=post_done_since_monotonic,
+                    )
                     return file_result
                 observation = self._probe_agent_liveness_for_file_wait()
-                last_probe_monotonic = time.monotonic()
+                last_probe_monotonic = self.clock.monotonic()
                 if not observation.session_exists:
                     raise RuntimeError("tmux pane exited while waiting for turn artifacts")
                 if observation.pane_dead:
@@ -3197,6 +3697,10 @@ class TmuxBatchWorker:
                         phase=contract.phase,
                         status_path=str(contract.status_path),
                     )
+                    self._trace_file_wait_tail(
+                        stable_since_monotonic=stable_since_monotonic,
+                        post_done_since_monotonic=post_done_since_monotonic,
+                    )
                     return file_result
                 if self._stable_turn_artifacts_can_finish_task(contract):
                     if task_status_path is not None:
@@ -3212,6 +3716,10 @@ class TmuxBatchWorker:
                         status_path=str(contract.status_path),
                         agent_state=agent_state.value,
                     )
+                    self._trace_file_wait_tail(
+                        stable_since_monotonic=stable_since_monotonic,
+                        post_done_since_monotonic=post_done_since_monotonic,
+                    )
                     return file_result
             observation, last_probe_monotonic = self._maybe_probe_agent_liveness_for_file_wait(
                 last_probe_monotonic=last_probe_monotonic,
@@ -3229,7 +3737,7 @@ class TmuxBatchWorker:
                             f"agent exited back to shell while waiting for turn artifacts:\n{self._diagnostic_visible_tail(160)}"
                         )
                     post_done_elapsed = (
-                        time.monotonic() - post_done_since_monotonic
+                        self.clock.monotonic() - post_done_since_monotonic
                         if post_done_since_monotonic
                         else 0.0
                     )
@@ -3250,7 +3758,7 @@ class TmuxBatchWorker:
                         f"phase={contract.phase} status_path={contract.status_path} "
                         f"runtime_stalled idle_sec={idle_elapsed:.1f}"
                     )
-            time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+            self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
 
         raise TimeoutError(
             f"等待 turn 文件结果超时: phase={contract.phase} status_path={contract.status_path}\n"
@@ -3279,7 +3787,7 @@ class TmuxBatchWorker:
         )
         quiet_window = max(float(contract.quiet_window_sec), 0.0)
         if quiet_window:
-            time.sleep(quiet_window)
+            self.clock.sleep(quiet_window)
         try:
             next_result = contract.validator(contract.status_path)
             validate_turn_file_artifact_rules(contract, next_result)
@@ -3485,7 +3993,7 @@ class TmuxBatchWorker:
                 )
                 return True
             if probe_index + 1 < probe_count:
-                time.sleep(0.5)
+                self.clock.sleep(0.5)
         self._log_event("prompt_submission_busy_probe_exhausted")
         return False
 
@@ -3583,6 +4091,7 @@ class TmuxBatchWorker:
         self.mark_provider_runtime_error(reason_text=message)
         raise RuntimeError(message)
 
+    @traced_method("wait_task_result")
     def _wait_for_ready_task_result_after_submit(
             self,
             *,
@@ -3593,14 +4102,14 @@ class TmuxBatchWorker:
             prompt: str,
             baseline_observation: WorkerObservation,
     ) -> TaskResultFile:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         baseline_signature = self._observation_terminal_signature(baseline_observation)
         saw_busy_after_submit = False
         saw_submission_evidence = False
         ready_hits = 0
         status_done_seen = task_status_path is None
 
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             status_done_seen = self._track_task_completion_signal(
                 task_status_path=task_status_path,
                 status_done_seen=status_done_seen,
@@ -3637,7 +4146,7 @@ class TmuxBatchWorker:
             if agent_state == AgentRuntimeState.BUSY:
                 saw_busy_after_submit = True
                 ready_hits = 0
-                time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+                self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
                 continue
 
             prompt_observed = (
@@ -3678,13 +4187,14 @@ class TmuxBatchWorker:
                     return result_file
             else:
                 ready_hits = 0
-            time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+            self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
 
         raise TimeoutError(
             f"等待 READY-only 任务结果超时: phase={contract.phase} result_path={result_path}\n"
             f"{self._diagnostic_visible_tail(200)}"
         )
 
+    @traced_method("wait_task_result")
     def wait_for_task_result(
             self,
             *,
@@ -3695,7 +4205,7 @@ class TmuxBatchWorker:
             baseline_visible: str = "",
             baseline_raw_log_tail: str = "",
     ) -> TaskResultFile:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         stable_signature: tuple[object, ...] | None = None
         stable_hits = 0
         missing_contract_signature: tuple[object, ...] | None = None
@@ -3705,18 +4215,18 @@ class TmuxBatchWorker:
         ready_missing_signature: tuple[object, ...] | None = None
         ready_missing_since_monotonic = 0.0
         status_done_seen = task_status_path is None
-        post_done_since_monotonic = time.monotonic() if status_done_seen else 0.0
+        post_done_since_monotonic = self.clock.monotonic() if status_done_seen else 0.0
         post_done_grace_sec = TASK_RESULT_POST_DONE_GRACE_SEC
         last_probe_monotonic = 0.0
 
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             previous_done_seen = status_done_seen
             status_done_seen = self._track_task_completion_signal(
                 task_status_path=task_status_path,
                 status_done_seen=status_done_seen,
             )
             if status_done_seen and not previous_done_seen and not post_done_since_monotonic:
-                post_done_since_monotonic = time.monotonic()
+                post_done_since_monotonic = self.clock.monotonic()
 
             try:
                 result_file = self._validate_task_result_file(
@@ -3752,6 +4262,7 @@ class TmuxBatchWorker:
                             result_path=str(result_path),
                             status=str(result_file.payload.get("status", "")),
                         )
+                        self._trace_file_wait_tail(post_done_since_monotonic=post_done_since_monotonic)
                         return result_file
                 else:
                     missing_contract_signature = None
@@ -3771,13 +4282,13 @@ class TmuxBatchWorker:
                     )
                     if current_invalid_signature == invalid_signature:
                         invalid_elapsed = (
-                            time.monotonic() - invalid_since_monotonic
+                            self.clock.monotonic() - invalid_since_monotonic
                             if invalid_since_monotonic
                             else 0.0
                         )
                     else:
                         invalid_signature = current_invalid_signature
-                        invalid_since_monotonic = time.monotonic()
+                        invalid_since_monotonic = self.clock.monotonic()
                         invalid_elapsed = 0.0
                     if invalid_elapsed >= max(post_done_grace_sec, 0.0):
                         raise RuntimeError(
@@ -3811,7 +4322,7 @@ class TmuxBatchWorker:
                         )
                     agent_ready = observation is not None and self.get_agent_state(observation) == AgentRuntimeState.READY
                     if not agent_ready:
-                        time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+                        self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
                         continue
                     try:
                         result_file = finalize_task_result(
@@ -3832,6 +4343,7 @@ class TmuxBatchWorker:
                             result_path=str(result_path),
                             status=str(result_file.payload.get("status", "")),
                         )
+                        self._trace_file_wait_tail(post_done_since_monotonic=post_done_since_monotonic)
                         return result_file
                 observation, last_probe_monotonic = self._maybe_probe_agent_liveness_for_file_wait(
                     last_probe_monotonic=last_probe_monotonic,
@@ -3863,13 +4375,13 @@ class TmuxBatchWorker:
                         )
                         if current_ready_missing_signature == ready_missing_signature:
                             ready_missing_elapsed = (
-                                time.monotonic() - ready_missing_since_monotonic
+                                self.clock.monotonic() - ready_missing_since_monotonic
                                 if ready_missing_since_monotonic
                                 else 0.0
                             )
                         else:
                             ready_missing_signature = current_ready_missing_signature
-                            ready_missing_since_monotonic = time.monotonic()
+                            ready_missing_since_monotonic = self.clock.monotonic()
                             ready_missing_elapsed = 0.0
                         if ready_missing_elapsed >= TASK_RESULT_READY_MISSING_GRACE_SEC:
                             raise RuntimeError(
@@ -3891,7 +4403,7 @@ class TmuxBatchWorker:
                             f"phase={contract.phase} result_path={result_path} "
                             f"runtime_stalled idle_sec={idle_elapsed:.1f}"
                         ) from error
-                time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+                self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
                 continue
 
             result_stat = result_path.stat()
@@ -3922,9 +4434,10 @@ class TmuxBatchWorker:
                         result_path=str(result_path),
                         status=str(result_file.payload.get("status", "")),
                     )
+                    self._trace_file_wait_tail(post_done_since_monotonic=post_done_since_monotonic)
                     return result_file
                 observation = self._probe_agent_liveness_for_file_wait()
-                last_probe_monotonic = time.monotonic()
+                last_probe_monotonic = self.clock.monotonic()
                 if not observation.session_exists:
                     raise RuntimeError("tmux pane exited while waiting for task result")
                 if observation.pane_dead:
@@ -3949,6 +4462,7 @@ class TmuxBatchWorker:
                         result_path=str(result_path),
                         status=str(result_file.payload.get("status", "")),
                     )
+                    self._trace_file_wait_tail(post_done_since_monotonic=post_done_since_monotonic)
                     return result_file
             observation, last_probe_monotonic = self._maybe_probe_agent_liveness_for_file_wait(
                 last_probe_monotonic=last_probe_monotonic,
@@ -3970,7 +4484,7 @@ class TmuxBatchWorker:
                             f"agent exited back to shell while waiting for task result:\n{self._diagnostic_visible_tail(160)}"
                         )
                     post_done_elapsed = (
-                        time.monotonic() - post_done_since_monotonic
+                        self.clock.monotonic() - post_done_since_monotonic
                         if post_done_since_monotonic
                         else 0.0
                     )
@@ -3991,7 +4505,7 @@ class TmuxBatchWorker:
                         f"phase={contract.phase} result_path={result_path} "
                         f"runtime_stalled idle_sec={idle_elapsed:.1f}"
                     )
-            time.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
+            self.clock.sleep(FILE_CONTRACT_POLL_INTERVAL_SEC)
 
         raise TimeoutError(
             f"等待任务结果超时: phase={contract.phase} result_path={result_path}\n"
@@ -3999,10 +4513,10 @@ class TmuxBatchWorker:
         )
 
     def _wait_for_shell_ready(self, timeout_sec: float = 12.0) -> None:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         previous_output = ""
         stable_count = 0
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             observation = self.observe(tail_lines=120)
             if not observation.session_exists:
                 raise RuntimeError("tmux pane exited before shell became ready")
@@ -4017,17 +4531,17 @@ class TmuxBatchWorker:
                 if stable_count >= 1:
                     return
             previous_output = visible
-            time.sleep(0.4)
+            self.clock.sleep(0.4)
         raise RuntimeError(f"Shell initialization timed out.\n{self.capture_visible(120)}")
 
     def _boot_action_allowed(self, action_signature: str, cooldown_sec: float = 3.0) -> bool:
         if (
             action_signature == self._last_boot_action_signature
-            and time.monotonic() - self._last_boot_action_at < cooldown_sec
+            and self.clock.monotonic() - self._last_boot_action_at < cooldown_sec
         ):
             return False
         self._last_boot_action_signature = action_signature
-        self._last_boot_action_at = time.monotonic()
+        self._last_boot_action_at = self.clock.monotonic()
         return True
 
     def _maybe_handle_codex_boot_prompt(self, visible_text: str) -> bool:
@@ -4050,9 +4564,9 @@ class TmuxBatchWorker:
             if not self._boot_action_allowed(action_signature):
                 return False
             self.send_special_key("Down")
-            time.sleep(0.1)
+            self.clock.sleep(0.1)
             self.send_special_key("Down")
-            time.sleep(0.1)
+            self.clock.sleep(0.1)
             self.send_special_key("Enter")
             return True
         if all(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_MODEL_SELECTION_PROMPT_PATTERNS):
@@ -4060,7 +4574,7 @@ class TmuxBatchWorker:
             if not self._boot_action_allowed(action_signature):
                 return False
             self.send_special_key("Down")
-            time.sleep(0.1)
+            self.clock.sleep(0.1)
             self.send_special_key("Enter")
             return True
         return False
@@ -4139,7 +4653,7 @@ class TmuxBatchWorker:
             status_done_seen: bool,
             force: bool = False,
     ) -> tuple[WorkerObservation | None, float]:
-        now = time.monotonic()
+        now = self.clock.monotonic()
         interval = POST_DONE_AGENT_PROBE_INTERVAL_SEC if status_done_seen else ACTIVE_AGENT_PROBE_INTERVAL_SEC
         if type(self).observe is not TmuxBatchWorker.observe:
             force = True
@@ -4167,7 +4681,7 @@ class TmuxBatchWorker:
         if self.terminal_recently_changed:
             return 0.0
         if self._last_terminal_change_monotonic:
-            return max(0.0, time.monotonic() - self._last_terminal_change_monotonic)
+            return max(0.0, self.clock.monotonic() - self._last_terminal_change_monotonic)
         last_changed_at = str(self.last_terminal_changed_at or "").strip()
         if not last_changed_at:
             return 0.0
@@ -4175,7 +4689,7 @@ class TmuxBatchWorker:
             changed_at = datetime.fromisoformat(last_changed_at.replace("Z", "+00:00"))
         except ValueError:
             return 0.0
-        return max(0.0, time.time() - changed_at.timestamp())
+        return max(0.0, self.clock.time() - changed_at.timestamp())
 
     def _contract_wait_stalled(
             self,
@@ -4217,7 +4731,7 @@ class TmuxBatchWorker:
         self._last_terminal_change_monotonic = 0.0
 
     def _update_terminal_activity(self, terminal_text: str, *, observed_at: str) -> None:
-        now = time.monotonic()
+        now = self.clock.monotonic()
         signature = self._build_terminal_signature(terminal_text)
         if signature != self.last_terminal_signature:
             self.last_terminal_signature = signature
@@ -4232,7 +4746,7 @@ class TmuxBatchWorker:
             except ValueError:
                 last_changed_at = None
             if last_changed_at is not None:
-                elapsed_sec = max(0.0, time.time() - last_changed_at.timestamp())
+                elapsed_sec = max(0.0, self.clock.time() - last_changed_at.timestamp())
                 self._last_terminal_change_monotonic = max(0.0, now - elapsed_sec)
         self.terminal_recently_changed = bool(signature) and bool(self._last_terminal_change_monotonic) and (
             now - self._last_terminal_change_monotonic < TERMINAL_ACTIVITY_IDLE_WINDOW_SEC
@@ -4348,19 +4862,22 @@ class TmuxBatchWorker:
             return self.agent_state
         return classify_agent_runtime_state(
             observation,
-            context=AgentRuntimeClassifierContext(
-                vendor=self.config.vendor,
-                agent_started=self.agent_started,
-                cached_state=self.agent_state,
-                pane_id=self.pane_id,
-                expected_current_commands=self.config.expected_current_commands(),
-                task_running=self.current_task_runtime_status == TASK_STATUS_RUNNING,
-                title_ready=self._title_indicates_ready(observation.pane_title),
-                title_busy=self._title_indicates_busy(observation.pane_title),
-            ),
+            context=self._agent_runtime_classifier_context(observation),
             detector=self.detector,
         )
 
+    def _agent_runtime_classifier_context(self, observation: WorkerObservation) -> AgentRuntimeClassifierContext:
+        return AgentRuntimeClassifierContext(
+            vendor=self.config.vendor,
+            agent_started=self.agent_started,
+            cached_state=self.agent_state,
+            pane_id=self.pane_id,
+            expected_current_commands=self.config.expected_current_commands(),
+            task_running=self.current_task_runtime_status == TASK_STATUS_RUNNING,
+            title_ready=self._title_indicates_ready(observation.pane_title),
+            title_busy=self._title_indicates_busy(observation.pane_title),
+        )
+
     def get_agent_state(self, observation: WorkerObservation | None = None) -> AgentRuntimeState:
         return self._classify_agent_state(observation)
 
@@ -4447,36 +4964,12 @@ class TmuxBatchWorker:
             *,
             current_command: str = "",
     ) -> bool:
-        recent_output = "\n".join(str(visible_text or raw_log_tail or "").splitlines()[-120:])
-        if not recent_output.strip():
-            return False
-        if self.config.vendor == Vendor.CODEX:
-            recent_output = _codex_effective_recent_surface(recent_output)
-            if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_TRUST_PROMPT_PATTERNS):
-                return False
-            if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_MODEL_SELECTION_PROMPT_PATTERNS):
-                return False
-            if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_STARTING_PATTERNS):
-                return False
-            if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in CODEX_BUSY_PATTERNS):
-                return False
-            return any(re.search(pattern, recent_output, re.IGNORECASE | re.MULTILINE) for pattern in CODEX_READY_PATTERNS)
-        if self.config.vendor == Vendor.CLAUDE:
-            return bool(re.search(r"^\s*❯", recent_output, re.MULTILINE))
-        if self.config.vendor == Vendor.GEMINI:
-            if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in GEMINI_TRUST_PROMPT_PATTERNS + GEMINI_NOT_READY_PATTERNS):
-                return False
-            if any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in GEMINI_BUSY_PATTERNS):
-                return False
-            return any(re.search(pattern, recent_output, re.IGNORECASE) for pattern in GEMINI_INPUT_BOX_PATTERNS + GEMINI_READY_PATTERNS)
-        if self.config.vendor == Vendor.OPENCODE:
-            state = _classify_opencode_surface_state(
-                visible_text=recent_output,
-                recent_log=raw_log_tail,
-                current_command=current_command or self.current_command or "node",
-            )
-            return state == AgentRuntimeState.READY
-        return False
+        return visible_indicates_agent_ready(
+            self.config.vendor,
+            visible_text,
+            raw_log_tail,
+            current_command=current_command or self.current_command,
+        )
 
     def _visible_ready_signature(self, observation: WorkerObservation) -> str:
         current_command = observation.current_command or self.current_command
@@ -4520,10 +5013,10 @@ class TmuxBatchWorker:
         return WrapperState.NOT_READY
 
     def _wait_for_agent_ready(self, timeout_sec: float = 60.0) -> None:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         previous_ready_signature = ""
         stable_count = 0
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             observation = self.observe(tail_lines=220)
             if not observation.session_exists:
                 raise RuntimeError("tmux pane exited while agent was starting")
@@ -4539,7 +5032,7 @@ class TmuxBatchWorker:
                 or self._maybe_handle_gemini_boot_prompt(visible)
                 or self._maybe_handle_gemini_boot_prompt(fallback_visible)
             ):
-                time.sleep(0.6)
+                self.clock.sleep(0.6)
                 previous_ready_signature = ""
                 stable_count = 0
                 continue
@@ -4571,10 +5064,11 @@ class TmuxBatchWorker:
                 raise RuntimeError(f"agent exited back to shell while starting:\n{visible}")
 
             previous_ready_signature = ready_signature if self._agent_running(current_command) else ""
-            time.sleep(0.5)
+            self.clock.sleep(0.5)
 
         raise RuntimeError(f"Timed out waiting for agent ready.\n{self.capture_visible(240)}")
 
+    @traced_method("agent_boot")
     def launch_agent(self, timeout_sec: float = 60.0) -> None:
         last_error: Exception | None = None
         max_attempts = 1
@@ -4604,7 +5098,7 @@ class TmuxBatchWorker:
                 self.mark_awaiting_reconfiguration(
                     reason_text=(
                         f"{self.session_name} 启动失败，系统不会自动重试或重建该智能体。\n"
-                        f"请人工进入会话处理: tmux attach -t {self.session_name}\n"
+                        f"请人工进入会话处理: {self.attach_command()}\n"
                         f"原因: {error}"
                     )
                 )
@@ -4624,7 +5118,7 @@ class TmuxBatchWorker:
         reason_text = str(reason or "").strip() or "agent_not_ready"
         intervention_text = (
             f"检测到 {self.session_name} 需要重新启动或重建，但系统不会自动执行。\n"
-            f"请人工进入会话处理: tmux attach -t {self.session_name}\n"
+            f"请人工进入会话处理: {self.attach_command()}\n"
             f"原因: {reason_text}"
         )
         self.mark_awaiting_reconfiguration(reason_text=intervention_text)
@@ -4710,7 +5204,7 @@ class TmuxBatchWorker:
         intervention_text = (
             f"检测到 {self.session_name} 上一轮仍处于异常 BUSY/失败状态。\n"
             "系统不会自动重启该智能体。\n"
-            f"请人工进入会话处理: tmux attach -t {self.session_name}\n"
+            f"请人工进入会话处理: {self.attach_command()}\n"
             f"原因: {reason_text}"
         )
         self.mark_awaiting_reconfiguration(reason_text=intervention_text)
@@ -4733,6 +5227,7 @@ class TmuxBatchWorker:
         )
         return True
 
+    @traced_method("agent_ready")
     def _ensure_agent_ready_for_turn_start(
             self,
             *,
@@ -5005,6 +5500,7 @@ class TmuxBatchWorker:
                     return token
         return ""
 
+    @traced_method("wait_reply")
     def _wait_for_turn_reply(
             self,
             *,
@@ -5015,10 +5511,10 @@ class TmuxBatchWorker:
             task_status_path: Path | None = None,
             timeout_sec: float,
     ) -> str:
-        deadline = time.monotonic() + timeout_sec
+        deadline = self.clock.monotonic() + timeout_sec
         resolved_reply = ""
         status_done_seen = task_status_path is None
-        while time.monotonic() < deadline:
+        while self.clock.monotonic() < deadline:
             observation = self.observe(tail_lines=DEFAULT_CAPTURE_TAIL_LINES)
             if not observation.session_exists:
                 raise RuntimeError("tmux pane exited while waiting for reply")
@@ -5045,7 +5541,7 @@ class TmuxBatchWorker:
                 resolved_reply = reply
 
             if not resolved_reply and baseline_reply:
-                time.sleep(0.4)
+                self.clock.sleep(0.4)
                 continue
             if not resolved_reply and status_done_seen:
                 fallback_reply = self._extract_required_token_reply_without_turn_token(
@@ -5055,10 +5551,10 @@ class TmuxBatchWorker:
                 if fallback_reply:
                     resolved_reply = fallback_reply
             if not resolved_reply:
-                time.sleep(0.4)
+                self.clock.sleep(0.4)
                 continue
             if not status_done_seen:
-                time.sleep(0.4)
+                self.clock.sleep(0.4)
                 continue
             self.current_command = current_command
             self.current_path = observation.current_path
@@ -5074,6 +5570,7 @@ class TmuxBatchWorker:
         self.agent_ready = False
         raise TimeoutError(f"等待智能体回复超时:\n{clean_ansi(self.capture_visible(200))[-4000:]}")
 
+    @traced_method("turn", arg_names=("label",))
     def run_turn(
             self,
             *,
@@ -5084,7 +5581,30 @@ class TmuxBatchWorker:
             result_contract: TaskResultContract | None = None,
             timeout_sec: float = DEFAULT_COMMAND_TIMEOUT_SEC,
     ) -> CommandResult:
-        started_at = _now_iso()
+        self._acquire_agent_slot_lease()
+        try:
+            return self._run_turn_attempts(
+                label=label,
+                prompt=prompt,
+                required_tokens=required_tokens,
+                completion_contract=completion_contract,
+                result_contract=result_contract,
+                timeout_sec=timeout_sec,
+            )
+        finally:
+            self._release_agent_slot_lease()
+
+    def _run_turn_attempts(
+            self,
+            *,
+            label: str,
+            prompt: str,
+            required_tokens: Sequence[str],
+            completion_contract: TurnFileContract | None,
+            result_contract: TaskResultContract | None,
+            timeout_sec: float,
+    ) -> CommandResult:
+        started_at = self.clock.now_iso()
         last_timeout: TimeoutError | None = None
         for attempt in range(1, 3):
             previous_task_runtime_status = self.current_task_runtime_status
@@ -5201,7 +5721,7 @@ class TmuxBatchWorker:
                         task_status_path=task_status_path,
                         timeout_sec=timeout_sec,
                     )
-                finished_at = _now_iso()
+                finished_at = self.clock.now_iso()
                 self.current_task_runtime_status = read_task_status(task_status_path)
                 self.agent_ready = True
                 self.agent_started = True
@@ -5258,7 +5778,7 @@ class TmuxBatchWorker:
                             ensure_ascii=False,
                             indent=2,
                         )
-                        finished_at = _now_iso()
+                        finished_at = self.clock.now_iso()
                         result = CommandResult(
                             label=label,
                             command=submitted_prompt,
@@ -5296,7 +5816,7 @@ class TmuxBatchWorker:
                     )
                     if task_result is not None:
                         reply = json.dumps(task_result.payload, ensure_ascii=False, indent=2)
-                        finished_at = _now_iso()
+                        finished_at = self.clock.now_iso()
                         result = CommandResult(
                             label=label,
                             command=submitted_prompt,
@@ -5339,7 +5859,7 @@ class TmuxBatchWorker:
                             ensure_ascii=False,
                             indent=2,
                         )
-                        finished_at = _now_iso()
+                        finished_at = self.clock.now_iso()
                         result = CommandResult(
                             label=label,
                             command=submitted_prompt,
@@ -5380,7 +5900,7 @@ class TmuxBatchWorker:
                     )
                     if task_result is not None:
                         reply = json.dumps(task_result.payload, ensure_ascii=False, indent=2)
-                        finished_at = _now_iso()
+                        finished_at = self.clock.now_iso()
                         result = CommandResult(
                             label=label,
                             command=submitted_prompt,
@@ -5426,7 +5946,7 @@ class TmuxBatchWorker:
                     )
                     self.ensure_agent_ready(timeout_sec=timeout_sec)
                     continue
-                finished_at = _now_iso()
+                finished_at = self.clock.now_iso()
                 clean_output = str(error).strip()
                 timeout_extra = {
                     "label": label,
@@ -5466,7 +5986,7 @@ class TmuxBatchWorker:
                 )
                 return result
             except Exception as error:
-                finished_at = _now_iso()
+                finished_at = self.clock.now_iso()
                 current_visible = clean_ansi(self.capture_visible(200)) if self.pane_id and self.target_exists() else ""
                 clean_output = "\n".join(part for part in [str(error).strip(), current_visible.strip()] if part).strip()
                 runtime_state_extra = self._turn_failure_runtime_state_extra(clean_output)
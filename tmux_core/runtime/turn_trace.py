@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from tmux_core.runtime.clock import SYSTEM_CLOCK, RuntimeClock
+from tmux_core.runtime.metrics import TURN_PHASE_SECONDS
+
+TURN_TRACE_ENV = "TMUX_TURN_TRACE"
+TURN_TRACE_MAX_BYTES_ENV = "TMUX_TURN_TRACE_MAX_BYTES"
+TURN_TRACE_DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+TURN_TRACE_ROOT_NAME = ".turn_traces"
+TURN_TRACE_FILE_SUFFIX = ".trace.json"
+TURN_TRACE_ROTATED_STEM_SUFFIX = ".1"
+TURN_TRACE_DEFAULT_FILE_STEM = "turns"
+TURN_TRACE_GROUP_FIELDS = ("phase", "vendor", "stage")
+_TRACE_ENABLED_VALUES = {"1", "true", "yes", "on"}
+_TRACE_WRITE_LOCK = threading.Lock()
+_TRACE_TRACK_IDS = itertools.count(1)
+_UNSAFE_TRACE_NAME_RE = re.compile(r'[\\/:*?"<>|\s]+')
+_WORKFLOW_STAGE_RE = re.compile(r"stage\.(a\d{2})", re.IGNORECASE)
+
+
+def turn_tracing_enabled() -> bool:
+    return str(os.environ.get(TURN_TRACE_ENV, "") or "").strip().lower() in _TRACE_ENABLED_VALUES
+
+
+def resolve_turn_trace_max_bytes(default: int = TURN_TRACE_DEFAULT_MAX_BYTES) -> int:
+    try:
+        return max(int(os.environ.get(TURN_TRACE_MAX_BYTES_ENV, "").strip() or default), 0)
+    except ValueError:
+        return default
+
+
+def stage_from_workflow_action(workflow_action: str) -> str:
+    text = str(workflow_action or "").strip()
+    match = _WORKFLOW_STAGE_RE.search(text)
+    return match.group(1).upper() if match else text
+
+
+def build_turn_trace_path(
+        *,
+        project_dir: str | Path = "",
+        requirement_name: str = "",
+        runtime_root: str | Path = "",
+) -> Path | None:
+    stem = _UNSAFE_TRACE_NAME_RE.sub("_", str(requirement_name or "").strip()).strip("._") or TURN_TRACE_DEFAULT_FILE_STEM
+    # 优先写在阶段运行目录下：项目目录里的 trace 会混进评审 diff、并行补丁和变更集。
+    if str(runtime_root or "").strip():
+        root = Path(runtime_root).expanduser().resolve() / TURN_TRACE_ROOT_NAME
+    elif str(project_dir or "").strip():
+        root = Path(project_dir).expanduser().resolve() / TURN_TRACE_ROOT_NAME
+    else:
+        return None
+    return root / f"{stem}{TURN_TRACE_FILE_SUFFIX}"
+
+
+def build_rotated_turn_trace_path(path: str | Path) -> Path:
+    trace_path = Path(path)
+    name = trace_path.name
+    stem = name[:-len(TURN_TRACE_FILE_SUFFIX)] if name.endswith(TURN_TRACE_FILE_SUFFIX) else name
+    return trace_path.with_name(f"{stem}{TURN_TRACE_ROTATED_STEM_SUFFIX}{TURN_TRACE_FILE_SUFFIX}")
+
+
+def _append_trace_event(
+        path: Path,
+        event: Mapping[str, object],
+        *,
+        header: Mapping[str, object] | None = None,
+        announce: bool = False,
+        max_bytes: int = 0,
+) -> None:
+    # header 是轨道名元数据：首次写入或文件刚轮转（新文件）时补写，保证每个文件单独可读。
+    with _TRACE_WRITE_LOCK:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            stat = os.fstat(fd)
+            size = stat.st_size
+            if max_bytes > 0 and size >= max_bytes:
+                # 超过上限后只保留一个旧文件，trace 总量不超过约两倍上限；
+                # 其他进程可能已先轮转，路径换了 inode 就直接写新文件。
+                os.close(fd)
+                fd = -1
+                with contextlib.suppress(FileNotFoundError):
+                    if os.stat(path).st_ino == stat.st_ino:
+                        os.replace(path, build_rotated_turn_trace_path(path))
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                size = os.fstat(fd).st_size
+            events = [header] if header is not None and (announce or size == 0) else []
+            events.append(event)
+            text = "".join(json.dumps(item, ensure_ascii=False) + ",\n" for item in events)
+            if size == 0:
+                text = "[\n" + text
+            os.write(fd, text.encode("utf-8"))
+        finally:
+            if fd >= 0:
+                os.close(fd)
+
+
+class TurnTracer:
+    def __init__(
+            self,
+            path: str | Path | None,
+            *,
+            clock: RuntimeClock | None = None,
+            track_name: str = "",
+            base_args: Mapping[str, object] | None = None,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.clock = clock or SYSTEM_CLOCK
+        self.track_name = str(track_name or "").strip()
+        self.base_args = {str(key): value for key, value in dict(base_args or {}).items() if value not in (None, "")}
+        self.track_id = next(_TRACE_TRACK_IDS)
+        self._track_announced = False
+
+    @property
+    def recording(self) -> bool:
+        return self.path is not None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and turn_tracing_enabled()
+
+    def metric_labels(self) -> dict[str, object]:
+        return {"vendor": self.base_args.get("vendor", "-"), "stage": self.base_args.get("stage", "-")}
+
+    def _emit(self, event: dict[str, object]) -> None:
+        if not self.enabled or self.path is None:
+            return
+        header = None
+        if self.track_name:
+            header = {
+                "ph": "M",
+                "name": "thread_name",
+                "pid": os.getpid(),
+                "tid": self.track_id,
+                "args": {"name": self.track_name},
+            }
+        try:
+            _append_trace_event(
+                self.path,
+                event,
+                header=header,
+                announce=not self._track_announced,
+                max_bytes=resolve_turn_trace_max_bytes(),
+            )
+            self._track_announced = True
+        except OSError:
+            return
+
+    def complete(
+            self,
+            name: str,
+            start_monotonic: float,
+            end_monotonic: float | None = None,
+            *,
+            cat: str = "turn",
+            **args: object,
+    ) -> None:
+        if not self.recording or not start_monotonic:
+            return
+        end = self.clock.monotonic() if end_monotonic is None else end_monotonic
+        TURN_PHASE_SECONDS.observe(end - start_monotonic, phase=name, **self.metric_labels())
+        if not self.enabled:
+            return
+        self._emit(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": int(start_monotonic * 1_000_000),
+                "dur": max(int((end - start_monotonic) * 1_000_000), 0),
+                "pid": os.getpid(),
+                "tid": self.track_id,
+                "args": {**self.base_args, **args},
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, *, cat: str = "turn", **args: object) -> Iterator[dict[str, object]]:
+        span_args: dict[str, object] = dict(args)
+        if not self.recording:
+            yield span_args
+            return
+        started = self.clock.monotonic()
+        try:
+            yield span_args
+        except BaseException as error:
+            span_args.setdefault("error", type(error).__name__)
+            raise
+        finally:
+            self.complete(name, started, cat=cat, **span_args)
+
+
+NULL_TURN_TRACER = TurnTracer(None)
+
+
+def tracer_for(owner: object | None) -> TurnTracer:
+    tracer = getattr(owner, "tracer", None)
+    if isinstance(tracer, TurnTracer):
+        return tracer
+    worker = getattr(owner, "worker", None)
+    tracer = getattr(worker, "tracer", None)
+    return tracer if isinstance(tracer, TurnTracer) else NULL_TURN_TRACER
+
+
+def traced_method(
+        name: str,
+        *,
+        cat: str = "turn",
+        arg_names: Sequence[str] = (),
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            tracer = tracer_for(self)
+            if not tracer.recording:
+                return fn(self, *args, **kwargs)
+            span_args = {key: kwargs[key] for key in arg_names if isinstance(kwargs.get(key), (str, int, float, bool))}
+            with tracer.span(name, cat=cat, **span_args):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def load_trace_events(path: str | Path) -> list[dict[str, object]]:
+    events: list[dict[str, object]] = []
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except OSError:
+        return events
+    stripped = text.strip()
+    if stripped.startswith("[") and stripped.endswith("]"):
+        try:
+            payload = json.loads(stripped)
+        except ValueError:
+            payload = None
+        if isinstance(payload, list):
+            return [item for item in payload if isinstance(item, dict)]
+    for line in text.splitlines():
+        candidate = line.strip().rstrip(",").strip()
+        if not candidate or candidate in {"[", "]"}:
+            continue
+        try:
+            event = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(event, dict):
+            events.append(event)
+    return events
+
+
+def iter_trace_files(paths: Iterable[str | Path]) -> Iterator[Path]:
+    for raw_path in paths:
+        path = Path(raw_path).expanduser().resolve()
+        if path.is_dir():
+            yield from sorted(path.rglob(f"*{TURN_TRACE_FILE_SUFFIX}"))
+        elif path.is_file():
+            yield path
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-fraction * len(sorted_values) // 1)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass(frozen=True)
+class TurnPhaseSummary:
+    group: tuple[str, ...]
+    count: int
+    p50_sec: float
+    p95_sec: float
+    max_sec: float
+    total_sec: float
+
+    def to_dict(self, group_by: Sequence[str]) -> dict[str, object]:
+        return {
+            **dict(zip(group_by, self.group)),
+            "count": self.count,
+            "p50_sec": round(self.p50_sec, 3),
+            "p95_sec": round(self.p95_sec, 3),
+            "max_sec": round(self.max_sec, 3),
+            "total_sec": round(self.total_sec, 3),
+        }
+
+
+def summarize_turn_traces(
+        events: Iterable[Mapping[str, object]],
+        *,
+        group_by: Sequence[str] = TURN_TRACE_GROUP_FIELDS,
+) -> list[TurnPhaseSummary]:
+    durations: dict[tuple[str, ...], list[float]] = {}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        args = event.get("args")
+        args = args if isinstance(args, Mapping) else {}
+        fields = {
+            "phase": str(event.get("name", "") or ""),
+            "vendor": str(args.get("vendor", "") or "-"),
+            "stage": str(args.get("stage", "") or "-"),
+        }
+        key = tuple(fields[field_name] for field_name in group_by)
+        durations.setdefault(key, []).append(float(event.get("dur", 0) or 0) / 1_000_000)
+    summaries: list[TurnPhaseSummary] = []
+    for key, values in sorted(durations.items()):
+        values.sort()
+        summaries.append(
+            TurnPhaseSummary(
+                group=key,
+                count=len(values),
+                p50_sec=_percentile(values, 0.5),
+                p95_sec=_percentile(values, 0.95),
+                max_sec=values[-1],
+                total_sec=sum(values),
+            )
+        )
+    return summaries
+
+
+def render_turn_trace_summary(summaries: Sequence[TurnPhaseSummary], *, group_by: Sequence[str]) -> str:
+    header = [*group_by, "count", "p50_s", "p95_s", "max_s", "total_s"]
+    rows = [
+        [*summary.group, str(summary.count)]
+        + [f"{value:.3f}" for value in (summary.p50_sec, summary.p95_sec, summary.max_sec, summary.total_sec)]
+        for summary in summaries
+    ]
+    widths = [max(len(str(row[index])) for row in [header, *rows]) for index in range(len(header))]
+    return "\n".join("  ".join(str(cell).ljust(widths[index]) for index, cell in enumerate(row)).rstrip() for row in [header, *rows])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="汇总 turn 分段耗时 trace，按阶段分段、厂商和阶段输出 p50/p95")
+    parser.add_argument("paths", nargs="+", help=f"trace 文件或目录；目录下递归查找 *{TURN_TRACE_FILE_SUFFIX}")
+    parser.add_argument(
+        "--group-by",
+        default=",".join(TURN_TRACE_GROUP_FIELDS),
+        help=f"分组字段，逗号分隔，可选 {', '.join(TURN_TRACE_GROUP_FIELDS)}",
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 行输出")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    group_by = tuple(item.strip() for item in str(args.group_by or "").split(",") if item.strip())
+    unknown = sorted(set(group_by) - set(TURN_TRACE_GROUP_FIELDS))
+    if not group_by or unknown:
+        sys.stderr.write(f"无效的分组字段: {', '.join(unknown) or '(空)'}\n")
+        return 2
+    trace_files = list(iter_trace_files(args.paths))
+    if not trace_files:
+        sys.stderr.write("未找到 trace 文件\n")
+        return 1
+    events = [event for path in trace_files for event in load_trace_events(path)]
+    summaries = summarize_turn_traces(events, group_by=group_by)
+    if args.json:
+        for summary in summaries:
+            sys.stdout.write(json.dumps(summary.to_dict(group_by), ensure_ascii=False) + "\n")
+    else:
+        sys.stdout.write(render_turn_trace_summary(summaries, group_by=group_by) + "\n")
+    sys.stdout.flush()
+    return 0
+
+
+__all__ = [
+    "NULL_TURN_TRACER",
+    "TURN_TRACE_DEFAULT_MAX_BYTES",
+    "TURN_TRACE_ENV",
+    "TURN_TRACE_FILE_SUFFIX",
+    "TURN_TRACE_MAX_BYTES_ENV",
+    "TURN_TRACE_ROOT_NAME",
+    "TurnPhaseSummary",
+    "TurnTracer",
+    "build_parser",
+    "build_rotated_turn_trace_path",
+    "build_turn_trace_path",
+    "iter_trace_files",
+    "load_trace_events",
+    "main",
+    "render_turn_trace_summary",
+    "resolve_turn_trace_max_bytes",
+    "stage_from_workflow_action",
+    "summarize_turn_traces",
+    "traced_method",
+    "tracer_for",
+    "turn_tracing_enabled",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,8 @@ import re
 import shutil
 import subprocess
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -13,6 +15,7 @@ from typing import Any, Callable, Sequence
 
 SCHEMA_VERSION = "1.0"
 SCAN_TIMEOUT_SEC = 12.0
+CATALOG_CACHE_TTL_SEC = 12 * 3600.0
 VENDOR_ORDER: tuple[str, ...] = ("codex", "claude", "gemini", "opencode")
 NORMALIZED_EFFORT_LEVELS: tuple[str, ...] = ("low", "medium", "high", "xhigh", "max")
 NATIVE_REASONING_ORDER: tuple[str, ...] = ("minimal", "low", "medium", "high", "xhigh", "max")
@@ -57,6 +60,9 @@ REASONING_MODEL_FAMILY_ROUTING = "model_family_routing"
 _CATALOG_LOCK = threading.RLock()
 _CATALOG_SNAPSHOT: "CatalogSnapshot | None" = None
 _CATALOG_REFRESHED = False
+_CATALOG_REFRESH_THREAD: threading.Thread | None = None
+# 每次替换内存快照都递增；后台刷新只在代数未变时落地，避免旧结果覆盖 force_refresh 的新快照
+_CATALOG_GENERATION = 0
 
 
 @dataclass(frozen=True)
@@ -173,6 +179,7 @@ class CatalogSnapshot:
     generated_at: str
     cache_path: str
     vendors: tuple[VendorInventory, ...] = ()
+    binary_fingerprints: dict[str, dict[str, Any]] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -180,15 +187,22 @@ class CatalogSnapshot:
             "generated_at": self.generated_at,
             "cache_path": self.cache_path,
             "vendors": [item.to_dict() for item in self.vendors],
+            "binary_fingerprints": {key: dict(value) for key, value in self.binary_fingerprints.items()},
         }
 
     @classmethod
     def from_dict(cls, payload: dict[str, Any]) -> "CatalogSnapshot":
+        raw_fingerprints = payload.get("binary_fingerprints", {})
         return cls(
             schema_version=str(payload.get("schema_version", SCHEMA_VERSION)).strip() or SCHEMA_VERSION,
             generated_at=str(payload.get("generated_at", "")).strip() or _now_iso(),
             cache_path=str(payload.get("cache_path", "")).strip(),
             vendors=tuple(VendorInventory.from_dict(dict(item or {})) for item in payload.get("vendors", []) if isinstance(item, dict)),
+            binary_fingerprints={
+                str(key): dict(value)
+                for key, value in (raw_fingerprints.items() if isinstance(raw_fingerprints, dict) else ())
+                if isinstance(value, dict)
+            },
         )
 
     def vendor(self, vendor_id: str) -> VendorInventory:
@@ -314,6 +328,7 @@ def _load_cached_snapshot() -> CatalogSnapshot | None:
         generated_at=snapshot.generated_at,
         cache_path=str(cache_path),
         vendors=snapshot.vendors,
+        binary_fingerprints=snapshot.binary_fingerprints,
     )
 
 
@@ -325,10 +340,13 @@ def _save_cached_snapshot(snapshot: CatalogSnapshot) -> None:
 
 
 def reset_catalog_cache_for_tests() -> None:
-    global _CATALOG_SNAPSHOT, _CATALOG_REFRESHED
+    global _CATALOG_SNAPSHOT, _CATALOG_REFRESHED, _CATALOG_REFRESH_THREAD, _CATALOG_GENERATION
+    wait_for_catalog_refresh()
     with _CATALOG_LOCK:
         _CATALOG_SNAPSHOT = None
+        _CATALOG_GENERATION += 1
         _CATALOG_REFRESHED = False
+        _CATALOG_REFRESH_THREAD = None
 
 
 def _resolved_binary_path(binary_name: str) -> str:
@@ -338,6 +356,46 @@ def _resolved_binary_path(binary_name: str) -> str:
     return str(Path(candidate).expanduser().resolve())
 
 
+def _binary_fingerprint(binary_path: str) -> dict[str, Any]:
+    if not binary_path:
+        return {"path": "", "mtime_ns": 0, "size": 0}
+    try:
+        stat = Path(binary_path).stat()
+    except OSError:
+        return {"path": binary_path, "mtime_ns": 0, "size": 0}
+    return {"path": binary_path, "mtime_ns": int(stat.st_mtime_ns), "size": int(stat.st_size)}
+
+
+def current_binary_fingerprints() -> dict[str, dict[str, Any]]:
+    return {vendor_id: _binary_fingerprint(_resolved_binary_path(vendor_id)) for vendor_id in VENDOR_ORDER}
+
+
+def _snapshot_age_sec(snapshot: CatalogSnapshot, *, now: float | None = None) -> float | None:
+    try:
+        generated_at = datetime.fromisoformat(snapshot.generated_at)
+    except ValueError:
+        return None
+    if generated_at.tzinfo is None:
+        generated_at = generated_at.replace(tzinfo=timezone.utc)
+    return (time.time() if now is None else now) - generated_at.timestamp()
+
+
+def catalog_snapshot_is_fresh(
+    snapshot: CatalogSnapshot | None,
+    *,
+    fingerprints: dict[str, dict[str, Any]] | None = None,
+    ttl_sec: float = CATALOG_CACHE_TTL_SEC,
+    now: float | None = None,
+) -> bool:
+    if snapshot is None or snapshot.schema_version != SCHEMA_VERSION or not snapshot.binary_fingerprints:
+        return False
+    age_sec = _snapshot_age_sec(snapshot, now=now)
+    if age_sec is None or age_sec < 0 or age_sec > ttl_sec:
+        return False
+    current = current_binary_fingerprints() if fingerprints is None else fingerprints
+    return snapshot.binary_fingerprints == current
+
+
 def _unique_models(items: list[ModelInventory]) -> tuple[ModelInventory, ...]:
     seen: set[str] = set()
     ordered: list[ModelInventory] = []
@@ -997,44 +1055,98 @@ _SCANNERS: dict[str, Callable[[str], VendorInventory]] = {
 }
 
 
+def _scan_vendor(vendor_id: str, binary_path: str, prior_vendor: VendorInventory | None) -> VendorInventory:
+    if not binary_path:
+        return _unavailable_vendor(vendor_id, "")
+    scanner = _SCANNERS[vendor_id]
+    try:
+        return scanner(binary_path)
+    except Exception as error:  # noqa: BLE001
+        note = f"scan_error={type(error).__name__}"
+        if prior_vendor is not None and prior_vendor.models:
+            return _cached_degraded_vendor(vendor_id, prior_vendor, binary_path=binary_path, note=note)
+        return _fallback_vendor(vendor_id, binary_path=binary_path, note=note)
+
+
 def refresh_catalog_snapshot(*, prior_snapshot: CatalogSnapshot | None = None) -> CatalogSnapshot:
+    snapshot = _build_catalog_snapshot(prior_snapshot)
+    _save_cached_snapshot(snapshot)
+    return snapshot
+
+
+def _build_catalog_snapshot(prior_snapshot: CatalogSnapshot | None) -> CatalogSnapshot:
     cache_path = catalog_cache_path()
     prior_by_vendor = {item.vendor_id: item for item in prior_snapshot.vendors} if prior_snapshot else {}
-    vendors: list[VendorInventory] = []
-    for vendor_id in VENDOR_ORDER:
-        binary_path = _resolved_binary_path(vendor_id)
-        if not binary_path:
-            vendors.append(_unavailable_vendor(vendor_id, ""))
-            continue
-        scanner = _SCANNERS[vendor_id]
-        try:
-            inventory = scanner(binary_path)
-        except Exception as error:  # noqa: BLE001
-            prior_vendor = prior_by_vendor.get(vendor_id)
-            note = f"scan_error={type(error).__name__}"
-            if prior_vendor is not None and prior_vendor.models:
-                inventory = _cached_degraded_vendor(vendor_id, prior_vendor, binary_path=binary_path, note=note)
-            else:
-                inventory = _fallback_vendor(vendor_id, binary_path=binary_path, note=note)
-        vendors.append(inventory)
+    binary_paths = {vendor_id: _resolved_binary_path(vendor_id) for vendor_id in VENDOR_ORDER}
+    with ThreadPoolExecutor(max_workers=len(VENDOR_ORDER), thread_name_prefix="vendor-scan") as executor:
+        futures = {
+            vendor_id: executor.submit(_scan_vendor, vendor_id, binary_paths[vendor_id], prior_by_vendor.get(vendor_id))
+            for vendor_id in VENDOR_ORDER
+        }
+        vendors = [futures[vendor_id].result() for vendor_id in VENDOR_ORDER]
     snapshot = CatalogSnapshot(
         schema_version=SCHEMA_VERSION,
         generated_at=_now_iso(),
         cache_path=str(cache_path),
         vendors=tuple(vendors),
+        binary_fingerprints={vendor_id: _binary_fingerprint(binary_paths[vendor_id]) for vendor_id in VENDOR_ORDER},
     )
-    _save_cached_snapshot(snapshot)
     return snapshot
 
 
+def _run_background_catalog_refresh(prior_snapshot: CatalogSnapshot | None, generation: int) -> None:
+    global _CATALOG_SNAPSHOT, _CATALOG_GENERATION
+    try:
+        snapshot = _build_catalog_snapshot(prior_snapshot)
+    except Exception:  # noqa: BLE001
+        return
+    with _CATALOG_LOCK:
+        if generation != _CATALOG_GENERATION:
+            return
+        try:
+            _save_cached_snapshot(snapshot)
+        except OSError:
+            pass
+        _CATALOG_SNAPSHOT = snapshot
+        _CATALOG_GENERATION += 1
+
+
+def refresh_catalog_snapshot_in_background() -> threading.Thread:
+    global _CATALOG_REFRESH_THREAD
+    with _CATALOG_LOCK:
+        if _CATALOG_REFRESH_THREAD is not None and _CATALOG_REFRESH_THREAD.is_alive():
+            return _CATALOG_REFRESH_THREAD
+        thread = threading.Thread(
+            target=_run_background_catalog_refresh,
+            args=(_CATALOG_SNAPSHOT, _CATALOG_GENERATION),
+            name="vendor-catalog-refresh",
+            daemon=True,
+        )
+        _CATALOG_REFRESH_THREAD = thread
+        thread.start()
+        return thread
+
+
+def wait_for_catalog_refresh(timeout_sec: float | None = None) -> bool:
+    with _CATALOG_LOCK:
+        thread = _CATALOG_REFRESH_THREAD
+    if thread is None:
+        return True
+    thread.join(timeout=timeout_sec)
+    return not thread.is_alive()
+
+
 def get_catalog_snapshot(*, force_refresh: bool = False) -> CatalogSnapshot:
-    global _CATALOG_SNAPSHOT, _CATALOG_REFRESHED
+    global _CATALOG_SNAPSHOT, _CATALOG_REFRESHED, _CATALOG_GENERATION
     with _CATALOG_LOCK:
         if _CATALOG_SNAPSHOT is None:
             _CATALOG_SNAPSHOT = _load_cached_snapshot()
-        if force_refresh or not _CATALOG_REFRESHED:
+        if force_refresh or (not _CATALOG_REFRESHED and _CATALOG_SNAPSHOT is None):
             _CATALOG_SNAPSHOT = refresh_catalog_snapshot(prior_snapshot=_CATALOG_SNAPSHOT)
-            _CATALOG_REFRESHED = True
+            _CATALOG_GENERATION += 1
+        elif not _CATALOG_REFRESHED and not catalog_snapshot_is_fresh(_CATALOG_SNAPSHOT):
+            refresh_catalog_snapshot_in_background()
+        _CATALOG_REFRESHED = True
         if _CATALOG_SNAPSHOT is None:
             _CATALOG_SNAPSHOT = CatalogSnapshot(
                 schema_version=SCHEMA_VERSION,
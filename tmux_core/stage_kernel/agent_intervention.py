@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Mapping, Sequence
 
 from T09_terminal_ops import message, prompt_select_option
+from tmux_core.runtime.tmux_runtime import worker_attach_command
 
 AGENT_INTERVENTION_RECHECK = "recheck_after_manual_intervention"
 AGENT_INTERVENTION_WORKER_DEAD = "worker_dead_after_manual_intervention"
@@ -41,8 +42,7 @@ def _worker_state(worker: object | None) -> str:
 
 
 def _attach_command(worker: object | None) -> str:
-    session = _session_name(worker)
-    return f"tmux attach -t {session}" if session else ""
+    return worker_attach_command(worker) if _session_name(worker) else ""
 
 
 def _mark_awaiting_manual(worker: object | None, *, reason_text: str) -> None:
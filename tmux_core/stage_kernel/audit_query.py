@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from tmux_core.stage_kernel.stage_audit import (
+    STAGE_AUDIT_OFFSET_HEADER_KEY,
+    STAGE_AUDIT_OFFSET_INDEX_FIELDS,
+    build_stage_audit_log_path,
+    build_stage_audit_offset_index_path,
+    iter_stage_audit_records,
+    rebuild_stage_audit_indexes,
+    rehydrate_stage_audit_record,
+)
+
+
+_INDEX_CACHE_LOCK = threading.RLock()
+_INDEX_CACHE: dict[str, "StageAuditOffsetIndex"] = {}
+
+
+@dataclass(frozen=True)
+class StageAuditOffsetEntry:
+    offset: int
+    length: int
+    record_index: int
+    event_type: str
+    task_name: str
+    review_round_index: int | None
+    stage_run_index: int | None
+
+
+@dataclass(frozen=True)
+class StageAuditQuery:
+    event_type: str | None = None
+    task_name: str | None = None
+    review_round_index: int | None = None
+    stage_run_index: int | None = None
+
+    def constraints(self) -> tuple[tuple[str, Any], ...]:
+        return tuple(
+            (field_name, getattr(self, field_name))
+            for field_name in STAGE_AUDIT_OFFSET_INDEX_FIELDS
+            if getattr(self, field_name) is not None
+        )
+
+    def matches(self, payload: Any) -> bool:
+        for field_name, expected in self.constraints():
+            actual = payload.get(field_name) if isinstance(payload, dict) else getattr(payload, field_name, None)
+            if actual != expected:
+                return False
+        return True
+
+
+@dataclass
+class StageAuditOffsetIndex:
+    signature: tuple[int, int, int]
+    header: bytes = b""
+    log_inode: int = 0
+    entries: list[StageAuditOffsetEntry] = field(default_factory=list)
+    postings: dict[tuple[str, Any], list[int]] = field(default_factory=dict)
+    covered_size: int = 0
+    parsed_size: int = 0
+
+    def extend(self, file_obj: Any) -> None:
+        file_obj.seek(self.parsed_size)
+        for raw_line in file_obj:
+            if not raw_line.endswith(b"\n"):
+                break
+            self.parsed_size += len(raw_line)
+            try:
+                entry = _entry_from_payload(json.loads(raw_line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                entry = None
+            if entry is None or entry.offset < self.covered_size:
+                continue
+            position = len(self.entries)
+            self.entries.append(entry)
+            for field_name in STAGE_AUDIT_OFFSET_INDEX_FIELDS:
+                self.postings.setdefault((field_name, getattr(entry, field_name)), []).append(position)
+            self.covered_size = entry.offset + entry.length
+
+    def candidate_positions(self, query: StageAuditQuery) -> list[int]:
+        constraints = query.constraints()
+        if not constraints:
+            return list(range(len(self.entries)))
+        posting_lists = sorted((self.postings.get(item, []) for item in constraints), key=len)
+        if not posting_lists[0]:
+            return []
+        positions = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            positions.intersection_update(posting)
+            if not positions:
+                return []
+        return sorted(positions)
+
+
+def _optional_int(value: Any) -> int | None:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _entry_from_payload(payload: Any) -> StageAuditOffsetEntry | None:
+    if not isinstance(payload, dict):
+        return None
+    try:
+        offset = int(payload["offset"])
+        length = int(payload["length"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if offset < 0 or length <= 0:
+        return None
+    return StageAuditOffsetEntry(
+        offset=offset,
+        length=length,
+        record_index=_optional_int(payload.get("record_index")) or 0,
+        event_type=str(payload.get("event_type") or ""),
+        task_name=str(payload.get("task_name") or ""),
+        review_round_index=_optional_int(payload.get("review_round_index")),
+        stage_run_index=_optional_int(payload.get("stage_run_index")),
+    )
+
+
+def _header_log_inode(raw_line: bytes) -> int | None:
+    if not raw_line.endswith(b"\n"):
+        return None
+    try:
+        payload = json.loads(raw_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return _optional_int(payload.get(STAGE_AUDIT_OFFSET_HEADER_KEY)) if isinstance(payload, dict) else None
+
+
+def load_stage_audit_offset_index(audit_log_path: str | Path) -> StageAuditOffsetIndex | None:
+    index_path = build_stage_audit_offset_index_path(audit_log_path)
+    cache_key = str(index_path)
+    with _INDEX_CACHE_LOCK:
+        try:
+            file_obj = index_path.open("rb")
+        except OSError:
+            _INDEX_CACHE.pop(cache_key, None)
+            return None
+        with file_obj:
+            stat = os.fstat(file_obj.fileno())
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            cached = _INDEX_CACHE.get(cache_key)
+            if cached is not None and cached.signature == signature:
+                return cached
+            header = file_obj.readline()
+            # 同一 inode 且只增不减时从上次解析到的位置续读；首行变了说明索引被整体重建
+            if (
+                cached is not None
+                and cached.signature[0] == stat.st_ino
+                and cached.header == header
+                and cached.parsed_size <= stat.st_size
+            ):
+                index = cached
+            else:
+                log_inode = _header_log_inode(header)
+                if log_inode is None:
+                    _INDEX_CACHE.pop(cache_key, None)
+                    return None
+                index = StageAuditOffsetIndex(
+                    signature=signature,
+                    header=header,
+                    log_inode=log_inode,
+                    parsed_size=len(header),
+                )
+            index.extend(file_obj)
+            index.signature = signature
+            _INDEX_CACHE[cache_key] = index
+            return index
+
+
+def _index_matches_log(index: StageAuditOffsetIndex, file_obj: Any, log_inode: int, log_size: int) -> bool:
+    if index.log_inode != log_inode or index.covered_size > log_size:
+        return False
+    if not index.entries:
+        return True
+    # 流水被原地改写时 inode 不变，抽查最后一条已索引记录是否还在原位置
+    last_entry = index.entries[-1]
+    file_obj.seek(last_entry.offset)
+    record = _decode_record(file_obj.read(last_entry.length))
+    return record is not None and (_optional_int(record.get("record_index")) or 0) == last_entry.record_index
+
+
+def _decode_record(raw_line: bytes) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(raw_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def query_stage_audit_records(
+    audit_log_path: str | Path,
+    *,
+    event_type: str | None = None,
+    task_name: str | None = None,
+    review_round_index: int | None = None,
+    stage_run_index: int | None = None,
+    rehydrate: bool = True,
+) -> Iterator[dict[str, Any]]:
+    path = Path(audit_log_path)
+    query = StageAuditQuery(
+        event_type=event_type,
+        task_name=task_name,
+        review_round_index=review_round_index,
+        stage_run_index=stage_run_index,
+    )
+    try:
+        file_obj = path.open("rb")
+    except OSError:
+        return
+    with file_obj:
+        log_stat = os.fstat(file_obj.fileno())
+        log_size = log_stat.st_size
+        index = load_stage_audit_offset_index(path)
+        with _INDEX_CACHE_LOCK:
+            if index is not None and _index_matches_log(index, file_obj, log_stat.st_ino, log_size):
+                positions = index.candidate_positions(query)
+                covered_size = index.covered_size
+            else:
+                index = None
+        if index is None:
+            for record in iter_stage_audit_records(path, rehydrate=False):
+                if query.matches(record):
+                    yield rehydrate_stage_audit_record(path, record) if rehydrate else record
+            return
+        blob_cache: dict[str, str] = {}
+        for position in positions:
+            entry = index.entries[position]
+            file_obj.seek(entry.offset)
+            record = _decode_record(file_obj.read(entry.length))
+            if record is None or not query.matches(record):
+                continue
+            yield rehydrate_stage_audit_record(path, record, blob_cache=blob_cache) if rehydrate else record
+        if covered_size >= log_size:
+            return
+        file_obj.seek(covered_size)
+        for raw_line in file_obj:
+            record = _decode_record(raw_line)
+            if record is None or not query.matches(record):
+                continue
+            yield rehydrate_stage_audit_record(path, record, blob_cache=blob_cache) if rehydrate else record
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="按事件类型、任务、评审轮次和阶段运行序号查询阶段流水记录")
+    parser.add_argument("audit_log_path", nargs="?", default="", help="阶段流水 jsonl 路径")
+    parser.add_argument("--project-dir", default="", help="项目目录；未传 audit_log_path 时使用")
+    parser.add_argument("--requirement-name", default="", help="需求名称；未传 audit_log_path 时使用")
+    parser.add_argument("--stage", default="", help="阶段编号，例如 A07；未传 audit_log_path 时使用")
+    parser.add_argument("--event-type", default=None, help="事件类型，例如 review_merged")
+    parser.add_argument("--task-name", default=None, help="任务名，例如 M2-T3")
+    parser.add_argument("--review-round", type=int, default=None, help="评审轮次")
+    parser.add_argument("--stage-run", type=int, default=None, help="阶段运行序号")
+    parser.add_argument("--raw", action="store_true", help="输出原始记录，不从 audit_blobs 还原快照")
+    parser.add_argument("--count", action="store_true", help="只输出匹配记录数")
+    parser.add_argument("--reindex", action="store_true", help="查询前从流水文件重建索引")
+    return parser
+
+
+def _resolve_audit_log_path(args: argparse.Namespace) -> Path:
+    if str(args.audit_log_path or "").strip():
+        return Path(args.audit_log_path).expanduser().resolve()
+    if not args.project_dir or not args.requirement_name or not args.stage:
+        raise ValueError("需要 audit_log_path，或同时提供 --project-dir、--requirement-name、--stage")
+    return build_stage_audit_log_path(args.project_dir, args.requirement_name, args.stage)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        audit_log_path = _resolve_audit_log_path(args)
+    except ValueError as error:
+        sys.stderr.write(f"{error}\n")
+        return 2
+    if not audit_log_path.is_file():
+        sys.stderr.write(f"阶段流水文件不存在: {audit_log_path}\n")
+        return 1
+    if args.reindex:
+        rebuild_stage_audit_indexes(audit_log_path)
+    records = query_stage_audit_records(
+        audit_log_path,
+        event_type=args.event_type,
+        task_name=args.task_name,
+        review_round_index=args.review_round,
+        stage_run_index=args.stage_run,
+        rehydrate=not args.raw,
+    )
+    if args.count:
+        sys.stdout.write(f"{sum(1 for _ in records)}\n")
+        return 0
+    for record in records:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+    return 0
+
+
+__all__ = [
+    "StageAuditOffsetEntry",
+    "StageAuditOffsetIndex",
+    "StageAuditQuery",
+    "build_parser",
+    "load_stage_audit_offset_index",
+    "main",
+    "query_stage_audit_records",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
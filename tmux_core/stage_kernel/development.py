@@ -12,10 +12,11 @@ import argparse
 import json
 import shutil
 import threading
+import time
 from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import nullcontext, suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable, Sequence
 
@@ -62,11 +63,26 @@ from tmux_core.runtime.tmux_runtime import (
 )
 from tmux_core.stage_kernel.detailed_design import collect_ba_agent_selection
 from tmux_core.stage_kernel.reviewer_orchestration import (
+    REVIEW_DECISION_WAIT_ALL,
+    LateReviewerResult,
+    PendingReviewerTurns,
+    ReviewDecisionPolicy,
+    parse_review_decision_policy,
+    read_review_verdict,
     repair_reviewer_round_outputs,
     run_parallel_reviewer_round,
     shutdown_stage_workers,
 )
 from tmux_core.stage_kernel.prompt_turns import build_prompt_task_turn
+from tmux_core.stage_kernel.development_scheduler import (
+    PARALLEL_WORKTREE_DIRNAME,
+    DevelopedTask,
+    GitWorktreePool,
+    ParallelDevelopmentScheduler,
+    build_task_dependency_path,
+    load_passed_tasks,
+    load_task_dependency_graph,
+)
 from tmux_core.stage_kernel.death_orchestration import (
     ensure_active_reviewers,
     run_main_phase_with_death_handling,
@@ -77,6 +93,13 @@ from tmux_core.stage_kernel.agent_intervention import (
     request_worker_manual_intervention,
 )
 from tmux_core.stage_kernel.requirement_concurrency import requirement_concurrency_lock
+from tmux_core.stage_kernel.review_diff_context import (
+    REVIEW_DIFF_CONTEXT_DIRNAME,
+    ReviewDiffTracker,
+    begin_review_diff_task,
+    record_review_diff_round,
+    render_review_diff_appendix,
+)
 from tmux_core.stage_kernel.runtime_scope_cleanup import cleanup_runtime_dirs_by_scope
 from tmux_core.stage_kernel.stage_audit import (
     StageAuditRunContext,
@@ -165,6 +188,9 @@ MAX_DEVELOPMENT_HITL_ROUNDS = 8
 MAX_DEVELOPMENT_REVIEW_ROUNDS = 5
 MAX_DEVELOPER_METADATA_REPAIR_ATTEMPTS = 2
 DEFAULT_DEVELOPER_MAX_TURNS = 15
+PIPELINE_STASH_DIRNAME = "pipeline_stash"
+PARALLEL_SHUTDOWN_WAIT_SEC = 60.0
+PIPELINE_PREEMPT_WAIT_SEC = 60.0
 PLACEHOLDER_NEXT_STEP = "下一步进入测试阶段（待接入）"
 
 DEFAULT_DEVELOPMENT_REVIEWER_PROMPTS: dict[str, str] = {
@@ -274,6 +300,18 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--developer-max-turns", default=None, help="开发工程师最大对话轮数；传 infinite 表示不重建，默认 15")
     parser.add_argument("--review-max-rounds", default="", help="代码评审最多重试几轮；传 infinite 表示不设上限")
     parser.add_argument("--subagent-num", type=int, default=None, help="开发工程师自检使用的 subagent 数量")
+    parser.add_argument("--parallel-workers", type=int, default=1, help="按任务依赖并行开发的开发工程师数量；默认 1 表示串行")
+    parser.add_argument(
+        "--pipeline-review",
+        action="store_true",
+        help="流水线评审：评审当前任务期间，在独立 worktree 中预先开发下一个任务；评审未通过时作废预开发结果",
+    )
+    parser.add_argument(
+        "--review-decision-policy",
+        type=parse_review_decision_policy,
+        default=REVIEW_DECISION_WAIT_ALL,
+        help="评审轮次提前结束策略：all（等待全部审核器，默认）、any-fail（任一不通过即判定）、k-of-n（k 个通过且已完成的审核器无不通过即判定，如 2-of-n）",
+    )
     parser.add_argument("--reviewer-agent", action="append", default=[], help="审核智能体模型配置: name=<key>,vendor=...,model=...,effort=...,proxy=...")
     parser.add_argument("--reviewer-role", action="append", default=[], help="重复传入以覆盖代码评审角色列表")
     parser.add_argument("--reviewer-role-prompt", action="append", default=[], help="重复传入以覆盖对应角色提示词")
@@ -696,15 +734,18 @@ def create_developer_runtime(
     role_prompt: str,
     launch_coordinator: LaunchCoordinator | None = None,
     run_id: str = "",
+    worker_id: str = "",
+    work_dir: str | Path | None = None,
 ) -> DeveloperRuntime:
     project_root = Path(project_dir).expanduser().resolve()
+    resolved_worker_id = str(worker_id or "").strip() or build_developer_worker_id()
     selection, config = resolve_agent_run_config_with_recovery(
         selection,
-        role_label=_developer_display_name(project_dir=project_root),
+        role_label=_predict_worker_display_name(project_dir=project_root, worker_id=resolved_worker_id),
     )
     worker = TmuxBatchWorker(
-        worker_id=build_developer_worker_id(),
-        work_dir=project_root,
+        worker_id=resolved_worker_id,
+        work_dir=Path(work_dir).expanduser().resolve() if work_dir is not None else project_root,
         config=config,
         runtime_root=build_development_runtime_root(project_root, requirement_name),
         launch_coordinator=launch_coordinator,
@@ -2312,6 +2353,8 @@ def _run_parallel_reviewers(
     prompt_builder,
     label_prefix: str,
     progress: ReviewStageProgress | None = None,
+    decision_policy: ReviewDecisionPolicy = REVIEW_DECISION_WAIT_ALL,
+    pending_reviews: PendingReviewerTurns | None = None,
 ) -> list[ReviewerRuntime]:
     if progress is not None:
         progress.set_phase(f"任务开发 / {task_name} 评审第 {round_index} 轮")
@@ -2339,9 +2382,36 @@ def _run_parallel_reviewers(
         key_func=lambda reviewer: reviewer.reviewer_name,
         run_turn=run_review_turn,
         error_prefix=f"{task_name} 代码评审智能体执行失败:",
+        decision_policy=decision_policy,
+        verdict_func=lambda reviewer: read_review_verdict(reviewer.review_json_path, task_name),
+        pending=pending_reviews,
     )
 
 
+def _rejoin_pending_reviewers(
+    pending_reviews: PendingReviewerTurns,
+    reviewers: Sequence[ReviewerRuntime],
+    *,
+    task_name: str,
+    audit_context: StageAuditRunContext | None = None,
+) -> list[ReviewerRuntime]:
+    if not pending_reviews.pending_keys():
+        return list(reviewers)
+
+    def record_late_result(late: LateReviewerResult) -> None:
+        verdict_text = {True: "通过", False: "未通过"}.get(late.verdict, "未知")
+        message(f"{task_name} 迟到评审结果: {late.reviewer_key} {verdict_text}{f'（{late.error}）' if late.error else ''}")
+        append_stage_audit_record(
+            audit_context,
+            event_type="review_late_result",
+            source_paths={},
+            task_name=task_name,
+            metadata={"reviewer": late.reviewer_key, "review_pass": late.verdict, "error": late.error},
+        )
+
+    return pending_reviews.rejoin(reviewers, on_late_result=record_late_result)
+
+
 def repair_reviewer_outputs(
     reviewers: Sequence[ReviewerRuntime],
     *,
@@ -3046,6 +3116,255 @@ def _export_reviewer_handoff(
     return tuple(handoffs)
 
 
+@dataclass
+class ParallelDevelopmentState:
+    scheduler: ParallelDevelopmentScheduler
+    worktree_pool: GitWorktreePool
+    slot_developers: dict[int, DeveloperRuntime]
+    slot_lock: threading.Lock
+    speculation_commits: dict[str, str] = field(default_factory=dict)
+    retired_developers: list[DeveloperRuntime] = field(default_factory=list)
+
+
+def build_parallel_developer_worker_id(slot_index: int) -> str:
+    return f"{build_developer_worker_id()}-p{int(slot_index) + 1}"
+
+
+def build_parallel_slot_paths(paths: dict[str, Path], *, runtime_root: str | Path, slot_index: int) -> dict[str, Path]:
+    slot_paths = dict(paths)
+    slot_dir = Path(runtime_root) / "parallel" / f"slot-{int(slot_index)}"
+    slot_dir.mkdir(parents=True, exist_ok=True)
+    slot_paths["developer_output_path"] = slot_dir / paths["developer_output_path"].name
+    return slot_paths
+
+
+def start_parallel_development(
+    *,
+    project_dir: str | Path,
+    requirement_name: str,
+    paths: dict[str, Path],
+    max_workers: int,
+    developer_plan: DeveloperPlan,
+    reviewer_specs_by_name: dict[str, DevelopmentReviewerSpec],
+    subagent_num: int,
+    max_turns: int | None,
+    launch_coordinator: LaunchCoordinator | None = None,
+    inline_task: str = "",
+    pipeline_review: bool = False,
+) -> ParallelDevelopmentState | None:
+    if max_workers <= 1 and not pipeline_review:
+        return None
+    project_root = Path(project_dir).expanduser().resolve()
+    dependency_path = build_task_dependency_path(project_root, requirement_name)
+    if not dependency_path.is_file() and not pipeline_review:
+        message(f"未找到《{dependency_path.name}》，任务之间按顺序依赖，继续串行开发")
+        return None
+    if not GitWorktreePool.available(project_root):
+        message("项目目录不是 git 仓库根目录，无法创建独立 worktree，继续串行开发")
+        return None
+    graph = load_task_dependency_graph(paths["task_json_path"], dependency_path)
+    runtime_root = build_development_runtime_root(project_root, requirement_name)
+    worktree_pool = GitWorktreePool(project_root, runtime_root / PARALLEL_WORKTREE_DIRNAME)
+    slot_developers: dict[int, DeveloperRuntime] = {}
+    slot_lock = threading.Lock()
+    speculation_commits: dict[str, str] = {}
+    worktree_pool.record_reviewed_base()
+
+    def develop_in_worktree(task_name: str, slot_index: int) -> DevelopedTask:
+        speculative_base = scheduler.speculative_base(task_name)
+        with slot_lock:
+            base_commit = speculation_commits.get(speculative_base or "", "")
+        if not base_commit:
+            base_commit = worktree_pool.reviewed_base()
+        slot_root = worktree_pool.checkout_slot(slot_index, base_commit)
+        slot_paths = build_parallel_slot_paths(paths, runtime_root=runtime_root, slot_index=slot_index)
+        try:
+            code_change = develop_slot_task(task_name, slot_index, slot_root, slot_paths)
+        except Exception as error:  # noqa: BLE001
+            if not scheduler.is_preempted(task_name):
+                raise
+            # 预开发被评审未通过打断时，仍收集已写出的代码，交给 stash_preempted_speculation 保存。
+            return DevelopedTask(
+                task_name=task_name,
+                slot_index=slot_index,
+                patch=worktree_pool.collect_patch(slot_root, base_commit),
+                error=error,
+            )
+        return DevelopedTask(
+            task_name=task_name,
+            slot_index=slot_index,
+            code_change=code_change,
+            patch=worktree_pool.collect_patch(slot_root, base_commit),
+        )
+
+    def develop_slot_task(task_name: str, slot_index: int, slot_root: Path, slot_paths: dict[str, Path]) -> str:
+        turn_policy = DeveloperTurnPolicy(max_turns)
+        with slot_lock:
+            slot_developer = slot_developers.get(slot_index)
+        if slot_developer is None:
+            slot_developer = create_developer_runtime(
+                project_dir=project_root,
+                requirement_name=requirement_name,
+                selection=developer_plan.selection,
+                role_prompt=developer_plan.role_prompt,
+                launch_coordinator=launch_coordinator,
+                worker_id=build_parallel_developer_worker_id(slot_index),
+                work_dir=slot_root,
+            )
+            with slot_lock:
+                slot_developers[slot_index] = slot_developer
+            slot_developer, _ = initialize_development_workers(
+                slot_developer,
+                project_dir=project_root,
+                requirement_name=requirement_name,
+                paths=slot_paths,
+                reviewers=(),
+                reviewer_specs_by_name=reviewer_specs_by_name,
+                initialize_developer=True,
+                initialize_reviewers=False,
+                turn_policy=turn_policy,
+            )
+        if scheduler.is_preempted(task_name):
+            raise RuntimeError(f"{task_name} 的预开发已作废")
+        slot_developer, code_change = develop_current_task(
+            slot_developer,
+            paths=slot_paths,
+            task_name=task_name,
+            subagent_num=subagent_num,
+            turn_policy=turn_policy,
+        )
+        with slot_lock:
+            if not scheduler.is_preempted(task_name):
+                slot_developers[slot_index] = slot_developer
+        return code_change
+
+    scheduler = ParallelDevelopmentScheduler(
+        graph,
+        max_workers=max_workers,
+        develop_task=develop_in_worktree,
+        passed_tasks=load_passed_tasks(paths["task_json_path"]),
+        auto_schedule=max_workers > 1,
+    )
+    if inline_task:
+        scheduler.claim(inline_task)
+    scheduler.start()
+    if max_workers > 1:
+        message(f"已启用并行开发: 最多 {scheduler.max_workers} 个开发工程师在独立 worktree 中按依赖并行开发")
+    if pipeline_review:
+        message("已启用流水线评审: 评审当前任务期间，下一个任务在独立 worktree 中预先开发")
+    return ParallelDevelopmentState(
+        scheduler=scheduler,
+        worktree_pool=worktree_pool,
+        slot_developers=slot_developers,
+        slot_lock=slot_lock,
+        speculation_commits=speculation_commits,
+    )
+
+
+def speculate_parallel_development(state: ParallelDevelopmentState, *, task_name: str) -> str | None:
+    # 流水线预开发有意基于评审中的代码；评审未通过时该预开发会被作废。
+    commit = state.worktree_pool.snapshot_working_tree()
+    with state.slot_lock:
+        state.speculation_commits[task_name] = commit
+    return state.scheduler.speculate_after(task_name)
+
+
+def preempt_parallel_speculation(state: ParallelDevelopmentState, *, task_name: str) -> list[str]:
+    preempted = state.scheduler.preempt_speculation(task_name)
+    for preempted_task in preempted:
+        slot_index = state.scheduler.running_slot(preempted_task)
+        if slot_index is None:
+            continue
+        with state.slot_lock:
+            slot_developer = state.slot_developers.pop(slot_index, None)
+            if slot_developer is not None:
+                state.retired_developers.append(slot_developer)
+        if slot_developer is not None:
+            # 中断预开发的智能体，停止消耗额度并尽快释放 slot；已写出的代码由 slot 线程收集成补丁。
+            slot_developer.worker.request_kill()
+    return preempted
+
+
+def mark_parallel_task_passed(state: ParallelDevelopmentState, *, task_name: str) -> None:
+    state.worktree_pool.record_reviewed_base()
+    with state.slot_lock:
+        state.speculation_commits.pop(task_name, None)
+    state.scheduler.mark_passed(task_name)
+
+
+def take_parallel_development_result(
+    state: ParallelDevelopmentState,
+    *,
+    task_name: str,
+    paths: dict[str, Path],
+    progress: ReviewStageProgress | None = None,
+) -> str | None:
+    if state.scheduler.is_preempted(task_name):
+        stash_preempted_speculation(state, task_name=task_name)
+    if not state.scheduler.is_scheduled(task_name):
+        state.scheduler.claim(task_name)
+        return None
+    if progress is not None and not state.scheduler.has_result(task_name):
+        progress.set_phase(f"任务开发 / 等待并行开发结果 | {task_name}")
+    result = state.scheduler.wait_for(task_name)
+    if result.error is not None:
+        message(f"{task_name} 并行开发失败，改由主开发工程师串行开发: {result.error}")
+        return None
+    if not state.worktree_pool.apply_patch(result.patch):
+        message(f"{task_name} 并行开发结果无法合并回主工作区，改由主开发工程师串行开发")
+        return None
+    slot_output_path = build_parallel_slot_paths(
+        paths,
+        runtime_root=state.worktree_pool.worktree_root.parent,
+        slot_index=result.slot_index,
+    )["developer_output_path"]
+    if slot_output_path.exists():
+        shutil.copyfile(slot_output_path, paths["developer_output_path"])
+    return result.code_change
+
+
+def stash_preempted_speculation(state: ParallelDevelopmentState, *, task_name: str) -> Path | None:
+    result = state.scheduler.result_for(task_name, timeout_sec=PIPELINE_PREEMPT_WAIT_SEC)
+    if result is None:
+        message(f"{task_name} 的预开发在 {PIPELINE_PREEMPT_WAIT_SEC:g} 秒内未结束，未保存预开发补丁，由主开发工程师重新开发")
+        return None
+    if not result.patch.strip():
+        message(f"{task_name} 的预开发已作废且没有代码改动，由主开发工程师基于评审修改后的代码重新开发")
+        return None
+    stash_dir = state.worktree_pool.worktree_root.parent / PIPELINE_STASH_DIRNAME
+    stash_dir.mkdir(parents=True, exist_ok=True)
+    stash_path = stash_dir / f"{sanitize_requirement_name(task_name)}.patch"
+    stash_path.write_bytes(result.patch)
+    message(f"{task_name} 的预开发已作废，预开发补丁保存在《{stash_path}》，由主开发工程师重新开发")
+    return stash_path
+
+
+def shutdown_parallel_development(state: ParallelDevelopmentState | None) -> tuple[str, ...]:
+    if state is None:
+        return ()
+    state.scheduler.shutdown(wait=False)
+    removed: list[str] = []
+    stopped: set[int] = set()
+
+    def stop_slot_developers() -> None:
+        with state.slot_lock:
+            slot_developers = [*state.slot_developers.values(), *state.retired_developers]
+        for slot_developer in slot_developers:
+            if id(slot_developer) in stopped:
+                continue
+            stopped.add(id(slot_developer))
+            removed.extend(shutdown_stage_workers(slot_developer, (), cleanup_runtime=True))
+
+    stop_slot_developers()
+    finished = state.scheduler.shutdown(wait=True, timeout_sec=PARALLEL_SHUTDOWN_WAIT_SEC)
+    stop_slot_developers()
+    if not finished:
+        message(f"并行开发线程在 {PARALLEL_SHUTDOWN_WAIT_SEC:g} 秒内未退出，保留 worktree: {state.worktree_pool.worktree_root}")
+        return tuple(removed)
+    removed.extend(state.worktree_pool.cleanup())
+    return tuple(removed)
+
+
 def _shutdown_workers(
     developer: DeveloperRuntime | None,
     reviewers: Sequence[ReviewerRuntime],
@@ -3086,6 +3405,9 @@ def run_development_stage(
     progress = ReviewStageProgress(initial_phase="任务开发准备中")
     developer: DeveloperRuntime | None = None
     reviewer_workers: list[ReviewerRuntime] = []
+    parallel_state: ParallelDevelopmentState | None = None
+    pending_reviews = PendingReviewerTurns()
+    pending_review_task = ""
     cleanup_records: list[str] = []
     audit_context: StageAuditRunContext | None = None
     current_task_name = ""
@@ -3282,9 +3604,32 @@ def run_development_stage(
             notify=message,
         )
         review_round_policy = ReviewRoundPolicy(review_round_limit)
+        review_decision_policy = getattr(args, "review_decision_policy", REVIEW_DECISION_WAIT_ALL)
+        if isinstance(review_decision_policy, str):
+            review_decision_policy = parse_review_decision_policy(review_decision_policy)
+        parallel_state = start_parallel_development(
+            project_dir=project_dir,
+            requirement_name=requirement_name,
+            paths=paths,
+            max_workers=int(getattr(args, "parallel_workers", 1) or 1),
+            developer_plan=developer_plan,
+            reviewer_specs_by_name=reviewer_specs_by_name,
+            subagent_num=subagent_num,
+            max_turns=developer_turn_policy.max_turns,
+            launch_coordinator=launch_coordinator,
+            inline_task=str(next_task),
+            pipeline_review=bool(getattr(args, "pipeline_review", False)),
+        )
+        review_diff_tracker = ReviewDiffTracker.create(
+            project_dir,
+            build_development_runtime_root(project_dir, requirement_name) / REVIEW_DIFF_CONTEXT_DIRNAME,
+            requirement_name=requirement_name,
+        )
 
         while next_task is not None:
             current_task_name = str(next_task)
+            task_started_at = time.monotonic()
+            begin_review_diff_task(review_diff_tracker, current_task_name)
             if not reviewers_built:
                 reviewer_workers = build_reviewer_workers(
                     args,
@@ -3323,40 +3668,69 @@ def run_development_stage(
                 )
                 reviewers_initialized = True
             else:
-                (developer, code_change), reviewer_workers, developer = run_main_phase_with_death_handling(
-                    developer,
-                    reviewers=reviewer_workers,
-                    run_phase=lambda current_developer: develop_current_task(
-                        current_developer,
+                code_change = None
+                if parallel_state is not None:
+                    code_change = take_parallel_development_result(
+                        parallel_state,
+                        task_name=next_task,
                         paths=paths,
-                            task_name=next_task,
-                            subagent_num=subagent_num,
-                            progress=progress,
-                            turn_policy=developer_turn_policy,
-                            replace_dead_developer=lambda active_developer, error: _replace_dead_developer_with_bootstrap(
-                                active_developer,
-                                paths=paths,
-                                reviewer_specs_by_name=reviewer_specs_by_name,
-                                project_dir=project_dir,
-                                requirement_name=requirement_name,
+                        progress=progress,
+                    )
+                if code_change is not None:
+                    task_started_at = time.monotonic()
+                    append_stage_audit_record(
+                        audit_context,
+                        event_type="developer_output",
+                        source_paths={"developer_output": paths["developer_output_path"]},
+                        task_name=next_task,
+                        metadata={"trigger": "parallel_development"},
+                    )
+                else:
+                    (developer, code_change), reviewer_workers, developer = run_main_phase_with_death_handling(
+                        developer,
+                        reviewers=reviewer_workers,
+                        run_phase=lambda current_developer: develop_current_task(
+                            current_developer,
+                            paths=paths,
+                                task_name=next_task,
+                                subagent_num=subagent_num,
                                 progress=progress,
                                 turn_policy=developer_turn_policy,
-                                launch_coordinator=launch_coordinator,
-                                error=error,
+                                replace_dead_developer=lambda active_developer, error: _replace_dead_developer_with_bootstrap(
+                                    active_developer,
+                                    paths=paths,
+                                    reviewer_specs_by_name=reviewer_specs_by_name,
+                                    project_dir=project_dir,
+                                    requirement_name=requirement_name,
+                                    progress=progress,
+                                    turn_policy=developer_turn_policy,
+                                    launch_coordinator=launch_coordinator,
+                                    error=error,
+                                ),
+                                audit_context=audit_context,
                             ),
-                            audit_context=audit_context,
-                        ),
-                        owner_getter=lambda result: result[0],
-                    replace_dead_main_owner=replace_dead_developer_owner,
-                    main_label="开发工程师",
-                    reviewer_label_getter=reviewer_label_getter,
-                    notify=message,
-                )
+                            owner_getter=lambda result: result[0],
+                        replace_dead_main_owner=replace_dead_developer_owner,
+                        main_label="开发工程师",
+                        reviewer_label_getter=reviewer_label_getter,
+                        notify=message,
+                    )
 
+            if parallel_state is not None and bool(getattr(args, "pipeline_review", False)):
+                speculative_task = speculate_parallel_development(parallel_state, task_name=current_task_name)
+                if speculative_task:
+                    message(f"流水线评审: 评审 {current_task_name} 期间预先开发 {speculative_task}")
             round_index = 1
             post_hitl_continue_completed = False
             while True:
                 if not review_round_policy.initial_review_done:
+                    reviewer_workers = _rejoin_pending_reviewers(
+                        pending_reviews,
+                        reviewer_workers,
+                        task_name=pending_review_task,
+                        audit_context=audit_context,
+                    )
+                    review_diff_round = record_review_diff_round(review_diff_tracker, round_index)
                     prepare_review_round_artifacts(
                         paths,
                         reviewer_workers,
@@ -3382,9 +3756,11 @@ def run_development_stage(
                                 detailed_design_md=str(paths["detailed_design_path"].resolve()),
                                 review_md=str(reviewer.review_md_path.resolve()),
                                 review_json=str(reviewer.review_json_path.resolve()),
-                            ),
+                            ) + render_review_diff_appendix(review_diff_round),
                             label_prefix=f"development_review_init_{sanitize_requirement_name(next_task)}",
                             progress=progress,
+                            decision_policy=review_decision_policy,
+                            pending_reviews=pending_reviews,
                         ),
                         replace_dead_main_owner=replace_dead_developer_owner,
                         replace_dead_reviewer=replace_dead_reviewer,
@@ -3429,6 +3805,13 @@ def run_development_stage(
                             notify=message,
                         )
                     post_hitl_continue_completed = False
+                    reviewer_workers = _rejoin_pending_reviewers(
+                        pending_reviews,
+                        reviewer_workers,
+                        task_name=pending_review_task,
+                        audit_context=audit_context,
+                    )
+                    review_diff_round = record_review_diff_round(review_diff_tracker, round_index)
                     prepare_review_round_artifacts(
                         paths,
                         reviewer_workers,
@@ -3455,9 +3838,11 @@ def run_development_stage(
                                 detailed_design_md=str(paths["detailed_design_path"].resolve()),
                                 review_md=str(reviewer.review_md_path.resolve()),
                                 review_json=str(reviewer.review_json_path.resolve()),
-                            ),
+                            ) + render_review_diff_appendix(review_diff_round),
                             label_prefix=f"development_review_again_{sanitize_requirement_name(next_task)}",
                             progress=progress,
+                            decision_policy=review_decision_policy,
+                            pending_reviews=pending_reviews,
                         ),
                         replace_dead_main_owner=replace_dead_developer_owner,
                         main_label="开发工程师",
@@ -3465,6 +3850,7 @@ def run_development_stage(
                         notify=message,
                     )
 
+                pending_review_task = next_task
                 review_round_policy.record_review_attempt()
                 reviewer_workers, developer = run_reviewer_phase_with_death_handling(
                     developer,
@@ -3520,6 +3906,9 @@ def run_development_stage(
                         task_name=next_task,
                     )
                     break
+                if parallel_state is not None:
+                    for preempted_task in preempt_parallel_speculation(parallel_state, task_name=current_task_name):
+                        message(f"流水线评审: {current_task_name} 评审未通过，中断并作废 {preempted_task} 的预开发")
                 review_msg = get_markdown_content(paths["merged_review_path"]).strip()
                 if not review_msg:
                     raise RuntimeError(f"{next_task} 代码评审未通过，但《{paths['merged_review_path'].name}》为空")
@@ -3608,6 +3997,13 @@ def run_development_stage(
                 round_index += 1
 
             next_task = get_first_false_task(paths["task_json_path"])
+            if parallel_state is not None:
+                parallel_state.scheduler.record_serial_duration(current_task_name, time.monotonic() - task_started_at)
+                mark_parallel_task_passed(parallel_state, task_name=current_task_name)
+                scheduled_task = parallel_state.scheduler.next_task()
+                if next_task is not None and scheduled_task and scheduled_task != next_task:
+                    message(f"按《任务依赖》调整开发顺序: 任务单中的下一个任务是 {next_task}，先开发其依赖就绪的 {scheduled_task}")
+                    next_task = scheduled_task
             if (
                 next_task is not None
                 and developer is not None
@@ -3634,6 +4030,15 @@ def run_development_stage(
             review_round_policy = ReviewRoundPolicy(review_round_limit)
 
         current_task_name = ""
+        reviewer_workers = _rejoin_pending_reviewers(
+            pending_reviews,
+            reviewer_workers,
+            task_name=pending_review_task,
+            audit_context=audit_context,
+        )
+        if parallel_state is not None:
+            message(parallel_state.scheduler.report().render())
+        cleanup_records.extend(shutdown_parallel_development(parallel_state))
         result_developer_handoff = _export_developer_handoff(developer) if preserve_workers else None
         result_reviewer_handoff = _export_reviewer_handoff(
             reviewer_workers,
@@ -3694,6 +4099,7 @@ def run_development_stage(
             },
             metadata={"error": str(error)},
         )
+        shutdown_parallel_development(parallel_state)
         _shutdown_workers(
             developer,
             reviewer_workers,
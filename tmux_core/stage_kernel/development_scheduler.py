@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from T01_tools import get_task_ledger
+from T12_requirements_common import sanitize_requirement_name
+from tmux_core.runtime.turn_trace import TURN_TRACE_ROOT_NAME
+from tmux_core.stage_kernel.requirement_concurrency import LOCK_ROOT_NAME
+from tmux_core.workflow.stage_registry import STAGE_ENTRYPOINTS
+
+
+TASK_DEPENDENCY_FILE_SUFFIX = "_任务依赖.json"
+PARALLEL_WORKTREE_DIRNAME = "worktrees"
+PARALLEL_GIT_TIMEOUT_SEC = 120.0
+PARALLEL_COMMIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "TmuxCodingTeam A07",
+    "GIT_AUTHOR_EMAIL": "a07@tmux-coding-team.local",
+    "GIT_COMMITTER_NAME": "TmuxCodingTeam A07",
+    "GIT_COMMITTER_EMAIL": "a07@tmux-coding-team.local",
+}
+REQUIREMENTS_INTAKE_CACHE_DIR_NAME = ".requirements_intake_cache"
+# 各阶段运行目录以 stage_registry 为准；这里只补充不挂在阶段入口上的运行期目录。
+AUXILIARY_RUNTIME_DIR_NAMES: tuple[str, ...] = (
+    ".requirements_analysis_runtime",
+    ".routing_init_runtime",
+    ".tmux_workflow",
+    LOCK_ROOT_NAME,
+    REQUIREMENTS_INTAKE_CACHE_DIR_NAME,
+    TURN_TRACE_ROOT_NAME,
+)
+RUNTIME_SNAPSHOT_EXCLUDES: tuple[str, ...] = tuple(
+    sorted(
+        {
+            *(entrypoint.runtime_root_name for entrypoint in STAGE_ENTRYPOINTS.values() if entrypoint.runtime_root_name),
+            *AUXILIARY_RUNTIME_DIR_NAMES,
+        }
+    )
+)
+
+
+def build_task_dependency_path(project_dir: str | Path, requirement_name: str) -> Path:
+    project_root = Path(project_dir).expanduser().resolve()
+    return project_root / f"{sanitize_requirement_name(requirement_name)}{TASK_DEPENDENCY_FILE_SUFFIX}"
+
+
+@dataclass(frozen=True)
+class TaskDependencyGraph:
+    task_order: tuple[str, ...]
+    dependencies: Mapping[str, frozenset[str]]
+    explicit: bool = False
+
+    def topological_order(self) -> tuple[str, ...]:
+        position = {task_name: index for index, task_name in enumerate(self.task_order)}
+        remaining = {task_name: set(self.dependencies.get(task_name, ())) for task_name in self.task_order}
+        ordered: list[str] = []
+        while remaining:
+            ready = [task_name for task_name, deps in remaining.items() if not deps]
+            if not ready:
+                cycle = ", ".join(sorted(remaining, key=position.__getitem__))
+                raise ValueError(f"任务依赖存在环: {cycle}")
+            chosen = min(ready, key=position.__getitem__)
+            ordered.append(chosen)
+            remaining.pop(chosen)
+            for deps in remaining.values():
+                deps.discard(chosen)
+        return tuple(ordered)
+
+    def ready_tasks(self, passed: Iterable[str], started: Iterable[str] = ()) -> list[str]:
+        passed_set = set(passed)
+        excluded = passed_set | set(started)
+        return [
+            task_name
+            for task_name in self.topological_order()
+            if task_name not in excluded and self.dependencies.get(task_name, frozenset()) <= passed_set
+        ]
+
+
+def _task_order_from_progress(payload: Any) -> tuple[str, ...]:
+    if not isinstance(payload, dict):
+        return ()
+    order: list[str] = []
+    for tasks in payload.values():
+        if isinstance(tasks, dict):
+            order.extend(str(task_name) for task_name in tasks)
+    return tuple(order)
+
+
+def load_passed_tasks(task_json_path: str | Path) -> tuple[str, ...]:
+    payload = get_task_ledger(task_json_path).snapshot()
+    if not isinstance(payload, dict):
+        return ()
+    return tuple(
+        str(task_name)
+        for tasks in payload.values()
+        if isinstance(tasks, dict)
+        for task_name, done in tasks.items()
+        if done is True
+    )
+
+
+def _sequential_dependencies(task_order: Sequence[str]) -> dict[str, frozenset[str]]:
+    return {
+        task_name: frozenset((task_order[index - 1],)) if index > 0 else frozenset()
+        for index, task_name in enumerate(task_order)
+    }
+
+
+def load_task_dependency_graph(
+    task_json_path: str | Path,
+    dependency_path: str | Path | None = None,
+) -> TaskDependencyGraph:
+    task_order = _task_order_from_progress(get_task_ledger(task_json_path).snapshot())
+    if not task_order:
+        raise ValueError(f"任务单 JSON 不合法或为空: {task_json_path}")
+    path = Path(dependency_path) if dependency_path is not None else None
+    if path is None or not path.is_file():
+        return TaskDependencyGraph(task_order=task_order, dependencies=_sequential_dependencies(task_order))
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(payload, dict) and isinstance(payload.get("dependencies"), dict):
+        payload = payload["dependencies"]
+    if not isinstance(payload, dict):
+        raise ValueError(f"任务依赖文件必须是对象: {path}")
+    known = set(task_order)
+    dependencies: dict[str, frozenset[str]] = {}
+    for task_name in task_order:
+        raw_deps = payload.get(task_name, [])
+        if isinstance(raw_deps, str):
+            raw_deps = [raw_deps]
+        if not isinstance(raw_deps, (list, tuple)):
+            raise ValueError(f"任务 {task_name} 的依赖必须是任务名列表: {path}")
+        unknown = [str(item) for item in raw_deps if str(item) not in known]
+        if unknown:
+            raise ValueError(f"任务 {task_name} 依赖了不存在的任务: {', '.join(unknown)}")
+        dependencies[task_name] = frozenset(str(item) for item in raw_deps if str(item) != task_name)
+    graph = TaskDependencyGraph(task_order=task_order, dependencies=dependencies, explicit=True)
+    graph.topological_order()
+    return graph
+
+
+class GitWorktreePool:
+    def __init__(self, project_root: str | Path, worktree_root: str | Path) -> None:
+        self.project_root = Path(project_root).expanduser().resolve()
+        self.worktree_root = Path(worktree_root).expanduser().resolve()
+        self.reviewed_commit = ""
+        self._lock = threading.Lock()
+
+    def _git(
+        self,
+        *args: str,
+        cwd: Path | None = None,
+        input_bytes: bytes | None = None,
+        env: Mapping[str, str] | None = None,
+        check: bool = True,
+    ) -> subprocess.CompletedProcess[bytes]:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=str(cwd or self.project_root),
+            input=input_bytes,
+            capture_output=True,
+            timeout=PARALLEL_GIT_TIMEOUT_SEC,
+            env={**os.environ, **PARALLEL_COMMIT_IDENTITY, **dict(env or {})},
+            check=False,
+        )
+        if check and completed.returncode != 0:
+            detail = completed.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"git {' '.join(args)} 失败: {detail}")
+        return completed
+
+    @staticmethod
+    def available(project_root: str | Path) -> bool:
+        root = Path(project_root).expanduser().resolve()
+        try:
+            completed = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel"],
+                cwd=str(root),
+                capture_output=True,
+                timeout=PARALLEL_GIT_TIMEOUT_SEC,
+                check=False,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return False
+        if completed.returncode != 0:
+            return False
+        return Path(completed.stdout.decode("utf-8").strip()).resolve() == root
+
+    def _add_pathspecs(self, excludes: Sequence[str] = ()) -> list[str]:
+        return ["-A", "--", ".", *(f":(exclude){name}" for name in (*RUNTIME_SNAPSHOT_EXCLUDES, *excludes))]
+
+    def snapshot_working_tree(self, excludes: Sequence[str] = ()) -> str:
+        with self._lock:
+            self.worktree_root.mkdir(parents=True, exist_ok=True)
+            index_path = self.worktree_root / f".snapshot.{os.getpid()}.index"
+            env = {"GIT_INDEX_FILE": str(index_path)}
+            try:
+                head = self._git("rev-parse", "--verify", "-q", "HEAD", check=False).stdout.decode("utf-8").strip()
+                if head:
+                    self._git("read-tree", head, env=env)
+                self._git("add", *self._add_pathspecs(excludes), env=env)
+                tree = self._git("write-tree", env=env).stdout.decode("utf-8").strip()
+                parents = ["-p", head] if head else []
+                commit = self._git("commit-tree", tree, *parents, "-m", "A07 parallel snapshot", env=env)
+                return commit.stdout.decode("utf-8").strip()
+            finally:
+                index_path.unlink(missing_ok=True)
+
+    def record_reviewed_base(self, excludes: Sequence[str] = ()) -> str:
+        # 并行开发的 worktree 只基于评审通过后的主工作区快照，避免带入主开发工程师写了一半的代码。
+        commit = self.snapshot_working_tree(excludes)
+        with self._lock:
+            self.reviewed_commit = commit
+        return commit
+
+    def reviewed_base(self) -> str:
+        with self._lock:
+            commit = self.reviewed_commit
+        return commit or self.record_reviewed_base()
+
+    def checkout_slot(self, slot_index: int, base_commit: str) -> Path:
+        slot_path = self.worktree_root / f"slot-{int(slot_index)}"
+        if not (slot_path / ".git").exists():
+            self.worktree_root.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._git("worktree", "prune", check=False)
+                self._git("worktree", "add", "--detach", str(slot_path), base_commit)
+            return slot_path
+        self._git("checkout", "--detach", "--force", base_commit, cwd=slot_path)
+        self._git("clean", "-fd", cwd=slot_path)
+        return slot_path
+
+    def collect_patch(self, slot_path: str | Path, base_commit: str) -> bytes:
+        path = Path(slot_path)
+        self._git("add", *self._add_pathspecs(), cwd=path)
+        return self._git("diff", "--cached", "--binary", base_commit, cwd=path).stdout
+
+    def diff_commits(self, base_commit: str, head_commit: str, *, name_status: bool = False) -> str:
+        mode = ("--name-status",) if name_status else ("--unified=3",)
+        completed = self._git("diff", "--no-color", "--no-ext-diff", *mode, base_commit, head_commit)
+        return completed.stdout.decode("utf-8", errors="replace")
+
+    def apply_patch(self, patch: bytes) -> bool:
+        if not patch.strip():
+            return True
+        with self._lock:
+            checked = self._git("apply", "--check", "--binary", "-", input_bytes=patch, check=False)
+            if checked.returncode != 0:
+                return False
+            self._git("apply", "--binary", "-", input_bytes=patch)
+            return True
+
+    def cleanup(self) -> list[str]:
+        removed: list[str] = []
+        if not self.worktree_root.exists():
+            return removed
+        for slot_path in sorted(self.worktree_root.glob("slot-*")):
+            self._git("worktree", "remove", "--force", str(slot_path), check=False)
+            removed.append(str(slot_path))
+        self._git("worktree", "prune", check=False)
+        return removed
+
+
+@dataclass
+class DevelopedTask:
+    task_name: str
+    slot_index: int
+    code_change: str = ""
+    patch: bytes = b""
+    duration_sec: float = 0.0
+    error: Exception | None = None
+
+
+@dataclass(frozen=True)
+class ParallelScheduleReport:
+    task_count: int
+    worker_count: int
+    wall_clock_sec: float
+    sequential_estimate_sec: float
+
+    @property
+    def saved_sec(self) -> float:
+        return max(self.sequential_estimate_sec - self.wall_clock_sec, 0.0)
+
+    def render(self) -> str:
+        ratio = (self.saved_sec / self.sequential_estimate_sec * 100.0) if self.sequential_estimate_sec > 0 else 0.0
+        return (
+            f"并行开发完成: 任务 {self.task_count} 个, worker {self.worker_count} 个, "
+            f"实际耗时 {self.wall_clock_sec:.1f}s, 串行估算 {self.sequential_estimate_sec:.1f}s, "
+            f"节省 {self.saved_sec:.1f}s ({ratio:.0f}%)"
+        )
+
+
+@dataclass
+class _SchedulerState:
+    passed: set[str] = field(default_factory=set)
+    started: set[str] = field(default_factory=set)
+    claimed: set[str] = field(default_factory=set)
+    results: dict[str, DevelopedTask] = field(default_factory=dict)
+    serial_durations: dict[str, float] = field(default_factory=dict)
+    free_slots: list[int] = field(default_factory=list)
+    speculative_bases: dict[str, str] = field(default_factory=dict)
+    preempted: set[str] = field(default_factory=set)
+    running_slots: dict[str, int] = field(default_factory=dict)
+
+
+class ParallelDevelopmentScheduler:
+    def __init__(
+        self,
+        graph: TaskDependencyGraph,
+        *,
+        max_workers: int,
+        develop_task: Callable[[str, int], DevelopedTask],
+        passed_tasks: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+        auto_schedule: bool = True,
+    ) -> None:
+        self.graph = graph
+        self.max_workers = max(int(max_workers), 1)
+        self.auto_schedule = auto_schedule
+        self._develop_task = develop_task
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._state = _SchedulerState(
+            passed=set(passed_tasks),
+            free_slots=list(range(self.max_workers)),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="a07-parallel-dev")
+        self._futures: list[Future[None]] = []
+        self._started_at: float | None = None
+        self._closed = False
+
+    def start(self) -> None:
+        with self._condition:
+            if self._started_at is None:
+                self._started_at = self._clock()
+            self._schedule_ready_locked()
+
+    def _schedule_ready_locked(self) -> None:
+        if self._closed or not self.auto_schedule:
+            return
+        for task_name in self.graph.ready_tasks(self._state.passed, self._state.started):
+            if not self._state.free_slots:
+                return
+            slot_index = self._state.free_slots.pop(0)
+            self._state.started.add(task_name)
+            self._state.running_slots[task_name] = slot_index
+            self._futures.append(self._executor.submit(self._run_task, task_name, slot_index))
+
+    def _run_task(self, task_name: str, slot_index: int) -> None:
+        started_at = self._clock()
+        try:
+            result = self._develop_task(task_name, slot_index)
+        except Exception as error:  # noqa: BLE001
+            result = DevelopedTask(task_name=task_name, slot_index=slot_index, error=error)
+        result.duration_sec = max(self._clock() - started_at, 0.0)
+        with self._condition:
+            self._state.results[task_name] = result
+            self._state.running_slots.pop(task_name, None)
+            self._state.free_slots.append(slot_index)
+            self._state.free_slots.sort()
+            self._schedule_ready_locked()
+            self._condition.notify_all()
+
+    def next_task(self) -> str | None:
+        with self._condition:
+            for task_name in self.graph.topological_order():
+                if task_name not in self._state.passed:
+                    return task_name
+        return None
+
+    def wait_for(self, task_name: str, timeout_sec: float | None = None) -> DevelopedTask:
+        with self._condition:
+            if self._started_at is None:
+                self._started_at = self._clock()
+            if task_name in self._state.claimed:
+                raise RuntimeError(f"任务 {task_name} 已由主开发工程师串行处理")
+            if task_name not in self._state.started:
+                missing = self.graph.dependencies.get(task_name, frozenset()) - self._state.passed
+                if missing:
+                    raise RuntimeError(f"任务 {task_name} 的依赖尚未通过: {', '.join(sorted(missing))}")
+                self._schedule_ready_locked()
+            if not self._condition.wait_for(lambda: task_name in self._state.results, timeout=timeout_sec):
+                raise TimeoutError(f"等待并行开发任务超时: {task_name}")
+            return self._state.results[task_name]
+
+    def speculate_after(self, task_name: str) -> str | None:
+        with self._condition:
+            if self._closed or not self._state.free_slots:
+                return None
+            assumed = self._state.passed | {task_name}
+            candidates = [
+                candidate
+                for candidate in self.graph.ready_tasks(assumed, self._state.started)
+                if candidate != task_name
+            ]
+            if not candidates:
+                return None
+            candidate = candidates[0]
+            slot_index = self._state.free_slots.pop(0)
+            self._state.started.add(candidate)
+            self._state.running_slots[candidate] = slot_index
+            if task_name in self.graph.dependencies.get(candidate, frozenset()):
+                self._state.speculative_bases[candidate] = task_name
+            self._futures.append(self._executor.submit(self._run_task, candidate, slot_index))
+            return candidate
+
+    def preempt_speculation(self, task_name: str) -> list[str]:
+        with self._condition:
+            preempted = [
+                candidate
+                for candidate, base_task in self._state.speculative_bases.items()
+                if base_task == task_name and candidate not in self._state.claimed
+            ]
+            for candidate in preempted:
+                self._state.claimed.add(candidate)
+                self._state.preempted.add(candidate)
+            return preempted
+
+    def speculative_base(self, task_name: str) -> str | None:
+        with self._condition:
+            return self._state.speculative_bases.get(task_name)
+
+    def is_preempted(self, task_name: str) -> bool:
+        with self._condition:
+            return task_name in self._state.preempted
+
+    def running_slot(self, task_name: str) -> int | None:
+        with self._condition:
+            return self._state.running_slots.get(task_name)
+
+    def result_for(self, task_name: str, timeout_sec: float | None = 0.0) -> DevelopedTask | None:
+        with self._condition:
+            if timeout_sec != 0.0:
+                self._condition.wait_for(
+                    lambda: task_name in self._state.results or task_name not in self._state.running_slots,
+                    timeout=timeout_sec,
+                )
+            return self._state.results.get(task_name)
+
+    def claim(self, task_name: str) -> None:
+        with self._condition:
+            self._state.started.add(task_name)
+            self._state.claimed.add(task_name)
+
+    def has_result(self, task_name: str) -> bool:
+        with self._condition:
+            return task_name in self._state.results
+
+    def is_scheduled(self, task_name: str) -> bool:
+        with self._condition:
+            return task_name in self._state.started and task_name not in self._state.claimed
+
+    def record_serial_duration(self, task_name: str, seconds: float) -> None:
+        with self._condition:
+            self._state.serial_durations[task_name] = self._state.serial_durations.get(task_name, 0.0) + max(seconds, 0.0)
+
+    def mark_passed(self, task_name: str) -> None:
+        with self._condition:
+            self._state.passed.add(task_name)
+            self._schedule_ready_locked()
+            self._condition.notify_all()
+
+    def report(self) -> ParallelScheduleReport:
+        with self._condition:
+            wall_clock_sec = max(self._clock() - self._started_at, 0.0) if self._started_at is not None else 0.0
+            sequential_estimate_sec = sum(result.duration_sec for result in self._state.results.values())
+            sequential_estimate_sec += sum(self._state.serial_durations.values())
+            return ParallelScheduleReport(
+                task_count=len(set(self._state.results) | set(self._state.serial_durations)),
+                worker_count=self.max_workers,
+                wall_clock_sec=wall_clock_sec,
+                sequential_estimate_sec=sequential_estimate_sec,
+            )
+
+    def shutdown(self, *, wait: bool = True, timeout_sec: float | None = None) -> bool:
+        with self._condition:
+            self._closed = True
+            futures = list(self._futures)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if not wait:
+            return all(future.done() for future in futures)
+        _, not_done = wait_futures(futures, timeout=timeout_sec)
+        return not not_done
+
+
+__all__ = [
+    "AUXILIARY_RUNTIME_DIR_NAMES",
+    "DevelopedTask",
+    "GitWorktreePool",
+    "ParallelDevelopmentScheduler",
+    "ParallelScheduleReport",
+    "REQUIREMENTS_INTAKE_CACHE_DIR_NAME",
+    "RUNTIME_SNAPSHOT_EXCLUDES",
+    "TASK_DEPENDENCY_FILE_SUFFIX",
+    "TaskDependencyGraph",
+    "build_task_dependency_path",
+    "load_passed_tasks",
+    "load_task_dependency_graph",
+]
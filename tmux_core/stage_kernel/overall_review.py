@@ -10,7 +10,11 @@ from __future__ import annotations
 
 import argparse
 import contextlib
+import heapq
 import json
+import os
+import subprocess
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Sequence
@@ -915,28 +919,129 @@ _OVERALL_REVIEW_CONTEXT_EXCLUDED_DIRS = {
 }
 
 
+_OVERALL_REVIEW_HIDDEN_CONFIG_SUFFIXES = {".toml", ".yaml", ".yml"}
+_OVERALL_REVIEW_GIT_TIMEOUT_SEC = 10.0
+_OVERALL_REVIEW_WALK_MAX_ENTRIES = 20000
+_OVERALL_REVIEW_WALK_MAX_CANDIDATES = 2000
+_OVERALL_REVIEW_ACTIVE_FILE_CACHE_SIZE = 16
+_OVERALL_REVIEW_ACTIVE_FILE_CACHE: dict[tuple[str, str, str, int], tuple[str, ...]] = {}
+
+
+def _is_overall_review_active_file(rel_path: str) -> bool:
+    parts = rel_path.split("/")
+    if any(part in _OVERALL_REVIEW_CONTEXT_EXCLUDED_DIRS for part in parts):
+        return False
+    name = parts[-1]
+    suffix = os.path.splitext(name)[1].lower()
+    if suffix not in _OVERALL_REVIEW_ACTIVE_CODE_SUFFIXES:
+        return False
+    return not name.startswith(".") or suffix in _OVERALL_REVIEW_HIDDEN_CONFIG_SUFFIXES
+
+
+def _run_overall_review_git(root: Path, *args: str) -> list[str] | None:
+    try:
+        completed = subprocess.run(
+            ["git", "-c", "core.quotepath=off", *args],
+            cwd=str(root),
+            capture_output=True,
+            timeout=_OVERALL_REVIEW_GIT_TIMEOUT_SEC,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return [item for item in completed.stdout.decode("utf-8", errors="replace").split("\0") if item]
+
+
+def _overall_review_git_change_set(root: Path) -> tuple[str, frozenset[str]] | None:
+    head_lines = _run_overall_review_git(root, "rev-parse", "--verify", "-q", "HEAD")
+    untracked = _run_overall_review_git(root, "ls-files", "-z", "--others", "--exclude-standard")
+    if untracked is None:
+        return None
+    head = head_lines[0].strip() if head_lines else ""
+    changed = _run_overall_review_git(root, "diff", "-z", "--name-only", "--relative", "HEAD") if head else []
+    return head, frozenset([*(changed or ()), *untracked])
+
+
+def _overall_review_file_mtime(root: Path, rel_path: str) -> float | None:
+    try:
+        return (root / rel_path).stat().st_mtime
+    except OSError:
+        return None
+
+
+def _walk_overall_review_candidates(root: Path) -> dict[str, float]:
+    candidates: dict[str, float] = {}
+    pending: deque[tuple[str, str]] = deque([(str(root), "")])
+    visited = 0
+    while pending and visited < _OVERALL_REVIEW_WALK_MAX_ENTRIES:
+        directory, prefix = pending.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    visited += 1
+                    rel_path = f"{prefix}{entry.name}"
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _OVERALL_REVIEW_CONTEXT_EXCLUDED_DIRS:
+                                pending.append((entry.path, f"{rel_path}/"))
+                            continue
+                        if not entry.is_file() or not _is_overall_review_active_file(rel_path):
+                            continue
+                        candidates[rel_path] = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    if len(candidates) >= _OVERALL_REVIEW_WALK_MAX_CANDIDATES:
+                        return candidates
+        except OSError:
+            continue
+    return candidates
+
+
+def _rank_overall_review_active_files(
+        root: Path,
+        candidates: Sequence[str],
+        *,
+        change_set: frozenset[str],
+        limit: int,
+        mtimes: dict[str, float] | None = None,
+) -> tuple[str, ...]:
+    ranked: list[tuple[int, float, str]] = []
+    for rel_path in candidates:
+        mtime = mtimes.get(rel_path) if mtimes is not None else _overall_review_file_mtime(root, rel_path)
+        if mtime is None:
+            continue
+        ranked.append((1 if rel_path in change_set else 0, mtime, rel_path))
+    top = heapq.nsmallest(max(int(limit), 0), ranked, key=lambda item: (-item[0], -item[1], item[2]))
+    return tuple(rel_path for _, _, rel_path in top)
+
+
 def _discover_overall_review_active_files(project_dir: str | Path, *, limit: int = 40) -> tuple[str, ...]:
     root = Path(project_dir).expanduser().resolve()
     if not root.exists():
         return ()
-    discovered: list[str] = []
-    for path in sorted(root.rglob("*")):
-        if not path.is_file():
-            continue
-        try:
-            rel = path.relative_to(root)
-        except ValueError:
-            continue
-        if any(part in _OVERALL_REVIEW_CONTEXT_EXCLUDED_DIRS for part in rel.parts):
-            continue
-        if path.suffix.lower() not in _OVERALL_REVIEW_ACTIVE_CODE_SUFFIXES:
-            continue
-        if rel.name.startswith(".") and rel.suffix.lower() not in {".toml", ".yaml", ".yml"}:
-            continue
-        discovered.append(rel.as_posix())
-        if len(discovered) >= limit:
-            break
-    return tuple(discovered)
+    git_state = _overall_review_git_change_set(root)
+    if git_state is None:
+        mtimes = _walk_overall_review_candidates(root)
+        return _rank_overall_review_active_files(root, list(mtimes), change_set=frozenset(), limit=limit, mtimes=mtimes)
+    head, change_set = git_state
+    active_changes = sorted(item for item in change_set if _is_overall_review_active_file(item))
+    change_fingerprint = json.dumps(
+        [[item, _overall_review_file_mtime(root, item)] for item in active_changes],
+        ensure_ascii=False,
+    )
+    cache_key = (str(root), head, change_fingerprint, int(limit))
+    cached = _OVERALL_REVIEW_ACTIVE_FILE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    tracked = _run_overall_review_git(root, "ls-files", "-z", "--cached") or []
+    candidates = sorted({*(item for item in tracked if _is_overall_review_active_file(item)), *active_changes})
+    discovered = _rank_overall_review_active_files(root, candidates, change_set=change_set, limit=limit)
+    while len(_OVERALL_REVIEW_ACTIVE_FILE_CACHE) >= _OVERALL_REVIEW_ACTIVE_FILE_CACHE_SIZE:
+        _OVERALL_REVIEW_ACTIVE_FILE_CACHE.pop(next(iter(_OVERALL_REVIEW_ACTIVE_FILE_CACHE)))
+    _OVERALL_REVIEW_ACTIVE_FILE_CACHE[cache_key] = discovered
+    return discovered
 
 
 def _build_overall_review_active_code_context(project_dir: str | Path) -> str:
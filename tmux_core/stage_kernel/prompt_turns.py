@@ -14,8 +14,7 @@ from tmux_core.prompt_contracts.spec import (
     OutcomeSpec,
     ResolvedPromptSpec,
     get_prompt_spec,
-    render_prompt_contract_appendix,
-    resolve_prompt_files,
+    resolve_prompt_contract,
 )
 from tmux_core.runtime.contracts import (
     TaskResultContract,
@@ -192,12 +191,12 @@ def build_completion_turn_goal_from_prompt(resolved: ResolvedPromptSpec) -> Comp
 
 
 def build_prompt_text(prompt_fn: Callable[..., str], *args: Any, **kwargs: Any) -> tuple[str, ResolvedPromptSpec]:
-    resolved = resolve_prompt_files(prompt_fn, *args, **kwargs)
+    resolved, appendix = resolve_prompt_contract(prompt_fn, *args, **kwargs)
     prompt_text = prompt_fn(*args, **kwargs)
     if not isinstance(prompt_text, str) or not prompt_text.strip():
         raise RuntimeError(f"{getattr(prompt_fn, '__name__', 'prompt')} did not return prompt text")
     if resolved.spec.prompt_appendix:
-        prompt_text = prompt_text.rstrip() + "\n" + render_prompt_contract_appendix(resolved)
+        prompt_text = prompt_text.rstrip() + "\n" + appendix
     return prompt_text, resolved
 
 
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from tmux_core.stage_kernel.development_scheduler import GitWorktreePool
+from T12_requirements_common import sanitize_requirement_name
+
+
+REVIEW_DIFF_CONTEXT_DIRNAME = "review_context"
+REVIEW_DIFF_MAX_CHARS = 200_000
+
+
+@dataclass(frozen=True)
+class ReviewDiffRound:
+    task_name: str
+    round_index: int
+    base_commit: str
+    head_commit: str
+    previous_commit: str
+    changed_files: tuple[str, ...]
+    context_path: Path
+
+
+def _truncate_diff(diff_text: str, max_chars: int) -> str:
+    if len(diff_text) <= max_chars:
+        return diff_text
+    return diff_text[:max_chars].rstrip("\n") + f"\n... diff 过长，已截断（共 {len(diff_text)} 字符），其余改动请直接查看文件"
+
+
+class ReviewDiffTracker:
+    def __init__(
+        self,
+        project_dir: str | Path,
+        context_dir: str | Path,
+        *,
+        excludes: tuple[str, ...] = (),
+        max_chars: int = REVIEW_DIFF_MAX_CHARS,
+    ) -> None:
+        self.context_dir = Path(context_dir).expanduser().resolve()
+        self.excludes = excludes
+        self.max_chars = max(int(max_chars), 1)
+        self._pool = GitWorktreePool(project_dir, self.context_dir)
+        self._task_name = ""
+        self._base_commit = ""
+        self._previous_commit = ""
+
+    @classmethod
+    def create(cls, project_dir: str | Path, context_dir: str | Path, *, requirement_name: str) -> ReviewDiffTracker | None:
+        if not GitWorktreePool.available(project_dir):
+            return None
+        excludes = (f"{sanitize_requirement_name(requirement_name)}_*",) if str(requirement_name).strip() else ()
+        return cls(project_dir, context_dir, excludes=excludes)
+
+    def begin_task(self, task_name: str) -> str:
+        self._task_name = str(task_name)
+        self._base_commit = self._pool.snapshot_working_tree(self.excludes)
+        self._previous_commit = ""
+        return self._base_commit
+
+    def reset(self) -> None:
+        self._task_name = ""
+        self._base_commit = ""
+        self._previous_commit = ""
+
+    def record_round(self, round_index: int) -> ReviewDiffRound:
+        if not self._base_commit:
+            raise RuntimeError("尚未记录任务基线，无法生成评审 diff 上下文")
+        head_commit = self._pool.snapshot_working_tree(self.excludes)
+        name_status = self._pool.diff_commits(self._base_commit, head_commit, name_status=True)
+        changed_files = tuple(line.strip() for line in name_status.splitlines() if line.strip())
+        task_diff = self._pool.diff_commits(self._base_commit, head_commit)
+        round_diff = ""
+        if self._previous_commit:
+            round_diff = self._pool.diff_commits(self._previous_commit, head_commit)
+        self.context_dir.mkdir(parents=True, exist_ok=True)
+        context_path = self.context_dir / f"{sanitize_requirement_name(self._task_name)}_round_{int(round_index)}.md"
+        context_path.write_text(
+            self._render(
+                round_index=round_index,
+                head_commit=head_commit,
+                changed_files=changed_files,
+                task_diff=task_diff,
+                round_diff=round_diff,
+            ),
+            encoding="utf-8",
+        )
+        result = ReviewDiffRound(
+            task_name=self._task_name,
+            round_index=int(round_index),
+            base_commit=self._base_commit,
+            head_commit=head_commit,
+            previous_commit=self._previous_commit,
+            changed_files=changed_files,
+            context_path=context_path,
+        )
+        self._previous_commit = head_commit
+        return result
+
+    def _render(
+        self,
+        *,
+        round_index: int,
+        head_commit: str,
+        changed_files: tuple[str, ...],
+        task_diff: str,
+        round_diff: str,
+    ) -> str:
+        lines = [
+            f"# {self._task_name} 第 {int(round_index)} 轮评审代码变更",
+            "",
+            f"- 任务基线: `{self._base_commit[:12]}`",
+            f"- 本轮快照: `{head_commit[:12]}`",
+            "",
+            "## 本任务变更文件",
+            "",
+        ]
+        lines.extend(f"- `{item}`" for item in changed_files)
+        if not changed_files:
+            lines.append("- 无（相对任务基线没有检测到代码变更）")
+        if self._previous_commit:
+            lines.extend([
+                "",
+                "## 相对上一轮评审的变更",
+                "",
+                "```diff",
+                _truncate_diff(round_diff, self.max_chars).rstrip("\n") or "（上一轮评审后没有新的代码变更）",
+                "```",
+            ])
+        lines.extend([
+            "",
+            "## 本任务完整 diff",
+            "",
+            "```diff",
+            _truncate_diff(task_diff, self.max_chars).rstrip("\n"),
+            "```",
+            "",
+        ])
+        return "\n".join(lines)
+
+
+def begin_review_diff_task(tracker: ReviewDiffTracker | None, task_name: str) -> None:
+    if tracker is None:
+        return
+    try:
+        tracker.begin_task(task_name)
+    except (OSError, RuntimeError, subprocess.SubprocessError):
+        tracker.reset()
+
+
+def record_review_diff_round(tracker: ReviewDiffTracker | None, round_index: int) -> ReviewDiffRound | None:
+    if tracker is None:
+        return None
+    try:
+        return tracker.record_round(round_index)
+    except (OSError, RuntimeError, subprocess.SubprocessError):
+        return None
+
+
+def render_review_diff_appendix(diff_round: ReviewDiffRound | None) -> str:
+    if diff_round is None:
+        return ""
+    scope = "本任务变更与相对上一轮评审的增量 diff" if diff_round.previous_commit else "本任务相对开发前基线的变更文件与 diff"
+    return (
+        "\n\n补充上下文：\n"
+        f"- {scope} 已整理在《{diff_round.context_path}》，共 {len(diff_round.changed_files)} 个变更文件。\n"
+        "- 请先据此定位本次改动，再按需打开相关文件核对上下文，无需在整个仓库中重新查找改动位置。\n"
+    )
+
+
+__all__ = [
+    "REVIEW_DIFF_CONTEXT_DIRNAME",
+    "REVIEW_DIFF_MAX_CHARS",
+    "ReviewDiffRound",
+    "ReviewDiffTracker",
+    "begin_review_diff_task",
+    "record_review_diff_round",
+    "render_review_diff_appendix",
+]
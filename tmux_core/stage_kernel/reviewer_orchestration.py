@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import json
+import re
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Sequence, TypeVar
 
@@ -9,6 +13,9 @@ from tmux_core.runtime.tmux_runtime import (
     worker_state_has_launch_evidence,
     worker_state_is_prelaunch_active,
 )
+from tmux_core.runtime.contracts import normalize_review_status_payload
+from tmux_core.runtime.metrics import REPAIR_TURNS_TOTAL
+from tmux_core.runtime.turn_trace import TurnTracer, tracer_for
 from tmux_core.stage_kernel.agent_intervention import (
     AGENT_INTERVENTION_WORKER_DEAD,
     request_file_noncompliance_intervention,
@@ -16,6 +23,119 @@ from tmux_core.stage_kernel.agent_intervention import (
 
 TReviewer = TypeVar("TReviewer")
 
+REVIEW_DECISION_ALL = "all"
+REVIEW_DECISION_ANY_FAIL = "any-fail"
+REVIEW_DECISION_QUORUM = "quorum"
+_QUORUM_POLICY_RE = re.compile(r"^(?:quorum:)?(\d+)(?:-of-n)?$")
+
+
+@dataclass(frozen=True)
+class ReviewDecisionPolicy:
+    mode: str = REVIEW_DECISION_ALL
+    quorum: int = 0
+
+    @property
+    def waits_for_all(self) -> bool:
+        return self.mode == REVIEW_DECISION_ALL
+
+    def decide(self, verdicts: Sequence[bool | None], *, total: int) -> bool | None:
+        passes = sum(1 for item in verdicts if item is True)
+        fails = sum(1 for item in verdicts if item is False)
+        if self.mode == REVIEW_DECISION_ANY_FAIL:
+            if fails:
+                return False
+        elif self.mode == REVIEW_DECISION_QUORUM:
+            required = min(max(self.quorum, 1), max(total, 1))
+            # 阶段通过检查要求每个返回的评审都通过：已完成的评审里有不通过的，法定人数不能提前判过。
+            if passes >= required and passes == len(verdicts):
+                return True
+            if total - fails < required:
+                return False
+        if len(verdicts) >= total:
+            return bool(verdicts) and passes == len(verdicts)
+        return None
+
+    def render(self) -> str:
+        if self.mode == REVIEW_DECISION_QUORUM:
+            return f"{self.quorum}-of-n"
+        return self.mode
+
+
+REVIEW_DECISION_WAIT_ALL = ReviewDecisionPolicy()
+
+
+def parse_review_decision_policy(text: str) -> ReviewDecisionPolicy:
+    normalized = str(text or "").strip().lower().replace("_", "-")
+    if normalized in {"", REVIEW_DECISION_ALL}:
+        return REVIEW_DECISION_WAIT_ALL
+    if normalized == REVIEW_DECISION_ANY_FAIL:
+        return ReviewDecisionPolicy(mode=REVIEW_DECISION_ANY_FAIL)
+    matched = _QUORUM_POLICY_RE.match(normalized)
+    if matched and int(matched.group(1)) > 0:
+        return ReviewDecisionPolicy(mode=REVIEW_DECISION_QUORUM, quorum=int(matched.group(1)))
+    raise ValueError(f"不支持的评审决策策略: {text}（可选 all、any-fail、k-of-n，例如 2-of-n）")
+
+
+def read_review_verdict(review_json_path: str | Path, task_name: str) -> bool | None:
+    try:
+        payload = json.loads(Path(review_json_path).read_text(encoding="utf-8"))
+        return bool(normalize_review_status_payload(payload, task_name=task_name)["review_pass"])
+    except (OSError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class LateReviewerResult:
+    reviewer_key: str
+    verdict: bool | None
+    error: str = ""
+
+
+class PendingReviewerTurns:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[object, Future, Callable[[object], bool | None] | None]] = {}
+
+    def add(
+        self,
+        reviewer_key: str,
+        reviewer: TReviewer,
+        future: Future,
+        verdict_func: Callable[[TReviewer], bool | None] | None = None,
+    ) -> None:
+        with self._lock:
+            self._pending[reviewer_key] = (reviewer, future, verdict_func)
+
+    def pending_keys(self) -> tuple[str, ...]:
+        with self._lock:
+            return tuple(self._pending)
+
+    def rejoin(
+        self,
+        reviewers: Sequence[TReviewer],
+        *,
+        on_late_result: Callable[[LateReviewerResult], None] | None = None,
+    ) -> list[TReviewer]:
+        with self._lock:
+            pending = list(self._pending.items())
+            self._pending.clear()
+        reviewer_list = list(reviewers)
+        for reviewer_key, (reviewer, future, verdict_func) in pending:
+            late = LateReviewerResult(reviewer_key=reviewer_key, verdict=None)
+            try:
+                result = future.result()
+            except Exception as error:  # noqa: BLE001
+                result = reviewer
+                late = LateReviewerResult(reviewer_key=reviewer_key, verdict=None, error=str(error))
+            else:
+                if result is not None and verdict_func is not None:
+                    late = LateReviewerResult(reviewer_key=reviewer_key, verdict=verdict_func(result))
+            if on_late_result is not None:
+                on_late_result(late)
+            if result is not None:
+                reviewer_list.append(result)  # type: ignore[arg-type]
+        return reviewer_list
+
 
 def _resolve_worker(owner: object | None):
     if owner is None:
@@ -24,6 +144,24 @@ def _resolve_worker(owner: object | None):
     return worker if worker is not None else owner
 
 
+def _reviewer_tracer(owner: object | None) -> TurnTracer:
+    return tracer_for(_resolve_worker(owner))
+
+
+def _run_traced_reviewer_turn(
+    name: str,
+    reviewer_key: str,
+    run: Callable[..., TReviewer | None],
+    reviewer: TReviewer,
+    *args: object,
+) -> TReviewer | None:
+    tracer = _reviewer_tracer(reviewer)
+    if name == "reviewer_repair_turn":
+        REPAIR_TURNS_TOTAL.inc(kind="reviewer", **tracer.metric_labels())
+    with tracer.span(name, cat="reviewer", reviewer=reviewer_key):
+        return run(reviewer, *args)
+
+
 def _owner_is_dead(owner: object | None) -> bool:
     worker = _resolve_worker(owner)
     if worker is None:
@@ -58,30 +196,54 @@ def run_parallel_reviewer_round(
     key_func: Callable[[TReviewer], str],
     run_turn: Callable[[TReviewer], TReviewer | None],
     error_prefix: str,
+    decision_policy: ReviewDecisionPolicy = REVIEW_DECISION_WAIT_ALL,
+    verdict_func: Callable[[TReviewer], bool | None] | None = None,
+    pending: PendingReviewerTurns | None = None,
 ) -> list[TReviewer]:
     reviewer_list = list(reviewers)
     if not reviewer_list:
         return reviewer_list
     reviewer_index = {key_func(item): index for index, item in enumerate(reviewer_list)}
     dropped_keys: set[str] = set()
-    with ThreadPoolExecutor(max_workers=max(1, len(reviewer_list))) as executor:
-        future_map = {
-            executor.submit(run_turn, reviewer): key_func(reviewer)
-            for reviewer in reviewer_list
-        }
-        errors: list[str] = []
-        for future in as_completed(future_map):
-            reviewer_key = future_map[future]
-            try:
-                result = future.result()
-                if result is None:
-                    dropped_keys.add(reviewer_key)
+    early_decision = not decision_policy.waits_for_all and verdict_func is not None and pending is not None
+    executor = ThreadPoolExecutor(max_workers=max(1, len(reviewer_list)))
+    try:
+        with _reviewer_tracer(reviewer_list[0]).span("reviewer_round", cat="reviewer", reviewers=len(reviewer_list)):
+            future_map = {
+                executor.submit(_run_traced_reviewer_turn, "reviewer_turn", key_func(reviewer), run_turn, reviewer): key_func(reviewer)
+                for reviewer in reviewer_list
+            }
+            errors: list[str] = []
+            verdicts: list[bool | None] = []
+            remaining = set(future_map)
+            while remaining:
+                done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    reviewer_key = future_map[future]
+                    try:
+                        result = future.result()
+                        if result is None:
+                            dropped_keys.add(reviewer_key)
+                            continue
+                        reviewer_list[reviewer_index[reviewer_key]] = result
+                        if early_decision:
+                            verdicts.append(verdict_func(result))
+                    except Exception as error:  # noqa: BLE001
+                        errors.append(f"{reviewer_key}: {error}")
+                if not early_decision or errors or not remaining:
                     continue
-                reviewer_list[reviewer_index[reviewer_key]] = result
-            except Exception as error:  # noqa: BLE001
-                errors.append(f"{reviewer_key}: {error}")
-        if errors:
-            raise RuntimeError(error_prefix + "\n" + "\n".join(errors))
+                total = len(reviewer_list) - len(dropped_keys)
+                if decision_policy.decide(verdicts, total=total) is None:
+                    continue
+                for future in remaining:
+                    reviewer_key = future_map[future]
+                    pending.add(reviewer_key, reviewer_list[reviewer_index[reviewer_key]], future, verdict_func)
+                    dropped_keys.add(reviewer_key)
+                remaining = set()
+            if errors:
+                raise RuntimeError(error_prefix + "\n" + "\n".join(errors))
+    finally:
+        executor.shutdown(wait=not early_decision)
     return [reviewer for reviewer in reviewer_list if key_func(reviewer) not in dropped_keys]
 
 
@@ -106,13 +268,32 @@ def repair_reviewer_round_outputs(
         prompts = check_job([artifact_name_func(item) for item in reviewer_list])
         if not prompts:
             return reviewer_list
-        with ThreadPoolExecutor(max_workers=max(1, len(prompts))) as executor:
+        with (
+            _reviewer_tracer(reviewer_list[0]).span(
+                "reviewer_repair_round",
+                cat="reviewer",
+                reviewers=len(prompts),
+                repair_attempt=repair_attempt,
+            ),
+            ThreadPoolExecutor(max_workers=max(1, len(prompts))) as executor,
+        ):
             future_map = {}
             for reviewer in reviewer_list:
                 fix_prompt = prompts.get(artifact_name_func(reviewer))
                 if not fix_prompt:
                     continue
-                future_map[executor.submit(run_fix_turn, reviewer, fix_prompt, repair_attempt)] = key_func(reviewer)
+                reviewer_key = key_func(reviewer)
+                future_map[
+                    executor.submit(
+                        _run_traced_reviewer_turn,
+                        "reviewer_repair_turn",
+                        reviewer_key,
+                        run_fix_turn,
+                        reviewer,
+                        fix_prompt,
+                        repair_attempt,
+                    )
+                ] = reviewer_key
             errors: list[str] = []
             dropped_keys: set[str] = set()
             for future in as_completed(future_map):
@@ -224,3 +405,19 @@ def shutdown_stage_workers(
             runtime_root.rmdir()
             removed.append(str(runtime_root))
     return tuple(removed)
+
+
+__all__ = [
+    "LateReviewerResult",
+    "PendingReviewerTurns",
+    "REVIEW_DECISION_ALL",
+    "REVIEW_DECISION_ANY_FAIL",
+    "REVIEW_DECISION_QUORUM",
+    "REVIEW_DECISION_WAIT_ALL",
+    "ReviewDecisionPolicy",
+    "parse_review_decision_policy",
+    "read_review_verdict",
+    "repair_reviewer_round_outputs",
+    "run_parallel_reviewer_round",
+    "shutdown_stage_workers",
+]
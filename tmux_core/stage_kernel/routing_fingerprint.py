@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+
+ROUTING_FINGERPRINT_FILE = "docs/routing_fingerprint.json"
+ROUTING_FINGERPRINT_VERSION = 1
+ROUTING_ROOT_SCOPE = "."
+ROUTING_FINGERPRINT_EXCLUDED_DIRS = {"node_modules", "__pycache__", "venv", "dist", "build"}
+ROUTING_FINGERPRINT_EXCLUDED_FILES = {
+    "AGENTS.md",
+    "audit.json",
+    "路由层审核记录.md",
+    "docs/repo_map.json",
+    "docs/task_routes.json",
+    "docs/pitfalls.json",
+    ROUTING_FINGERPRINT_FILE,
+}
+ROUTING_REFRESH_FULL_RATIO = 0.5
+ROUTING_REFRESH_ACTION_FULL = "full"
+ROUTING_REFRESH_ACTION_REFRESH = "refresh"
+ROUTING_REFRESH_ACTION_SKIP = "skip"
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class RoutingFingerprint:
+    scopes: dict[str, str]
+    files: dict[str, FileFingerprint] = field(default_factory=dict)
+    hashed_files: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "version": ROUTING_FINGERPRINT_VERSION,
+            "scopes": dict(sorted(self.scopes.items())),
+            "files": {
+                rel_path: [item.size, item.mtime_ns, item.sha256]
+                for rel_path, item in sorted(self.files.items())
+            },
+        }
+
+
+@dataclass(frozen=True)
+class RoutingRefreshPlan:
+    work_dir: str
+    action: str
+    changed_scopes: tuple[str, ...] = ()
+    reason: str = ""
+
+
+def build_routing_fingerprint_path(work_dir: str | Path) -> Path:
+    return Path(work_dir).expanduser().resolve() / ROUTING_FINGERPRINT_FILE
+
+
+def is_routing_layer_file(rel_path: str) -> bool:
+    # 子目录也可能是独立的路由目标，其自身路由层文件的变化不应影响上层目录的指纹。
+    return any(
+        rel_path == name or rel_path.endswith(f"/{name}")
+        for name in ROUTING_FINGERPRINT_EXCLUDED_FILES
+    )
+
+
+def _iter_fingerprint_files(root: Path) -> Iterable[tuple[str, os.DirEntry[str]]]:
+    pending = [(str(root), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                children = sorted(entries, key=lambda item: item.name)
+        except OSError:
+            continue
+        for entry in children:
+            if entry.name.startswith(".") or entry.name in ROUTING_FINGERPRINT_EXCLUDED_DIRS:
+                continue
+            rel_path = f"{prefix}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, f"{rel_path}/"))
+                elif entry.is_file(follow_symlinks=False) and not is_routing_layer_file(rel_path):
+                    yield rel_path, entry
+            except OSError:
+                continue
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        for chunk in iter(lambda: file_obj.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def routing_scope_for(rel_path: str) -> str:
+    head, separator, _ = rel_path.partition("/")
+    return head if separator else ROUTING_ROOT_SCOPE
+
+
+def compute_routing_fingerprint(
+        work_dir: str | Path,
+        *,
+        previous: RoutingFingerprint | None = None,
+) -> RoutingFingerprint:
+    root = Path(work_dir).expanduser().resolve()
+    cached_files = previous.files if previous is not None else {}
+    files: dict[str, FileFingerprint] = {}
+    hashed_files = 0
+    for rel_path, entry in _iter_fingerprint_files(root):
+        try:
+            stat_result = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        cached = cached_files.get(rel_path)
+        if cached is not None and cached.size == stat_result.st_size and cached.mtime_ns == stat_result.st_mtime_ns:
+            files[rel_path] = cached
+            continue
+        try:
+            sha256 = _hash_file(entry.path)
+        except OSError:
+            continue
+        hashed_files += 1
+        files[rel_path] = FileFingerprint(size=stat_result.st_size, mtime_ns=stat_result.st_mtime_ns, sha256=sha256)
+    scope_digests: dict[str, Any] = {}
+    for rel_path in sorted(files):
+        digest = scope_digests.setdefault(routing_scope_for(rel_path), hashlib.sha256())
+        digest.update(f"{rel_path}\0{files[rel_path].sha256}\n".encode("utf-8"))
+    scopes = {scope: f"sha256:{digest.hexdigest()}" for scope, digest in scope_digests.items()}
+    return RoutingFingerprint(scopes=scopes, files=files, hashed_files=hashed_files)
+
+
+def load_routing_fingerprint(work_dir: str | Path) -> RoutingFingerprint | None:
+    path = build_routing_fingerprint_path(work_dir)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, Mapping) or int(payload.get("version", 0) or 0) != ROUTING_FINGERPRINT_VERSION:
+        return None
+    raw_scopes = payload.get("scopes")
+    raw_files = payload.get("files")
+    if not isinstance(raw_scopes, Mapping) or not isinstance(raw_files, Mapping):
+        return None
+    files: dict[str, FileFingerprint] = {}
+    for rel_path, item in raw_files.items():
+        if isinstance(item, list) and len(item) == 3:
+            files[str(rel_path)] = FileFingerprint(size=int(item[0]), mtime_ns=int(item[1]), sha256=str(item[2]))
+    return RoutingFingerprint(scopes={str(key): str(value) for key, value in raw_scopes.items()}, files=files)
+
+
+def write_routing_fingerprint(work_dir: str | Path, fingerprint: RoutingFingerprint | None = None) -> Path:
+    path = build_routing_fingerprint_path(work_dir)
+    if fingerprint is None:
+        fingerprint = compute_routing_fingerprint(work_dir, previous=load_routing_fingerprint(work_dir))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(fingerprint.to_dict(), ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def diff_routing_scopes(previous: RoutingFingerprint, current: RoutingFingerprint) -> tuple[str, ...]:
+    scopes = set(previous.scopes) | set(current.scopes)
+    return tuple(sorted(scope for scope in scopes if previous.scopes.get(scope) != current.scopes.get(scope)))
+
+
+def plan_routing_refresh(
+        work_dir: str | Path,
+        *,
+        full_ratio: float = ROUTING_REFRESH_FULL_RATIO,
+) -> RoutingRefreshPlan:
+    root = Path(work_dir).expanduser().resolve()
+    previous = load_routing_fingerprint(root)
+    if previous is None:
+        return RoutingRefreshPlan(work_dir=str(root), action=ROUTING_REFRESH_ACTION_FULL, reason="fingerprint_missing")
+    current = compute_routing_fingerprint(root, previous=previous)
+    changed_scopes = diff_routing_scopes(previous, current)
+    if not changed_scopes:
+        return RoutingRefreshPlan(work_dir=str(root), action=ROUTING_REFRESH_ACTION_SKIP, reason="unchanged")
+    total_scopes = max(len(set(previous.scopes) | set(current.scopes)), 1)
+    if len(changed_scopes) / total_scopes > full_ratio:
+        return RoutingRefreshPlan(
+            work_dir=str(root),
+            action=ROUTING_REFRESH_ACTION_FULL,
+            changed_scopes=changed_scopes,
+            reason="too_many_scopes_changed",
+        )
+    return RoutingRefreshPlan(
+        work_dir=str(root),
+        action=ROUTING_REFRESH_ACTION_REFRESH,
+        changed_scopes=changed_scopes,
+        reason="scopes_changed",
+    )
+
+
+def render_routing_refresh_record(plan: RoutingRefreshPlan) -> str:
+    scope_lines = "\n".join(
+        f"- `{scope}`" if scope != ROUTING_ROOT_SCOPE else "- 当前目录根部文件"
+        for scope in plan.changed_scopes
+    )
+    return (
+        "# 路由层增量刷新\n\n"
+        "自上次路由层审核通过后，只有以下范围的文件内容发生了变化：\n"
+        f"{scope_lines}\n\n"
+        "审核意见:\n"
+        "- 只核对上述范围对应的模块、任务路由和坑点是否仍与实际代码一致，并就地更新路由层文件。\n"
+        "- 未列出的范围视为未变化，保持原有内容，不要重写。\n"
+        "- 如果上述变化不影响路由层内容，保持文件不变即可。\n"
+    )
+
+
+__all__ = [
+    "FileFingerprint",
+    "ROUTING_FINGERPRINT_FILE",
+    "ROUTING_REFRESH_ACTION_FULL",
+    "ROUTING_REFRESH_ACTION_REFRESH",
+    "ROUTING_REFRESH_ACTION_SKIP",
+    "RoutingFingerprint",
+    "RoutingRefreshPlan",
+    "build_routing_fingerprint_path",
+    "compute_routing_fingerprint",
+    "diff_routing_scopes",
+    "is_routing_layer_file",
+    "load_routing_fingerprint",
+    "plan_routing_refresh",
+    "render_routing_refresh_record",
+    "routing_scope_for",
+    "write_routing_fingerprint",
+]
@@ -25,6 +25,7 @@ from tmux_core.runtime.tmux_runtime import (
     is_provider_auth_error,
     is_provider_runtime_error,
     is_worker_death_error,
+    worker_attach_command,
 )
 from T09_terminal_ops import (
     PROMPT_BACK_VALUE,
@@ -809,7 +810,7 @@ def render_tmux_start_summary(role_name: str, worker: TmuxBatchWorker) -> str:
             f"session_name: {worker.session_name}",
             "首次执行任务时会等待 READY；启动失败将进入阶段恢复逻辑。",
             "可使用以下命令进入会话:",
-            f"  tmux attach -t {worker.session_name}",
+            f"  {worker_attach_command(worker)}",
         ]
     )
 
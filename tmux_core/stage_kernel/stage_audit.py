@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+import contextlib
 import datetime as dt
+import fcntl
+import gzip
 import hashlib
 import json
+import os
 import sys
 import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -13,7 +19,7 @@ from typing import Any
 from T12_requirements_common import sanitize_requirement_name
 
 
-STAGE_AUDIT_SCHEMA_VERSION = 1
+STAGE_AUDIT_SCHEMA_VERSION = 2
 SUPPORTED_STAGE_AUDIT_STAGES = frozenset(("A03", "A04", "A05", "A06", "A07", "A08"))
 SUPPORTED_STAGE_AUDIT_EVENT_SCOPES = frozenset(("stage", "task", "hitl", "review"))
 _EVENT_SCOPE_BY_TYPE = {
@@ -25,6 +31,7 @@ _EVENT_SCOPE_BY_TYPE = {
     "hitl_question": "hitl",
     "hitl_answer": "hitl",
     "review_merged": "review",
+    "review_late_result": "review",
     "overall_review_merged": "review",
     "feedback_written": "review",
     "change_after_review": "task",
@@ -34,8 +41,27 @@ _EVENT_SCOPE_BY_TYPE = {
 }
 _AMBIGUOUS_EVENT_TYPES = frozenset(("developer_output",))
 _EVENT_TYPES_WITH_REVIEWER_ARRAYS = frozenset(("before_cleanup", "review_merged", "overall_review_merged"))
+STAGE_AUDIT_INDEX_SUFFIX = ".idx"
+STAGE_AUDIT_OFFSET_INDEX_SUFFIX = ".offsets"
+STAGE_AUDIT_OFFSET_INDEX_FIELDS = ("event_type", "task_name", "review_round_index", "stage_run_index")
+STAGE_AUDIT_BLOB_DIRNAME = "audit_blobs"
+STAGE_AUDIT_BLOB_SUFFIX = ".gz"
+STAGE_AUDIT_BLOB_REF_KEY = "$blob"
+STAGE_AUDIT_OFFSET_HEADER_KEY = "log_inode"
+_INDEX_SCHEMA_VERSION = 2
 _LOCK_GUARD = threading.RLock()
 _FILE_LOCKS: dict[str, threading.RLock] = {}
+_FILE_LOCK_DEPTHS: dict[str, int] = {}
+_INDEX_STATES: dict[str, "_AuditIndexState"] = {}
+
+
+@dataclass
+class _AuditIndexState:
+    size: int = 0
+    inode: int = 0
+    record_index: int = 0
+    stage_run_index: int = 0
+    offsets_valid: bool = True
 
 
 @dataclass(frozen=True)
@@ -118,23 +144,189 @@ def build_stage_audit_log_path(project_dir: str | Path, requirement_name: str, s
     return project_root / f"{safe_name}_{normalized_stage}_流水记录.jsonl"
 
 
-def _read_max_integer_field(audit_log_path: Path, field_name: str) -> int:
-    if not audit_log_path.exists() or not audit_log_path.is_file():
-        return 0
-    max_value = 0
-    for line in audit_log_path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
+def build_stage_audit_index_path(audit_log_path: str | Path) -> Path:
+    path = Path(audit_log_path)
+    return path.with_name(path.name + STAGE_AUDIT_INDEX_SUFFIX)
+
+
+def build_stage_audit_offset_index_path(audit_log_path: str | Path) -> Path:
+    path = Path(audit_log_path)
+    return path.with_name(path.name + STAGE_AUDIT_OFFSET_INDEX_SUFFIX)
+
+
+def build_stage_audit_offset_entry(offset: int, length: int, payload: Mapping[str, Any]) -> dict[str, Any]:
+    entry: dict[str, Any] = {
+        "offset": int(offset),
+        "length": int(length),
+        "record_index": _integer_field(payload, "record_index"),
+    }
+    for field_name in STAGE_AUDIT_OFFSET_INDEX_FIELDS:
+        entry[field_name] = _json_safe(payload.get(field_name))
+    return entry
+
+
+def build_stage_audit_offset_header(log_inode: int) -> dict[str, Any]:
+    # 偏移索引首行记下它对应的流水文件 inode 和生成时间，查询端据此识别流水被替换或索引被重建
+    return {STAGE_AUDIT_OFFSET_HEADER_KEY: int(log_inode), "created_ns": time.time_ns()}
+
+
+def _invalidate_offset_index(audit_log_path: Path) -> None:
+    # 偏移索引缺了记录后不能再往后追加：删掉索引让查询回退全量扫描，
+    # 同时删掉 .idx 并清掉进程内缓存，下次加锁时从流水文件整体重建。
+    _INDEX_STATES.pop(str(audit_log_path), None)
+    for sidecar_path in (build_stage_audit_offset_index_path(audit_log_path), build_stage_audit_index_path(audit_log_path)):
+        with contextlib.suppress(OSError):
+            sidecar_path.unlink(missing_ok=True)
+
+
+def _append_offset_entries(
+    audit_log_path: Path,
+    entries: Sequence[Mapping[str, Any]],
+    *,
+    truncate: bool = False,
+    log_inode: int = 0,
+) -> bool:
+    if not entries and not truncate:
+        return True
+    if truncate:
+        entries = [build_stage_audit_offset_header(log_inode), *entries]
+    text = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    offsets_path = build_stage_audit_offset_index_path(audit_log_path)
+    temp_path = offsets_path.with_name(f"{offsets_path.name}.{os.getpid()}.tmp")
+    try:
+        if truncate:
+            # 整体重建走临时文件替换，换新 inode，查询端的增量缓存据此整体重读
+            with temp_path.open("w", encoding="utf-8") as file_obj:
+                file_obj.write(text)
+            os.replace(temp_path, offsets_path)
+        else:
+            with offsets_path.open("a", encoding="utf-8") as file_obj:
+                file_obj.write(text)
+    except OSError:
+        with contextlib.suppress(OSError):
+            temp_path.unlink(missing_ok=True)
+        _invalidate_offset_index(audit_log_path)
+        return False
+    return True
+
+
+def _integer_field(payload: Mapping[str, Any], field_name: str) -> int:
+    value = payload.get(field_name)
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return 0
+
+
+def _scan_index_state(
+    file_obj: Any,
+    state: _AuditIndexState,
+    start_offset: int,
+    end_offset: int,
+) -> list[dict[str, Any]]:
+    offset_entries: list[dict[str, Any]] = []
+    file_obj.seek(start_offset)
+    position = start_offset
+    while position < end_offset:
+        raw_line = file_obj.readline()
+        if not raw_line:
+            break
+        line_offset = position
+        position += len(raw_line)
+        if not raw_line.strip():
             continue
         try:
-            payload = json.loads(line)
-        except json.JSONDecodeError:
+            payload = json.loads(raw_line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
             continue
         if not isinstance(payload, dict):
             continue
-        value = payload.get(field_name)
-        if isinstance(value, int) and not isinstance(value, bool) and value > max_value:
-            max_value = value
-    return max_value
+        state.record_index = max(state.record_index, _integer_field(payload, "record_index"))
+        state.stage_run_index = max(state.stage_run_index, _integer_field(payload, "stage_run_index"))
+        offset_entries.append(build_stage_audit_offset_entry(line_offset, len(raw_line), payload))
+    state.size = end_offset
+    return offset_entries
+
+
+def _load_index_sidecar(index_path: Path) -> _AuditIndexState | None:
+    try:
+        payload = json.loads(index_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("schema_version") != _INDEX_SCHEMA_VERSION:
+        return None
+    try:
+        return _AuditIndexState(
+            size=int(payload.get("size", 0)),
+            inode=int(payload.get("inode", 0)),
+            record_index=_integer_field(payload, "record_index"),
+            stage_run_index=_integer_field(payload, "stage_run_index"),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def _write_index_sidecar(index_path: Path, state: _AuditIndexState) -> None:
+    payload = {
+        "schema_version": _INDEX_SCHEMA_VERSION,
+        "size": state.size,
+        "inode": state.inode,
+        "record_index": state.record_index,
+        "stage_run_index": state.stage_run_index,
+    }
+    temp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with contextlib.suppress(OSError):
+        temp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, index_path)
+
+
+def _recover_index_state(audit_log_path: Path, file_obj: Any, *, rebuild: bool = False) -> _AuditIndexState:
+    stat = os.fstat(file_obj.fileno())
+    cached = _INDEX_STATES.get(str(audit_log_path))
+    if not rebuild and cached is not None and cached.inode == stat.st_ino and cached.size == stat.st_size:
+        return cached
+    state = None if rebuild else _load_index_sidecar(build_stage_audit_index_path(audit_log_path))
+    rebuild_offsets = state is None or state.inode != stat.st_ino or state.size > stat.st_size
+    if rebuild_offsets:
+        state = _AuditIndexState(inode=stat.st_ino)
+    if state.size < stat.st_size or rebuild_offsets:
+        offset_entries = _scan_index_state(file_obj, state, state.size, stat.st_size)
+        state.offsets_valid = _append_offset_entries(
+            audit_log_path,
+            offset_entries,
+            truncate=rebuild_offsets,
+            log_inode=stat.st_ino,
+        )
+    if state.offsets_valid:
+        _INDEX_STATES[str(audit_log_path)] = state
+    return state
+
+
+@contextmanager
+def _locked_audit_log(audit_log_path: Path, *, rebuild: bool = False) -> Iterator[tuple[Any, _AuditIndexState]]:
+    lock_key = str(audit_log_path)
+    with _file_lock(audit_log_path):
+        audit_log_path.parent.mkdir(parents=True, exist_ok=True)
+        with audit_log_path.open("ab") as file_obj:
+            depth = _FILE_LOCK_DEPTHS.get(lock_key, 0)
+            if depth == 0:
+                fcntl.flock(file_obj.fileno(), fcntl.LOCK_EX)
+            _FILE_LOCK_DEPTHS[lock_key] = depth + 1
+            try:
+                with audit_log_path.open("rb") as reader:
+                    state = _recover_index_state(audit_log_path, reader, rebuild=rebuild)
+                yield file_obj, state
+            finally:
+                _FILE_LOCK_DEPTHS[lock_key] = depth
+                if depth == 0:
+                    fcntl.flock(file_obj.fileno(), fcntl.LOCK_UN)
+
+
+def rebuild_stage_audit_indexes(audit_log_path: str | Path) -> int:
+    path = Path(audit_log_path)
+    with _locked_audit_log(path, rebuild=True) as (_file_obj, state):
+        if state.offsets_valid:
+            _write_index_sidecar(build_stage_audit_index_path(path), state)
+        return state.record_index
 
 
 def _json_safe(value: Any) -> Any:
@@ -202,6 +394,87 @@ def _sha256_text(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
+def build_stage_audit_blob_dir(audit_log_path: str | Path) -> Path:
+    return Path(audit_log_path).parent / STAGE_AUDIT_BLOB_DIRNAME
+
+
+def _blob_path(blob_dir: Path, digest: str) -> Path:
+    return blob_dir / f"{digest}{STAGE_AUDIT_BLOB_SUFFIX}"
+
+
+def _store_text_blob(blob_dir: Path, content: str) -> dict[str, str]:
+    digest = _sha256_text(content)
+    blob_path = _blob_path(blob_dir, digest)
+    # 每次都按路径确认 blob 仍在磁盘上：audit_blobs/ 可能被清理，或属于另一个项目目录。
+    if not blob_path.exists():
+        blob_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = blob_dir / f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        temp_path.write_bytes(gzip.compress(content.encode("utf-8"), mtime=0))
+        os.replace(temp_path, blob_path)
+    return {STAGE_AUDIT_BLOB_REF_KEY: digest}
+
+
+def load_stage_audit_blob(audit_log_path: str | Path, digest: str) -> str:
+    blob_path = _blob_path(build_stage_audit_blob_dir(audit_log_path), str(digest or "").strip())
+    return gzip.decompress(blob_path.read_bytes()).decode("utf-8")
+
+
+def _is_blob_ref(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and len(value) == 1
+        and isinstance(value.get(STAGE_AUDIT_BLOB_REF_KEY), str)
+    )
+
+
+def _rehydrate_value(audit_log_path: Path, value: Any, cache: dict[str, str]) -> Any:
+    if _is_blob_ref(value):
+        digest = value[STAGE_AUDIT_BLOB_REF_KEY]
+        if digest not in cache:
+            cache[digest] = load_stage_audit_blob(audit_log_path, digest)
+        return cache[digest]
+    if isinstance(value, dict):
+        return {key: _rehydrate_value(audit_log_path, item, cache) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rehydrate_value(audit_log_path, item, cache) for item in value]
+    return value
+
+
+def rehydrate_stage_audit_record(
+    audit_log_path: str | Path,
+    record: Mapping[str, Any],
+    *,
+    blob_cache: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    rehydrated = dict(record)
+    if "snapshots" in rehydrated:
+        cache = blob_cache if blob_cache is not None else {}
+        rehydrated["snapshots"] = _rehydrate_value(Path(audit_log_path), rehydrated["snapshots"], cache)
+    return rehydrated
+
+
+def iter_stage_audit_records(
+    audit_log_path: str | Path,
+    *,
+    rehydrate: bool = True,
+) -> Iterator[dict[str, Any]]:
+    path = Path(audit_log_path)
+    if not path.exists() or not path.is_file():
+        return
+    blob_cache: dict[str, str] = {}
+    with path.open("rb") as file_obj:
+        for raw_line in file_obj:
+            if not raw_line.strip():
+                continue
+            try:
+                payload = json.loads(raw_line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if not isinstance(payload, dict):
+                continue
+            yield rehydrate_stage_audit_record(path, payload, blob_cache=blob_cache) if rehydrate else payload
+
+
 def _read_text_snapshot(path_text: str, metadata: dict[str, Any]) -> str:
     if not path_text:
         return ""
@@ -219,6 +492,7 @@ def _read_text_snapshot(path_text: str, metadata: dict[str, Any]) -> str:
 def _build_fixed_snapshots(
     source_paths: Mapping[str, str | Path | None],
     metadata: dict[str, Any],
+    blob_dir: Path,
 ) -> tuple[dict[str, str], dict[str, Any]]:
     normalized_source_paths: dict[str, str] = {}
     snapshots: dict[str, Any] = {}
@@ -226,27 +500,28 @@ def _build_fixed_snapshots(
         normalized_path = _normalize_file_path(value)
         normalized_key = str(key)
         normalized_source_paths[normalized_key] = normalized_path
-        snapshots[normalized_key] = _read_text_snapshot(normalized_path, metadata)
+        snapshots[normalized_key] = _store_text_blob(blob_dir, _read_text_snapshot(normalized_path, metadata))
     return normalized_source_paths, snapshots
 
 
 def _build_dynamic_snapshots(
     paths: Sequence[str | Path],
     metadata: dict[str, Any],
-) -> tuple[list[str], list[dict[str, str]]]:
+    blob_dir: Path,
+) -> tuple[list[str], list[dict[str, Any]]]:
     normalized_paths: list[str] = []
-    snapshots: list[dict[str, str]] = []
+    snapshots: list[dict[str, Any]] = []
     for value in paths:
         normalized_path = _normalize_file_path(value)
         if not normalized_path:
             continue
-        content = _read_text_snapshot(normalized_path, metadata)
+        blob_ref = _store_text_blob(blob_dir, _read_text_snapshot(normalized_path, metadata))
         normalized_paths.append(normalized_path)
         snapshots.append(
             {
                 "path": normalized_path,
-                "content": content,
-                "sha256": _sha256_text(content),
+                "content": blob_ref,
+                "sha256": blob_ref[STAGE_AUDIT_BLOB_REF_KEY],
             }
         )
     return normalized_paths, snapshots
@@ -282,25 +557,27 @@ def append_stage_audit_record(
         normalized_event_scope = _resolve_event_scope(context.stage, normalized_event_type, event_scope)
         normalized_task_name = str(task_name or "")
         record_metadata = _metadata_with_defaults(metadata, task_name=normalized_task_name)
-        normalized_source_paths, snapshots = _build_fixed_snapshots(source_paths, record_metadata)
+        blob_dir = build_stage_audit_blob_dir(context.audit_log_path)
+        normalized_source_paths, snapshots = _build_fixed_snapshots(source_paths, record_metadata, blob_dir)
         for key, value in (snapshot_overrides or {}).items():
-            snapshots[str(key)] = _json_safe(value)
+            snapshots[str(key)] = _store_text_blob(blob_dir, value) if isinstance(value, str) else _json_safe(value)
         reviewer_markdowns, reviewer_markdown_snapshots = _build_dynamic_snapshots(
             _sequence_or_empty(reviewer_markdown_paths),
             record_metadata,
+            blob_dir,
         )
         reviewer_jsons, reviewer_json_snapshots = _build_dynamic_snapshots(
             _sequence_or_empty(reviewer_json_paths),
             record_metadata,
+            blob_dir,
         )
         if reviewer_markdowns or reviewer_jsons or normalized_event_type in _EVENT_TYPES_WITH_REVIEWER_ARRAYS:
             normalized_source_paths["reviewer_markdowns"] = reviewer_markdowns
             normalized_source_paths["reviewer_jsons"] = reviewer_jsons
             snapshots["reviewer_markdowns"] = reviewer_markdown_snapshots
             snapshots["reviewer_jsons"] = reviewer_json_snapshots
-        lock = _file_lock(context.audit_log_path)
-        with lock:
-            record_index = _read_max_integer_field(context.audit_log_path, "record_index") + 1
+        with _locked_audit_log(context.audit_log_path) as (file_obj, index_state):
+            record_index = index_state.record_index + 1
             record = {
                 "schema_version": STAGE_AUDIT_SCHEMA_VERSION,
                 "record_index": record_index,
@@ -317,11 +594,18 @@ def append_stage_audit_record(
                 "snapshots": snapshots,
                 "metadata": record_metadata,
             }
-            line = json.dumps(record, ensure_ascii=False) + "\n"
-            context.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
-            with context.audit_log_path.open("a", encoding="utf-8") as file_obj:
-                file_obj.write(line)
-                file_obj.flush()
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            file_obj.write(line)
+            file_obj.flush()
+            index_state.offsets_valid = index_state.offsets_valid and _append_offset_entries(
+                context.audit_log_path,
+                [build_stage_audit_offset_entry(index_state.size, len(line), record)],
+            )
+            index_state.size += len(line)
+            index_state.record_index = record_index
+            index_state.stage_run_index = max(index_state.stage_run_index, context.stage_run_index)
+            if index_state.offsets_valid:
+                _write_index_sidecar(build_stage_audit_index_path(context.audit_log_path), index_state)
         return True
     except Exception as error:  # noqa: BLE001
         warn_stage_audit_failure(
@@ -379,18 +663,8 @@ def begin_stage_audit_run(
         return None
 
     try:
-        lock = _file_lock(audit_log_path)
-        with lock:
-            try:
-                max_stage_run_index = _read_max_integer_field(audit_log_path, "stage_run_index")
-            except Exception as error:  # noqa: BLE001
-                warn_stage_audit_failure(
-                    stage=normalized_stage,
-                    event_type="stage_started",
-                    audit_log_path=audit_log_path,
-                    error=error,
-                )
-                max_stage_run_index = 0
+        with _locked_audit_log(audit_log_path) as (_file_obj, index_state):
+            max_stage_run_index = index_state.stage_run_index
             context = StageAuditRunContext(
                 project_dir=project_root,
                 requirement_name=normalized_requirement,
@@ -425,12 +699,27 @@ def begin_stage_audit_run(
 
 
 __all__ = [
+    "STAGE_AUDIT_BLOB_DIRNAME",
+    "STAGE_AUDIT_BLOB_REF_KEY",
+    "STAGE_AUDIT_INDEX_SUFFIX",
+    "STAGE_AUDIT_OFFSET_HEADER_KEY",
+    "STAGE_AUDIT_OFFSET_INDEX_FIELDS",
+    "STAGE_AUDIT_OFFSET_INDEX_SUFFIX",
     "STAGE_AUDIT_SCHEMA_VERSION",
     "SUPPORTED_STAGE_AUDIT_STAGES",
     "StageAuditRunContext",
     "append_stage_audit_record",
     "begin_stage_audit_run",
+    "build_stage_audit_blob_dir",
+    "build_stage_audit_index_path",
     "build_stage_audit_log_path",
+    "build_stage_audit_offset_entry",
+    "build_stage_audit_offset_header",
+    "build_stage_audit_offset_index_path",
+    "iter_stage_audit_records",
+    "load_stage_audit_blob",
+    "rebuild_stage_audit_indexes",
     "record_before_cleanup",
+    "rehydrate_stage_audit_record",
     "warn_stage_audit_failure",
 ]
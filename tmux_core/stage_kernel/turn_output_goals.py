@@ -21,6 +21,8 @@ from tmux_core.runtime.tmux_runtime import (
     is_task_result_contract_error,
     is_turn_artifact_contract_error,
 )
+from tmux_core.runtime.metrics import REPAIR_TURNS_TOTAL
+from tmux_core.runtime.turn_trace import tracer_for
 from tmux_core.stage_kernel.agent_intervention import (
     AGENT_INTERVENTION_WORKER_DEAD,
     request_file_noncompliance_intervention,
@@ -323,12 +325,20 @@ def run_task_result_turn_with_repair(
             if repair_attempt == 0 or repair_result_contract is None
             else repair_result_contract
         )
-        result = worker.run_turn(
+        tracer = tracer_for(worker)
+        if repair_attempt:
+            REPAIR_TURNS_TOTAL.inc(kind="task_result", **tracer.metric_labels())
+        with tracer.span(
+            "repair_turn" if repair_attempt else "task_result_turn",
             label=current_label,
-            prompt=current_prompt,
-            result_contract=active_result_contract,
-            timeout_sec=timeout_sec,
-        )
+            repair_attempt=repair_attempt,
+        ):
+            result = worker.run_turn(
+                label=current_label,
+                prompt=current_prompt,
+                result_contract=active_result_contract,
+                timeout_sec=timeout_sec,
+            )
         current_error: RuntimeError | None = None
         payload: dict[str, object] | None = None
         if result.ok:
@@ -383,14 +393,15 @@ def run_task_result_turn_with_repair(
             )
             while True:
                 target_paths = tuple(observation.artifact_paths.values()) or (str(result_path),)
-                decision = request_file_noncompliance_intervention(
-                    stage_label=stage_label or active_result_contract.stage_name or active_result_contract.phase,
-                    role_label=role_label,
-                    worker=worker,
-                    reason_text=str(terminal_error),
-                    attempts_used=repair_budget,
-                    target_paths=target_paths,
-                )
+                with tracer.span("manual_intervention", label=current_label):
+                    decision = request_file_noncompliance_intervention(
+                        stage_label=stage_label or active_result_contract.stage_name or active_result_contract.phase,
+                        role_label=role_label,
+                        worker=worker,
+                        reason_text=str(terminal_error),
+                        attempts_used=repair_budget,
+                        target_paths=target_paths,
+                    )
                 if decision == AGENT_INTERVENTION_WORKER_DEAD:
                     raise RuntimeError(f"tmux pane died after manual file intervention: {terminal_error}") from terminal_error
                 observation = observe_task_result_state(active_result_contract, result_path)
@@ -10,19 +10,10 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import Sequence
-
-from tmux_core.runtime.tmux_runtime import cleanup_registered_tmux_workers
-from tmux_core.stage_kernel.shared_review import ReviewAgentSelection, StageAgentConfig, resolve_stage_agent_config
-from tmux_core.stage_kernel.requirement_intake import run_requirement_intake_stage
-from tmux_core.stage_kernel.requirements_clarification import run_requirements_clarification_stage
-from tmux_core.stage_kernel.detailed_design import run_detailed_design_stage
-from tmux_core.stage_kernel.overall_review import run_overall_review_stage
-from tmux_core.stage_kernel.requirements_review import run_requirements_review_stage
-from tmux_core.stage_kernel.routing_init import run_routing_stage as routing_stage_main
-from tmux_core.stage_kernel.development import cleanup_stale_development_runtime_state, run_development_stage
+from typing import TYPE_CHECKING, Sequence
+
 from tmux_core.stage_kernel.requirement_concurrency import requirement_concurrency_lock
-from tmux_core.stage_kernel.task_split import cleanup_stale_task_split_runtime_state, run_task_split_stage
+from tmux_core.workflow.stage_registry import lazy_stage_callable
 from T08_pre_development import (
     build_pre_development_task_record_path as shared_build_pre_development_task_record_path,
     build_pre_development_task_record_payload as shared_build_pre_development_task_record_payload,
@@ -32,6 +23,20 @@ from T09_terminal_ops import PROMPT_BACK_VALUE, PromptBackRequested, clear_pendi
 from T09_terminal_ops import BridgeTerminalUI, get_terminal_ui, maybe_launch_tui, message, notify_stage_action_changed
 from T09_terminal_ops import prompt_metadata, prompt_select_option
 
+if TYPE_CHECKING:
+    from tmux_core.stage_kernel.shared_review import ReviewAgentSelection, StageAgentConfig
+
+
+routing_stage_main = lazy_stage_callable("A01")
+run_requirement_intake_stage = lazy_stage_callable("A02")
+run_requirements_clarification_stage = lazy_stage_callable("A03")
+run_requirements_review_stage = lazy_stage_callable("A04")
+run_detailed_design_stage = lazy_stage_callable("A05")
+run_task_split_stage = lazy_stage_callable("A06")
+cleanup_stale_task_split_runtime_state = lazy_stage_callable("A06", "cleanup_stale_task_split_runtime_state")
+run_development_stage = lazy_stage_callable("A07")
+cleanup_stale_development_runtime_state = lazy_stage_callable("A07", "cleanup_stale_development_runtime_state")
+run_overall_review_stage = lazy_stage_callable("A08")
 
 UNIMPLEMENTED_STAGES = (
     "测试阶段（功能测试 + 全面回归，占位）",
@@ -144,6 +149,8 @@ def _workflow_reviewer_agent_args(agent_config: StageAgentConfig) -> tuple[str,
 
 
 def _workflow_stage_agent_config(args: argparse.Namespace, stage_key: str) -> StageAgentConfig:
+    from tmux_core.stage_kernel.shared_review import resolve_stage_agent_config
+
     return resolve_stage_agent_config(args, stage_key=stage_key)
 
 
@@ -521,6 +528,8 @@ if __name__ == "__main__":
     try:
         raise SystemExit(main())
     except KeyboardInterrupt:
+        from tmux_core.runtime.tmux_runtime import cleanup_registered_tmux_workers
+
         cleaned_sessions = cleanup_registered_tmux_workers(reason="keyboard_interrupt")
         if cleaned_sessions:
             message(f"\n已清理 tmux 会话: {', '.join(cleaned_sessions)}")
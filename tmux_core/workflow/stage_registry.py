@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class StageEntrypoint:
+    stage_key: str
+    module_name: str
+    main_name: str
+    runtime_root_name: str = ""
+
+
+STAGE_ENTRYPOINTS: dict[str, StageEntrypoint] = {
+    entrypoint.stage_key: entrypoint
+    for entrypoint in (
+        StageEntrypoint("A00", "tmux_core.workflow.entry", "main"),
+        StageEntrypoint("A01", "tmux_core.stage_kernel.routing_init", "run_routing_stage"),
+        StageEntrypoint(
+            "A02",
+            "tmux_core.stage_kernel.requirement_intake",
+            "run_requirement_intake_stage",
+            ".requirements_intake_runtime",
+        ),
+        StageEntrypoint(
+            "A03",
+            "tmux_core.stage_kernel.requirements_clarification",
+            "run_requirements_clarification_stage",
+            ".requirements_clarification_runtime",
+        ),
+        StageEntrypoint(
+            "A04",
+            "tmux_core.stage_kernel.requirements_review",
+            "run_requirements_review_stage",
+            ".requirements_review_runtime",
+        ),
+        StageEntrypoint(
+            "A05",
+            "tmux_core.stage_kernel.detailed_design",
+            "run_detailed_design_stage",
+            ".detailed_design_runtime",
+        ),
+        StageEntrypoint("A06", "tmux_core.stage_kernel.task_split", "run_task_split_stage", ".task_split_runtime"),
+        StageEntrypoint("A07", "tmux_core.stage_kernel.development", "run_development_stage", ".development_runtime"),
+        StageEntrypoint("A08", "tmux_core.stage_kernel.overall_review", "run_overall_review_stage"),
+    )
+}
+_STAGE_IMPORT_LOCK = threading.RLock()
+
+
+def get_stage_entrypoint(stage_key: str) -> StageEntrypoint:
+    normalized_key = str(stage_key or "").strip().upper()
+    entrypoint = STAGE_ENTRYPOINTS.get(normalized_key)
+    if entrypoint is None:
+        raise KeyError(f"未注册的阶段: {stage_key}")
+    return entrypoint
+
+
+def load_stage_module(stage_key: str) -> ModuleType:
+    module_name = get_stage_entrypoint(stage_key).module_name
+    with _STAGE_IMPORT_LOCK:
+        module = import_module(module_name)
+        getattr(module, "__name__")
+    return module
+
+
+def resolve_stage_attribute(stage_key: str, attribute_name: str = "") -> Any:
+    entrypoint = get_stage_entrypoint(stage_key)
+    name = str(attribute_name or "").strip() or entrypoint.main_name
+    module = load_stage_module(entrypoint.stage_key)
+    try:
+        return getattr(module, name)
+    except AttributeError as error:
+        raise AttributeError(f"阶段 {entrypoint.stage_key} 的模块 {entrypoint.module_name} 缺少 {name}") from error
+
+
+def stage_runtime_root_name(stage_key: str) -> str:
+    runtime_root_name = get_stage_entrypoint(stage_key).runtime_root_name
+    if not runtime_root_name:
+        raise KeyError(f"阶段 {stage_key} 未登记运行时目录")
+    return runtime_root_name
+
+
+class LazyStageCallable:
+    def __init__(self, stage_key: str, attribute_name: str = "") -> None:
+        entrypoint = get_stage_entrypoint(stage_key)
+        self.stage_key = entrypoint.stage_key
+        self.attribute_name = str(attribute_name or "").strip() or entrypoint.main_name
+        self.__name__ = self.attribute_name
+        self.__qualname__ = self.attribute_name
+
+    def resolve(self) -> Callable[..., Any]:
+        return resolve_stage_attribute(self.stage_key, self.attribute_name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        entrypoint = get_stage_entrypoint(self.stage_key)
+        return f"<lazy stage {self.stage_key} {entrypoint.module_name}.{self.attribute_name}>"
+
+
+def lazy_stage_callable(stage_key: str, attribute_name: str = "") -> LazyStageCallable:
+    return LazyStageCallable(stage_key, attribute_name)
+
+
+__all__ = [
+    "LazyStageCallable",
+    "STAGE_ENTRYPOINTS",
+    "StageEntrypoint",
+    "get_stage_entrypoint",
+    "lazy_stage_callable",
+    "load_stage_module",
+    "resolve_stage_attribute",
+    "stage_runtime_root_name",
+]